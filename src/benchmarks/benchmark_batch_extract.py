@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - Benchmark da Extração em Lote
+batch_extract (threads, time.sleep no retry, resultado só no fim) vs batch_extract_stream (aiohttp, backoff assíncrono, prazo do lote)
+
+Uso: python src/benchmarks/benchmark_batch_extract.py --pages 40 --slow 4 --failing 4
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Cache HTTP desligado (cada modo baixa tudo) e auto-save num diretório temporário
+os.chdir(tempfile.mkdtemp(prefix="batch_bench_"))
+os.environ["HTTP_CACHE_ENABLED"] = "false"
+
+FRASE = ("O mercado brasileiro de telemedicina cresceu 35% em 2024, com mais de 2 mil empresas "
+         "atendendo pacientes em todo o país e investimento de R$ 1,2 bilhão no setor. ")
+
+class Handler(BaseHTTPRequestHandler):
+    latency = 0.3
+    slow_latency = 20.0
+
+    def do_GET(self):
+        kind, _, number = self.path.strip('/').partition('/')
+        if kind == 'falha':
+            time.sleep(self.latency)
+            self.send_response(503)
+            self.end_headers()
+            return
+        time.sleep(self.slow_latency if kind == 'lento' else self.latency)
+        body = (f"<html><head><title>{self.path}</title></head><body><article><h1>Artigo {number}</h1>"
+                + "".join(f"<p>{FRASE} Parágrafo {i}.</p>" for i in range(25)) + "</article></body></html>")
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.end_headers()
+            self.wfile.write(body.encode("utf-8"))
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+def start_server(latency: float, slow_latency: float) -> int:
+    Handler.latency, Handler.slow_latency = latency, slow_latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address[1]
+
+async def stream(extractor, urls, concurrency, deadline):
+    start = time.perf_counter()
+    first, ok, arrivals = None, 0, []
+    async for url, content, metadata in extractor.batch_extract_stream(urls, concurrency, deadline):
+        elapsed = time.perf_counter() - start
+        first = first or elapsed
+        ok += bool(content)
+        arrivals.append(elapsed)
+    return time.perf_counter() - start, first, arrivals[len(arrivals) // 2], ok, len(arrivals)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da extração em lote")
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--slow", type=int, default=4, help="URLs de host lento (--slow-latency)")
+    parser.add_argument("--failing", type=int, default=4, help="URLs que respondem 503")
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--slow-latency", type=float, default=20.0)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--deadline", type=float, default=15.0)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    port = start_server(args.latency, args.slow_latency)
+    urls = ([f"http://127.0.0.1:{port}/ok/{i}" for i in range(args.pages)]
+            + [f"http://127.0.0.1:{port}/lento/{i}" for i in range(args.slow)]
+            + [f"http://127.0.0.1:{port}/falha/{i}" for i in range(args.failing)])
+
+    from services.robust_content_extractor import RobustContentExtractor
+
+    print(f"{len(urls)} URLs ({args.pages} ok, {args.slow} lentas de {args.slow_latency}s, {args.failing} com 503), "
+          f"concorrência {args.concurrency}, prazo {args.deadline}s")
+    print(f"{'modo':<26} {'1º resultado (s)':>17} {'metade (s)':>11} {'total (s)':>10} {'com texto':>10} {'entregues':>10}")
+
+    extractor = RobustContentExtractor()
+    start = time.perf_counter()
+    results = extractor.batch_extract(urls, max_workers=args.concurrency)
+    elapsed = time.perf_counter() - start
+    ok = sum(1 for content in results.values() if content)
+    print(f"{'batch_extract (antes)':<26} {elapsed:>17.2f} {elapsed:>11.2f} {elapsed:>10.2f} {ok:>10} {len(results):>10}")
+
+    extractor = RobustContentExtractor()
+    elapsed, first, half, ok, delivered = asyncio.run(stream(extractor, urls, args.concurrency, args.deadline))
+    print(f"{'batch_extract_stream':<26} {first:>17.2f} {half:>11.2f} {elapsed:>10.2f} {ok:>10} {delivered:>10}")
+    print(f"lote: {extractor.get_extractor_stats()['batch']}")
+
+if __name__ == "__main__":
+    main()
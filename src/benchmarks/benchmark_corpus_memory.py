@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - Benchmark de Memória do Corpus
+Compara o pico de memória da contagem de palavras com o corpus inteiro em memória vs SessionCorpus
+
+Uso: python src/benchmarks/benchmark_corpus_memory.py --docs 2000 --doc-kb 50
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from engine.corpus import SessionCorpus
+
+PALAVRAS = (
+    "mercado cliente produto estratégia venda crescimento digital marca consumidor preço "
+    "qualidade inovação concorrência campanha resultado empresa serviço experiência"
+).split()
+STOPWORDS = ['a', 'o', 'e', 'de', 'do', 'da', 'em', 'um', 'uma', 'para', 'com', 'que']
+
+
+def build_corpus(session_dir: Path, n_docs: int, doc_kb: int):
+    """Gera n_docs arquivos .txt de ~doc_kb KB"""
+    session_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(7)
+    vocabulary = PALAVRAS + STOPWORDS
+    for i in range(n_docs):
+        words = []
+        size = 0
+        while size < doc_kb * 1024:
+            word = rng.choice(vocabulary)
+            words.append(word)
+            size += len(word) + 1
+        (session_dir / f"documento_{i:05d}.txt").write_text(" ".join(words), encoding="utf-8")
+
+
+def count_in_memory(session_dir: Path) -> Counter:
+    """Comportamento anterior: dict com todos os textos + join + findall"""
+    textual_data = {}
+    for text_file in session_dir.glob("*.txt"):
+        with open(text_file, "r", encoding="utf-8") as f:
+            textual_data[text_file.name] = f.read()
+    combined_text = " ".join(textual_data.values()).lower()
+    words = [word for word in re.findall(r'\b\w+\b', combined_text) if word not in STOPWORDS]
+    return Counter(words)
+
+
+def count_streaming(session_dir: Path) -> Counter:
+    return SessionCorpus(session_dir).token_counts(STOPWORDS)
+
+
+def measure(func, session_dir: Path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    counts = func(session_dir)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de memória do SessionCorpus")
+    parser.add_argument("--docs", type=int, default=1000)
+    parser.add_argument("--doc-kb", type=int, default=20, help="Tamanho aproximado de cada documento")
+    parser.add_argument("--root", default=None, help="Diretório do corpus (padrão: temporário)")
+    args = parser.parse_args()
+
+    session_dir = Path(args.root or tempfile.mkdtemp(prefix="corpus_bench_")) / "bench_session"
+    build_corpus(session_dir, args.docs, args.doc_kb)
+    corpus_mb = sum(p.stat().st_size for p in session_dir.glob("*.txt")) / 1024 / 1024
+    print(f"Corpus: {args.docs} documentos, {corpus_mb:.1f} MB em {session_dir}")
+
+    print(f"{'modo':<22} {'tempo (s)':>10} {'pico (MB)':>10}")
+    results = {}
+    for label, func in (("em memória (antes)", count_in_memory), ("streaming", count_streaming)):
+        elapsed, peak, counts = measure(func, session_dir)
+        results[label] = counts
+        print(f"{label:<22} {elapsed:>10.2f} {peak / 1024 / 1024:>10.1f}")
+
+    same = results["em memória (antes)"] == results["streaming"]
+    print(f"Contagens idênticas: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - Benchmark do Cache HTTP
+Quatro extratores sobre as mesmas URLs: downloads independentes (antes) vs services.http_fetch_cache (frio, quente e revalidação 304)
+
+Uso: python src/benchmarks/benchmark_http_cache.py --pages 50 --latency 0.2
+"""
+
+import os
+import sys
+import time
+import hashlib
+import argparse
+import tempfile
+import threading
+from email.utils import formatdate
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Cache e auto-save num diretório temporário
+os.chdir(tempfile.mkdtemp(prefix="http_cache_bench_"))
+os.environ.setdefault("HTTP_CACHE_PATH", os.path.join(os.getcwd(), "http_cache.sqlite3"))
+for key in ("JINA_API_KEY", "EXA_API_KEY"):
+    os.environ.pop(key, None)
+
+PARAGRAFO = ("O mercado brasileiro de telemedicina cresceu 35% em 2024, com mais de 2 mil empresas "
+             "atendendo pacientes em todo o país e investimento de R$ 1,2 bilhão no setor. ")
+
+class Handler(BaseHTTPRequestHandler):
+    latency = 0.2
+    counts = {'200': 0, '304': 0}
+    lock = threading.Lock()
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        body = (f"<html><head><title>{self.path}</title></head><body><main><h1>Artigo {self.path}</h1>"
+                + "".join(f"<p>{PARAGRAFO}</p>" for _ in range(30)) + "</main></body></html>").encode("utf-8")
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            with self.lock:
+                self.counts['304'] += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        with self.lock:
+            self.counts['200'] += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", formatdate(0, usegmt=True))
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def start_server(latency: float) -> int:
+    Handler.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address[1]
+
+def run_extractors(urls, extractors):
+    for url in urls:
+        for extract in extractors:
+            extract(url)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do cache HTTP compartilhado")
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    port = start_server(args.latency)
+    urls = [f"http://127.0.0.1:{port}/artigos/{i}" for i in range(args.pages)]
+
+    from services.http_fetch_cache import http_fetch_cache
+    from services.content_extractor import ContentExtractor
+    from services.robust_content_extractor import RobustContentExtractor
+    from services.deep_search_service import DeepSearchService
+    from services.alibaba_websailor import AlibabaWebSailorAgent
+
+    content_extractor, robust = ContentExtractor(), RobustContentExtractor()
+    deep_search, websailor = DeepSearchService(), AlibabaWebSailorAgent()
+    extractors = [
+        content_extractor._extract_direct,
+        robust.extract_content,
+        deep_search._extract_direct_real,
+        lambda url: websailor._fallback_extraction(url, "", {}, None)
+    ]
+
+    print(f"{args.pages} URLs x {len(extractors)} extratores, latência {args.latency}s")
+    print(f"{'modo':<28} {'tempo (s)':>10} {'HTTP 200':>9} {'HTTP 304':>9}")
+
+    def measure(label):
+        before = dict(Handler.counts)
+        start = time.perf_counter()
+        run_extractors(urls, extractors)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<28} {elapsed:>10.2f} {Handler.counts['200'] - before['200']:>9} "
+              f"{Handler.counts['304'] - before['304']:>9}")
+
+    http_fetch_cache.enabled = False
+    measure("sem cache (antes)")
+    http_fetch_cache.enabled = True
+    http_fetch_cache.clear()
+    measure("cache frio")
+    measure("cache quente (repetição)")
+    # Entradas vencidas: o primeiro extrator revalida com If-None-Match, os outros pegam a entrada renovada
+    http_fetch_cache._get_connection().execute("UPDATE http_cache SET fresh_until = 0")
+    measure("vencido (revalidação)")
+
+    stats = http_fetch_cache.get_stats()
+    print(f"hits {stats['hits']}, revalidadas {stats['revalidated']}, misses {stats['misses']}, "
+          f"textos reaproveitados {stats['extracted_hits']}, {stats['entries']} entradas ({stats['stored_mb']} MB)")
+
+if __name__ == "__main__":
+    main()
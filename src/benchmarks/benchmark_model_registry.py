@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - Benchmark do Registro de Modelos
+Tempo de LDA/KMeans/Prophet com ajuste do zero, reutilização (dados iguais) e atualização (dados novos)
+
+Uso: python src/benchmarks/benchmark_model_registry.py --docs 500 --new-docs 50
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+BENCH_ROOT = Path(tempfile.mkdtemp(prefix="model_registry_bench_"))
+os.environ.setdefault("MODEL_REGISTRY_PATH", str(BENCH_ROOT / "models"))
+
+from engine.corpus import SessionCorpus
+from engine.predictive_analytics_engine1 import PredictiveAnalyticsEngine
+
+TEMAS = [
+    "mercado cliente produto venda preço concorrência margem canal",
+    "digital marca conteúdo engajamento campanha público anúncio rede",
+    "inovação tecnologia plataforma dados automação software nuvem",
+    "experiência serviço atendimento qualidade satisfação suporte",
+    "estratégia crescimento expansão investimento resultado empresa"
+]
+
+
+def write_docs(session_dir: Path, start: int, count: int, words_per_doc: int):
+    """Documentos sintéticos, cada um dominado por um tema"""
+    session_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(start)
+    for i in range(start, start + count):
+        theme = TEMAS[i % len(TEMAS)].split()
+        other = rng.choice(TEMAS).split()
+        words = [rng.choice(theme if rng.random() < 0.8 else other) for _ in range(words_per_doc)]
+        (session_dir / f"documento_{i:05d}.txt").write_text(" ".join(words), encoding="utf-8")
+
+
+def write_series(session_dir: Path, n_points: int, seed: int):
+    """Série diária em metricas.json (entrada do Prophet)"""
+    rng = random.Random(seed)
+    start = datetime(2022, 1, 1)
+    points = [{"timestamp": (start + timedelta(days=i)).isoformat(),
+               "value": 100 + i * 0.2 + 10 * math.sin(i / 7) + rng.gauss(0, 2)} for i in range(n_points)]
+    with open(session_dir / "metricas.json", "w", encoding="utf-8") as f:
+        json.dump(points, f)
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do registro de modelos (LDA/KMeans/Prophet)")
+    parser.add_argument("--docs", type=int, default=500)
+    parser.add_argument("--new-docs", type=int, default=50, help="Documentos acrescentados na rodada de atualização")
+    parser.add_argument("--words-per-doc", type=int, default=300)
+    parser.add_argument("--points", type=int, default=730, help="Pontos da série do Prophet")
+    args = parser.parse_args()
+
+    session_dir = BENCH_ROOT / "analyses_data" / "bench_session"
+    write_docs(session_dir, 0, args.docs, args.words_per_doc)
+    write_series(session_dir, args.points, seed=1)
+
+    engine = PredictiveAnalyticsEngine()
+    registry = engine.model_registry
+
+    def text_models():
+        corpus = SessionCorpus(session_dir).filter(engine.config['min_text_length'])
+        return (timed(lambda: engine._extract_topics_lda(corpus)),
+                timed(lambda: engine._perform_semantic_clustering(corpus)))
+
+    def forecast():
+        return timed(lambda: asyncio.run(engine._perform_temporal_analysis(session_dir)))
+
+    rounds = []
+    rounds.append(("ajuste do zero", *text_models(), forecast()))
+    rounds.append(("dados iguais", *text_models(), forecast()))
+    write_docs(session_dir, args.docs, args.new_docs, args.words_per_doc)
+    write_series(session_dir, args.points + 7, seed=1)
+    rounds.append((f"+{args.new_docs} docs / +7 dias", *text_models(), forecast()))
+
+    print(f"Corpus: {args.docs} documentos; registro em {registry.base_path}")
+    print(f"{'rodada':<24} {'LDA (s)':>9} {'KMeans (s)':>11} {'temporal (s)':>13}")
+    for label, lda, kmeans, temporal in rounds:
+        print(f"{label:<24} {lda:>9.2f} {kmeans:>11.2f} {temporal:>13.2f}")
+    print(f"Registro: {registry.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - Benchmark do Estágio de NLP em Lote
+Compara nlp(texto) documento a documento com BatchNLPProcessor.pipe em um corpus sintético
+
+Uso: python src/benchmarks/benchmark_nlp_batch.py --docs 500 --batch-size 32 64 --n-process 1 2
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import spacy
+
+from engine.nlp_pipeline import BatchNLPProcessor
+
+PESSOAS = ["Ana Souza", "Carlos Lima", "Mariana Alves", "João Pereira", "Beatriz Costa"]
+EMPRESAS = ["Petrobras", "Magazine Luiza", "Nubank", "Ambev", "Natura", "Itaú"]
+LUGARES = ["São Paulo", "Rio de Janeiro", "Belo Horizonte", "Curitiba", "Recife"]
+FRASES = [
+    "{p} afirmou que a {e} vai ampliar as operações em {l} no próximo trimestre.",
+    "Segundo analistas, o mercado de {l} cresceu de forma consistente em 2024.",
+    "Você já pensou em como a {e} conquistou tantos clientes?",
+    "A estratégia digital da {e} foi apresentada por {p} durante o evento em {l}.",
+    "Os consumidores estão mais exigentes e comparam preços antes de comprar!",
+    "Nós acreditamos que a experiência do cliente define a fidelidade à marca.",
+]
+
+
+def build_corpus(root: Path, session_id: str, n_docs: int, sentences_per_doc: int) -> Path:
+    """Gera analyses_data/<session>/*.txt com texto em português e entidades"""
+    session_dir = root / "analyses_data" / session_id
+    session_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(42)
+    for i in range(n_docs):
+        sentences = [
+            rng.choice(FRASES).format(p=rng.choice(PESSOAS), e=rng.choice(EMPRESAS), l=rng.choice(LUGARES))
+            for _ in range(sentences_per_doc)
+        ]
+        (session_dir / f"documento_{i:04d}.txt").write_text(" ".join(sentences), encoding="utf-8")
+    return session_dir
+
+
+def load_corpus(session_dir: Path):
+    return [f.read_text(encoding="utf-8") for f in sorted(session_dir.glob("*.txt"))]
+
+
+def run_sequential(nlp, texts):
+    """Comportamento anterior: pipeline completo, um documento por chamada"""
+    entities = 0
+    start = time.perf_counter()
+    for text in texts:
+        doc = nlp(text[:1000000])
+        entities += len(doc.ents)
+        sum(1 for _ in doc.sents)
+    return time.perf_counter() - start, entities
+
+
+def run_batched(processor, texts):
+    entities = 0
+    start = time.perf_counter()
+    for _, doc in processor.pipe(texts, task="textual"):
+        entities += len(doc.ents)
+        sum(1 for _ in doc.sents)
+    return time.perf_counter() - start, entities
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do BatchNLPProcessor")
+    parser.add_argument("--docs", type=int, default=500)
+    parser.add_argument("--sentences", type=int, default=20, help="Frases por documento")
+    parser.add_argument("--model", default="pt_core_news_sm")
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[32, 128])
+    parser.add_argument("--n-process", type=int, nargs="+", default=[1])
+    parser.add_argument("--root", default=None, help="Diretório base do corpus (padrão: temporário)")
+    args = parser.parse_args()
+
+    root = Path(args.root or tempfile.mkdtemp(prefix="nlp_bench_"))
+    session_dir = build_corpus(root, "bench_session", args.docs, args.sentences)
+    texts = load_corpus(session_dir)
+    print(f"Corpus: {len(texts)} documentos em {session_dir} ({sum(len(t) for t in texts):,} caracteres)")
+
+    nlp = spacy.load(args.model)
+    # Aquece o modelo para não medir inicialização
+    nlp("Aquecimento do modelo em São Paulo.")
+
+    elapsed, entities = run_sequential(nlp, texts)
+    print(f"{'modo':<28} {'tempo (s)':>10} {'docs/s':>9} {'entidades':>10}")
+    print(f"{'sequencial (antes)':<28} {elapsed:>10.2f} {len(texts) / elapsed:>9.1f} {entities:>10}")
+    baseline = elapsed
+
+    for n_process in args.n_process:
+        for batch_size in args.batch_size:
+            processor = BatchNLPProcessor(nlp, batch_size=batch_size, n_process=n_process)
+            elapsed, entities = run_batched(processor, texts)
+            label = f"pipe bs={batch_size} np={n_process}"
+            print(f"{label:<28} {elapsed:>10.2f} {len(texts) / elapsed:>9.1f} {entities:>10}  ({baseline / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - Benchmark do OCR
+Compara OCR sequencial em resolução cheia com o services.ocr_pipeline (pool, pré-processamento e cache)
+
+Uso: python src/benchmarks/benchmark_ocr.py --images 200 --workers 4
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+BENCH_ROOT = Path(tempfile.mkdtemp(prefix="ocr_bench_"))
+os.environ.setdefault("OCR_CACHE_PATH", str(BENCH_ROOT / "ocr.sqlite3"))
+
+from PIL import Image, ImageDraw
+
+FRASES = [
+    "Oferta exclusiva por tempo limitado",
+    "Compre agora e ganhe frete grátis",
+    "Mais de 10 mil clientes satisfeitos",
+    "Garantia de 30 dias ou seu dinheiro de volta",
+    "Cadastre-se e receba conteúdo gratuito",
+    "Marketing digital para pequenas empresas"
+]
+
+
+def build_screenshots(directory: Path, n_images: int, width: int, height: int):
+    """Screenshots sintéticos: faixas de texto, botões em modo escuro e blocos de 'imagem'"""
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(5)
+    paths = []
+    for i in range(n_images):
+        image = Image.new("RGB", (width, height), (250, 250, 250))
+        draw = ImageDraw.Draw(image)
+        draw.rectangle([0, 0, width, 80], fill=(30, 30, 40))
+        draw.text((40, 30), rng.choice(FRASES), fill=(255, 255, 255))
+        for line in range(rng.randint(4, 12)):
+            draw.text((120, 150 + line * 40), rng.choice(FRASES), fill=(20, 20, 20))
+        draw.rectangle([width - 700, 200, width - 100, 700],
+                       fill=tuple(rng.randint(0, 255) for _ in range(3)))
+        path = directory / f"screenshot_{i:04d}.png"
+        image.save(path)
+        paths.append(path)
+    return paths
+
+
+def legacy_ocr(paths):
+    """Antes: uma imagem por vez, resolução cheia, sem recorte"""
+    import pytesseract
+    return [pytesseract.image_to_string(Image.open(path), lang=os.getenv("OCR_LANG", "por")) for path in paths]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline de OCR")
+    parser.add_argument("--images", type=int, default=100)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--workers", type=int, default=None, help="OCR_WORKERS (padrão: min(4, CPUs))")
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    if args.workers is not None:
+        os.environ["OCR_WORKERS"] = str(args.workers)
+    from services.ocr_pipeline import OCRPipeline, HAS_OCR
+    if not HAS_OCR:
+        print("pytesseract/Pillow não instalados; benchmark indisponível")
+        return
+
+    paths = build_screenshots(BENCH_ROOT / "screenshots", args.images, args.width, args.height)
+    pipeline = OCRPipeline()
+    print(f"{args.images} screenshots {args.width}x{args.height}, {pipeline.workers} workers")
+    print(f"{'modo':<28} {'tempo (s)':>10} {'imagens/s':>10}")
+
+    def report(label, elapsed):
+        print(f"{label:<28} {elapsed:>10.2f} {args.images / elapsed:>10.1f}")
+
+    if not args.skip_legacy:
+        start = time.perf_counter()
+        legacy_ocr(paths)
+        report("sequencial (antes)", time.perf_counter() - start)
+
+    for label in ("pipeline (cache frio)", "pipeline (cache quente)"):
+        start = time.perf_counter()
+        results = asyncio.run(pipeline.process_images(paths))
+        report(label, time.perf_counter() - start)
+
+    errors = sum(1 for result in results if "error" in result)
+    words = sum(result["word_count"] for result in results)
+    print(f"Palavras extraídas: {words:,}; erros: {errors}")
+
+
+if __name__ == "__main__":
+    main()
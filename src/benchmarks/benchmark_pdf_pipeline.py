@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - Benchmark do PDF Pipeline
+Download inteiro + todas as páginas em sequência (antes) vs services.pdf_pipeline (streaming, blocos em processos, parada antecipada, cache por hash)
+
+Uso: python src/benchmarks/benchmark_pdf_pipeline.py --pages 400 --workers 1 4
+"""
+
+import os
+import sys
+import time
+import logging
+import random
+import argparse
+import tracemalloc
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Cache e auto-save num diretório temporário
+os.chdir(tempfile.mkdtemp(prefix="pdf_bench_"))
+os.environ.setdefault("PDF_CACHE_PATH", os.path.join(os.getcwd(), "pdf_text.sqlite3"))
+
+import fitz
+import requests
+
+PARAGRAFO = ("O mercado brasileiro de telemedicina cresceu 35% em 2024, com mais de 2 mil empresas "
+             "atendendo pacientes em todo o país e investimento de R$ 1,2 bilhão no setor.")
+
+def build_pdf(pages: int, image_every: int) -> bytes:
+    """Relatório sintético: várias linhas de texto por página e um gráfico (ruído, incompressível) a cada image_every páginas"""
+    doc = fitz.open()
+    rng = random.Random(7)
+    for number in range(pages):
+        page = doc.new_page()
+        text = "\n".join(f"{number}.{line} {PARAGRAFO[:90]}" for line in range(40))
+        page.insert_textbox(fitz.Rect(36, 36, 576, 806), text, fontsize=8)
+        if image_every and number % image_every == 0:
+            pixmap = fitz.Pixmap(fitz.csRGB, 256, 256, bytes(rng.getrandbits(8) for _ in range(256 * 256 * 3)), False)
+            page.insert_image(fitz.Rect(300, 600, 556, 806), pixmap=pixmap)
+    data = doc.tobytes(deflate=True)
+    doc.close()
+    return data
+
+class Handler(BaseHTTPRequestHandler):
+    body = b""
+    bandwidth = 20 * 1024 * 1024  # bytes/s
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        step = 256 * 1024
+        for offset in range(0, len(self.body), step):
+            self.wfile.write(self.body[offset:offset + step])
+            time.sleep(step / self.bandwidth)
+
+    def log_message(self, *args):
+        pass
+
+def start_server() -> int:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address[1]
+
+def legacy_extract(url: str) -> int:
+    """Como o PyMuPDFClient fazia: corpo inteiro na memória, arquivo temporário, todas as páginas"""
+    response = requests.get(url, timeout=60)
+    response.raise_for_status()
+    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
+        temp_file.write(response.content)
+        path = temp_file.name
+    try:
+        doc = fitz.open(path)
+        text = ""
+        for number in range(len(doc)):
+            page_text = doc[number].get_text()
+            if page_text:
+                text += page_text + "\n"
+        doc.close()
+        return len(text)
+    finally:
+        os.unlink(path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline de PDF")
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--image-every", type=int, default=4, help="Uma imagem a cada N páginas (0 = só texto)")
+    parser.add_argument("--bandwidth", type=float, default=20.0, help="MB/s do servidor local")
+    parser.add_argument("--memory", action="store_true", help="Mede o pico de memória Python (tracemalloc deixa tudo mais lento)")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    Handler.body = build_pdf(args.pages, args.image_every)
+    Handler.bandwidth = args.bandwidth * 1024 * 1024
+    port = start_server()
+
+    from services.pdf_pipeline import PDFPipeline
+
+    print(f"PDF de {args.pages} páginas ({len(Handler.body) / 1024 / 1024:.1f} MB), servidor a {args.bandwidth} MB/s")
+    print(f"{'modo':<44} {'tempo (s)':>10} {'páginas lidas':>14} {'caracteres':>11}"
+          + (f" {'pico Python (MB)':>17}" if args.memory else ""))
+
+    def measure(label, func):
+        if args.memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        pages, chars = func()
+        elapsed = time.perf_counter() - start
+        line = f"{label:<44} {elapsed:>10.2f} {pages:>14} {chars:>11}"
+        if args.memory:
+            line += f" {tracemalloc.get_traced_memory()[1] / 1024 / 1024:>17.1f}"
+            tracemalloc.stop()
+        print(line)
+
+    measure("download inteiro + sequencial (antes)",
+            lambda: (args.pages, legacy_extract(f"http://127.0.0.1:{port}/antes.pdf")))
+
+    def run_pipeline(pipeline, name):
+        result = pipeline.extract_from_url(f"http://127.0.0.1:{port}/{name}.pdf")
+        return result['metadata']['pages_extracted'], len(result['text'])
+
+    for workers in args.workers:
+        for target in ("0", "60000"):
+            os.environ["PDF_WORKERS"] = str(workers)
+            os.environ["PDF_TARGET_CHARS"] = target
+            pipeline = PDFPipeline()
+            mode = "todas as páginas" if target == "0" else "parada antecipada"
+            if workers > 1 and target == "0":
+                # Pool aquecido, como num servidor de longa duração (spawn custa ~1s por worker)
+                for future in [pipeline._get_executor().submit(len, "") for _ in range(workers)]:
+                    future.result()
+            pipeline.cache.clear()
+            measure(f"pipeline, {workers} worker(s), {mode}", lambda: run_pipeline(pipeline, f"w{workers}-{target}"))
+
+    measure("mesmo PDF de novo (cache por hash)", lambda: (0, run_pipeline(pipeline, "repetido")[1]))
+
+if __name__ == "__main__":
+    main()
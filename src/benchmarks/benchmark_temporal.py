@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - Benchmark da Análise Temporal
+Compara as análises que reconstroem o DataFrame a cada chamada com o frame único vetorizado
+
+Uso: python src/benchmarks/benchmark_temporal.py --points 100000 1000000
+"""
+
+import os
+import sys
+import json
+import time
+import math
+import random
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import pandas as pd
+
+from engine.predictive_analytics_engine1 import PredictiveAnalyticsEngine
+
+
+def build_session(root: Path, n_points: int) -> Path:
+    """Gera analyses_data/<session>/metricas.json com uma série horária com ruído e outliers"""
+    session_dir = root / "analyses_data" / f"bench_{n_points}"
+    session_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(11)
+    start = datetime(2020, 1, 1)
+    points = []
+    for i in range(n_points):
+        value = 100 + i * 0.01 + 10 * math.sin(i / 7) + rng.gauss(0, 2)
+        if rng.random() < 0.001:
+            value *= 5
+        points.append({"timestamp": (start + timedelta(hours=i)).isoformat(), "value": value})
+    rng.shuffle(points)
+    with open(session_dir / "metricas.json", "w", encoding="utf-8") as f:
+        json.dump(points, f)
+    return session_dir
+
+
+def _frame(temporal_data):
+    df = pd.DataFrame(temporal_data)
+    df["timestamp"] = pd.to_datetime(df["timestamp"])
+    return df.set_index("timestamp").sort_index()
+
+
+def _monthly(series):
+    try:
+        return series.resample("ME").last()
+    except ValueError:
+        return series.resample("M").last()
+
+
+def legacy_temporal_analysis(session_dir: Path):
+    """Implementação anterior: lista de dicts, cada análise refaz DataFrame/parse/sort, iterrows"""
+    temporal_data = []
+    for f in session_dir.glob("*.json"):
+        with open(f, 'r', encoding='utf-8') as infile:
+            for item in json.load(infile):
+                item["timestamp"] = datetime.fromisoformat(item["timestamp"])
+                temporal_data.append(item)
+    temporal_data.sort(key=lambda x: x["timestamp"])
+
+    df = pd.DataFrame(temporal_data)
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    df = df.sort_values('timestamp')
+
+    results = {}
+    g = _frame(df)
+    results["growth_rates"] = {"daily_average_growth": g["value"].diff().mean()}
+    monthly = _monthly(g["value"])
+    if len(monthly) > 1:
+        results["growth_rates"]["monthly_growth_rate"] = (monthly.iloc[-1] - monthly.iloc[-2]) / monthly.iloc[-2]
+
+    s = _frame(df)
+    s["day_of_week"] = s.index.dayofweek
+    s["month"] = s.index.month
+    results["seasonality_patterns"] = {
+        "weekly_seasonality": s.groupby("day_of_week")["value"].mean().to_dict(),
+        "monthly_seasonality": s.groupby("month")["value"].mean().to_dict()
+    }
+
+    v = _frame(df)
+    v["change"] = v["value"].diff()
+    results["velocity_of_change"] = {
+        "average_change_per_period": v["change"].mean(),
+        "max_change_per_period": v["change"].max(),
+        "min_change_per_period": v["change"].min()
+    }
+
+    a = _frame(df)
+    a["acceleration"] = a["value"].diff().diff()
+    results["trend_acceleration"] = {
+        "average_acceleration": a["acceleration"].mean(),
+        "max_acceleration": a["acceleration"].max(),
+        "min_acceleration": a["acceleration"].min()
+    }
+
+    d = _frame(df)
+    q1, q3 = d["value"].quantile(0.25), d["value"].quantile(0.75)
+    lower, upper = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    anomalies = []
+    for index, row in d.iterrows():
+        if row["value"] < lower or row["value"] > upper:
+            anomalies.append({"timestamp": index.isoformat(), "value": row["value"], "type": "outlier"})
+    results["anomaly_detection"] = anomalies
+    return results
+
+
+def same(a, b) -> bool:
+    """Compara resultados com tolerância numérica"""
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(same(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    if isinstance(a, float) or isinstance(b, float):
+        return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+    return a == b
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da análise temporal vetorizada")
+    parser.add_argument("--points", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--skip-legacy-above", type=int, default=1_000_000,
+                        help="Não roda a implementação anterior acima deste número de pontos")
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="temporal_bench_"))
+    engine = PredictiveAnalyticsEngine()
+
+    print(f"{'pontos':>10} {'antes (s)':>10} {'depois (s)':>11} {'ganho':>7}  resultados iguais")
+    for n_points in args.points:
+        session_dir = build_session(root, n_points)
+
+        start = time.perf_counter()
+        results = asyncio.run(engine._perform_temporal_analysis(session_dir))
+        new_elapsed = time.perf_counter() - start
+
+        if n_points > args.skip_legacy_above:
+            print(f"{n_points:>10,} {'-':>10} {new_elapsed:>11.2f} {'-':>7}  -")
+            continue
+
+        start = time.perf_counter()
+        legacy = legacy_temporal_analysis(session_dir)
+        old_elapsed = time.perf_counter() - start
+
+        equal = all(same(legacy[key], results[key]) for key in legacy)
+        print(f"{n_points:>10,} {old_elapsed:>10.2f} {new_elapsed:>11.2f} {old_elapsed / new_elapsed:>6.1f}x  {equal}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - Benchmark do Tokenizador Compartilhado
+Contagem de palavras sem stopwords: lista recriada por palavra (antes) vs services.text_tokenizer
+
+Uso: python src/benchmarks/benchmark_tokenizer.py --words 10000000
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from services.text_tokenizer import PORTUGUESE_STOPWORDS, count_tokens
+
+VOCABULARIO = (
+    "mercado cliente produto estratégia venda crescimento digital marca consumidor preço "
+    "qualidade inovação concorrência campanha resultado empresa serviço experiência ação "
+    "análise público conteúdo engajamento conversão"
+).split()
+
+
+def get_portuguese_stopwords():
+    """Comportamento anterior: a lista é montada de novo a cada chamada"""
+    return list(PORTUGUESE_STOPWORDS_LIST)
+
+PORTUGUESE_STOPWORDS_LIST = sorted(PORTUGUESE_STOPWORDS)
+
+
+def build_texts(n_words: int, words_per_doc: int):
+    """Documentos sintéticos com ~40% de stopwords e pontuação"""
+    rng = random.Random(3)
+    vocabulary = VOCABULARIO + PORTUGUESE_STOPWORDS_LIST[:40]
+    texts = []
+    remaining = n_words
+    while remaining > 0:
+        size = min(words_per_doc, remaining)
+        words = [rng.choice(vocabulary) for _ in range(size)]
+        for i in range(0, size, 12):
+            words[i] = words[i].capitalize() + ","
+        texts.append(" ".join(words))
+        remaining -= size
+    return texts
+
+
+def count_old(texts):
+    """Antes: re.findall sem pré-compilação e `in` linear em lista recriada por palavra"""
+    counts = Counter()
+    for text in texts:
+        counts.update(word for word in re.findall(r'\b\w+\b', text.lower())
+                      if word not in get_portuguese_stopwords())
+    return counts
+
+
+def count_old_hoisted(texts):
+    """Antes, com a lista criada uma vez (ainda busca linear)"""
+    stopwords = get_portuguese_stopwords()
+    counts = Counter()
+    for text in texts:
+        counts.update(word for word in re.findall(r'\b\w+\b', text.lower()) if word not in stopwords)
+    return counts
+
+
+def count_new(texts):
+    return count_tokens(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do tokenizador compartilhado")
+    parser.add_argument("--words", type=int, default=10_000_000)
+    parser.add_argument("--words-per-doc", type=int, default=2000)
+    parser.add_argument("--skip-old", action="store_true", help="Pula a versão mais lenta (lista por palavra)")
+    args = parser.parse_args()
+
+    texts = build_texts(args.words, args.words_per_doc)
+    print(f"Corpus: {args.words:,} palavras em {len(texts):,} documentos")
+
+    modes = [("lista por palavra (antes)", count_old), ("lista única", count_old_hoisted),
+             ("text_tokenizer", count_new)]
+    if args.skip_old:
+        modes = modes[1:]
+
+    print(f"{'modo':<28} {'tempo (s)':>10} {'palavras/s':>14}")
+    reference = None
+    for label, func in modes:
+        start = time.perf_counter()
+        counts = func(texts)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<28} {elapsed:>10.2f} {args.words / elapsed:>14,.0f}")
+        if reference is None:
+            reference = counts
+        elif counts != reference:
+            print(f"  ⚠️ contagens diferentes de '{modes[0][0]}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - Benchmark do WebSailor
+Extração serial com time.sleep (antes) vs CrawlFrontier com concorrência configurável, contra um servidor HTTP local com latência
+
+Uso: python src/benchmarks/benchmark_websailor.py --latency 0.3 --concurrency 1 4 8 16
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Arquivos de auto-save vão para um diretório temporário
+os.chdir(tempfile.mkdtemp(prefix="websailor_bench_"))
+for key in ("JINA_API_KEY", "EXA_API_KEY", "GOOGLE_SEARCH_KEY", "SERPER_API_KEY"):
+    os.environ.pop(key, None)
+
+PARAGRAFO = ("O mercado brasileiro de telemedicina cresceu 35% em 2024, com mais de 2 mil empresas "
+             "e investimento de R$ 1,2 bilhão. ") * 20
+
+class Handler(BaseHTTPRequestHandler):
+    latency = 0.3
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        page = int(self.path.strip('/').split('/')[-1] or 0)
+        links = "".join(f'<a href="/artigos/telemedicina/{page * 10 + i}">telemedicina {i}</a>' for i in range(1, 6))
+        body = f"<html><body><main><h1>Página {page}</h1><p>{PARAGRAFO}</p>{links}</main></body></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.end_headers()
+        self.wfile.write(body.encode("utf-8"))
+
+    def log_message(self, *args):
+        pass
+
+def start_server(latency: float) -> int:
+    Handler.latency = latency
+    server = ThreadingHTTPServer(("", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address[1]
+
+def fake_engines(agent, port: int, n_hosts: int):
+    """Engines sintéticos: 10 resultados por engine espalhados por n_hosts hosts (127.0.0.x), com sobreposição"""
+    def engine(offset):
+        def search(query, max_results):
+            rng = random.Random(hash(query) + offset)
+            return [{"title": f"{query} {i}",
+                     "url": f"http://127.0.0.{1 + rng.randrange(n_hosts)}:{port}/artigos/{rng.randrange(40)}"}
+                    for i in range(max_results)]
+        return search
+    agent._google_search_deep = engine(0)
+    agent._serper_search_deep = engine(1)
+
+def legacy_level1(agent, query, context):
+    """Antes: resultados extraídos um a um com time.sleep(0.5) entre eles (nível 2 era um stub)"""
+    pages = 0
+    for search in (agent._google_search_deep, agent._serper_search_deep):
+        for result in search(query, 10)[:5]:
+            if agent._extract_content_multi_strategy(result['url'], result['title'], context, None):
+                pages += 1
+            time.sleep(0.5)
+    return pages
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da navegação WebSailor")
+    parser.add_argument("--latency", type=float, default=0.3, help="Latência por página do servidor (s)")
+    parser.add_argument("--hosts", type=int, default=6)
+    parser.add_argument("--pages", type=int, default=40, help="max_pages da navegação")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    port = start_server(args.latency)
+    from services.alibaba_websailor import AlibabaWebSailorAgent
+
+    query, context = "telemedicina", {"segmento": "telemedicina", "keywords": ["telemedicina"]}
+    print(f"latência {args.latency}s por página, {args.hosts} hosts, orçamento {args.pages} páginas")
+    print(f"{'modo':<26} {'páginas':>8} {'tempo (s)':>10} {'páginas/s':>10} {'duplicadas':>11} {'espera host (s)':>16}")
+
+    agent = AlibabaWebSailorAgent()
+    fake_engines(agent, port, args.hosts)
+    start = time.perf_counter()
+    pages = legacy_level1(agent, query, context)
+    elapsed = time.perf_counter() - start
+    print(f"{'serial + sleep (antes)':<26} {pages:>8} {elapsed:>10.2f} {pages / elapsed:>10.2f} {'-':>11} {'-':>16}")
+
+    for concurrency in args.concurrency:
+        os.environ["WEBSAILOR_CONCURRENCY"] = str(concurrency)
+        agent = AlibabaWebSailorAgent()
+        fake_engines(agent, port, args.hosts)
+        start = time.perf_counter()
+        result = agent.navigate_and_research_deep(query, context, max_pages=args.pages, depth_levels=3)
+        elapsed = time.perf_counter() - start
+        crawl = result["navegacao_profunda"]["fronteira"]
+        print(f"{f'fronteira (conc. {concurrency})':<26} {crawl['succeeded']:>8} {elapsed:>10.2f} "
+              f"{crawl['succeeded'] / elapsed:>10.2f} {crawl['duplicates']:>11} {crawl['politeness_wait']:>16.2f}")
+        print(f"{'':<26} páginas por profundidade: {crawl['pages_per_depth']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - Session Corpus
+Leitura sob demanda dos documentos de texto de uma sessão para o motor preditivo
+"""
+
+import os
+import copy
+import logging
+from pathlib import Path
+from collections import Counter
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from services.text_tokenizer import tokenize
+
+logger = logging.getLogger(__name__)
+
+class SessionCorpus:
+    """Documentos *.txt de uma sessão, lidos um por vez
+
+    Só a lista de caminhos fica em memória; cada iteração relê os arquivos,
+    então o pico de memória acompanha o maior documento (ou o maior lote)
+    e não o tamanho do corpus. O objeto é re-iterável, o que permite usá-lo
+    como corpus de várias passadas (Gensim) ou como entrada de fit_transform.
+    """
+
+    def __init__(self, session_dir: Path, pattern: str = "*.txt", min_length: int = 0,
+                 encoding: str = "utf-8"):
+        """Lista os arquivos da sessão (o conteúdo só é lido na iteração)"""
+        self.session_dir = Path(session_dir)
+        self.pattern = pattern
+        self.min_length = min_length
+        self.encoding = encoding
+        self.paths = sorted(self.session_dir.glob(pattern)) if self.session_dir.exists() else []
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __bool__(self) -> bool:
+        return bool(self.paths)
+
+    def filter(self, min_length: int) -> "SessionCorpus":
+        """Mesmo corpus, ignorando documentos com menos de min_length caracteres"""
+        corpus = copy.copy(self)
+        corpus.min_length = min_length
+        return corpus
+
+    def subset(self, names: Iterable[str]) -> "SessionCorpus":
+        """Mesmo corpus, restrito aos arquivos com os nomes indicados"""
+        names = set(names)
+        corpus = copy.copy(self)
+        corpus.paths = [path for path in self.paths if path.name in names]
+        return corpus
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        """Gera (nome do arquivo, texto) na ordem dos nomes"""
+        for path in self.paths:
+            try:
+                # UTF-8 tem ao menos 1 byte por caractere: arquivo menor que o mínimo nem é lido
+                if self.min_length and os.path.getsize(path) < self.min_length:
+                    continue
+                with open(path, "r", encoding=self.encoding) as f:
+                    text = f.read()
+            except Exception as e:
+                logger.error(f"❌ Erro ao ler arquivo de texto {path.name}: {e}")
+                continue
+            if len(text) >= self.min_length:
+                yield path.name, text
+
+    def texts(self) -> Iterator[str]:
+        """Apenas os textos, sob demanda"""
+        for _, text in self:
+            yield text
+
+    def batches(self, max_docs: int, max_chars: Optional[int] = None) -> Iterator[List[Tuple[str, str]]]:
+        """Lotes de (nome, texto) limitados por número de documentos e de caracteres"""
+        batch = []
+        chars = 0
+        for source, text in self:
+            if batch and (len(batch) >= max_docs or (max_chars and chars + len(text) > max_chars)):
+                yield batch
+                batch, chars = [], 0
+            batch.append((source, text))
+            chars += len(text)
+        if batch:
+            yield batch
+
+    def tokens(self, stopwords: Iterable[str] = (), alpha_only: bool = False) -> Iterator[List[str]]:
+        """Lista de tokens de cada documento, sob demanda"""
+        stopwords = frozenset(stopwords)
+        for text in self.texts():
+            yield tokenize(text, stopwords, alpha_only=alpha_only)
+
+    def token_counts(self, stopwords: Iterable[str] = ()) -> Counter:
+        """Frequência das palavras do corpus, contada documento a documento"""
+        counts = Counter()
+        for tokens in self.tokens(stopwords):
+            counts.update(tokens)
+        return counts
+
+class StreamingBowCorpus:
+    """Corpus bag-of-words re-iterável para o Gensim (uma passada por época)"""
+
+    def __init__(self, corpus: SessionCorpus, dictionary, stopwords: Iterable[str] = ()):
+        self.corpus = corpus
+        self.dictionary = dictionary
+        self.stopwords = frozenset(stopwords)
+
+    def __iter__(self):
+        for tokens in self.corpus.tokens(self.stopwords, alpha_only=True):
+            yield self.dictionary.doc2bow(tokens)
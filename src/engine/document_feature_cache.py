@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - Document Feature Cache
+Cache persistente (SQLite) de features de NLP por documento, endereçado pelo hash do conteúdo
+"""
+
+from services.sqlite_cache import ContentHashCache
+
+class DocumentFeatureCache(ContentHashCache):
+    """Features por documento indexadas por (hash do texto, versão do extrator)
+
+    O mesmo texto com o mesmo modelo sempre gera as mesmas features, então
+    uma sessão que cresceu só paga o NLP dos documentos novos ou alterados.
+    A versão inclui o modelo SpaCy e os extratores disponíveis; quando ela
+    muda, as entradas antigas simplesmente deixam de ser encontradas e saem
+    pelo despejo LRU (SQLiteCache).
+    """
+
+    value_column = 'features'
+
+    def __init__(self, db_path: str = None, max_entries: int = None):
+        """Inicializa o cache e cria o schema se necessário"""
+        super().__init__(
+            label="Document Feature Cache",
+            table="document_features",
+            env_prefix="NLP_FEATURE_CACHE",
+            default_path='cache/nlp_features.sqlite3',
+            default_max_entries=200000,
+            db_path=db_path,
+            max_entries=max_entries
+        )
+
+# Instância global
+document_feature_cache = DocumentFeatureCache()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - Model Hub
+Modelos pesados de NLP/ML compartilhados pelo processo, carregados uma vez no primeiro uso
+"""
+
+import os
+import gc
+import time
+import logging
+import threading
+import importlib.util
+from datetime import datetime
+from typing import Dict, Any, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Disponibilidade verificada sem importar (o import fica para o primeiro uso)
+HAS_SPACY = importlib.util.find_spec("spacy") is not None
+HAS_VADER = importlib.util.find_spec("vaderSentiment") is not None
+
+def _current_rss() -> Optional[int]:
+    """RSS do processo em bytes (psutil ou /proc), None se indisponível"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    except Exception:
+        return None
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return None
+
+class ModelHub:
+    """Registro de modelos por nome com carregamento preguiçoso
+
+    Cada modelo é carregado no máximo uma vez por processo, na primeira
+    chamada a get() (ou no pré-aquecimento), e compartilhado por todos os
+    motores. Falhas de carregamento também são lembradas: o modelo fica
+    indisponível sem nova tentativa a cada chamada. A memória de cada modelo
+    é estimada pela variação do RSS durante o carregamento.
+    """
+
+    def __init__(self):
+        """Inicializa o hub (nenhum modelo é carregado aqui)"""
+        self._loaders: Dict[str, Dict[str, Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._info: Dict[str, Dict[str, Any]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        # Carregamentos aninhados (um loader que pede outro modelo): o custo do
+        # modelo interno é descontado do externo
+        self._local = threading.local()
+
+    def register(self, name: str, loader: Callable[[], Any], description: str = ""):
+        """Registra o carregador de um modelo (chamado só no primeiro get)"""
+        with self._lock:
+            self._loaders[name] = {'loader': loader, 'description': description}
+            self._locks.setdefault(name, threading.Lock())
+
+    def get(self, name: str) -> Any:
+        """Modelo carregado (ou None se indisponível); carrega na primeira chamada"""
+        if name in self._models:
+            return self._models[name]
+        if name not in self._loaders:
+            raise KeyError(f"Modelo não registrado no hub: {name}")
+
+        with self._locks[name]:
+            # Outra thread pode ter carregado enquanto esta esperava
+            if name in self._models:
+                return self._models[name]
+
+            outer_nested = getattr(self._local, 'nested', (0.0, 0))
+            self._local.nested = (0.0, 0)
+            rss_before = _current_rss()
+            start = time.perf_counter()
+            error = None
+            try:
+                model = self._loaders[name]['loader']()
+            except Exception as e:
+                logger.error(f"❌ Erro ao carregar modelo '{name}': {e}")
+                model, error = None, str(e)
+            elapsed = time.perf_counter() - start
+            rss_after = _current_rss()
+            memory = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+            nested_seconds, nested_memory = self._local.nested
+            self._local.nested = (outer_nested[0] + elapsed, outer_nested[1] + (memory or 0))
+
+            self._info[name] = {
+                'loaded': model is not None,
+                'loaded_at': datetime.now().isoformat(),
+                'load_seconds': round(elapsed - nested_seconds, 3),
+                'memory_mb': round(max(memory - nested_memory, 0) / 1024 / 1024, 1)
+                if memory is not None else None,
+                'error': error
+            }
+            self._models[name] = model
+            if model is not None:
+                logger.info(f"🧠 Modelo '{name}' carregado em {elapsed:.2f}s")
+            return model
+
+    def is_loaded(self, name: str) -> bool:
+        return self._models.get(name) is not None
+
+    def preload(self, names: Optional[Iterable[str]] = None) -> Dict[str, bool]:
+        """Pré-aquecimento (ex.: no boot do worker)
+
+        Sem nomes, usa MODEL_HUB_PRELOAD (lista separada por vírgula, ou "all").
+        """
+        if names is None:
+            configured = os.getenv("MODEL_HUB_PRELOAD", "").strip()
+            if not configured:
+                return {}
+            names = list(self._loaders) if configured == "all" else configured.split(",")
+
+        loaded = {}
+        for name in names:
+            name = name.strip()
+            if name in self._loaders:
+                loaded[name] = self.get(name) is not None
+            elif name:
+                logger.warning(f"⚠️ Modelo desconhecido em MODEL_HUB_PRELOAD: {name}")
+        return loaded
+
+    def release(self, name: str):
+        """Descarta o modelo (o próximo get carrega de novo)"""
+        with self._locks.get(name, self._lock):
+            self._models.pop(name, None)
+            self._info.pop(name, None)
+        gc.collect()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Modelos registrados, estado de carregamento e memória estimada"""
+        models = {}
+        for name, entry in self._loaders.items():
+            models[name] = {'description': entry['description'], 'loaded': False,
+                            **self._info.get(name, {})}
+        rss = _current_rss()
+        return {
+            'models': models,
+            'loaded_memory_mb': round(sum(m.get('memory_mb') or 0 for m in models.values()), 1),
+            'process_rss_mb': round(rss / 1024 / 1024, 1) if rss is not None else None
+        }
+
+def _load_spacy_portuguese():
+    """Primeiro modelo SpaCy português disponível (SPACY_MODELS, em ordem de preferência)"""
+    if not HAS_SPACY:
+        return None
+    import spacy
+    for model_name in os.getenv("SPACY_MODELS", "pt_core_news_sm,pt_core_news_lg").split(","):
+        try:
+            nlp = spacy.load(model_name.strip())
+            logger.info(f"✅ Modelo SpaCy português carregado ({model_name.strip()})")
+            return nlp
+        except OSError:
+            continue
+    logger.warning("⚠️ Modelo SpaCy não encontrado. Execute: python -m spacy download pt_core_news_sm")
+    return None
+
+def _load_nlp_batch_processor():
+    """Processador em lote sobre o modelo SpaCy compartilhado"""
+    nlp = model_hub.get("spacy_pt")
+    if nlp is None:
+        return None
+    from engine.nlp_pipeline import BatchNLPProcessor
+    return BatchNLPProcessor(nlp)
+
+def _load_vader():
+    if not HAS_VADER:
+        return None
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    analyzer = SentimentIntensityAnalyzer()
+    logger.info("✅ Analisador de sentimento VADER carregado")
+    return analyzer
+
+# Instância global
+model_hub = ModelHub()
+model_hub.register("spacy_pt", _load_spacy_portuguese, "SpaCy português (pt_core_news)")
+model_hub.register("nlp_batch", _load_nlp_batch_processor, "BatchNLPProcessor sobre spacy_pt")
+model_hub.register("vader", _load_vader, "VADER SentimentIntensityAnalyzer")
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - Model Registry
+Registro em disco de modelos ajustados (Prophet, LDA, KMeans) por sessão/segmento e fingerprint dos dados
+"""
+
+import os
+import pickle
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class ModelRegistry:
+    """Guarda o último modelo ajustado de cada (tipo, segmento)
+
+    Cada entrada é um único arquivo com dois pickles em sequência: o meta
+    (com o fingerprint dos dados de treino) e o modelo. Com isso o motor
+    decide entre reutilizar (dados iguais), atualizar de forma incremental
+    (só chegaram itens novos) ou ajustar do zero. Como modelo e meta trocam
+    juntos num só rename, outro processo nunca lê o meta novo com o modelo
+    antigo.
+    """
+
+    # Ações possíveis para um novo conjunto de dados
+    REUSE = "reuse"
+    UPDATE = "update"
+    FIT = "fit"
+
+    def __init__(self, base_path: str = None):
+        """Inicializa o registro (os modelos são carregados sob demanda)"""
+        self.base_path = base_path or os.getenv("MODEL_REGISTRY_PATH", "cache/models")
+        self.enabled = os.getenv("MODEL_REGISTRY_ENABLED", "true").lower() != "false"
+        # Acima desta fração de itens novos o modelo é reajustado em vez de atualizado
+        self.max_update_ratio = float(os.getenv("MODEL_REGISTRY_MAX_UPDATE_RATIO", "0.5"))
+
+        self.stats = {self.REUSE: 0, self.UPDATE: 0, self.FIT: 0, 'load_errors': 0}
+
+        if self.enabled:
+            os.makedirs(self.base_path, exist_ok=True)
+            logger.info(f"🗃️ Model Registry inicializado em {self.base_path}")
+
+    @staticmethod
+    def _safe_name(value: str) -> str:
+        return "".join(c for c in str(value) if c.isalnum() or c in ('_', '-'))[:128] or "_global"
+
+    def _entry_path(self, kind: str, segment: str) -> str:
+        return os.path.join(self.base_path, self._safe_name(kind), self._safe_name(segment), "entry.pkl")
+
+    @staticmethod
+    def fingerprint(items: Iterable[str]) -> str:
+        """Fingerprint de um conjunto de itens (ordem não importa)"""
+        digest = hashlib.sha256()
+        for item in sorted(items):
+            digest.update(item.encode('utf-8'))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    @staticmethod
+    def fingerprint_arrays(*arrays) -> str:
+        """Fingerprint do conteúdo de arrays numpy (ex.: ds/y de uma série temporal)"""
+        digest = hashlib.sha256()
+        for array in arrays:
+            digest.update(str(array.dtype).encode('ascii'))
+            digest.update(array.tobytes())
+        return digest.hexdigest()
+
+    def load(self, kind: str, segment: str, signature: str = None) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        """Último modelo salvo e seu meta, ou None (ausente, ilegível ou com outra assinatura)"""
+        if not self.enabled:
+            return None
+
+        try:
+            with open(self._entry_path(kind, segment), 'rb') as f:
+                # O meta vem primeiro: o modelo só é desserializado se a assinatura bater
+                meta = pickle.load(f)
+                if signature and meta.get("signature") != signature:
+                    logger.info(f"🗃️ Modelo {kind}/{segment} com outra assinatura, será reajustado")
+                    return None
+                model = pickle.load(f)
+            return model, meta
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.stats['load_errors'] += 1
+            logger.warning(f"⚠️ Modelo {kind}/{segment} ilegível, será reajustado: {e}")
+            return None
+
+    def save(self, kind: str, segment: str, model: Any, fingerprint: str,
+             signature: str = None, **meta):
+        """Grava modelo e meta juntos de forma atômica (arquivo temporário + rename)"""
+        if not self.enabled:
+            return
+
+        path = self._entry_path(kind, segment)
+        meta = {
+            **meta,
+            "kind": kind,
+            "segment": segment,
+            "fingerprint": fingerprint,
+            "signature": signature,
+            "updated_at": datetime.now().isoformat()
+        }
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Temporário único por processo/thread: workers do gunicorn e do pool de fases gravam em paralelo
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao salvar modelo {kind}/{segment}: {e}")
+
+    def lookup(self, kind: str, segment: str, fingerprint: str,
+               signature: str = None) -> Tuple[str, Optional[Tuple[Any, Dict[str, Any]]]]:
+        """Para modelos sem atualização incremental: reutiliza se o fingerprint bate
+
+        A entrada anterior é devolvida também no caso "fit", para servir de
+        ponto de partida (warm start) do novo ajuste.
+        """
+        entry = self.load(kind, segment, signature)
+        action = self.REUSE if entry and entry[1].get("fingerprint") == fingerprint else self.FIT
+        self.stats[action] += 1
+        logger.info(f"🗃️ Modelo {kind}/{segment}: {action}")
+        return action, entry
+
+    def plan(self, kind: str, segment: str, items: Iterable[str],
+             signature: str = None) -> Tuple[str, Optional[Tuple[Any, Dict[str, Any]]], set]:
+        """Decide como tratar um conjunto de itens (ex.: hashes dos documentos)
+
+        Returns:
+            (ação, (modelo, meta) salvo ou None, itens novos em relação ao treino anterior)
+        """
+        items = set(items)
+        entry = self.load(kind, segment, signature)
+        if entry is None:
+            action, new_items = self.FIT, items
+        else:
+            trained = set(entry[1].get("items", []))
+            new_items = items - trained
+            if entry[1].get("fingerprint") == self.fingerprint(items):
+                action = self.REUSE
+            elif trained <= items and len(new_items) <= self.max_update_ratio * max(len(trained), 1):
+                action = self.UPDATE
+            else:
+                # Itens removidos ou volume novo grande demais: ajuste do zero
+                action, new_items = self.FIT, items
+
+        self.stats[action] += 1
+        logger.info(f"🗃️ Modelo {kind}/{segment}: {action} ({len(new_items)} itens novos)")
+        return action, entry, new_items
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores de reutilização/atualização/ajuste deste processo"""
+        return {'enabled': self.enabled, 'path': self.base_path, **self.stats}
+
+# Instância global
+model_registry = ModelRegistry()
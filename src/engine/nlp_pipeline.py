@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - Batch NLP Pipeline
+Estágio de NLP em lote (nlp.pipe) com componentes do SpaCy ativados por tarefa
+"""
+
+import os
+import re
+import time
+import logging
+from typing import Dict, Any, List, Iterable, Iterator, Tuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# Componentes necessários por tarefa; o resto do pipeline fica desligado
+TASK_COMPONENTS = {
+    # Apenas doc.ents (o NER do pt_core_news tem tok2vec próprio)
+    "entities": {"ner"},
+    # doc.ents + doc.sents (co-ocorrência de entidades por frase)
+    "relations": {"ner", "senter"},
+    # POS e frases para padrões linguísticos
+    "linguistic": {"tok2vec", "morphologizer", "tagger", "attribute_ruler", "senter"},
+    # Análise textual do motor preditivo: entidades + padrões linguísticos
+    "textual": {"tok2vec", "morphologizer", "tagger", "attribute_ruler", "senter", "ner"},
+    # Pipeline completo
+    "full": None
+}
+
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?…])\s+')
+
+class BatchNLPProcessor:
+    """Processa documentos com nlp.pipe em lotes, com chunking por frase
+
+    Documentos longos são quebrados em pedaços de até max_chunk_chars nas
+    fronteiras de frase, então nenhum documento esbarra em nlp.max_length e
+    os lotes têm tamanho parecido. pipe() devolve (índice do documento, doc)
+    para cada pedaço, na ordem de entrada.
+    """
+
+    def __init__(self, nlp, batch_size: int = None, n_process: int = None,
+                 max_chunk_chars: int = None, max_doc_chars: int = None):
+        """Prepara as listas de componentes desligados de cada tarefa"""
+        self.nlp = nlp
+        self.batch_size = batch_size or int(os.getenv("NLP_BATCH_SIZE", "64"))
+        self.n_process = n_process or int(os.getenv("NLP_N_PROCESS", "1"))
+        self.max_chunk_chars = max_chunk_chars or int(os.getenv("NLP_MAX_CHUNK_CHARS", "100000"))
+        self.max_doc_chars = max_doc_chars or int(os.getenv("NLP_MAX_DOC_CHARS", "1000000"))
+
+        # senter vem desligado nos modelos pt_core_news e é bem mais barato que
+        # o parser: roda por chamada sobre os docs, sem religá-lo no modelo
+        # compartilhado
+        self._senter_disabled = "senter" in getattr(nlp, "disabled", [])
+
+        self._disable = {}
+        self._run_senter = {}
+        for task, keep in TASK_COMPONENTS.items():
+            self._disable[task] = self._components_to_disable(keep)
+            self._run_senter[task] = keep is not None and "senter" in keep and self._senter_disabled
+
+        self.stats = {'documents': 0, 'chunks': 0, 'seconds': 0.0}
+
+    def _components_to_disable(self, keep: Optional[set]) -> List[str]:
+        names = list(self.nlp.pipe_names)
+        if keep is None:
+            # Pipeline completo: o parser já define as frases
+            return ["senter"] if "senter" in names and "parser" in names else []
+
+        keep = set(keep)
+        if "senter" in keep and "senter" not in names and not self._senter_disabled and "parser" in names:
+            keep.add("parser")
+        return [name for name in names if name not in keep]
+
+    def chunk_text(self, text: str) -> List[str]:
+        """Quebra o texto em pedaços de até max_chunk_chars nas fronteiras de frase"""
+        text = text[:self.max_doc_chars]
+        if len(text) <= self.max_chunk_chars:
+            return [text]
+
+        chunks = []
+        current = []
+        size = 0
+        for sentence in _SENTENCE_BOUNDARY.split(text):
+            # Frase maior que o limite: corte seco
+            while len(sentence) > self.max_chunk_chars:
+                if current:
+                    chunks.append(" ".join(current))
+                    current, size = [], 0
+                chunks.append(sentence[:self.max_chunk_chars])
+                sentence = sentence[self.max_chunk_chars:]
+
+            if size + len(sentence) + 1 > self.max_chunk_chars and current:
+                chunks.append(" ".join(current))
+                current, size = [], 0
+            current.append(sentence)
+            size += len(sentence) + 1
+
+        if current:
+            chunks.append(" ".join(current))
+        return chunks
+
+    def pipe(self, texts: Iterable[str], task: str = "textual") -> Iterator[Tuple[int, Any]]:
+        """Executa o pipeline da tarefa em lote, gerando (índice do documento, doc)"""
+        if task not in self._disable:
+            raise ValueError(f"Tarefa de NLP desconhecida: {task}")
+
+        counts = {'documents': 0, 'chunks': 0}
+
+        def chunks():
+            for index, text in enumerate(texts):
+                counts['documents'] += 1
+                for chunk in self.chunk_text(text or ""):
+                    counts['chunks'] += 1
+                    yield chunk, index
+
+        start = time.perf_counter()
+        try:
+            docs = self.nlp.pipe(
+                chunks(),
+                as_tuples=True,
+                batch_size=self.batch_size,
+                n_process=self.n_process,
+                disable=self._disable[task]
+            )
+            if self._run_senter[task]:
+                docs = self._with_senter(docs)
+            for doc, index in docs:
+                yield index, doc
+        finally:
+            self.stats['documents'] += counts['documents']
+            self.stats['chunks'] += counts['chunks']
+            self.stats['seconds'] += time.perf_counter() - start
+
+    def _with_senter(self, pairs: Iterable[Tuple[Any, int]]) -> Iterator[Tuple[Any, int]]:
+        """Aplica o senter desligado do modelo aos (doc, índice), em lotes de batch_size"""
+        senter = self.nlp.get_pipe("senter")
+        batch = []
+        for pair in pairs:
+            batch.append(pair)
+            if len(batch) >= self.batch_size:
+                yield from zip(senter.pipe([doc for doc, _ in batch], batch_size=self.batch_size),
+                               [index for _, index in batch])
+                batch = []
+        if batch:
+            yield from zip(senter.pipe([doc for doc, _ in batch], batch_size=self.batch_size),
+                           [index for _, index in batch])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Throughput acumulado do estágio de NLP"""
+        seconds = self.stats['seconds']
+        return {
+            **self.stats,
+            'docs_per_second': self.stats['documents'] / seconds if seconds else 0.0,
+            'batch_size': self.batch_size,
+            'n_process': self.n_process,
+            'disabled_by_task': dict(self._disable)
+        }
@@ -6,6 +6,7 @@ Motor de Análise Preditiva e Insights Profundos Ultra-Avançado
 """
 
 import os
+import time
 import logging
 import json
 import asyncio
@@ -20,18 +21,18 @@ import warnings
 warnings.filterwarnings('ignore')
 
 # Imports condicionais para análise avançada
-try:
-    import spacy
-    HAS_SPACY = True
-except ImportError:
-    HAS_SPACY = False
+# SpaCy e VADER: só a disponibilidade é verificada aqui; o model hub importa
+# e carrega os modelos no primeiro uso, uma vez por processo
+from engine.model_hub import model_hub, HAS_SPACY, HAS_VADER
 
 try:
     from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.cluster import KMeans
+    from sklearn.base import clone
+    from sklearn.cluster import MiniBatchKMeans
     from sklearn.decomposition import LatentDirichletAllocation
     from sklearn.linear_model import LinearRegression
     from sklearn.preprocessing import StandardScaler
+    from sklearn import __version__ as sklearn_version
     HAS_SKLEARN = True
 except ImportError:
     HAS_SKLEARN = False
@@ -42,12 +43,6 @@ try:
 except ImportError:
     HAS_TEXTBLOB = False
 
-try:
-    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-    HAS_VADER = True
-except ImportError:
-    HAS_VADER = False
-
 try:
     import gensim
     from gensim import corpora, models
@@ -56,20 +51,9 @@ except ImportError:
     HAS_GENSIM = False
 
 try:
-    from PIL import Image
-    import pytesseract
-    HAS_OCR = True
-except ImportError:
-    HAS_OCR = False
-
-try:
-    import cv2
-    HAS_OPENCV = True
-except ImportError:
-    HAS_OPENCV = False
-
-try:
+    import prophet
     from prophet import Prophet
+    from prophet.serialize import model_to_json, model_from_json
     HAS_PROPHET = True
 except ImportError:
     HAS_PROPHET = False
@@ -89,18 +73,77 @@ except ImportError:
     HAS_NETWORKX = False
 
 from services.auto_save_manager import salvar_etapa, salvar_erro
+from engine.document_feature_cache import document_feature_cache
+from engine.corpus import SessionCorpus, StreamingBowCorpus
+from engine.model_registry import model_registry
+from services.text_tokenizer import PORTUGUESE_STOPWORDS, WORD_PATTERN, tokenize
+from services.ocr_pipeline import ocr_pipeline, HAS_OCR
+from engine.network_analysis import entity_graph_analyzer
+from services.process_pool import LazyProcessPool
 
 logger = logging.getLogger(__name__)
 
 class PredictiveAnalyticsEngine:
     """Motor de Análise Preditiva e Insights Profundos Ultra-Avançado"""
 
+    # Incrementar ao mudar o que _compute_document_features extrai (invalida o cache)
+    FEATURE_EXTRACTION_VERSION = "1"
+
+    # Fases da análise: (chave em insights, método, entrada, dependências, mensagem de log)
+    # Fases de entrada "session" leem apenas o diretório da sessão e rodam no pool de
+    # processos; fases de entrada "insights" rodam no processo principal assim que as
+    # chaves de que dependem estiverem prontas. A lista está em ordem topológica.
+    _FASES_SESSAO = (
+        "textual_insights", "temporal_trends", "visual_insights", "network_analysis",
+        "sentiment_dynamics", "topic_evolution", "engagement_patterns"
+    )
+    ANALYSIS_PHASES = [
+        ("textual_insights", "_perform_ultra_textual_analysis", "session", (),
+         "🧠 FASE 1: Análise textual ultra-profunda..."),
+        ("temporal_trends", "_perform_temporal_analysis", "session", (),
+         "📈 FASE 2: Análise de tendências temporais..."),
+        ("visual_insights", "_perform_advanced_visual_analysis", "session", (),
+         "👁️ FASE 3: Análise visual avançada..."),
+        # Independente da fase 1: reaproveita as features de NLP só se já estiverem no cache
+        ("network_analysis", "_perform_network_analysis", "session", (),
+         "🕸️ FASE 4: Análise de rede e conectividade..."),
+        ("sentiment_dynamics", "_analyze_sentiment_dynamics", "session", (),
+         "💭 FASE 5: Análise de dinâmica de sentimentos..."),
+        ("topic_evolution", "_analyze_topic_evolution", "session", (),
+         "🔄 FASE 6: Análise de evolução de tópicos..."),
+        ("engagement_patterns", "_analyze_engagement_patterns", "session", (),
+         "📊 FASE 7: Análise de padrões de engajamento..."),
+        ("data_quality_assessment", "_assess_data_quality", "session", (),
+         "🔍 FASE 13: Avaliação de qualidade dos dados..."),
+        ("predictions", "_generate_ultra_predictions", "insights", _FASES_SESSAO,
+         "🔮 FASE 8: Geração de previsões ultra-avançadas..."),
+        ("scenarios", "_model_complex_scenarios", "insights", _FASES_SESSAO + ("predictions",),
+         "🗺️ FASE 9: Modelagem de cenários complexos..."),
+        ("risk_assessment", "_assess_risks_and_opportunities", "insights", ("predictions", "scenarios"),
+         "⚖️ FASE 10: Avaliação de riscos e oportunidades..."),
+        ("opportunity_mapping", "_map_strategic_opportunities", "insights",
+         ("predictions", "scenarios", "risk_assessment"),
+         "🎯 FASE 11: Mapeamento estratégico de oportunidades..."),
+        ("confidence_metrics", "_calculate_confidence_metrics", "insights",
+         _FASES_SESSAO + ("predictions", "scenarios", "risk_assessment", "opportunity_mapping"),
+         "📏 FASE 12: Cálculo de métricas de confiança..."),
+        ("strategic_recommendations", "_generate_strategic_recommendations", "insights",
+         ("predictions", "scenarios", "risk_assessment", "opportunity_mapping",
+          "confidence_metrics", "data_quality_assessment"),
+         "💡 FASE 14: Geração de recomendações estratégicas..."),
+        ("action_priorities", "_prioritize_actions", "insights",
+         ("strategic_recommendations", "risk_assessment", "opportunity_mapping"),
+         "🎯 FASE 15: Priorização de ações...")
+    ]
+
     def __init__(self):
         """Inicializa o motor de análise preditiva"""
-        self.nlp_model = None
-        self.sentiment_analyzer = None
-        self.tfidf_vectorizer = None
+        self.model_hub = model_hub
+        self.feature_cache = document_feature_cache
+        self._tfidf_vectorizer = None
         self.topic_model = None
+        self.model_registry = model_registry
+        self.graph_analyzer = entity_graph_analyzer
         
         # Configurações de análise
         self.config = {
@@ -110,55 +153,47 @@ class PredictiveAnalyticsEngine:
             'n_clusters_kmeans': 5,
             'confidence_threshold': 0.7,
             'prediction_horizon_days': 90,
-            'min_data_points_prediction': 5
+            'min_data_points_prediction': 5,
+            # Lotes do corpus em streaming (só um lote de textos fica em memória)
+            'corpus_batch_docs': int(os.getenv("CORPUS_BATCH_DOCS", "64")),
+            'corpus_batch_chars': int(os.getenv("CORPUS_BATCH_CHARS", "2000000"))
         }
         
-        self._initialize_models()
         logger.info("🔮 Predictive Analytics Engine Ultra-Avançado inicializado")
 
-    def _initialize_models(self):
-        """Inicializa modelos de ML e NLP"""
-        
-        # Carrega modelo SpaCy para português
-        if HAS_SPACY:
-            try:
-                self.nlp_model = spacy.load("pt_core_news_sm")
-                logger.info("✅ Modelo SpaCy português carregado")
-            except OSError:
-                try:
-                    self.nlp_model = spacy.load("pt_core_news_lg")
-                    logger.info("✅ Modelo SpaCy português (large) carregado")
-                except OSError:
-                    logger.warning("⚠️ Modelo SpaCy não encontrado. Execute: python -m spacy download pt_core_news_sm")
-                    self.nlp_model = None
-        
-        # Inicializa analisador de sentimento
-        if HAS_VADER:
-            self.sentiment_analyzer = SentimentIntensityAnalyzer()
-            logger.info("✅ Analisador de sentimento VADER carregado")
-        
-        # Inicializa TF-IDF
-        if HAS_SKLEARN:
-            self.tfidf_vectorizer = TfidfVectorizer(
+    # Modelos pesados vêm do model hub: carregados no primeiro uso e
+    # compartilhados por todas as instâncias do motor no processo
+    @property
+    def nlp_model(self):
+        """Modelo SpaCy português (None se indisponível)"""
+        return self.model_hub.get("spacy_pt")
+
+    @property
+    def nlp_processor(self):
+        """Processador NLP em lote sobre o modelo SpaCy (None se indisponível)"""
+        return self.model_hub.get("nlp_batch")
+
+    @property
+    def sentiment_analyzer(self):
+        """Analisador de sentimento VADER (None se indisponível)"""
+        return self.model_hub.get("vader")
+
+    @property
+    def tfidf_vectorizer(self):
+        """TF-IDF configurado (modelo base, clonado antes de cada ajuste)"""
+        if self._tfidf_vectorizer is None and HAS_SKLEARN:
+            self._tfidf_vectorizer = TfidfVectorizer(
                 max_features=self.config['max_features_tfidf'],
                 stop_words=self._get_portuguese_stopwords(),
                 ngram_range=(1, 2),
                 min_df=2,
                 max_df=0.8
             )
-            logger.info("✅ TF-IDF Vectorizer configurado")
+        return self._tfidf_vectorizer
 
     def _get_portuguese_stopwords(self) -> List[str]:
-        """Retorna lista de stopwords em português"""
-        return [
-            'a', 'o', 'e', 'é', 'de', 'do', 'da', 'em', 'um', 'uma', 'para', 'com', 'não', 'que', 'se', 'na', 'por',
-            'mais', 'as', 'os', 'como', 'mas', 'foi', 'ao', 'ele', 'das', 'tem', 'à', 'seu', 'sua', 'ou', 'ser',
-            'quando', 'muito', 'há', 'nos', 'já', 'está', 'eu', 'também', 'só', 'pelo', 'pela', 'até', 'isso',
-            'ela', 'entre', 'era', 'depois', 'sem', 'mesmo', 'aos', 'ter', 'seus', 'quem', 'nas', 'me', 'esse',
-            'eles', 'estão', 'você', 'tinha', 'foram', 'essa', 'num', 'nem', 'suas', 'meu', 'às', 'minha', 'têm',
-            'numa', 'pelos', 'elas', 'havia', 'seja', 'qual', 'será', 'nós', 'tenho', 'lhe', 'deles', 'essas',
-            'esses', 'pelas', 'este', 'fosse', 'dele', 'tu', 'te', 'vocês', 'vos', 'lhes', 'meus', 'minhas'
-        ]
+        """Retorna lista de stopwords em português (para APIs que exigem list, como o TF-IDF)"""
+        return sorted(PORTUGUESE_STOPWORDS)
 
     async def analyze_session_data(self, session_id: str) -> Dict[str, Any]:
         """
@@ -209,70 +244,24 @@ class PredictiveAnalyticsEngine:
         }
 
         try:
-            # FASE 1: Análise Textual Ultra-Profunda
-            logger.info("🧠 FASE 1: Análise textual ultra-profunda...")
-            insights["textual_insights"] = await self._perform_ultra_textual_analysis(session_dir)
-            
-            # FASE 2: Análise de Tendências Temporais
-            logger.info("📈 FASE 2: Análise de tendências temporais...")
-            insights["temporal_trends"] = await self._perform_temporal_analysis(session_dir)
-            
-            # FASE 3: Análise Visual Avançada (OCR + Computer Vision)
-            logger.info("👁️ FASE 3: Análise visual avançada...")
-            insights["visual_insights"] = await self._perform_advanced_visual_analysis(session_dir)
-            
-            # FASE 4: Análise de Rede e Conectividade
-            logger.info("🕸️ FASE 4: Análise de rede e conectividade...")
-            insights["network_analysis"] = await self._perform_network_analysis(session_dir)
-            
-            # FASE 5: Dinâmica de Sentimentos
-            logger.info("💭 FASE 5: Análise de dinâmica de sentimentos...")
-            insights["sentiment_dynamics"] = await self._analyze_sentiment_dynamics(session_dir)
-            
-            # FASE 6: Evolução de Tópicos
-            logger.info("🔄 FASE 6: Análise de evolução de tópicos...")
-            insights["topic_evolution"] = await self._analyze_topic_evolution(session_dir)
-            
-            # FASE 7: Padrões de Engajamento
-            logger.info("📊 FASE 7: Análise de padrões de engajamento...")
-            insights["engagement_patterns"] = await self._analyze_engagement_patterns(session_dir)
-            
-            # FASE 8: Geração de Previsões Ultra-Avançadas
-            logger.info("🔮 FASE 8: Geração de previsões ultra-avançadas...")
-            insights["predictions"] = await self._generate_ultra_predictions(insights)
-            
-            # FASE 9: Modelagem de Cenários Complexos
-            logger.info("🗺️ FASE 9: Modelagem de cenários complexos...")
-            insights["scenarios"] = await self._model_complex_scenarios(insights)
-            
-            # FASE 10: Avaliação de Riscos e Oportunidades
-            logger.info("⚖️ FASE 10: Avaliação de riscos e oportunidades...")
-            insights["risk_assessment"] = await self._assess_risks_and_opportunities(insights)
-            
-            # FASE 11: Mapeamento de Oportunidades
-            logger.info("🎯 FASE 11: Mapeamento estratégico de oportunidades...")
-            insights["opportunity_mapping"] = await self._map_strategic_opportunities(insights)
-            
-            # FASE 12: Métricas de Confiança
-            logger.info("📏 FASE 12: Cálculo de métricas de confiança...")
-            insights["confidence_metrics"] = await self._calculate_confidence_metrics(insights)
-            
-            # FASE 13: Avaliação de Qualidade dos Dados
-            logger.info("🔍 FASE 13: Avaliação de qualidade dos dados...")
-            insights["data_quality_assessment"] = await self._assess_data_quality(session_dir)
-            
-            # FASE 14: Recomendações Estratégicas
-            logger.info("💡 FASE 14: Geração de recomendações estratégicas...")
-            insights["strategic_recommendations"] = await self._generate_strategic_recommendations(insights)
-            
-            # FASE 15: Priorização de Ações
-            logger.info("🎯 FASE 15: Priorização de ações...")
-            insights["action_priorities"] = await self._prioritize_actions(insights)
+            # Fases independentes rodam em paralelo; as demais aguardam só suas entradas
+            analysis_start = time.perf_counter()
+            timings, errors = await self._run_analysis_phases(session_dir, insights)
+
+            insights["phase_timings"] = timings
+            insights["critical_path"] = self._critical_path(timings)
+            insights["wall_time_seconds"] = round(time.perf_counter() - analysis_start, 3)
+            insights["sum_phase_seconds"] = round(sum(t["seconds"] for t in timings.values()), 3)
+            if errors:
+                insights["success"] = False
+                insights["phase_errors"] = errors
+                insights["error"] = f"Fases com erro: {', '.join(errors)}"
+                logger.warning(f"⚠️ {len(errors)} fases da análise preditiva falharam: {', '.join(errors)}")
 
             # Salva insights preditivos
             insights_path = session_dir / "insights_preditivos.json"
             with open(insights_path, 'w', encoding='utf-8') as f:
-                json.dump(insights, f, ensure_ascii=False, indent=2)
+                json.dump(insights, f, ensure_ascii=False, indent=2, default=str)
             
             # Salva também como etapa
             salvar_etapa("insights_preditivos_completos", insights, categoria="analise_preditiva")
@@ -290,6 +279,80 @@ class PredictiveAnalyticsEngine:
                 "timestamp": datetime.now().isoformat()
             }
 
+    async def _run_analysis_phases(self, session_dir: Path, insights: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """Agenda ANALYSIS_PHASES como um grafo de dependências
+
+        Returns:
+            (tempos por fase, erros por fase); uma fase cuja dependência falhou
+            não é executada e aparece nos erros
+        """
+        loop = asyncio.get_running_loop()
+        executor = _phase_pool.get()
+        origin = time.perf_counter()
+        tasks = {}
+        timings = {}
+        errors = {}
+
+        async def run_phase(key: str, method_name: str, source: str, dependencies: tuple, message: str) -> bool:
+            if dependencies:
+                outcomes = await asyncio.gather(*(tasks[dep] for dep in dependencies))
+                failed = [dep for dep, ok in zip(dependencies, outcomes) if not ok]
+                if failed:
+                    errors[key] = f"Dependências com erro: {', '.join(failed)}"
+                    logger.error(f"❌ Fase {key} ignorada: {errors[key]}")
+                    return False
+
+            logger.info(message)
+            started = time.perf_counter()
+            where = "local"
+            elapsed = None
+            try:
+                if source == "session" and executor is not None:
+                    where = "process"
+                    insights[key], elapsed = await loop.run_in_executor(
+                        executor, _run_phase_in_worker, method_name, str(session_dir)
+                    )
+                elif source == "session":
+                    insights[key] = await getattr(self, method_name)(session_dir)
+                else:
+                    insights[key] = await getattr(self, method_name)(insights)
+                return True
+            except Exception as e:
+                errors[key] = str(e)
+                logger.error(f"❌ Erro na fase {key}: {e}")
+                salvar_erro(f"predictive_phase_{key}", e, contexto={"session_id": insights.get("session_id")})
+                return False
+            finally:
+                finished = time.perf_counter()
+                timings[key] = {
+                    "start": round(started - origin, 3),
+                    "end": round(finished - origin, 3),
+                    # Tempo de CPU da fase no worker (sem a espera na fila do pool)
+                    "seconds": round(elapsed if elapsed is not None else finished - started, 3),
+                    "executor": where,
+                    "depends_on": list(dependencies)
+                }
+
+        for key, method_name, source, dependencies, message in self.ANALYSIS_PHASES:
+            tasks[key] = asyncio.ensure_future(run_phase(key, method_name, source, dependencies, message))
+        await asyncio.gather(*tasks.values())
+
+        order = [phase[0] for phase in self.ANALYSIS_PHASES]
+        return {key: timings[key] for key in order if key in timings}, errors
+
+    @staticmethod
+    def _critical_path(timings: Dict[str, Dict[str, Any]]) -> List[str]:
+        """Cadeia de fases que determinou o tempo total (da primeira à última a terminar)"""
+        if not timings:
+            return []
+        path = [max(timings, key=lambda key: timings[key]["end"])]
+        while True:
+            dependencies = [dep for dep in timings[path[-1]]["depends_on"] if dep in timings]
+            if not dependencies:
+                break
+            path.append(max(dependencies, key=lambda dep: timings[dep]["end"]))
+        return list(reversed(path))
+
     async def _perform_ultra_textual_analysis(self, session_dir: Path) -> Dict[str, Any]:
         """Realiza análise textual ultra-profunda com NLP avançado"""
         
@@ -308,89 +371,75 @@ class PredictiveAnalyticsEngine:
             "persuasion_elements": {}
         }
 
-        # Coleta dados textuais
-        textual_data = self._gather_comprehensive_textual_data(session_dir)
-        results["total_documents_processed"] = len(textual_data)
+        # Coleta dados textuais (os arquivos são lidos sob demanda, lote a lote)
+        corpus = self._gather_comprehensive_textual_data(session_dir)
+        results["total_documents_processed"] = len(corpus)
 
-        if not textual_data:
+        if not corpus:
             logger.warning("⚠️ Nenhum dado textual encontrado para análise")
             return results
 
-        all_texts = []
-        all_entities = []
-        sentiment_scores = []
-        
-        # Processa cada documento
-        for source, text_content in textual_data.items():
-            if len(text_content) < self.config['min_text_length']:
-                continue
-                
-            try:
-                # Análise com SpaCy
-                if HAS_SPACY and self.nlp_model:
-                    doc = self.nlp_model(text_content[:1000000])  # Limita para performance
-                    
-                    # Extração de entidades nomeadas
-                    for ent in doc.ents:
-                        if ent.label_ in ['PERSON', 'ORG', 'GPE', 'PRODUCT', 'EVENT']:
-                            all_entities.append((ent.text.strip(), ent.label_))
-                    
-                    # Análise de padrões linguísticos
-                    linguistic_patterns = self._analyze_linguistic_patterns(doc)
-                    results["linguistic_patterns"][source] = linguistic_patterns
-                
-                # Análise de sentimento
-                if HAS_VADER and self.sentiment_analyzer:
-                    sentiment = self.sentiment_analyzer.polarity_scores(text_content)
-                    sentiment_scores.append(sentiment)
-                    results["sentiment_analysis"][source] = sentiment
-                
-                # Análise de legibilidade
-                readability = self._calculate_readability_metrics(text_content)
-                results["readability_metrics"][source] = readability
-                
-                # Indicadores emocionais
-                emotional_indicators = self._extract_emotional_indicators(text_content)
-                results["emotional_indicators"][source] = emotional_indicators
-                
-                # Elementos de persuasão
-                persuasion_elements = self._identify_persuasion_elements(text_content)
-                results["persuasion_elements"][source] = persuasion_elements
-                
-                all_texts.append(text_content)
-                results["total_words_analyzed"] += len(text_content.split())
-                
-            except Exception as e:
-                logger.error(f"❌ Erro na análise textual de {source}: {e}")
-                continue
+        documents = corpus.filter(self.config['min_text_length'])
+        entity_counter = Counter()
+        word_counts = Counter()
+        document_hashes = {}
+        analyzed_documents = 0
+
+        for batch in documents.batches(self.config['corpus_batch_docs'], self.config['corpus_batch_chars']):
+            # Features por documento: só documentos novos ou alterados passam pelo NLP
+            features = self._get_document_features([text for _, text in batch])
+
+            for (source, text_content), document_features in zip(batch, features):
+                # Hash do conteúdo: identifica os dados de treino no registro de modelos
+                document_hashes[source] = self.feature_cache.content_hash(text_content)
+                if document_features is None:
+                    continue
+
+                for text, label in document_features["entities"]:
+                    if label in ['PERSON', 'ORG', 'GPE', 'PRODUCT', 'EVENT']:
+                        entity_counter[(text, label)] += 1
+
+                if document_features["linguistic_counts"] is not None:
+                    results["linguistic_patterns"][source] = self._linguistic_patterns_from_counts(
+                        document_features["linguistic_counts"]
+                    )
+                if document_features["sentiment"] is not None:
+                    results["sentiment_analysis"][source] = document_features["sentiment"]
+                results["readability_metrics"][source] = document_features["readability"]
+                results["emotional_indicators"][source] = document_features["emotional_indicators"]
+                results["persuasion_elements"][source] = document_features["persuasion_elements"]
+
+                # Contagem incremental de palavras (densidade e temas emergentes)
+                word_counts.update(tokenize(text_content))
+                analyzed_documents += 1
+                results["total_words_analyzed"] += document_features["words"]
 
         # Análise agregada
-        if all_entities:
-            entity_counter = Counter(all_entities)
+        if entity_counter:
             results["entities_found"] = {
                 str(entity): count for entity, count in entity_counter.most_common(50)
             }
 
-        # Extração de tópicos com LDA
-        if HAS_SKLEARN and HAS_GENSIM and all_texts:
+        # Extração de tópicos com LDA (o corpus é relido em streaming a cada passada)
+        if HAS_SKLEARN and HAS_GENSIM and analyzed_documents:
             try:
-                topics = self._extract_topics_lda(all_texts)
+                topics = self._extract_topics_lda(documents, document_hashes)
                 results["key_topics"] = topics
                 
                 # Clustering semântico
-                clusters = self._perform_semantic_clustering(all_texts)
+                clusters = self._perform_semantic_clustering(documents, document_hashes)
                 results["semantic_clusters"] = clusters
                 
             except Exception as e:
                 logger.error(f"❌ Erro na extração de tópicos: {e}")
 
         # Densidade de palavras-chave
-        if all_texts:
-            keyword_density = self._calculate_keyword_density(all_texts)
+        if word_counts:
+            keyword_density = self._calculate_keyword_density(word_counts)
             results["keyword_density"] = keyword_density
 
         # Temas emergentes
-        emerging_themes = self._identify_emerging_themes(all_texts)
+        emerging_themes = self._identify_emerging_themes(word_counts)
         results["emerging_themes"] = emerging_themes
 
         logger.info("✅ Análise textual ultra-profunda concluída")
@@ -410,47 +459,44 @@ class PredictiveAnalyticsEngine:
             "forecast_models": {}
         }
 
-        # Carrega dados com timestamps
-        temporal_data = self._gather_temporal_data(session_dir)
+        # Carrega dados com timestamps em um único frame indexado e ordenado
+        frame = self._gather_temporal_data(session_dir)
         
-        if not temporal_data:
+        if frame.empty:
             logger.warning("⚠️ Dados temporais insuficientes para análise")
             return results
 
-        results["data_points_analyzed"] = len(temporal_data)
+        results["data_points_analyzed"] = len(frame)
 
         try:
-            # Converte para DataFrame para análise
-            df = pd.DataFrame(temporal_data)
-            
-            if 'timestamp' in df.columns and len(df) >= self.config['min_data_points_prediction']:
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-                df = df.sort_values('timestamp')
+            if len(frame) >= self.config['min_data_points_prediction']:
+                # Séries derivadas calculadas uma vez e compartilhadas pelas análises
+                self._add_temporal_features(frame)
                 
                 # Análise de crescimento
-                growth_analysis = self._analyze_growth_patterns(df)
+                growth_analysis = self._analyze_growth_patterns(frame)
                 results["growth_rates"] = growth_analysis
                 
                 # Detecção de sazonalidade
-                if len(df) >= 10:  # Mínimo para análise sazonal
-                    seasonality = self._detect_seasonality(df)
+                if len(frame) >= 10:  # Mínimo para análise sazonal
+                    seasonality = self._detect_seasonality(frame)
                     results["seasonality_patterns"] = seasonality
                 
                 # Velocidade de mudança
-                velocity = self._calculate_velocity_of_change(df)
+                velocity = self._calculate_velocity_of_change(frame)
                 results["velocity_of_change"] = velocity
                 
                 # Aceleração de tendências
-                acceleration = self._calculate_trend_acceleration(df)
+                acceleration = self._calculate_trend_acceleration(frame)
                 results["trend_acceleration"] = acceleration
                 
                 # Detecção de anomalias
-                anomalies = self._detect_anomalies(df)
+                anomalies = self._detect_anomalies(frame)
                 results["anomaly_detection"] = anomalies
                 
                 # Modelos de previsão
-                if HAS_PROPHET and len(df) >= 10:
-                    forecast = self._create_forecast_models(df)
+                if HAS_PROPHET and len(frame) >= 10:
+                    forecast = self._create_forecast_models(frame, segment=session_dir.name)
                     results["forecast_models"] = forecast
 
         except Exception as e:
@@ -478,7 +524,7 @@ class PredictiveAnalyticsEngine:
             logger.warning("⚠️ OCR não disponível - análise visual limitada")
             return results
 
-        files_dir = Path(f"analyses_data/files/{session_id}")
+        files_dir = Path(f"analyses_data/files/{session_dir.name}")
         if not files_dir.exists():
             logger.info("📂 Diretório de screenshots não encontrado")
             return results
@@ -486,27 +532,28 @@ class PredictiveAnalyticsEngine:
         extracted_texts = []
         visual_features = []
 
-        for img_file in files_dir.glob("*.png"):
+        # OCR e cores de todas as imagens de uma vez: pool de processos, pré-processamento e cache por hash
+        image_files = sorted(files_dir.glob("*.png"))
+        ocr_results = await ocr_pipeline.process_images(image_files)
+
+        for img_file, ocr_result in zip(image_files, ocr_results):
             try:
-                logger.info(f"🔍 Analisando imagem: {img_file.name}")
-                
-                # Carrega imagem
-                image = Image.open(img_file)
-                
-                # OCR para extração de texto
-                ocr_text = pytesseract.image_to_string(image, lang='por')
+                if "error" in ocr_result:
+                    logger.error(f"❌ Erro na análise visual de {img_file.name}: {ocr_result['error']}")
+                    continue
+
+                ocr_text = ocr_result["text"]
                 if ocr_text.strip():
                     extracted_texts.append(ocr_text)
                     results["text_extracted_ocr"].append({
                         "file": img_file.name,
                         "text": ocr_text[:500],  # Limita para armazenamento
-                        "word_count": len(ocr_text.split())
+                        "word_count": ocr_result["word_count"]
                     })
                 
-                # Análise de cores (se OpenCV disponível)
-                if HAS_OPENCV:
-                    color_analysis = self._analyze_image_colors(img_file)
-                    results["color_analysis"][img_file.name] = color_analysis
+                # Análise de cores (calculada no mesmo worker do OCR, se OpenCV disponível)
+                if "colors" in ocr_result:
+                    results["color_analysis"][img_file.name] = {"dominant_colors": ocr_result["colors"]}
                 
                 # Análise de layout e elementos UI
                 ui_elements = self._detect_ui_elements(ocr_text)
@@ -572,7 +619,7 @@ class PredictiveAnalyticsEngine:
             
             # Adiciona nós (entidades)
             for entity in entities_data['entities']:
-                G.add_node(entity['name'], **entity['attributes'])
+                G.add_node(entity['name'], type=entity['type'])
             
             # Adiciona arestas (relacionamentos)
             for relationship in entities_data['relationships']:
@@ -582,30 +629,9 @@ class PredictiveAnalyticsEngine:
                     weight=relationship['strength']
                 )
 
-            results["network_nodes"] = G.number_of_nodes()
-            results["network_edges"] = G.number_of_edges()
-            results["network_density"] = nx.density(G)
-
-            # Métricas de centralidade
-            if G.number_of_nodes() > 0:
-                centrality = {
-                    "betweenness": dict(nx.betweenness_centrality(G)),
-                    "closeness": dict(nx.closeness_centrality(G)),
-                    "degree": dict(nx.degree_centrality(G)),
-                    "eigenvector": dict(nx.eigenvector_centrality(G, max_iter=1000))
-                }
-                results["centrality_metrics"] = centrality
-                
-                # Detecção de comunidades
-                communities = list(nx.community.greedy_modularity_communities(G))
-                results["community_detection"] = {
-                    "num_communities": len(communities),
-                    "modularity": nx.community.modularity(G, communities),
-                    "communities": [list(community) for community in communities]
-                }
-                
-                # Coeficiente de clustering
-                results["clustering_coefficient"] = nx.average_clustering(G)
+            # Centralidades, comunidades e clustering: exatos em grafos pequenos,
+            # amostrados/esparsos acima de NETWORK_EXACT_MAX_NODES nós
+            results.update(self.graph_analyzer.analyze(G))
 
         except Exception as e:
             logger.error(f"❌ Erro na análise de rede: {e}")
@@ -873,32 +899,235 @@ class PredictiveAnalyticsEngine:
         return scenarios
 
     # Métodos auxiliares para análise textual
-    def _gather_comprehensive_textual_data(self, session_dir: Path) -> Dict[str, str]:
-        """Coleta dados textuais de arquivos na pasta da sessão."""
-        textual_data = {}
-        text_files = [f for f in session_dir.glob("*.txt")]
-        for text_file in text_files:
+    def _gather_comprehensive_textual_data(self, session_dir: Path) -> SessionCorpus:
+        """Corpus dos arquivos de texto da pasta da sessão (lidos sob demanda)."""
+        return SessionCorpus(session_dir, "*.txt")
+
+    def _feature_version(self) -> str:
+        """Versão das features: modelo SpaCy, extratores disponíveis e versão do código"""
+        model = "sem_spacy"
+        if self.nlp_model is not None:
+            meta = self.nlp_model.meta
+            model = f"{meta.get('lang')}_{meta.get('name')}-{meta.get('version')}"
+        vader = "vader" if HAS_VADER and self.sentiment_analyzer else "sem_vader"
+        return f"{model}|{vader}|v{self.FEATURE_EXTRACTION_VERSION}"
+
+    def _get_document_features(self, texts: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Features de cada texto, calculando apenas os que não estão no cache."""
+        version = self._feature_version()
+        hashes = [self.feature_cache.content_hash(text) for text in texts]
+        features_by_hash = self.feature_cache.get_many(hashes, version)
+
+        # Um índice por hash ausente (textos repetidos são processados uma vez)
+        pending = {}
+        for index, content_hash in enumerate(hashes):
+            if content_hash not in features_by_hash and content_hash not in pending:
+                pending[content_hash] = index
+
+        if pending:
+            computed, cacheable = self._compute_document_features([texts[index] for index in pending.values()])
+            to_store = []
+            for content_hash, document_features in zip(pending, computed):
+                if document_features is None:
+                    continue
+                features_by_hash[content_hash] = document_features
+                to_store.append((content_hash, document_features))
+            if cacheable:
+                self.feature_cache.set_many(to_store, version)
+
+        logger.info(f"📚 Features de NLP: {len(texts) - len(pending)} documentos do cache, {len(pending)} calculados")
+        return [features_by_hash.get(content_hash) for content_hash in hashes]
+
+    def _compute_document_features(self, texts: List[str]) -> Tuple[List[Optional[Dict[str, Any]]], bool]:
+        """Calcula as features por documento (NLP em lote + extratores por texto).
+
+        Returns:
+            (features alinhadas com texts, None onde o documento falhou;
+             False se o estágio de NLP falhou e o resultado não deve ir para o cache)
+        """
+        features = [
+            {
+                "words": len(text.split()),
+                "entities": [],
+                "sentence_entities": [],
+                "linguistic_counts": None,
+                "sentiment": None
+            }
+            for text in texts
+        ]
+        cacheable = True
+
+        # Estágio de NLP em lote: entidades, co-ocorrências por frase e contagens linguísticas
+        if HAS_SPACY and self.nlp_processor:
+            linguistic_counts = defaultdict(Counter)
+            try:
+                for index, doc in self.nlp_processor.pipe(texts, task="textual"):
+                    document_features = features[index]
+                    for ent in doc.ents:
+                        document_features["entities"].append([ent.text.strip(), ent.label_])
+                    for sentence in doc.sents:
+                        sentence_entities = [[ent.text.strip(), ent.label_] for ent in sentence.ents]
+                        if len(sentence_entities) >= 2:
+                            document_features["sentence_entities"].append(sentence_entities)
+                    linguistic_counts[index].update(self._linguistic_counts(doc))
+            except Exception as e:
+                logger.error(f"❌ Erro no estágio de NLP em lote: {e}")
+                cacheable = False
+
+            for index, counts in linguistic_counts.items():
+                features[index]["linguistic_counts"] = dict(counts)
+
+        for index, text in enumerate(texts):
             try:
-                with open(text_file, "r", encoding="utf-8") as f:
-                    textual_data[text_file.name] = f.read()
+                if HAS_VADER and self.sentiment_analyzer:
+                    features[index]["sentiment"] = self.sentiment_analyzer.polarity_scores(text)
+                features[index]["readability"] = self._calculate_readability_metrics(text)
+                features[index]["emotional_indicators"] = self._extract_emotional_indicators(text)
+                features[index]["persuasion_elements"] = self._identify_persuasion_elements(text)
             except Exception as e:
-                logger.error(f"❌ Erro ao ler arquivo de texto {text_file.name}: {e}")
-        return textual_data
+                logger.error(f"❌ Erro na extração de features do documento {index}: {e}")
+                features[index] = None
+
+        return features, cacheable
+
+    def _calculate_readability_metrics(self, text: str) -> Dict[str, Any]:
+        """Métricas de legibilidade (Flesch adaptado ao português por Martins et al.)."""
+        words = WORD_PATTERN.findall(text)
+        sentences = max(1, len(re.findall(r'[.!?…]+', text)))
+        if not words:
+            return {"word_count": 0, "sentence_count": 0, "avg_words_per_sentence": 0.0,
+                    "avg_syllables_per_word": 0.0, "flesch_reading_ease": 0.0}
+
+        syllables = sum(max(1, len(re.findall(r'[aeiouáéíóúâêôãõàü]+', word.lower()))) for word in words)
+        words_per_sentence = len(words) / sentences
+        syllables_per_word = syllables / len(words)
+        flesch = 248.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word
+        return {
+            "word_count": len(words),
+            "sentence_count": sentences,
+            "avg_words_per_sentence": words_per_sentence,
+            "avg_syllables_per_word": syllables_per_word,
+            "flesch_reading_ease": max(0.0, min(100.0, flesch))
+        }
+
+    def _extract_emotional_indicators(self, text: str) -> Dict[str, int]:
+        """Conta palavras-chave associadas a emoções no texto."""
+        emotional_patterns = {
+            "joy": r'feliz|alegr\w*|sorriso|conquist\w*|sucesso|ótimo|excelente|incrível',
+            "fear": r'medo|receio|ameaça|perig\w*|insegur\w*|preocupa\w*',
+            "anger": r'raiva|revolt\w*|indign\w*|absurdo|injust\w*',
+            "sadness": r'triste\w*|decepcion\w*|frustra\w*|perd\w*|fracasso',
+            "trust": r'confian\w*|segur\w*|garantia|comprovad\w*|estável',
+            "surprise": r'surpre\w*|chocad\w*|inesperad\w*|revela\w*'
+        }
+        return {
+            emotion: len(re.findall(rf'\b(?:{pattern})\b', text, re.IGNORECASE))
+            for emotion, pattern in emotional_patterns.items()
+        }
+
+    def _identify_persuasion_elements(self, text: str) -> Dict[str, int]:
+        """Conta gatilhos de persuasão (escassez, urgência, prova social, autoridade...)."""
+        persuasion_patterns = {
+            "scarcity": r'últimas? vagas?|limitad\w*|esgota\w*|exclusiv\w*|apenas \d+',
+            "urgency": r'agora|hoje|imediat\w*|não perca|última chance|só até',
+            "social_proof": r'milhares de|clientes satisfeitos|depoimentos?|avalia\w*|mais vendid\w*',
+            "authority": r'especialista\w*|comprovad\w*|pesquisa\w*|estud\w*|certificad\w*',
+            "reciprocity": r'grátis|gratuit\w*|bônus|brinde|presente',
+            "guarantee": r'garantia|reembolso|sem risco|devolu\w*'
+        }
+        return {
+            element: len(re.findall(rf'\b(?:{pattern})\b', text, re.IGNORECASE))
+            for element, pattern in persuasion_patterns.items()
+        }
+
+    def _linguistic_counts(self, doc) -> Counter:
+        """Contagens aditivas de um doc (ou pedaço de doc) para padrões linguísticos."""
+        counts = Counter()
+        for sentence in doc.sents:
+            counts["sentences"] += 1
+            last = sentence[-1].text if len(sentence) else ""
+            if last == "?":
+                counts["questions"] += 1
+            elif last == "!":
+                counts["exclamations"] += 1
+        for token in doc:
+            if token.is_punct or token.is_space:
+                continue
+            counts["tokens"] += 1
+            counts[f"pos_{token.pos_}"] += 1
+            person = token.morph.get("Person")
+            if token.pos_ == "PRON" and person:
+                counts[f"person_{person[0]}"] += 1
+        return counts
+
+    def _linguistic_patterns_from_counts(self, counts: Counter) -> Dict[str, Any]:
+        """Converte contagens (somadas entre pedaços) em métricas linguísticas."""
+        tokens = counts.get("tokens", 0) or 1
+        sentences = counts.get("sentences", 0) or 1
+        return {
+            "sentence_count": counts.get("sentences", 0),
+            "avg_sentence_length": counts.get("tokens", 0) / sentences,
+            "noun_ratio": counts.get("pos_NOUN", 0) / tokens,
+            "verb_ratio": counts.get("pos_VERB", 0) / tokens,
+            "adjective_ratio": counts.get("pos_ADJ", 0) / tokens,
+            "adverb_ratio": counts.get("pos_ADV", 0) / tokens,
+            "question_count": counts.get("questions", 0),
+            "exclamation_count": counts.get("exclamations", 0),
+            "first_person_pronouns": counts.get("person_1", 0),
+            "second_person_pronouns": counts.get("person_2", 0)
+        }
+
+    def _analyze_linguistic_patterns(self, doc) -> Dict[str, Any]:
+        """Analisa padrões linguísticos (frases, classes gramaticais, pessoa) de um doc."""
+        return self._linguistic_patterns_from_counts(self._linguistic_counts(doc))
 
-    def _extract_topics_lda(self, texts: List[str]) -> List[Dict[str, Any]]:
-        """Extrai tópicos de um conjunto de textos usando LDA."""
+    def _document_hashes(self, corpus: SessionCorpus) -> Dict[str, str]:
+        """Hash do conteúdo de cada documento do corpus ({nome do arquivo: hash})"""
+        return {source: self.feature_cache.content_hash(text) for source, text in corpus}
+
+    def _extract_topics_lda(self, corpus: SessionCorpus,
+                            document_hashes: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """Extrai tópicos de um corpus usando LDA (documentos lidos em streaming).
+
+        O modelo fica no registro por sessão: corpus inalterado reutiliza o modelo,
+        documentos novos atualizam o modelo existente (LdaModel.update) e só
+        mudanças maiores refazem o treino.
+        """
         if not HAS_GENSIM or not HAS_SKLEARN:
             logger.warning("⚠️ Gensim ou Scikit-learn não disponíveis para extração de tópicos LDA.")
             return []
 
         try:
-            # Pré-processamento para Gensim
-            processed_texts = [[word for word in doc.lower().split() if word.isalpha() and word not in self._get_portuguese_stopwords()] for doc in texts]
-            dictionary = corpora.Dictionary(processed_texts)
-            corpus = [dictionary.doc2bow(text) for text in processed_texts]
-            
-            # Treina o modelo LDA
-            lda_model = models.LdaMulticore(corpus, num_topics=self.config["n_topics_lda"], id2word=dictionary, passes=10, workers=2)
+            if document_hashes is None:
+                document_hashes = self._document_hashes(corpus)
+            segment = corpus.session_dir.name
+            signature = f"gensim-{gensim.__version__}-topics{self.config['n_topics_lda']}"
+            action, entry, new_hashes = self.model_registry.plan(
+                "lda", segment, document_hashes.values(), signature
+            )
+
+            if action == self.model_registry.FIT:
+                # Pré-processamento para Gensim: dicionário e bag-of-words sem materializar o corpus
+                dictionary = corpora.Dictionary(corpus.tokens(PORTUGUESE_STOPWORDS, alpha_only=True))
+                bow_corpus = StreamingBowCorpus(corpus, dictionary, PORTUGUESE_STOPWORDS)
+
+                # Treina o modelo LDA
+                lda_model = models.LdaMulticore(bow_corpus, num_topics=self.config["n_topics_lda"], id2word=dictionary, passes=10, workers=2)
+            else:
+                lda_model, dictionary = entry[0]
+                if action == self.model_registry.UPDATE:
+                    # Atualização online só com os documentos novos (vocabulário do treino original)
+                    new_documents = corpus.subset(
+                        source for source, content_hash in document_hashes.items() if content_hash in new_hashes
+                    )
+                    lda_model.update(StreamingBowCorpus(new_documents, dictionary, PORTUGUESE_STOPWORDS))
+
+            if action != self.model_registry.REUSE:
+                self.model_registry.save(
+                    "lda", segment, (lda_model, dictionary),
+                    self.model_registry.fingerprint(document_hashes.values()), signature,
+                    items=sorted(set(document_hashes.values()))
+                )
             self.topic_model = lda_model # Armazena o modelo treinado
 
             topics = []
@@ -915,30 +1144,67 @@ class PredictiveAnalyticsEngine:
             logger.error(f"❌ Erro ao extrair tópicos com LDA: {e}")
             return []
 
-    def _perform_semantic_clustering(self, texts: List[str]) -> Dict[str, Any]:
-        """Realiza clustering semântico de textos usando TF-IDF e KMeans."""
+    def _perform_semantic_clustering(self, corpus: SessionCorpus,
+                                     document_hashes: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Realiza clustering semântico do corpus usando TF-IDF e MiniBatchKMeans.
+
+        Vetorizador e clusters ficam no registro por sessão: corpus inalterado só
+        é transformado e classificado, documentos novos entram via partial_fit.
+        """
         if not HAS_SKLEARN:
             logger.warning("⚠️ Scikit-learn não disponível para clustering semântico.")
             return {}
 
         try:
-            # Transforma os textos em vetores TF-IDF
-            X = self.tfidf_vectorizer.fit_transform(texts)
+            if document_hashes is None:
+                document_hashes = self._document_hashes(corpus)
+            segment = corpus.session_dir.name
+            n_clusters = self.config["n_clusters_kmeans"]
+            signature = f"sklearn-{sklearn_version}-clusters{n_clusters}"
+            action, entry, new_hashes = self.model_registry.plan(
+                "kmeans", segment, document_hashes.values(), signature
+            )
 
-            # Aplica KMeans
-            kmeans_model = KMeans(n_clusters=self.config["n_clusters_kmeans"], init='k-means++', max_iter=300, random_state=42, n_init=10)
-            kmeans_model.fit(X)
+            # Transforma os textos em vetores TF-IDF lendo um documento por vez
+            sources = []
+
+            def texts():
+                for source, text in corpus:
+                    sources.append(source)
+                    yield text
+
+            if action == self.model_registry.FIT:
+                vectorizer = clone(self.tfidf_vectorizer)
+                X = vectorizer.fit_transform(texts())
+
+                # Aplica MiniBatchKMeans (permite atualização incremental com partial_fit)
+                kmeans_model = MiniBatchKMeans(n_clusters=n_clusters, init='k-means++', max_iter=300, random_state=42, n_init=10, batch_size=1024)
+                kmeans_model.fit(X)
+            else:
+                vectorizer, kmeans_model = entry[0]
+                X = vectorizer.transform(texts())
+                if action == self.model_registry.UPDATE:
+                    new_rows = [i for i, source in enumerate(sources) if document_hashes.get(source) in new_hashes]
+                    kmeans_model.partial_fit(X[new_rows])
+
+            if action != self.model_registry.REUSE:
+                self.model_registry.save(
+                    "kmeans", segment, (vectorizer, kmeans_model),
+                    self.model_registry.fingerprint(document_hashes.values()), signature,
+                    items=sorted(set(document_hashes.values()))
+                )
             
+            # Os clusters listam os documentos (nomes dos arquivos), não os textos completos
             clusters = defaultdict(list)
-            for i, label in enumerate(kmeans_model.labels_):
-                clusters[f"cluster_{label}"].append(texts[i])
+            for i, label in enumerate(kmeans_model.predict(X)):
+                clusters[f"cluster_{label}"].append(sources[i])
             
             # Extrai as palavras-chave para cada cluster
             order_centroids = kmeans_model.cluster_centers_.argsort()[:, ::-1]
-            terms = self.tfidf_vectorizer.get_feature_names_out()
+            terms = vectorizer.get_feature_names_out()
             
             cluster_keywords = {}
-            for i in range(self.config["n_clusters_kmeans"]):
+            for i in range(n_clusters):
                 cluster_keywords[f"cluster_{i}"] = [terms[ind] for ind in order_centroids[i, :10]]
 
             return {"clusters": {k: v for k, v in clusters.items()}, "cluster_keywords": cluster_keywords}
@@ -949,15 +1215,9 @@ class PredictiveAnalyticsEngine:
 
 
 
-    def _calculate_keyword_density(self, texts: List[str]) -> Dict[str, float]:
-        """Calcula a densidade de palavras-chave em um conjunto de textos."""
-        if not texts:
-            return {}
-
-        combined_text = " ".join(texts).lower()
-        words = [word for word in re.findall(r'\b\w+\b', combined_text) if word not in self._get_portuguese_stopwords()]
-        word_counts = Counter(words)
-        total_words = len(words)
+    def _calculate_keyword_density(self, word_counts: Counter) -> Dict[str, float]:
+        """Calcula a densidade de palavras-chave a partir da contagem incremental do corpus."""
+        total_words = sum(word_counts.values())
 
         if total_words == 0:
             return {}
@@ -968,113 +1228,103 @@ class PredictiveAnalyticsEngine:
 
 
 
-    def _identify_emerging_themes(self, texts: List[str]) -> List[str]:
-        """Identifica temas emergentes analisando a frequência e co-ocorrência de termos."""
-        if not texts:
+    def _identify_emerging_themes(self, word_counts: Counter) -> List[str]:
+        """Identifica temas emergentes analisando a frequência dos termos."""
+        if not word_counts:
             return []
 
-        # Para simplificar, usaremos uma abordagem baseada em frequência e n-grams
+        # Para simplificar, usaremos uma abordagem baseada em frequência
         # Uma abordagem mais avançada envolveria análise temporal de tópicos ou detecção de anomalias em termos.
-        
-        all_words = []
-        for text in texts:
-            words = [word for word in re.findall(r'\b\w+\b', text.lower()) if word not in self._get_portuguese_stopwords()]
-            all_words.extend(words)
-
-        word_freq = Counter(all_words)
-        
-        # Considerar palavras que apareceram recentemente ou tiveram um aumento significativo
         # Esta é uma simulação, pois não temos dados temporais aqui. Em um cenário real, precisaríamos de timestamps.
         # Para este exemplo, vamos pegar as 20 palavras mais frequentes como 'temas emergentes' simplificados.
-        emerging_themes = [word for word, freq in word_freq.most_common(20)]
+        emerging_themes = [word for word, freq in word_counts.most_common(20)]
         
         return emerging_themes
 
 
 
 
-    def _gather_temporal_data(self, session_dir: Path) -> List[Dict[str, Any]]:
-        """Simula a coleta de dados temporais de arquivos na sessão."""
-        temporal_data = []
+    def _gather_temporal_data(self, session_dir: Path) -> pd.DataFrame:
+        """Coleta os pontos (timestamp, value) dos JSON da sessão em um frame indexado por tempo."""
+        timestamps = []
+        values = []
         # Exemplo: busca por arquivos JSON que contenham dados com timestamps
         # Em um cenário real, isso leria dados de logs, eventos, etc.
         for f in session_dir.glob("*.json"):
             try:
                 with open(f, 'r', encoding='utf-8') as infile:
                     data = json.load(infile)
-                    if isinstance(data, list):
-                        for item in data:
-                            if "timestamp" in item and "value" in item:
-                                try:
-                                    item["timestamp"] = datetime.fromisoformat(item["timestamp"])
-                                    temporal_data.append(item)
-                                except ValueError:
-                                    continue
-                    elif isinstance(data, dict):
-                        if "timestamp" in data and "value" in data:
-                            try:
-                                data["timestamp"] = datetime.fromisoformat(data["timestamp"])
-                                temporal_data.append(data)
-                            except ValueError:
-                                continue
-            except json.JSONDecodeError:
+            except (json.JSONDecodeError, OSError):
                 continue
-        
-        # Ordena os dados por timestamp
-        temporal_data.sort(key=lambda x: x["timestamp"])
-        return temporal_data
+            items = data if isinstance(data, list) else [data]
+            for item in items:
+                if isinstance(item, dict) and "timestamp" in item and "value" in item:
+                    timestamps.append(item["timestamp"])
+                    values.append(item["value"])
 
+        return self._build_temporal_frame(timestamps, values)
 
+    @staticmethod
+    def _build_temporal_frame(timestamps: List[Any], values: List[Any]) -> pd.DataFrame:
+        """Frame com DatetimeIndex ordenado e coluna 'value' numérica (parse vetorizado)."""
+        if not timestamps:
+            return pd.DataFrame({"value": pd.Series(dtype="float64")}, index=pd.DatetimeIndex([], name="timestamp"))
 
-
-    def _analyze_growth_patterns(self, temporal_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        raw = pd.Series(timestamps, dtype="object")
+        try:
+            index = pd.to_datetime(raw, format="ISO8601", errors="coerce")
+        except (ValueError, TypeError):
+            # Fusos diferentes entre os pontos: normaliza tudo para UTC
+            index = pd.to_datetime(raw, format="ISO8601", errors="coerce", utc=True)
+
+        frame = pd.DataFrame({"value": pd.to_numeric(pd.Series(values, dtype="object"), errors="coerce")})
+        frame.index = pd.DatetimeIndex(index, name="timestamp")
+        frame = frame[frame.index.notna() & frame["value"].notna()]
+        # Ordenação estável: pontos com o mesmo timestamp mantêm a ordem de leitura
+        return frame.sort_index(kind="mergesort")
+
+    def _add_temporal_features(self, frame: pd.DataFrame):
+        """Acrescenta ao frame as séries derivadas usadas pelas análises temporais."""
+        frame["change"] = frame["value"].diff()
+        frame["acceleration"] = frame["change"].diff()
+
+    def _analyze_growth_patterns(self, frame: pd.DataFrame) -> Dict[str, Any]:
         """Analisa padrões de crescimento em dados temporais."""
-        if not temporal_data:
+        if frame.empty:
             return {}
 
-        df = pd.DataFrame(temporal_data)
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        df = df.set_index("timestamp").sort_index()
-
         growth_patterns = {}
         # Exemplo: cálculo de crescimento diário, semanal, mensal
         # Isso pode ser expandido para diferentes granularidades e métricas
-        if "value" in df.columns:
-            # Crescimento diário
-            daily_growth = df["value"].diff().mean()
-            growth_patterns["daily_average_growth"] = daily_growth
+        # Crescimento diário
+        growth_patterns["daily_average_growth"] = frame["change"].mean()
 
-            # Crescimento percentual mensal (exemplo simplificado)
-            monthly_resampled = df["value"].resample("M").last()
-            if len(monthly_resampled) > 1:
-                monthly_growth_rate = (monthly_resampled.iloc[-1] - monthly_resampled.iloc[-2]) / monthly_resampled.iloc[-2]
-                growth_patterns["monthly_growth_rate"] = monthly_growth_rate
+        # Crescimento percentual mensal (exemplo simplificado)
+        try:
+            monthly_resampled = frame["value"].resample("ME").last()
+        except ValueError:
+            # pandas < 2.2 não conhece o alias "ME" (fim do mês)
+            monthly_resampled = frame["value"].resample("M").last()
+        if len(monthly_resampled) > 1:
+            monthly_growth_rate = (monthly_resampled.iloc[-1] - monthly_resampled.iloc[-2]) / monthly_resampled.iloc[-2]
+            growth_patterns["monthly_growth_rate"] = monthly_growth_rate
 
         return growth_patterns
 
 
 
 
-    def _detect_seasonality(self, temporal_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _detect_seasonality(self, frame: pd.DataFrame) -> Dict[str, Any]:
         """Detecta padrões de sazonalidade em dados temporais."""
-        if not temporal_data:
-            return {}
-
-        df = pd.DataFrame(temporal_data)
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        df = df.set_index("timestamp").sort_index()
-
         seasonality_patterns = {}
 
-        if "value" in df.columns and len(df) > 2 * 7: # Mínimo de duas semanas para detectar sazonalidade semanal
+        if len(frame) > 2 * 7: # Mínimo de duas semanas para detectar sazonalidade semanal
             # Exemplo: Sazonalidade semanal (média por dia da semana)
-            df["day_of_week"] = df.index.dayofweek
-            weekly_seasonality = df.groupby("day_of_week")["value"].mean().to_dict()
+            weekly_seasonality = frame["value"].groupby(frame.index.dayofweek).mean().to_dict()
             seasonality_patterns["weekly_seasonality"] = weekly_seasonality
 
             # Exemplo: Sazonalidade mensal (média por mês)
-            df["month"] = df.index.month
-            monthly_seasonality = df.groupby("month")["value"].mean().to_dict()
+            monthly_seasonality = frame["value"].groupby(frame.index.month).mean().to_dict()
             seasonality_patterns["monthly_seasonality"] = monthly_seasonality
 
         return seasonality_patterns
@@ -1082,94 +1332,74 @@ class PredictiveAnalyticsEngine:
 
 
 
-    def _calculate_velocity_of_change(self, temporal_data: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Calcula a velocidade de mudança de uma métrica ao longo do tempo."""
-        if not temporal_data or len(temporal_data) < 2:
+    def _calculate_velocity_of_change(self, frame: pd.DataFrame) -> Dict[str, Any]:
+        """Calcula a velocidade de mudança (primeira derivada) de uma métrica ao longo do tempo."""
+        if len(frame) < 2:
             return {}
 
-        df = pd.DataFrame(temporal_data)
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        df = df.set_index("timestamp").sort_index()
-
-        velocity_of_change = {}
-        if "value" in df.columns:
-            # Calcula a primeira derivada (taxa de mudança)
-            df["change"] = df["value"].diff()
-            velocity_of_change["average_change_per_period"] = df["change"].mean()
-            velocity_of_change["max_change_per_period"] = df["change"].max()
-            velocity_of_change["min_change_per_period"] = df["change"].min()
-
-        return velocity_of_change
+        change = frame["change"]
+        return {
+            "average_change_per_period": change.mean(),
+            "max_change_per_period": change.max(),
+            "min_change_per_period": change.min()
+        }
 
 
 
 
-    def _calculate_trend_acceleration(self, temporal_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _calculate_trend_acceleration(self, frame: pd.DataFrame) -> Dict[str, Any]:
         """Calcula a aceleração da tendência (segunda derivada)."""
-        if not temporal_data or len(temporal_data) < 3:
+        if len(frame) < 3:
             return {}
 
-        df = pd.DataFrame(temporal_data)
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        df = df.set_index("timestamp").sort_index()
-
-        trend_acceleration = {}
-        if "value" in df.columns:
-            # Calcula a primeira derivada (velocidade)
-            df["velocity"] = df["value"].diff()
-            # Calcula a segunda derivada (aceleração)
-            df["acceleration"] = df["velocity"].diff()
-            trend_acceleration["average_acceleration"] = df["acceleration"].mean()
-            trend_acceleration["max_acceleration"] = df["acceleration"].max()
-            trend_acceleration["min_acceleration"] = df["acceleration"].min()
-
-        return trend_acceleration
+        acceleration = frame["acceleration"]
+        return {
+            "average_acceleration": acceleration.mean(),
+            "max_acceleration": acceleration.max(),
+            "min_acceleration": acceleration.min()
+        }
 
 
 
 
-    def _detect_anomalies(self, temporal_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Detecta anomalias em dados temporais usando um método simples (e.g., IQR)."""
-        if not temporal_data or len(temporal_data) < 5:
+    def _detect_anomalies(self, frame: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Detecta anomalias em dados temporais usando máscara IQR vetorizada."""
+        if len(frame) < 5:
             return []
 
-        df = pd.DataFrame(temporal_data)
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        df = df.set_index("timestamp").sort_index()
-
-        anomalies = []
-        if "value" in df.columns:
-            Q1 = df["value"].quantile(0.25)
-            Q3 = df["value"].quantile(0.75)
-            IQR = Q3 - Q1
-            
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
+        values = frame["value"]
+        Q1, Q3 = values.quantile([0.25, 0.75])
+        IQR = Q3 - Q1
+        
+        lower_bound = Q1 - 1.5 * IQR
+        upper_bound = Q3 + 1.5 * IQR
 
-            for index, row in df.iterrows():
-                if row["value"] < lower_bound or row["value"] > upper_bound:
-                    anomalies.append({"timestamp": index.isoformat(), "value": row["value"], "type": "outlier"})
+        outliers = values[(values < lower_bound) | (values > upper_bound)]
+        return [
+            {"timestamp": timestamp.isoformat(), "value": value, "type": "outlier"}
+            for timestamp, value in zip(outliers.index, outliers.tolist())
+        ]
 
-        return anomalies
 
 
 
+    def _create_forecast_models(self, frame: pd.DataFrame, segment: Optional[str] = None) -> Dict[str, Any]:
+        """Cria modelos de previsão usando Prophet (se disponível) ou regressão linear.
 
-    def _create_forecast_models(self, temporal_data: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Cria modelos de previsão usando Prophet (se disponível) ou regressão linear."""
+        Com um segmento (sessão), o Prophet ajustado fica no registro: série
+        idêntica pula o ajuste e série alterada parte dos parâmetros anteriores.
+        """
         forecast_models = {}
-        if not temporal_data or len(temporal_data) < self.config["min_data_points_prediction"]:
+        if len(frame) < self.config["min_data_points_prediction"]:
             logger.warning("⚠️ Dados insuficientes para criar modelos de previsão.")
             return forecast_models
 
-        df = pd.DataFrame(temporal_data)
-        df["ds"] = pd.to_datetime(df["timestamp"])
-        df["y"] = df["value"]
+        ds = frame.index.tz_localize(None) if frame.index.tz is not None else frame.index
+        df = pd.DataFrame({"ds": ds, "y": frame["value"].to_numpy()})
 
         if HAS_PROPHET:
             try:
-                m = Prophet()
-                m.fit(df)
+                m = self._fit_prophet(df, segment)
                 future = m.make_future_dataframe(periods=self.config["prediction_horizon_days"])
                 forecast = m.predict(future)
                 forecast_models["prophet_forecast"] = forecast[["ds", "yhat", "yhat_lower", "yhat_upper"]].to_dict(orient="records")
@@ -1180,7 +1410,8 @@ class PredictiveAnalyticsEngine:
         if HAS_SKLEARN:
             try:
                 # Regressão Linear como fallback ou modelo adicional
-                df["ordinal_date"] = df["ds"].apply(lambda date: date.toordinal())
+                # Ordinal do calendário (date.toordinal) calculado em bloco: dias desde 1970 + 719163
+                df["ordinal_date"] = df["ds"].to_numpy().astype("datetime64[D]").astype(np.int64) + 719163
                 X = df[["ordinal_date"]]
                 y = df["y"]
 
@@ -1206,54 +1437,46 @@ class PredictiveAnalyticsEngine:
 
 
 
-    def _analyze_image_colors(self, image_path: Path) -> Dict[str, Any]:
-        """Analisa as cores predominantes em uma imagem."""
-        if not HAS_OPENCV:
-            logger.warning("⚠️ OpenCV não disponível para análise de cores de imagem.")
-            return {}
-
-        try:
-            img = cv2.imread(str(image_path))
-            if img is None:
-                logger.error(f"❌ Não foi possível carregar a imagem: {image_path}")
-                return {}
-
-            # Redimensiona a imagem para acelerar o processamento
-            img = cv2.resize(img, (100, 100))
-            
-            # Converte para RGB (OpenCV lê em BGR)
-            img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-            
-            # Remodela a imagem para uma lista de pixels
-            pixels = img.reshape((-1, 3))
-            pixels = np.float32(pixels)
-
-            # Define critérios de parada e aplica KMeans para encontrar as cores predominantes
-            criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 100, 0.2)
-            k = 5  # Número de cores predominantes a serem encontradas
-            _, labels, centers = cv2.kmeans(pixels, k, None, criteria, 10, cv2.KMEANS_RANDOM_CENTERS)
-
-            # Converte os centros de volta para inteiros de 8 bits
-            centers = np.uint8(centers)
-
-            # Conta a frequência de cada cor
-            counts = Counter(labels.flatten())
-            
-            # Ordena as cores pela frequência
-            sorted_colors = sorted(counts.items(), key=lambda x: x[1], reverse=True)
-
-            dominant_colors = []
-            for i, count in sorted_colors:
-                color = centers[i]
-                dominant_colors.append({"rgb": color.tolist(), "percentage": (count / len(pixels)) * 100})
-
-            return {"dominant_colors": dominant_colors}
-        except Exception as e:
-            logger.error(f"❌ Erro ao analisar cores da imagem {image_path}: {e}")
-            return {}
-
+    def _fit_prophet(self, df: pd.DataFrame, segment: Optional[str] = None):
+        """Prophet ajustado para a série: reutilizado do registro ou ajustado com warm start"""
+        if segment is None:
+            m = Prophet()
+            m.fit(df)
+            return m
 
+        signature = f"prophet-{prophet.__version__}"
+        fingerprint = self.model_registry.fingerprint_arrays(
+            df["ds"].to_numpy().astype("datetime64[ns]"), df["y"].to_numpy(dtype=float)
+        )
+        action, entry = self.model_registry.lookup("prophet", segment, fingerprint, signature)
+        previous = model_from_json(entry[0]) if entry else None
+        if action == self.model_registry.REUSE:
+            return previous
 
+        m = Prophet()
+        if previous is not None:
+            try:
+                m.fit(df, init=self._prophet_warm_start_params(previous))
+            except Exception as e:
+                # Dimensões diferentes (changepoints/sazonalidades): ajuste do zero
+                logger.warning(f"⚠️ Warm start do Prophet indisponível, ajustando do zero: {e}")
+                m = Prophet()
+                m.fit(df)
+        else:
+            m.fit(df)
+
+        self.model_registry.save("prophet", segment, model_to_json(m), fingerprint, signature)
+        return m
+
+    @staticmethod
+    def _prophet_warm_start_params(m) -> Dict[str, Any]:
+        """Parâmetros de um Prophet ajustado no formato de init do Stan"""
+        params = {}
+        for name in ['k', 'm', 'sigma_obs']:
+            params[name] = m.params[name][0][0] if m.mcmc_samples == 0 else np.mean(m.params[name])
+        for name in ['delta', 'beta']:
+            params[name] = m.params[name][0] if m.mcmc_samples == 0 else np.mean(m.params[name], axis=0)
+        return params
 
     def _detect_ui_elements(self, text_content: str) -> Dict[str, Any]:
         """Detecta elementos de UI em texto extraído de imagens (OCR)."""
@@ -1350,8 +1573,7 @@ class PredictiveAnalyticsEngine:
 
         # Reutiliza a lógica de densidade de palavras-chave ou tópicos para extrair palavras-chave relevantes
         # Aqui, uma abordagem simplificada é pegar as palavras mais frequentes após remover stopwords.
-        words = [word for word in re.findall(r'\b\w+\b', combined_text.lower()) if word not in self._get_portuguese_stopwords()]
-        word_counts = Counter(words)
+        word_counts = Counter(tokenize(combined_text))
         
         # Retorna as 20 palavras mais comuns como palavras-chave visuais
         visual_keywords = [word for word, count in word_counts.most_common(20)]
@@ -1397,37 +1619,36 @@ class PredictiveAnalyticsEngine:
         entities = []
         relationships = []
 
-        # Simula a leitura de dados textuais para extração de entidades
-        textual_data = self._gather_comprehensive_textual_data(session_dir)
+        # Corpus da sessão, lido em lotes
+        corpus = self._gather_comprehensive_textual_data(session_dir)
 
-        if not HAS_SPACY or not self.nlp_model:
+        if not HAS_SPACY or not self.nlp_processor:
             logger.warning("⚠️ SpaCy não disponível para extração de entidades e relacionamentos.")
             return {"entities": entities, "relationships": relationships}
 
-        for source, text_content in textual_data.items():
-            try:
-                doc = self.nlp_model(text_content[:1000000]) # Limita para performance
-                
+        # Reaproveita as features do estágio textual (mesmo cache por hash de conteúdo)
+        for batch in corpus.batches(self.config['corpus_batch_docs'], self.config['corpus_batch_chars']):
+            features = self._get_document_features([text for _, text in batch])
+            for (source, _), document_features in zip(batch, features):
+                if document_features is None:
+                    continue
+
                 # Extrai entidades
-                for ent in doc.ents:
-                    entities.append({"name": ent.text.strip(), "type": ent.label_, "source": source})
-                
+                for name, label in document_features["entities"]:
+                    entities.append({"name": name, "type": label, "source": source})
+
                 # Extrai relacionamentos (simplificado: co-ocorrência de entidades na mesma frase)
-                for sentence in doc.sents:
-                    sentence_entities = [ent.text.strip() for ent in sentence.ents if ent.label_ in ["PERSON", "ORG", "GPE"]]
-                    if len(sentence_entities) >= 2:
-                        # Cria relacionamentos entre todas as pares de entidades na frase
-                        for i in range(len(sentence_entities)):
-                            for j in range(i + 1, len(sentence_entities)):
-                                relationships.append({
-                                    "source": sentence_entities[i],
-                                    "target": sentence_entities[j],
-                                    "type": "co-occurrence",
-                                    "strength": 1.0 # Pode ser aprimorado com análise de dependência
-                                })
-            except Exception as e:
-                logger.error(f"❌ Erro ao extrair entidades/relacionamentos de {source}: {e}")
-                continue
+                for sentence_entities in document_features["sentence_entities"]:
+                    names = [name for name, label in sentence_entities if label in ["PERSON", "ORG", "GPE"]]
+                    # Cria relacionamentos entre todas as pares de entidades na frase
+                    for i in range(len(names)):
+                        for j in range(i + 1, len(names)):
+                            relationships.append({
+                                "source": names[i],
+                                "target": names[j],
+                                "type": "co-occurrence",
+                                "strength": 1.0 # Pode ser aprimorado com análise de dependência
+                            })
 
         return {"entities": entities, "relationships": relationships}
 
@@ -2189,3 +2410,26 @@ class PredictiveAnalyticsEngine:
         return contingency_plans
 
 
+# Motor de cada worker do pool das fases de sessão
+_phase_worker_engine = None
+
+def _init_phase_worker():
+    """Cria o motor do worker; os modelos carregam no primeiro uso (MODEL_HUB_PRELOAD pré-aquece)"""
+    global _phase_worker_engine
+    _phase_worker_engine = PredictiveAnalyticsEngine()
+    model_hub.preload()
+
+def _run_phase_in_worker(method_name: str, session_dir: str) -> Tuple[Dict[str, Any], float]:
+    """Executa uma fase de sessão no worker e devolve (resultado, segundos)"""
+    start = time.perf_counter()
+    result = asyncio.run(getattr(_phase_worker_engine, method_name)(Path(session_dir)))
+    return result, time.perf_counter() - start
+
+# Pool de processos das fases de sessão (compartilhado entre instâncias do motor);
+# PREDICTIVE_PHASE_WORKERS=0 executa tudo no processo atual
+_phase_pool = LazyProcessPool(
+    "das fases preditivas",
+    int(os.getenv("PREDICTIVE_PHASE_WORKERS", str(min(4, os.cpu_count() or 1)))),
+    "PREDICTIVE_PHASE_START_METHOD",
+    initializer=_init_phase_worker
+)
@@ -19,7 +19,8 @@ from services.viral_content_analyzer import viral_content_analyzer
 from services.enhanced_synthesis_engine import enhanced_synthesis_engine
 from services.enhanced_module_processor import enhanced_module_processor
 from services.comprehensive_report_generator_v3 import comprehensive_report_generator_v3
-from services.auto_save_manager import salvar_etapa
+from services.auto_save_manager import salvar_etapa, auto_save_manager
+from services.http_session_pool import http_session_pool
 
 logger = logging.getLogger(__name__)
 
@@ -70,7 +71,7 @@ def start_step1_collection():
             "query": query,
             "context": context,
             "timestamp": datetime.now().isoformat()
-        }, categoria="workflow")
+        }, categoria="workflow", session_id=session_id)
 
         # Executa coleta massiva em thread separada
         def execute_collection():
@@ -98,6 +99,8 @@ def start_step1_collection():
                     )
 
                 finally:
+                    # Libera as conexões HTTP do pool antes de descartar o loop
+                    loop.run_until_complete(http_session_pool.close_current())
                     loop.close()
 
                 # Gera relatório de coleta
@@ -115,7 +118,7 @@ def start_step1_collection():
                     "viral_analysis": viral_analysis,
                     "collection_report_generated": True,
                     "timestamp": datetime.now().isoformat()
-                }, categoria="workflow")
+                }, categoria="workflow", session_id=session_id)
 
                 logger.info(f"✅ ETAPA 1 CONCLUÍDA - Sessão: {session_id}")
 
@@ -125,7 +128,11 @@ def start_step1_collection():
                     "session_id": session_id,
                     "error": str(e),
                     "timestamp": datetime.now().isoformat()
-                }, categoria="workflow")
+                }, categoria="workflow", session_id=session_id)
+
+            finally:
+                # Barreira de durabilidade: a etapa só termina com tudo gravado em disco
+                auto_save_manager.flush(session_id)
 
         # Inicia execução em background
         import threading
@@ -166,7 +173,7 @@ def start_step2_synthesis():
         salvar_etapa("etapa2_iniciada", {
             "session_id": session_id,
             "timestamp": datetime.now().isoformat()
-        }, categoria="workflow")
+        }, categoria="workflow", session_id=session_id)
 
         # Executa síntese em thread separada
         def execute_synthesis():
@@ -194,6 +201,8 @@ def start_step2_synthesis():
                     )
 
                 finally:
+                    # Libera as conexões HTTP do pool antes de descartar o loop
+                    loop.run_until_complete(http_session_pool.close_current())
                     loop.close()
 
                 # Salva resultado da etapa 2
@@ -203,7 +212,7 @@ def start_step2_synthesis():
                     "behavioral_result": behavioral_result,
                     "market_result": market_result,
                     "timestamp": datetime.now().isoformat()
-                }, categoria="workflow")
+                }, categoria="workflow", session_id=session_id)
 
                 logger.info(f"✅ ETAPA 2 CONCLUÍDA - Sessão: {session_id}")
 
@@ -213,7 +222,11 @@ def start_step2_synthesis():
                     "session_id": session_id,
                     "error": str(e),
                     "timestamp": datetime.now().isoformat()
-                }, categoria="workflow")
+                }, categoria="workflow", session_id=session_id)
+
+            finally:
+                # Barreira de durabilidade: a etapa só termina com tudo gravado em disco
+                auto_save_manager.flush(session_id)
 
         # Inicia execução em background
         import threading
@@ -253,7 +266,7 @@ def start_step3_generation():
         salvar_etapa("etapa3_iniciada", {
             "session_id": session_id,
             "timestamp": datetime.now().isoformat()
-        }, categoria="workflow")
+        }, categoria="workflow", session_id=session_id)
 
         # Executa geração em thread separada
         def execute_generation():
@@ -267,6 +280,8 @@ def start_step3_generation():
                         enhanced_module_processor.generate_all_modules(session_id)
                     )
                 finally:
+                    # Libera as conexões HTTP do pool antes de descartar o loop
+                    loop.run_until_complete(http_session_pool.close_current())
                     loop.close()
 
                 # Compila relatório final
@@ -278,7 +293,7 @@ def start_step3_generation():
                     "modules_result": modules_result,
                     "final_report": final_report,
                     "timestamp": datetime.now().isoformat()
-                }, categoria="workflow")
+                }, categoria="workflow", session_id=session_id)
 
                 logger.info(f"✅ ETAPA 3 CONCLUÍDA - Sessão: {session_id}")
                 logger.info(f"📊 {modules_result.get('successful_modules', 0)}/16 módulos gerados")
@@ -289,7 +304,11 @@ def start_step3_generation():
                     "session_id": session_id,
                     "error": str(e),
                     "timestamp": datetime.now().isoformat()
-                }, categoria="workflow")
+                }, categoria="workflow", session_id=session_id)
+
+            finally:
+                # Barreira de durabilidade: a etapa só termina com tudo gravado em disco
+                auto_save_manager.flush(session_id)
 
         # Inicia execução em background
         import threading
@@ -388,6 +407,8 @@ def execute_complete_workflow():
                     final_report = comprehensive_report_generator_v3.compile_final_markdown_report(session_id)
 
                 finally:
+                    # Libera as conexões HTTP do pool antes de descartar o loop
+                    loop.run_until_complete(http_session_pool.close_current())
                     loop.close()
 
                 # Salva resultado final
@@ -399,7 +420,7 @@ def execute_complete_workflow():
                     "modules_result": modules_result,
                     "final_report": final_report,
                     "timestamp": datetime.now().isoformat()
-                }, categoria="workflow")
+                }, categoria="workflow", session_id=session_id)
 
                 logger.info(f"✅ WORKFLOW COMPLETO CONCLUÍDO - Sessão: {session_id}")
 
@@ -409,7 +430,11 @@ def execute_complete_workflow():
                     "session_id": session_id,
                     "error": str(e),
                     "timestamp": datetime.now().isoformat()
-                }, categoria="workflow")
+                }, categoria="workflow", session_id=session_id)
+
+            finally:
+                # Barreira de durabilidade: a etapa só termina com tudo gravado em disco
+                auto_save_manager.flush(session_id)
 
         # Inicia execução em background
         import threading
@@ -478,7 +503,8 @@ def get_workflow_status(session_id):
         error_files = [
             f"relatorios_intermediarios/workflow/etapa1_erro*{session_id}*",
             f"relatorios_intermediarios/workflow/etapa2_erro*{session_id}*",
-            f"relatorios_intermediarios/workflow/etapa3_erro*{session_id}*"
+            f"relatorios_intermediarios/workflow/etapa3_erro*{session_id}*",
+            f"relatorios_intermediarios/workflow/{session_id}/etapa*_erro*"
         ]
 
         for pattern in error_files:
@@ -31,6 +31,57 @@ def get_extractor_stats():
         }), 500
 
 
+@monitoring_bp.route('/api/model_hub_stats', methods=['GET'])
+def get_model_hub_stats():
+    """Modelos NLP/ML carregados no processo e memória estimada de cada um"""
+    try:
+        from engine.model_hub import model_hub
+        return jsonify({
+            'success': True,
+            'stats': model_hub.get_stats()
+        })
+    except Exception as e:
+        logger.error(f"❌ Erro ao obter estatísticas do model hub: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@monitoring_bp.route('/api/http_cache_stats', methods=['GET'])
+def get_http_cache_stats():
+    """Hits, revalidações e tamanho do cache HTTP compartilhado pelos extratores"""
+    try:
+        from services.http_fetch_cache import http_fetch_cache
+        return jsonify({
+            'success': True,
+            'stats': http_fetch_cache.get_stats()
+        })
+    except Exception as e:
+        logger.error(f"❌ Erro ao obter estatísticas do cache HTTP: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@monitoring_bp.route('/api/pdf_pipeline_stats', methods=['GET'])
+def get_pdf_pipeline_stats():
+    """Páginas extraídas, paradas antecipadas e cache de texto do pipeline de PDF"""
+    try:
+        from services.pdf_pipeline import pdf_pipeline
+        return jsonify({
+            'success': True,
+            'stats': pdf_pipeline.get_stats()
+        })
+    except Exception as e:
+        logger.error(f"❌ Erro ao obter estatísticas do pipeline de PDF: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @monitoring_bp.route('/api/test_extraction', methods=['GET'])
 def test_extraction():
     """Testa extração para uma URL específica"""
@@ -171,6 +171,24 @@ def create_app():
             }), 500
 
 
+    # Pré-aquece navegadores do pool em segundo plano (BROWSER_POOL_PREWARM=0 desativa)
+    try:
+        import threading
+        from services.browser_pool import browser_pool
+        if browser_pool.is_available() and browser_pool.prewarm_size > 0:
+            threading.Thread(target=browser_pool.warm_up, daemon=True).start()
+    except Exception as e:
+        logger.warning(f"⚠️ Não foi possível pré-aquecer o browser pool: {e}")
+
+    # Pré-carrega modelos NLP/ML em segundo plano (MODEL_HUB_PRELOAD=spacy_pt,nlp_batch,vader ou all)
+    try:
+        import threading
+        from engine.model_hub import model_hub
+        if os.getenv("MODEL_HUB_PRELOAD"):
+            threading.Thread(target=model_hub.preload, daemon=True).start()
+    except Exception as e:
+        logger.warning(f"⚠️ Não foi possível pré-carregar os modelos: {e}")
+
     @app.errorhandler(404)
     def not_found(error):
         return jsonify({'error': 'Endpoint não encontrado'}), 404
@@ -8,18 +8,22 @@ Agente de navegação web inteligente com busca profunda e análise contextual
 import os
 import logging
 import time
+import asyncio
 import requests
 import json
 import random
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from urllib.parse import quote_plus, urljoin, urlparse
 from bs4 import BeautifulSoup
 # Removido: from readability import Document as ReadabilityDocument
 
 from datetime import datetime
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from services.auto_save_manager import salvar_etapa, salvar_erro, salvar_trecho_pesquisa_web # Adicionado salvar_trecho_pesquisa_web
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from services.crawl_frontier import CrawlFrontier, normalize_url, url_host
+from services.http_fetch_cache import http_fetch_cache
+from services.auto_save_manager import auto_save_manager, salvar_etapa, salvar_erro, salvar_trecho_pesquisa_web # Adicionado salvar_trecho_pesquisa_web
 
 # Import para integração com Exa
 try:
@@ -75,8 +79,21 @@ class AlibabaWebSailorAgent:
         # Domínios bloqueados (irrelevantes)
         self.blocked_domains = {"airbnb.com"}
 
+        # Navegação: concorrência global, saltos de links internos (nível 2) e links seguidos por página
+        self.concurrency = int(os.getenv("WEBSAILOR_CONCURRENCY", "8"))
+        self.link_depth = int(os.getenv("WEBSAILOR_LINK_DEPTH", "1"))
+        self.links_per_page = int(os.getenv("WEBSAILOR_LINKS_PER_PAGE", "5"))
+        self.non_html_extensions = ('.pdf', '.doc', '.docx', '.xls', '.xlsx', '.zip', '.jpg', '.jpeg',
+                                    '.png', '.gif', '.webp', '.svg', '.mp4', '.mp3', '.css', '.js', '.xml')
+        self.non_content_paths = re.compile(r'/(login|entrar|cadastro|signup|register|conta|account|carrinho|'
+                                            r'cart|checkout|busca|search|tag|tags|autor|author|feed|wp-admin)(/|$)')
+
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        # A sessão é usada pelas threads da fronteira: um pool de conexões por vaga de concorrência
+        adapter = HTTPAdapter(pool_connections=self.concurrency, pool_maxsize=self.concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
         # Estatísticas de navegação
         self.navigation_stats = {
@@ -99,7 +116,38 @@ class AlibabaWebSailorAgent:
         depth_levels: int = 3,
         session_id: str = None
     ) -> Dict[str, Any]:
-        """Navegação e pesquisa profunda com múltiplos níveis"""
+        """Navegação e pesquisa profunda com múltiplos níveis (versão síncrona de research_deep_async)"""
+        coroutine = self.research_deep_async(query, context, max_pages, depth_levels, session_id)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        # Chamado de dentro de um event loop: roda num loop próprio em outra thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
+
+    async def research_deep_async(
+        self,
+        query: str,
+        context: Dict[str, Any],
+        max_pages: int = 25,
+        depth_levels: int = 3,
+        session_id: str = None
+    ) -> Dict[str, Any]:
+        """Navegação e pesquisa profunda com múltiplos níveis sobre uma CrawlFrontier
+
+        Nível 1: resultados de todos os engines; nível 2: BFS em links internos
+        (até WEBSAILOR_LINK_DEPTH saltos); nível 3: queries relacionadas. Os três
+        níveis dividem a mesma fronteira, então deduplicação, orçamento de
+        max_pages páginas, concorrência e politeness por host valem para todos.
+        """
+        frontier = CrawlFrontier(
+            max_pages=max_pages,
+            max_depth=self.link_depth if depth_levels > 1 else 0,
+            concurrency=self.concurrency
+        )
+        # Sessões cujo log recebeu trechos; trechos.json é gerado no finally
+        sessoes_com_trechos = set()
         try:
             logger.info(f"🚀 INICIANDO NAVEGAÇÃO PROFUNDA para: {query}")
             start_time = time.time()
@@ -115,104 +163,73 @@ class AlibabaWebSailorAgent:
             all_content = []
             search_engines_used = []
 
+            async def fetch(url: str, depth: int, meta: Dict[str, Any]):
+                content_data = await frontier.run_blocking(
+                    self._extract_content_multi_strategy, url, meta.get('title', ''), context, session_id
+                )
+                if not content_data or not content_data.get('success'):
+                    return None, []
+                links = content_data.pop('links', [])
+                # Páginas de queries relacionadas não abrem novos links internos
+                if depth < frontier.max_depth and not meta.get('related_query'):
+                    return content_data, self._select_internal_links(url, links, query, context)
+                return content_data, []
+
+            def on_result(url: str, depth: int, meta: Dict[str, Any], content_data: Dict[str, Any]):
+                content_data['search_engine'] = meta.get('search_engine', 'Desconhecido')
+                content_data['content_length'] = len(content_data.get('content', ''))
+                content_data['crawl_depth'] = depth
+                if meta.get('parent_url'):
+                    content_data['parent_url'] = meta['parent_url']
+                if meta.get('related_query'):
+                    content_data['related_query'] = meta['related_query']
+                all_content.append(content_data)
+                self.navigation_stats['successful_extractions'] += 1
+                self.navigation_stats['total_content_chars'] += content_data['content_length']
+
+                # === NOVO: Salva o trecho extraído ===
+                trecho_session_id = session_id or 'sessao_desconhecida'
+                sessoes_com_trechos.add(trecho_session_id)
+                salvar_trecho_pesquisa_web(
+                    url=url,
+                    titulo=content_data.get('title', ''),
+                    conteudo=content_data.get('content', ''),
+                    metodo_extracao=content_data.get('extraction_method', 'desconhecido'),
+                    qualidade=content_data.get('quality_score', 0.0),
+                    session_id=trecho_session_id
+                )
+                # ======================================
+
+                # Salva cada extração bem-sucedida (mantido para compatibilidade)
+                salvar_etapa(f"websailor_extracao_{len(all_content)}", {
+                    "url": url,
+                    "engine": content_data['search_engine'],
+                    "depth": depth,
+                    "content_length": content_data['content_length'],
+                    "quality_score": content_data.get('quality_score', 0.0)
+                }, categoria="pesquisa_web")
+
             # NÍVEL 1: BUSCA MASSIVA MULTI-ENGINE
+            # NÍVEL 2: BUSCA EM PROFUNDIDADE (Links internos) - BFS na mesma fronteira
             logger.info("🔍 NÍVEL 1: Busca massiva com múltiplos engines")
-
-            # Engines de busca em ordem de prioridade
-            search_engines = [
-                ("Google Custom Search", self._google_search_deep),
-                ("Serper API", self._serper_search_deep),
-                # ("Bing Scraping", self._bing_search_deep), # Comentado por padrão
-                # ("DuckDuckGo Scraping", self._duckduckgo_search_deep), # Comentado por padrão
-                # ("Yahoo Scraping", self._yahoo_search_deep) # Comentado por padrão
-            ]
-
-            # Executa buscas em paralelo
-            with ThreadPoolExecutor(max_workers=3) as executor:
-                future_to_engine = {
-                    executor.submit(func, query, min(max_pages, 10)): name
-                    for name, func in search_engines if func is not None
-                }
-
-                for future in as_completed(future_to_engine):
-                    engine_name = future_to_engine[future]
-                    try:
-                        results = future.result()
-                        if results:
-                            search_engines_used.append(engine_name)
-                            logger.info(f"✅ {engine_name}: {len(results)} resultados")
-
-                            # Processa cada resultado
-                            for result in results[:5]:  # Limita resultados por engine
-                                url = result.get('url') or result.get('link')
-                                if not url:
-                                    continue
-
-                                # Extrai conteúdo com múltiplas estratégias
-                                content_data = self._extract_content_multi_strategy(
-                                    url, result.get('title', ''), context, session_id # Passa session_id
-                                )
-
-                                if content_data and content_data.get('success'):
-                                    content_data['search_engine'] = engine_name
-                                    content_data['content_length'] = len(content_data.get('content', ''))
-                                    all_content.append(content_data)
-
-                                    # === NOVO: Salva o trecho extraído ===
-                                    salvar_trecho_pesquisa_web(
-                                        url=url,
-                                        titulo=content_data.get('title', ''),
-                                        conteudo=content_data.get('content', ''),
-                                        metodo_extracao=content_data.get('extraction_method', 'desconhecido'),
-                                        qualidade=content_data.get('quality_score', 0.0),
-                                        session_id=session_id or 'sessao_desconhecida'
-                                    )
-                                    # ======================================
-
-                                    # Salva cada extração bem-sucedida (mantido para compatibilidade)
-                                    salvar_etapa(f"websailor_extracao_{len(all_content)}", {
-                                        "url": url, # Corrigido: era result['url'], agora é url
-                                        "engine": engine_name,
-                                        "content_length": len(content_data.get('content', '')), # Corrigido: era content_data['content']
-                                        "quality_score": content_data.get('quality_score', 0.0) # Corrigido: era content_data['quality_score']
-                                    }, categoria="pesquisa_web")
-
-                                time.sleep(0.5)  # Rate limiting
-
-                    except Exception as e:
-                        logger.error(f"❌ Erro em {engine_name}: {str(e)}")
-                        continue
-
-            # NÍVEL 2: BUSCA EM PROFUNDIDADE (Links internos)
-            if depth_levels > 1 and all_content:
-                logger.info("🔍 NÍVEL 2: Busca em profundidade - Links internos")
-                # Implementação simplificada para busca em profundidade
-                # Pode envolver análise de links encontrados nos conteúdos iniciais
-                # e nova extração de conteúdo desses links.
-                # Por simplicidade, vamos pular esta etapa neste exemplo.
+            await self._seed_frontier(frontier, query, min(max_pages, 10), search_engines_used)
+            if frontier.max_depth > 0:
+                logger.info(f"🔍 NÍVEL 2: Busca em profundidade - Links internos (até {frontier.max_depth} salto(s))")
+            await frontier.run(fetch, on_result)
 
             # NÍVEL 3: BUSCA CONTEXTUAL AVANÇADA (Queries relacionadas)
-            if depth_levels > 2 and all_content:
+            if depth_levels > 2 and all_content and frontier.budget_left:
                 logger.info("🔍 NÍVEL 3: Busca contextual avançada - Queries relacionadas")
-                related_queries = self._generate_related_queries(query, context, all_content)
-
-                for related_query in related_queries[:3]:  # Limita queries relacionadas
-                    try:
-                        logger.info(f"🔍 Buscando por query relacionada: {related_query}")
-                        # Reutiliza o método de busca principal para a query relacionada
-                        related_content = self.navigate_and_research_deep(
-                            related_query, context, max_pages=5, depth_levels=1, session_id=session_id # Passa session_id
-                        )
-                        # Extrai insights relevantes e os adiciona
-                        related_content['related_query'] = related_query
-                        all_content.append(related_content)
-                        time.sleep(0.4)
-                    except Exception as e:
-                        logger.warning(f"⚠️ Erro em query relacionada '{related_query}': {str(e)}")
-                        continue
+                related_queries = self._generate_related_queries(query, context, all_content)[:3]
+                await asyncio.gather(*(
+                    self._seed_frontier(frontier, related_query, 5, search_engines_used, related_query=related_query)
+                    for related_query in related_queries
+                ))
+                await frontier.run(fetch, on_result)
 
             # PROCESSAMENTO E ANÁLISE FINAL
             processed_research = self._process_and_analyze_content(all_content, query, context)
+            processed_research['navegacao_profunda']['fronteira'] = frontier.get_stats()
 
             # Atualiza estatísticas
             self._update_navigation_stats(all_content)
@@ -231,6 +248,87 @@ class AlibabaWebSailorAgent:
             logger.error(f"❌ ERRO CRÍTICO na navegação WebSailor: {str(e)}")
             salvar_erro("websailor_critico", e, contexto={"query": query})
             return self._generate_emergency_research(query, context)
+        finally:
+            frontier.close()
+            # Materializa os trechos mesmo quando a navegação falha depois da extração
+            loop = asyncio.get_running_loop()
+            for trecho_session_id in sessoes_com_trechos:
+                await loop.run_in_executor(
+                    None, auto_save_manager.materializar_trechos_pesquisa_web, trecho_session_id
+                )
+
+    async def _seed_frontier(
+        self,
+        frontier: CrawlFrontier,
+        query: str,
+        max_results: int,
+        search_engines_used: List[str],
+        related_query: Optional[str] = None
+    ):
+        """Busca a query em todos os engines em paralelo e enfileira os resultados na profundidade 0"""
+        # Engines de busca em ordem de prioridade
+        search_engines = [
+            ("Google Custom Search", self._google_search_deep),
+            ("Serper API", self._serper_search_deep),
+            # ("Bing Scraping", self._bing_search_deep), # Comentado por padrão
+            # ("DuckDuckGo Scraping", self._duckduckgo_search_deep), # Comentado por padrão
+            # ("Yahoo Scraping", self._yahoo_search_deep) # Comentado por padrão
+        ]
+        responses = await asyncio.gather(*(
+            frontier.run_blocking(func, query, max_results) for _, func in search_engines
+        ), return_exceptions=True)
+        self.navigation_stats['total_searches'] += len(search_engines)
+
+        # Enfileira na ordem de prioridade dos engines; URLs repetidas entre
+        # engines (ou já vistas em outro nível) são descartadas pela fronteira
+        for (engine_name, _), results in zip(search_engines, responses):
+            if isinstance(results, Exception):
+                logger.error(f"❌ Erro em {engine_name}: {str(results)}")
+                continue
+            if not results:
+                continue
+            if engine_name not in search_engines_used:
+                search_engines_used.append(engine_name)
+            logger.info(f"✅ {engine_name}: {len(results)} resultados")
+            for result in results[:5]:  # Limita resultados por engine
+                meta = {'search_engine': engine_name, 'title': result.get('title', '')}
+                if related_query:
+                    meta['related_query'] = related_query
+                frontier.add(result.get('url') or result.get('link'), 0, **meta)
+
+    def _select_internal_links(
+        self,
+        page_url: str,
+        links: List[Tuple[str, str]],
+        query: str,
+        context: Dict[str, Any]
+    ) -> List[str]:
+        """Links internos (mesmo host) mais promissores da página para o próximo nível da BFS"""
+        host = url_host(page_url)
+        page_key = normalize_url(page_url)
+        terms = {term.lower() for term in re.findall(r'\w{4,}', " ".join(
+            [query, context.get('segmento', ''), context.get('produto', '')] + list(context.get('keywords', []))
+        ))}
+
+        candidates = {}
+        for href, text in links:
+            if not href.startswith(('http://', 'https://')) or url_host(href) != host:
+                continue
+            key = normalize_url(href)
+            if key == page_key or key in candidates:
+                continue
+            path = urlparse(href).path.lower()
+            if path.endswith(self.non_html_extensions) or self.non_content_paths.search(path):
+                continue
+            if not self._is_url_relevant(href, text, ""):
+                continue
+            haystack = f"{path} {text.lower()}"
+            # Relevância: termos da pesquisa no caminho/âncora; caminhos mais
+            # profundos (artigos) antes de seções rasas
+            candidates[key] = (sum(1 for term in terms if term in haystack), path.count('/'), href)
+
+        ranked = sorted(candidates.values(), key=lambda item: (item[0], item[1]), reverse=True)
+        return [href for _, _, href in ranked[:self.links_per_page]]
 
     def _extract_content_multi_strategy(
         self,
@@ -259,7 +357,9 @@ class AlibabaWebSailorAgent:
                             'title': title,
                             'content': content,
                             'quality_score': self._calculate_content_quality(content, url, context),
-                            'extraction_method': 'jina_reader'
+                            'extraction_method': 'jina_reader',
+                            'links': [(href, text) for text, href in
+                                      re.findall(r'\[([^\]]*)\]\((https?://[^)\s]+)', content)]
                         }
                         logger.info(f"✅ Jina Reader: {len(content)} caracteres")
                 else:
@@ -330,26 +430,10 @@ class AlibabaWebSailorAgent:
         # --- Tenta BeautifulSoup como último recurso ---
         try:
             logger.info(f"🔍 Tentando BeautifulSoup para {url}")
-            response = self.session.get(url, timeout=15)
+            response = http_fetch_cache.fetch(url, timeout=15, session=self.session)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # Remove elementos indesejados (scripts, styles, etc.)
-            for script in soup(["script", "style", "nav", "footer", "aside"]):
-                script.decompose()
-
-            # Tenta encontrar o conteúdo principal (heurística simples)
-            # Pode ser melhorado com seletores mais específicos
-            main_content = soup.find('main') or soup.find('article') or soup.find('div', class_=re.compile(r'content|main|post'))
-            if main_content:
-                text_content = main_content.get_text(separator=' ', strip=True)
-            else:
-                # Fallback para todo o body
-                body = soup.find('body')
-                text_content = body.get_text(separator=' ', strip=True) if body else ""
-
-            # Limita o tamanho se necessário e remove excesso de espaços
-            text_content = re.sub(r'\s+', ' ', text_content).strip()[:10000] # Limite arbitrário
+            page = http_fetch_cache.extracted(response, 'websailor.beautifulsoup', self._soup_text_and_links)
+            text_content, links = page['text'], page['links']
 
             if text_content and len(text_content) > 50:
                 logger.info(f"✅ Conteúdo extraído com BeautifulSoup ({len(text_content)} caracteres)")
@@ -360,7 +444,8 @@ class AlibabaWebSailorAgent:
                     'title': title,
                     'content': text_content,
                     'quality_score': self._calculate_content_quality(text_content, url, context),
-                    'extraction_method': extraction_method
+                    'extraction_method': extraction_method,
+                    'links': links
                 }
             else:
                 logger.info(f"ℹ️ BeautifulSoup não retornou conteúdo suficiente.")
@@ -370,6 +455,30 @@ class AlibabaWebSailorAgent:
         logger.warning(f"⚠️ Todos os métodos de fallback falharam para {url}")
         return None
 
+    def _soup_text_and_links(self, response) -> Dict[str, Any]:
+        """Texto principal e links (url absoluta, âncora) da página"""
+        soup = BeautifulSoup(response.content, 'html.parser')
+        links = [(urljoin(response.url, a['href']), a.get_text(' ', strip=True))
+                 for a in soup.find_all('a', href=True)]
+
+        # Remove elementos indesejados (scripts, styles, etc.)
+        for script in soup(["script", "style", "nav", "footer", "aside"]):
+            script.decompose()
+
+        # Tenta encontrar o conteúdo principal (heurística simples)
+        # Pode ser melhorado com seletores mais específicos
+        main_content = soup.find('main') or soup.find('article') or soup.find('div', class_=re.compile(r'content|main|post'))
+        if main_content:
+            text_content = main_content.get_text(separator=' ', strip=True)
+        else:
+            # Fallback para todo o body
+            body = soup.find('body')
+            text_content = body.get_text(separator=' ', strip=True) if body else ""
+
+        # Limita o tamanho se necessário e remove excesso de espaços
+        text_content = re.sub(r'\s+', ' ', text_content).strip()[:10000] # Limite arbitrário
+        return {'text': text_content, 'links': links}
+
     def _calculate_content_quality(self, content: str, url: str, context: Dict[str, Any]) -> float:
         """Calcula score de qualidade do conteúdo"""
         if not content:
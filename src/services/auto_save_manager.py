@@ -6,15 +6,26 @@ Sistema de salvamento automático ultra-robusto
 """
 
 import os
+import re
 import json
+import time
+import queue
+import atexit
 import logging
 import asyncio
+import threading
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
+from services.session_event_store import session_event_store
+from services.save_event_bus import save_event_bus
+
 logger = logging.getLogger(__name__)
 
+# Sufixo de timestamp dos arquivos gravados antes do log de eventos
+_LEGACY_TIMESTAMP = re.compile(r'_\d{8}_\d{6}(_\d{3})?$')
+
 # Import do serviço preditivo (lazy loading para evitar circular imports)
 _predictive_service = None
 
@@ -56,6 +67,37 @@ class AutoSaveManager:
         """Inicializa o gerenciador de salvamento"""
         self.base_path = "relatorios_intermediarios"
         self.analyses_path = "analyses_data"
+        self.event_store = session_event_store
+        self._known_dirs = set()
+
+        # Índice session_id -> etapa -> versão mais recente (arquivo/offset no log)
+        self._index_lock = threading.Lock()
+        self._step_index = {}
+        self._index_positions = {}
+        self._legacy_indexed = set()
+
+        # Gravação write-behind: fila limitada drenada em lotes por uma thread
+        self.write_queue_size = int(os.getenv("AUTOSAVE_QUEUE_SIZE", "1000"))
+        self.write_batch_size = int(os.getenv("AUTOSAVE_BATCH_SIZE", "64"))
+        self.enqueue_timeout = float(os.getenv("AUTOSAVE_ENQUEUE_TIMEOUT", "5"))
+        self.pretty_max_bytes = int(os.getenv("AUTOSAVE_PRETTY_MAX_BYTES", "262144"))
+        self._write_queue = queue.Queue(maxsize=self.write_queue_size)
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self._pending = {}
+        self._pending_cond = threading.Condition()
+        self.write_stats = {
+            'enqueued': 0,
+            'written': 0,
+            'failed': 0,
+            'batches': 0,
+            'backpressure_waits': 0
+        }
+        atexit.register(self.flush)
+
+        self.event_bus = save_event_bus
+        self._register_predictive_subscribers()
+
         self._ensure_directories()
 
         logger.info("🔧 Auto Save Manager inicializado")
@@ -96,31 +138,223 @@ class AutoSaveManager:
 
         for directory in directories:
             try:
-                os.makedirs(directory, exist_ok=True)
+                self._ensure_dir(directory)
             except Exception as e:
                 logger.error(f"❌ Erro ao criar diretório {directory}: {e}")
 
+    def _ensure_dir(self, directory: str):
+        """os.makedirs apenas na primeira vez que o diretório é visto"""
+        if directory not in self._known_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._known_dirs.add(directory)
+
+    @staticmethod
+    def _dump(dados: Any) -> str:
+        """Serialização compacta (encoder em C); funciona como snapshot dos dados"""
+        return json.dumps(dados, ensure_ascii=False, separators=(',', ':'), default=str)
+
+    def _write_view(self, arquivo: str, payload: str):
+        """Grava a visão materializada (sobrescreve a versão anterior da etapa)
+
+        Payloads pequenos são reformatados com indentação para leitura humana;
+        os grandes ficam compactos.
+        """
+        if len(payload) <= self.pretty_max_bytes:
+            payload = json.dumps(json.loads(payload), ensure_ascii=False, indent=2)
+        try:
+            f = open(arquivo, 'w', encoding='utf-8')
+        except FileNotFoundError:
+            # Diretório removido externamente depois de entrar no cache
+            directory = os.path.dirname(arquivo)
+            self._known_dirs.discard(directory)
+            self._ensure_dir(directory)
+            f = open(arquivo, 'w', encoding='utf-8')
+        with f:
+            f.write(payload)
+
+    def _ensure_writer(self):
+        """Inicia a thread de gravação (de novo, se o processo sofreu fork)"""
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._writer_loop, name="autosave_writer", daemon=True)
+                self._writer.start()
+
+    def _enqueue(self, job: Dict[str, Any]):
+        """Enfileira uma gravação; bloqueia o chamador quando a fila está cheia"""
+        self._ensure_writer()
+        key = self.event_store._session_key(job["session_id"])
+        with self._pending_cond:
+            self._pending[key] = self._pending.get(key, 0) + 1
+
+        try:
+            self._write_queue.put(job, timeout=self.enqueue_timeout)
+        except queue.Full:
+            self.write_stats['backpressure_waits'] += 1
+            logger.warning(f"⚠️ Fila de gravação cheia ({self.write_queue_size}), aguardando o writer")
+            self._write_queue.put(job)
+        self.write_stats['enqueued'] += 1
+
+    def _writer_loop(self):
+        """Drena a fila em lotes de até write_batch_size gravações"""
+        while True:
+            batch = [self._write_queue.get()]
+            while len(batch) < self.write_batch_size:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: List[Dict[str, Any]]):
+        """Grava um lote: uma escrita no log por sessão, depois visões e índice"""
+        por_sessao = {}
+        ultima_versao = {}
+        for position, job in enumerate(batch):
+            por_sessao.setdefault(job["session_id"], []).append(job)
+            job["position"] = position
+            for arquivo in job.get("views", []):
+                ultima_versao[arquivo] = position
+
+        for session_id, jobs in por_sessao.items():
+            try:
+                offsets = self.event_store.append_many(
+                    session_id, [(j["tipo"], j["nome"], j["categoria"], j["payload"], j.get("view_key")) for j in jobs]
+                )
+            except Exception as e:
+                logger.error(f"❌ Erro ao gravar lote no log da sessão {session_id}: {e}")
+                offsets = [None] * len(jobs)
+
+            for job, offset in zip(jobs, offsets):
+                try:
+                    self._materialize_job(job, offset, ultima_versao)
+                    self.write_stats['written'] += 1
+                except Exception as e:
+                    self.write_stats['failed'] += 1
+                    logger.error(f"❌ Erro ao materializar {job['tipo']} '{job['nome']}': {e}")
+
+            key = self.event_store._session_key(session_id)
+            with self._pending_cond:
+                self._pending[key] = self._pending.get(key, 0) - len(jobs)
+                if self._pending[key] <= 0:
+                    del self._pending[key]
+                self._pending_cond.notify_all()
+
+        self.write_stats['batches'] += 1
+
+    def _materialize_job(self, job: Dict[str, Any], offset: Optional[int], ultima_versao: Dict[str, int]):
+        """Grava as visões de um evento já registrado no log e atualiza o índice
+
+        Versões intermediárias da mesma visão dentro do lote são puladas;
+        todas continuam no log.
+        """
+        session_id = job["session_id"]
+        for arquivo in job.get("views", []):
+            if ultima_versao.get(arquivo) != job["position"]:
+                continue
+            self._ensure_dir(os.path.dirname(arquivo))
+            self._write_view(arquivo, job["payload"])
+
+        if job["tipo"] == "etapa":
+            self._index_entry(session_id, job["nome"], {"arquivo": job["views"][0], "categoria": job["categoria"], "offset": offset})
+        elif job["tipo"] == "erro":
+            arquivo_erro = job["error_view"]
+            self._ensure_dir(os.path.dirname(arquivo_erro))
+            self._write_error_view(arquivo_erro, job["nome"], json.loads(job["payload"]))
+            self._index_entry(session_id, f"ERRO_{job['nome']}", {"arquivo": arquivo_erro, "categoria": "erros", "offset": offset})
+
+    def flush(self, session_id: str = None, timeout: Optional[float] = None) -> bool:
+        """Barreira de durabilidade: espera as gravações pendentes da sessão (ou de todas)
+
+        Gravações feitas sem session_id (registradas em "_global") podem
+        pertencer a qualquer sessão, então a barreira também espera por elas.
+
+        Returns:
+            False se o prazo acabar antes da fila esvaziar
+        """
+        keys = {self.event_store._session_key(session_id), "_global"} if session_id else None
+        deadline = None if timeout is None else time.time() + timeout
+
+        def pendentes() -> int:
+            if keys is None:
+                return sum(self._pending.values())
+            return sum(self._pending.get(key, 0) for key in keys)
+
+        with self._pending_cond:
+            while pendentes() > 0:
+                if self._writer is None or not self._writer.is_alive():
+                    logger.warning("⚠️ Writer do auto save inativo com gravações pendentes")
+                    return False
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._pending_cond.wait(remaining if remaining is not None else 1.0)
+        return True
+
+    def get_write_stats(self) -> Dict[str, Any]:
+        """Métricas da fila de gravação write-behind"""
+        with self._pending_cond:
+            pending = sum(self._pending.values())
+        return {
+            **self.write_stats,
+            'pending': pending,
+            'queue_size': self._write_queue.qsize(),
+            'queue_capacity': self.write_queue_size
+        }
+
+    # Categorias de módulos que também ganham visão em analyses_data
+    MODULOS_PARA_ANALYSES_DATA = [
+        "avatars", "drivers_mentais", "anti_objecao", "provas_visuais",
+        "pre_pitch", "predicoes_futuro", "posicionamento", "concorrencia",
+        "palavras_chave", "funil_vendas", "insights", "plano_acao"
+    ]
+
+    def _view_key(self, session_id: Optional[str], dados: Any) -> Optional[str]:
+        """Chave que separa as visões de salvamentos sem session_id
+
+        Sem sessão explícita, usa o session_id contido nos dados (as etapas
+        do workflow o carregam); sem nenhum dos dois, a visão é global.
+        """
+        if session_id or not isinstance(dados, dict):
+            return None
+        session_dados = dados.get("session_id")
+        if not session_dados and isinstance(dados.get("data"), dict):
+            session_dados = dados["data"].get("session_id")
+        if not session_dados:
+            return None
+        key = self.event_store._session_key(session_dados)
+        return None if key == "_global" else key
+
+    def _etapa_view_paths(self, nome_etapa: str, categoria: str, session_id: str = None, view_key: str = None) -> List[str]:
+        """Caminhos das visões materializadas de uma etapa (uma por sessão e etapa; a mais recente vence)"""
+        if session_id:
+            diretorio = f"{self.base_path}/{categoria}/{session_id}"
+        else:
+            diretorio = f"{self.base_path}/{categoria}"
+        sufixo = f"_{view_key}" if view_key else ""
+        paths = [f"{diretorio}/{nome_etapa}{sufixo}.json"]
+
+        if categoria in self.MODULOS_PARA_ANALYSES_DATA:
+            nome_arquivo = f"{categoria}{sufixo}.json" if session_id is None else f"{categoria}_{session_id}.json"
+            paths.append(os.path.join(self.analyses_path, categoria, nome_arquivo))
+        return paths
+
     def salvar_etapa(self, nome_etapa: str, dados: Any, categoria: str = "analise_completa", session_id: str = None) -> str:
-        """Salva uma etapa do processo com timestamp"""
+        """Salva uma etapa do processo no log da sessão e atualiza sua visão materializada
+
+        A gravação em disco acontece na thread de write-behind; use flush()
+        quando a etapa precisar estar durável antes de seguir.
+        """
         try:
-            # Gera timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+            view_key = self._view_key(session_id, dados)
 
-            # Define diretório base
             if session_id:
                 diretorio = f"{self.base_path}/{categoria}/{session_id}"
             else:
                 diretorio = f"{self.base_path}/{categoria}"
 
-            os.makedirs(diretorio, exist_ok=True)
-
-            # Nome do arquivo
-            nome_arquivo = f"{nome_etapa}_{timestamp}"
-
-            # Salva como JSON se possível
             try:
-                arquivo_json = f"{diretorio}/{nome_arquivo}.json"
-
                 # Serializa dados de forma segura
                 dados_serializaveis = serializar_dados_seguros(dados)
 
@@ -134,49 +368,14 @@ class AutoSaveManager:
                         "original_data": dados_serializaveis
                     }
 
-                with open(arquivo_json, 'w', encoding='utf-8') as f:
-                    json.dump(dados_serializaveis, f, ensure_ascii=False, indent=2)
-
-                logger.info(f"💾 Etapa '{nome_etapa}' salva: {arquivo_json}")
-
-                # INTEGRAÇÃO COM ANÁLISE PREDITIVA
-                self._trigger_predictive_analysis(nome_etapa, dados_serializaveis, categoria, session_id)
-
-                # TAMBÉM salva na pasta analyses_data se for um módulo
-                # Lista de categorias que devem ser salvas em analyses_data
-                modulos_para_analyses_data = [
-                    "avatars", "drivers_mentais", "anti_objecao", "provas_visuais",
-                    "pre_pitch", "predicoes_futuro", "posicionamento", "concorrencia",
-                    "palavras_chave", "funil_vendas", "insights", "plano_acao"
-                ]
-
-                # Verifica se a categoria atual está na lista de módulos a serem salvos em analyses_data
-                if categoria in modulos_para_analyses_data:
-                    try:
-                        # Extrai nome do módulo da etapa (pode precisar de ajuste dependendo do prefixo)
-                        # Assumindo que a categoria já é o nome base do módulo
-                        nome_modulo_base = categoria
-
-                        analyses_dir = f"{self.analyses_path}/{categoria}"
-                        os.makedirs(analyses_dir, exist_ok=True)
-
-                        analyses_arquivo_nome = f"{nome_modulo_base}_{timestamp}.json" if session_id is None else f"{nome_modulo_base}_{session_id}_{timestamp}.json"
-                        analyses_arquivo = os.path.join(analyses_dir, analyses_arquivo_nome)
-
-                        with open(analyses_arquivo, 'w', encoding='utf-8') as f:
-                            json.dump(dados_serializaveis, f, ensure_ascii=False, indent=2)
-
-                        logger.info(f"💾 Módulo também salvo em analyses_data: {analyses_arquivo}")
-
-                    except Exception as e:
-                        logger.warning(f"⚠️ Não foi possível salvar em analyses_data para a etapa {nome_etapa} (categoria: {categoria}): {e}")
-
-                return arquivo_json
+                # Snapshot compacto no thread chamador; o resto fica com o writer
+                payload = self._dump(dados_serializaveis)
 
             except Exception as json_error:
                 logger.warning(f"⚠️ Falha ao salvar como JSON ({json_error}), tentando salvar como texto...")
                 # Fallback para texto se falhar ao salvar como JSON
-                arquivo_txt = f"{diretorio}/{nome_arquivo}.txt"
+                self._ensure_dir(diretorio)
+                arquivo_txt = f"{diretorio}/{nome_etapa}{f'_{view_key}' if view_key else ''}.txt"
                 with open(arquivo_txt, 'w', encoding='utf-8') as f:
                     if isinstance(dados, str):
                         f.write(dados)
@@ -186,6 +385,32 @@ class AutoSaveManager:
                 logger.info(f"💾 Etapa '{nome_etapa}' salva: {arquivo_txt}")
                 return arquivo_txt
 
+            # Visões materializadas: um arquivo por sessão e etapa (e cópia em
+            # analyses_data para módulos), sobrescrito a cada versão; o
+            # histórico completo fica no log
+            view_paths = self._etapa_view_paths(nome_etapa, categoria, session_id, view_key)
+            self._enqueue({
+                "tipo": "etapa",
+                "session_id": session_id,
+                "nome": nome_etapa,
+                "categoria": categoria,
+                "payload": payload,
+                "views": view_paths,
+                "view_key": view_key
+            })
+            logger.info(f"💾 Etapa '{nome_etapa}' salva: {view_paths[0]}")
+
+            # INTEGRAÇÃO COM ANÁLISE PREDITIVA (assinantes assíncronos do barramento)
+            if session_id and categoria not in self.CATEGORIAS_DERIVADAS:
+                self.event_bus.publish({
+                    "nome_etapa": nome_etapa,
+                    "categoria": categoria,
+                    "session_id": session_id,
+                    "payload": payload
+                })
+
+            return view_paths[0]
+
         except Exception as e:
             logger.error(f"❌ Erro ao salvar etapa {nome_etapa}: {e}")
             return ""
@@ -195,6 +420,10 @@ class AutoSaveManager:
         """
         Salva um trecho de texto extraído de uma pesquisa web.
 
+        O trecho vai apenas para o log da sessão; a visão consolidada
+        analyses_data/pesquisa_web/<session_id>/trechos.json é gerada por
+        materializar_trechos_pesquisa_web().
+
         Args:
             url (str): A URL da página de origem.
             titulo (str): O título da página.
@@ -204,25 +433,10 @@ class AutoSaveManager:
             session_id (str): O ID da sessão de análise.
 
         Returns:
-            str: O caminho do arquivo salvo, ou string vazia em caso de erro.
+            str: O caminho do log da sessão, ou string vazia em caso de erro.
         """
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
-            
-            # Diretório específico para trechos de pesquisa web
-            diretorio = f"{self.analyses_path}/pesquisa_web/{session_id}"
-            os.makedirs(diretorio, exist_ok=True)
-
-            # Nome do arquivo baseado na URL e timestamp para unicidade
-            # Sanitiza a URL para nome de arquivo
-            nome_arquivo_seguro = "".join(c for c in url if c.isalnum() or c in (' ', '.', '_', '-')).rstrip()
-            # Limita o tamanho do nome do arquivo
-            nome_arquivo_seguro = nome_arquivo_seguro[:100] if len(nome_arquivo_seguro) > 100 else nome_arquivo_seguro
-            # Substitui espaços por underscores
-            nome_arquivo_seguro = nome_arquivo_seguro.replace(" ", "_")
-            
-            nome_arquivo = f"trecho_{nome_arquivo_seguro}_{timestamp}.json"
-            arquivo_completo = os.path.join(diretorio, nome_arquivo)
 
             # Dados a serem salvos
             dados_trecho = {
@@ -235,16 +449,37 @@ class AutoSaveManager:
                 "session_id": session_id
             }
 
-            with open(arquivo_completo, 'w', encoding='utf-8') as f:
-                json.dump(dados_trecho, f, ensure_ascii=False, indent=2)
+            self._enqueue({
+                "tipo": "trecho_web",
+                "session_id": session_id,
+                "nome": url,
+                "categoria": "pesquisa_web",
+                "payload": self._dump(dados_trecho)
+            })
 
-            logger.info(f"🔍 Trecho de pesquisa web salvo: {arquivo_completo} (Qualidade: {qualidade:.1f})")
-            return arquivo_completo
+            logger.info(f"🔍 Trecho de pesquisa web salvo: {url} (Qualidade: {qualidade:.1f})")
+            return self.event_store.log_path(session_id)
 
         except Exception as e:
             logger.error(f"❌ Erro ao salvar trecho de pesquisa web para {url}: {e}")
             return ""
 
+    def materializar_trechos_pesquisa_web(self, session_id: str) -> str:
+        """Gera analyses_data/pesquisa_web/<session_id>/trechos.json a partir do log"""
+        try:
+            self.flush(session_id)
+            trechos = [event["dados"] for _, event in self.event_store.iter_events(session_id, "trecho_web")]
+            diretorio = f"{self.analyses_path}/pesquisa_web/{session_id}"
+            self._ensure_dir(diretorio)
+            arquivo = f"{diretorio}/trechos.json"
+            self._write_view(arquivo, self._dump(trechos))
+            logger.info(f"🔍 {len(trechos)} trechos de pesquisa web materializados: {arquivo}")
+            return arquivo
+
+        except Exception as e:
+            logger.error(f"❌ Erro ao materializar trechos de {session_id}: {e}")
+            return ""
+
     def salvar_erro(self, nome_erro: str, erro: Exception, contexto: Dict[str, Any] = None, session_id: str = None) -> str:
         """Salva um erro com contexto"""
         try:
@@ -255,8 +490,6 @@ class AutoSaveManager:
             else:
                 diretorio = f"{self.base_path}/erros"
 
-            os.makedirs(diretorio, exist_ok=True)
-
             erro_data = {
                 "erro": str(erro),
                 "tipo": type(erro).__name__,
@@ -264,14 +497,17 @@ class AutoSaveManager:
                 "contexto": contexto or {}
             }
 
+            # Erros são raros: mantém o relatório legível em texto e grava na hora
             arquivo_erro = f"{diretorio}/ERRO_{nome_erro}_{timestamp}.txt"
-            with open(arquivo_erro, 'w', encoding='utf-8') as f:
-                f.write(f"ERRO: {nome_erro}\n")
-                f.write(f"Timestamp: {timestamp}\n")
-                f.write(f"Tipo: {type(erro).__name__}\n")
-                f.write(f"Mensagem: {str(erro)}\n")
-                if contexto:
-                    f.write(f"Contexto: {json.dumps(contexto, ensure_ascii=False, indent=2)}\n")
+            self._enqueue({
+                "tipo": "erro",
+                "session_id": session_id,
+                "nome": nome_erro,
+                "categoria": "erros",
+                "payload": self._dump(erro_data),
+                "error_view": arquivo_erro
+            })
+            self.flush(session_id)
 
             logger.error(f"💾 Erro '{nome_erro}' salvo: {arquivo_erro}")
             return arquivo_erro
@@ -280,6 +516,49 @@ class AutoSaveManager:
             logger.error(f"❌ Erro ao salvar erro {nome_erro}: {e}")
             return ""
 
+    def _write_error_view(self, arquivo_erro: str, nome_erro: str, erro_data: Dict[str, Any]):
+        with open(arquivo_erro, 'w', encoding='utf-8') as f:
+            f.write(f"ERRO: {nome_erro}\n")
+            f.write(f"Timestamp: {erro_data['timestamp']}\n")
+            f.write(f"Tipo: {erro_data['tipo']}\n")
+            f.write(f"Mensagem: {erro_data['erro']}\n")
+            if erro_data.get("contexto"):
+                f.write(f"Contexto: {json.dumps(erro_data['contexto'], ensure_ascii=False, indent=2, default=str)}\n")
+
+    def rebuild_views(self, session_id: str = None) -> Dict[str, int]:
+        """Reconstrói as visões materializadas da sessão a partir do log de eventos"""
+        self.flush(session_id)
+        ultimas_etapas = {}
+        erros = 0
+        trechos = 0
+
+        for _, event in self.event_store.iter_events(session_id):
+            tipo = event.get("tipo")
+            if tipo == "etapa":
+                chave = (event.get("categoria"), event.get("nome"), event.get("view_key"))
+                ultimas_etapas[chave] = event.get("dados")
+            elif tipo == "trecho_web":
+                trechos += 1
+            elif tipo == "erro":
+                dados = event.get("dados") or {}
+                diretorio = f"{self.base_path}/erros/{session_id}" if session_id else f"{self.base_path}/erros"
+                self._ensure_dir(diretorio)
+                arquivo = f"{diretorio}/ERRO_{event.get('nome')}_{dados.get('timestamp', '')}.txt"
+                if not os.path.exists(arquivo):
+                    self._write_error_view(arquivo, event.get("nome"), dados)
+                erros += 1
+
+        for (categoria, nome_etapa, view_key), dados in ultimas_etapas.items():
+            for arquivo in self._etapa_view_paths(nome_etapa, categoria, session_id, view_key):
+                self._ensure_dir(os.path.dirname(arquivo))
+                self._write_view(arquivo, self._dump(dados))
+
+        if trechos and session_id:
+            self.materializar_trechos_pesquisa_web(session_id)
+
+        logger.info(f"♻️ Visões reconstruídas para {session_id}: {len(ultimas_etapas)} etapas, {trechos} trechos, {erros} erros")
+        return {"etapas": len(ultimas_etapas), "trechos": trechos, "erros": erros}
+
     def salvar_modulo_analyses_data(self, nome_modulo: str, dados: Any, session_id: str = None) -> str:
         """Salva módulo na pasta analyses_data"""
         try:
@@ -351,50 +630,97 @@ class AutoSaveManager:
             logger.error(f"❌ Erro ao salvar JSON gigante: {e}")
             raise
 
-    def recuperar_etapa(self, nome_etapa: str, session_id: str = None) -> Dict[str, Any]:
-        """Recupera dados de uma etapa salva"""
+    def _index_entry(self, session_id: str, nome: str, entry: Dict[str, Any]):
+        """Registra no índice a versão mais recente de uma etapa"""
+        key = self.event_store._session_key(session_id)
+        with self._index_lock:
+            etapas = self._step_index.setdefault(key, {})
+            atual = etapas.get(nome)
+            if atual is None or (entry.get("offset") or 0) >= (atual.get("offset") or 0):
+                etapas[nome] = entry
+
+    def _entry_from_event(self, session_id: str, offset: int, event: Dict[str, Any]) -> Optional[tuple]:
+        """Converte um evento do log em (nome no índice, entrada)"""
+        tipo = event.get("tipo")
+        nome = event.get("nome")
+        if tipo == "etapa":
+            arquivo = self._etapa_view_paths(nome, event.get("categoria"), session_id, event.get("view_key"))[0]
+            return nome, {"arquivo": arquivo, "categoria": event.get("categoria"), "offset": offset}
+        if tipo == "erro":
+            diretorio = f"{self.base_path}/erros/{session_id}" if session_id else f"{self.base_path}/erros"
+            timestamp = (event.get("dados") or {}).get("timestamp", "")
+            return f"ERRO_{nome}", {"arquivo": f"{diretorio}/ERRO_{nome}_{timestamp}.txt", "categoria": "erros", "offset": offset}
+        return None
+
+    def _refresh_index(self, session_id: str) -> Dict[str, Dict[str, Any]]:
+        """Atualiza o índice da sessão lendo apenas o trecho novo do log
+
+        Na primeira consulta de uma sessão (ex.: após reinício ou crash) o
+        índice é reconstruído do log; gravações de outros processos entram
+        na próxima leitura incremental.
+        """
+        self.flush(session_id)
+        key = self.event_store._session_key(session_id)
+        with self._index_lock:
+            start = self._index_positions.get(key, 0)
+
+        events, end = self.event_store.scan(session_id, start)
+        for offset, event in events:
+            item = self._entry_from_event(session_id, offset, event)
+            if item:
+                self._index_entry(session_id, *item)
+
+        with self._index_lock:
+            self._index_positions[key] = max(end, self._index_positions.get(key, 0))
+            if key not in self._legacy_indexed:
+                self._legacy_indexed.add(key)
+                legacy = self._scan_legacy_files(session_id) if session_id else {}
+                etapas = self._step_index.setdefault(key, {})
+                for nome, entry in legacy.items():
+                    etapas.setdefault(nome, entry)
+            return dict(self._step_index.get(key, {}))
+
+    def _scan_legacy_files(self, session_id: str) -> Dict[str, Dict[str, Any]]:
+        """Varre arquivos anteriores ao log de eventos (nome_etapa_AAAAMMDD_HHMMSS_mmm.json)"""
+        encontrados = {}
         try:
-            if session_id:
-                diretorio = f"{self.base_path}/{session_id}"
-            else:
-                diretorio = self.base_path
-            
-            # Procura arquivo da etapa
-            import glob
-            pattern = f"{diretorio}/*{nome_etapa}*.json"
-            arquivos = glob.glob(pattern)
-            
-            if not arquivos:
-                return {"status": "nao_encontrado", "dados": {}}
-            
-            # Pega o arquivo mais recente
-            arquivo_mais_recente = max(arquivos, key=os.path.getctime)
-            
-            with open(arquivo_mais_recente, 'r', encoding='utf-8') as f:
-                dados = json.load(f)
-            
-            return {"status": "sucesso", "dados": dados, "arquivo": arquivo_mais_recente}
-            
+            for categoria in os.listdir(self.base_path):
+                session_path = f"{self.base_path}/{categoria}/{session_id}"
+                if not os.path.isdir(session_path):
+                    continue
+                for arquivo in os.listdir(session_path):
+                    if not arquivo.endswith(('.json', '.txt')):
+                        continue
+                    nome = _LEGACY_TIMESTAMP.sub('', os.path.splitext(arquivo)[0])
+                    caminho = f"{session_path}/{arquivo}"
+                    mtime = os.path.getmtime(caminho)
+                    if nome not in encontrados or mtime >= encontrados[nome]["mtime"]:
+                        encontrados[nome] = {"arquivo": caminho, "categoria": categoria, "offset": None, "mtime": mtime}
         except Exception as e:
-            logger.error(f"❌ Erro ao recuperar etapa {nome_etapa}: {e}")
-            return {"status": "erro", "erro": str(e), "dados": {}}
+            logger.warning(f"⚠️ Erro ao varrer arquivos antigos da sessão {session_id}: {e}")
+        return encontrados
+
+    def reindex(self, session_id: str = None):
+        """Descarta o índice da sessão (ou de todas) para reconstrução a partir do disco"""
+        with self._index_lock:
+            if session_id is None:
+                self._step_index.clear()
+                self._index_positions.clear()
+                self._legacy_indexed.clear()
+            else:
+                key = self.event_store._session_key(session_id)
+                self._step_index.pop(key, None)
+                self._index_positions.pop(key, None)
+                self._legacy_indexed.discard(key)
 
     def listar_etapas_salvas(self, session_id: str = None) -> Dict[str, str]:
-        """Lista todas as etapas salvas"""
+        """Lista as etapas salvas da sessão: nome da etapa -> arquivo da versão mais recente"""
         etapas = {}
 
         try:
             if session_id:
-                base_dir = f"{self.base_path}"
-                for categoria in os.listdir(base_dir):
-                    categoria_path = f"{base_dir}/{categoria}"
-                    if os.path.isdir(categoria_path):
-                        session_path = f"{categoria_path}/{session_id}"
-                        if os.path.exists(session_path):
-                            for arquivo in os.listdir(session_path):
-                                if arquivo.endswith(('.json', '.txt')):
-                                    nome_etapa = arquivo.split('_')[0]
-                                    etapas[nome_etapa] = f"{session_path}/{arquivo}"
+                for nome, entry in self._refresh_index(session_id).items():
+                    etapas[nome] = entry["arquivo"]
 
         except Exception as e:
             logger.error(f"❌ Erro ao listar etapas: {e}")
@@ -402,21 +728,29 @@ class AutoSaveManager:
         return etapas
 
     def recuperar_etapa(self, nome_etapa: str, session_id: str = None) -> Dict[str, Any]:
-        """Recupera dados de uma etapa salva"""
+        """Recupera a versão mais recente de uma etapa via índice"""
         try:
-            etapas = self.listar_etapas_salvas(session_id)
-
-            if nome_etapa in etapas:
-                arquivo = etapas[nome_etapa]
-
-                if arquivo.endswith('.json'):
-                    with open(arquivo, 'r', encoding='utf-8') as f:
-                        dados = json.load(f)
-                    return {"status": "sucesso", "dados": dados}
-                else:
-                    with open(arquivo, 'r', encoding='utf-8') as f:
-                        dados = f.read()
-                    return {"status": "sucesso", "dados": dados}
+            self.flush(session_id)
+            key = self.event_store._session_key(session_id)
+            with self._index_lock:
+                entry = self._step_index.get(key, {}).get(nome_etapa)
+            if entry is None:
+                entry = self._refresh_index(session_id).get(nome_etapa)
+
+            if entry is None:
+                return {"status": "erro", "mensagem": "Etapa não encontrada"}
+
+            arquivo = entry["arquivo"]
+            if os.path.exists(arquivo):
+                with open(arquivo, 'r', encoding='utf-8') as f:
+                    dados = json.load(f) if arquivo.endswith('.json') else f.read()
+                return {"status": "sucesso", "dados": dados, "arquivo": arquivo}
+
+            # Visão ausente (crash antes de materializar): lê direto do log
+            if entry.get("offset") is not None:
+                event = self.event_store.read_at(session_id, entry["offset"])
+                if event is not None:
+                    return {"status": "sucesso", "dados": event.get("dados"), "arquivo": arquivo}
 
             return {"status": "erro", "mensagem": "Etapa não encontrada"}
 
@@ -581,92 +915,95 @@ class AutoSaveManager:
                 logger.warning(f"⚠️ Detectado problema 'unhashable type', aplicando correção...")
             return self._clean_for_serialization(data)
 
-    def _trigger_predictive_analysis(self, nome_etapa: str, dados: Dict[str, Any], categoria: str, session_id: str):
+    # Categorias gravadas pelos próprios assinantes preditivos (não disparam nova análise)
+    CATEGORIAS_DERIVADAS = ("analise_qualidade", "insights_parciais")
+
+    def _register_predictive_subscribers(self):
         """
         Aciona análises preditivas automaticamente após salvar dados-chave.
-        Implementa as especificações dos aprimoramentos.
+        Implementa as especificações dos aprimoramentos, fora do caminho de salvamento.
         """
-        if not session_id:
+        self.event_bus.subscribe("qualidade_conteudo", self._on_pesquisa_web_salva, dedup_key=self._conteudo_pesquisa_web)
+        self.event_bus.subscribe("insights_parciais", self._on_sintese_salva, dedup_key=self._conteudo_sintese)
+
+    @staticmethod
+    def _event_dados(event: Dict[str, Any]) -> Any:
+        """Desserializa o snapshot do evento (no worker, não no chamador)"""
+        if "dados" not in event:
+            event["dados"] = json.loads(event["payload"])
+        return event["dados"]
+
+    @staticmethod
+    def _is_pesquisa_web(event: Dict[str, Any]) -> bool:
+        return event["categoria"] == "pesquisa_web" or "websailor" in event["nome_etapa"].lower()
+
+    def _conteudo_pesquisa_web(self, event: Dict[str, Any]) -> Optional[str]:
+        """Condição 1: dados da categoria 'pesquisa_web' — retorna o conteúdo a pontuar"""
+        if not self._is_pesquisa_web(event):
+            return None
+
+        dados = self._event_dados(event)
+        if isinstance(dados, dict):
+            if "data" in dados:
+                return str(dados["data"])
+            elif "content" in dados:
+                return str(dados["content"])
+        return str(dados)
+
+    def _conteudo_sintese(self, event: Dict[str, Any]) -> Optional[str]:
+        """Condição 2: dados da categoria 'conteudo_sintetizado' — retorna o conteúdo principal"""
+        if self._is_pesquisa_web(event):
+            return None
+        if not (event["categoria"] == "conteudo_sintetizado" or "sintese" in event["nome_etapa"].lower()):
+            return None
+
+        dados = self._event_dados(event)
+        if isinstance(dados, dict):
+            if "data" in dados and isinstance(dados["data"], dict):
+                return dados["data"].get("conteudo_principal", "") or None
+            elif "conteudo_principal" in dados:
+                return dados["conteudo_principal"] or None
+        return str(dados) or None
+
+    def _on_pesquisa_web_salva(self, event: Dict[str, Any]):
+        """Calcula e salva o score de qualidade do conteúdo de pesquisa web"""
+        predictive_service = get_predictive_service()
+        if not predictive_service:
             return
-        
-        try:
-            predictive_service = get_predictive_service()
-            if not predictive_service:
-                return
-            
-            # Condição 1: Após salvar dados da categoria 'pesquisa_web'
-            if categoria == "pesquisa_web" or "websailor" in nome_etapa.lower():
-                try:
-                    # Extrai conteúdo para análise
-                    content = ""
-                    if isinstance(dados, dict):
-                        if "data" in dados:
-                            content = str(dados["data"])
-                        elif "content" in dados:
-                            content = str(dados["content"])
-                        else:
-                            content = str(dados)
-                    else:
-                        content = str(dados)
-                    
-                    # Calcula score de qualidade
-                    qualidade_score = predictive_service.get_content_quality_score(content)
-                    
-                    # Salva o score
-                    self.salvar_etapa(
-                        f"{nome_etapa}_qualidade", 
-                        {"score": qualidade_score, "content_length": len(content)}, 
-                        "analise_qualidade", 
-                        session_id
-                    )
-                    
-                    logger.info(f"🔮 Score de qualidade calculado para {nome_etapa}: {qualidade_score:.1f}")
-                    
-                except Exception as e:
-                    logger.warning(f"⚠️ Erro ao calcular qualidade para {nome_etapa}: {e}")
-            
-            # Condição 2: Após salvar dados da categoria 'conteudo_sintetizado'
-            elif categoria == "conteudo_sintetizado" or "sintese" in nome_etapa.lower():
-                try:
-                    # Extrai conteúdo principal
-                    conteudo_principal = ""
-                    if isinstance(dados, dict):
-                        if "data" in dados and isinstance(dados["data"], dict):
-                            conteudo_principal = dados["data"].get("conteudo_principal", "")
-                        elif "conteudo_principal" in dados:
-                            conteudo_principal = dados["conteudo_principal"]
-                        else:
-                            conteudo_principal = str(dados)
-                    else:
-                        conteudo_principal = str(dados)
-                    
-                    if conteudo_principal:
-                        # Executa análise de chunk de forma assíncrona
-                        loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(loop)
-                        try:
-                            insights_parciais = loop.run_until_complete(
-                                predictive_service.analyze_content_chunk(conteudo_principal)
-                            )
-                            
-                            # Salva insights parciais
-                            self.salvar_etapa(
-                                f"{nome_etapa}_insights_parciais", 
-                                insights_parciais, 
-                                "insights_parciais", 
-                                session_id
-                            )
-                            
-                            logger.info(f"🔮 Insights parciais gerados para {nome_etapa}")
-                            
-                        finally:
-                            loop.close()
-                    
-                except Exception as e:
-                    logger.warning(f"⚠️ Erro ao gerar insights parciais para {nome_etapa}: {e}")
-            
-        except Exception as e:
-            logger.warning(f"⚠️ Erro na integração preditiva para {nome_etapa}: {e}")
+
+        nome_etapa = event["nome_etapa"]
+        content = self._conteudo_pesquisa_web(event)
+        qualidade_score = predictive_service.get_content_quality_score(content)
+
+        self.salvar_etapa(
+            f"{nome_etapa}_qualidade",
+            {"score": qualidade_score, "content_length": len(content)},
+            "analise_qualidade",
+            event["session_id"]
+        )
+
+        logger.info(f"🔮 Score de qualidade calculado para {nome_etapa}: {qualidade_score:.1f}")
+
+    def _on_sintese_salva(self, event: Dict[str, Any]):
+        """Gera e salva insights parciais do conteúdo sintetizado"""
+        predictive_service = get_predictive_service()
+        if not predictive_service:
+            return
+
+        nome_etapa = event["nome_etapa"]
+        conteudo_principal = self._conteudo_sintese(event)
+
+        # Worker do barramento não tem event loop próprio
+        insights_parciais = asyncio.run(predictive_service.analyze_content_chunk(conteudo_principal))
+
+        self.salvar_etapa(
+            f"{nome_etapa}_insights_parciais",
+            insights_parciais,
+            "insights_parciais",
+            event["session_id"]
+        )
+
+        logger.info(f"🔮 Insights parciais gerados para {nome_etapa}")
 
 # Instância global
 auto_save_manager = AutoSaveManager()
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - Browser Pool
+Pool de navegadores Chrome headless reutilizáveis para screenshots e scraping
+"""
+
+import os
+import time
+import atexit
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, List, Callable
+
+try:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    HAS_SELENIUM = True
+except ImportError:
+    HAS_SELENIUM = False
+
+try:
+    from webdriver_manager.chrome import ChromeDriverManager
+    HAS_DRIVER_MANAGER = True
+except ImportError:
+    HAS_DRIVER_MANAGER = False
+
+logger = logging.getLogger(__name__)
+
+class BrowserPoolExhausted(Exception):
+    """Nenhum navegador ficou livre dentro do tempo limite"""
+
+class BrowserPool:
+    """Pool de instâncias Chrome headless
+
+    Iniciar o Chrome custa segundos por instância, então os drivers são
+    criados uma vez, emprestados com acquire()/release() e reciclados após
+    um número máximo de páginas ou quando falham na verificação de saúde.
+    """
+
+    def __init__(self):
+        """Inicializa o pool (os navegadores só são criados no primeiro uso)"""
+        self.max_size = int(os.getenv("BROWSER_POOL_MAX_SIZE", "3"))
+        self.prewarm_size = min(int(os.getenv("BROWSER_POOL_PREWARM", "1")), self.max_size)
+        self.max_pages_per_browser = int(os.getenv("BROWSER_POOL_MAX_PAGES", "50"))
+        self.page_load_timeout = int(os.getenv("BROWSER_POOL_PAGE_TIMEOUT", "30"))
+        self.acquire_timeout = float(os.getenv("BROWSER_POOL_ACQUIRE_TIMEOUT", "120"))
+
+        self._condition = threading.Condition()
+        self._idle = []
+        self._pages_served = {}
+        self._total = 0
+        self._service_path = None
+        self._chrome_binary = None
+        self._resolved = False
+        self._closed = False
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Prazo do item de run_parallel em execução na thread
+        self._local = threading.local()
+
+        self.stats = {
+            'browsers_started': 0,
+            'browsers_recycled': 0,
+            'browsers_failed_health_check': 0,
+            'acquisitions': 0,
+            'acquire_wait_total': 0.0,
+            'startup_time_total': 0.0
+        }
+
+        atexit.register(self.shutdown)
+        logger.info(f"🌐 Browser Pool inicializado (máx {self.max_size}, reciclagem a cada {self.max_pages_per_browser} páginas)")
+
+    def is_available(self) -> bool:
+        return HAS_SELENIUM
+
+    def _build_options(self) -> "Options":
+        """Opções comuns a todos os fluxos de captura e scraping"""
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-plugins")
+        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument("--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36")
+        if self._chrome_binary:
+            chrome_options.binary_location = self._chrome_binary
+        return chrome_options
+
+    def _resolve_driver(self):
+        """Resolve binário do Chrome e chromedriver uma única vez por processo"""
+        if self._resolved:
+            return
+
+        try:
+            from services.selenium_checker import selenium_checker
+            self._chrome_binary = selenium_checker.full_check().get('best_chrome_path')
+        except Exception as e:
+            logger.warning(f"⚠️ Selenium checker indisponível: {e}")
+
+        if HAS_DRIVER_MANAGER:
+            try:
+                self._service_path = ChromeDriverManager().install()
+                logger.info("✅ ChromeDriverManager resolvido para o pool")
+            except Exception as e:
+                logger.warning(f"⚠️ ChromeDriverManager falhou: {e}, usando chromedriver do sistema")
+
+        self._resolved = True
+
+    def _start_browser(self):
+        """Inicia uma nova instância do Chrome"""
+        self._resolve_driver()
+        start = time.time()
+
+        if self._service_path:
+            driver = webdriver.Chrome(service=Service(self._service_path), options=self._build_options())
+        else:
+            driver = webdriver.Chrome(options=self._build_options())
+        driver.set_page_load_timeout(self.page_load_timeout)
+
+        self.stats['browsers_started'] += 1
+        self.stats['startup_time_total'] += time.time() - start
+        self._pages_served[id(driver)] = 0
+        return driver
+
+    def _is_healthy(self, driver) -> bool:
+        """Verifica se o processo do navegador ainda responde"""
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _discard(self, driver):
+        """Encerra um driver e libera sua vaga no pool"""
+        self._pages_served.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"Erro ao encerrar navegador: {e}")
+        with self._condition:
+            self._total -= 1
+            self._condition.notify()
+
+    def warm_up(self, count: Optional[int] = None):
+        """Pré-inicia navegadores para que o primeiro empréstimo não pague o startup"""
+        if not HAS_SELENIUM:
+            return
+
+        count = self.prewarm_size if count is None else count
+        while True:
+            with self._condition:
+                if self._closed or self._total >= min(count, self.max_size):
+                    return
+                self._total += 1
+            try:
+                driver = self._start_browser()
+            except Exception as e:
+                logger.error(f"❌ Falha ao pré-iniciar navegador: {e}")
+                with self._condition:
+                    self._total -= 1
+                return
+            with self._condition:
+                self._idle.append(driver)
+                self._condition.notify()
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Empresta um navegador, iniciando um novo se houver vaga"""
+        if not HAS_SELENIUM:
+            raise RuntimeError("Selenium não instalado")
+
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.time() + timeout
+        wait_start = time.time()
+
+        while True:
+            driver = None
+            start_new = False
+
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError("Browser pool encerrado")
+                while not self._idle and self._total >= self.max_size:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise BrowserPoolExhausted(f"Nenhum navegador livre em {timeout:.0f}s")
+                    self._condition.wait(remaining)
+
+                if self._idle:
+                    driver = self._idle.pop()
+                else:
+                    self._total += 1
+                    start_new = True
+
+            if start_new:
+                try:
+                    driver = self._start_browser()
+                except Exception:
+                    with self._condition:
+                        self._total -= 1
+                        self._condition.notify()
+                    raise
+            elif not self._is_healthy(driver):
+                self.stats['browsers_failed_health_check'] += 1
+                logger.warning("⚠️ Navegador do pool não respondeu, substituindo")
+                self._discard(driver)
+                continue
+
+            self.stats['acquisitions'] += 1
+            self.stats['acquire_wait_total'] += time.time() - wait_start
+            return driver
+
+    async def acquire_async(self, timeout: Optional[float] = None):
+        """Versão assíncrona de acquire(): a espera por vaga roda fora do event loop"""
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(None, self.acquire, timeout)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # Navegador emprestado depois do cancelamento volta para o pool
+            future.add_done_callback(
+                lambda f: f.cancelled() or f.exception() or loop.run_in_executor(None, self.release, f.result())
+            )
+            raise
+
+    def release(self, driver, pages: int = 1, healthy: bool = True):
+        """Devolve o navegador; recicla se atingiu o limite de páginas ou falhou"""
+        if driver is None:
+            return
+
+        served = self._pages_served.get(id(driver), 0) + pages
+        self._pages_served[id(driver)] = served
+
+        if self._closed or not healthy or served >= self.max_pages_per_browser:
+            if served >= self.max_pages_per_browser:
+                self.stats['browsers_recycled'] += 1
+            self._discard(driver)
+            return
+
+        # Limpa estado entre empréstimos
+        try:
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+        except Exception:
+            self._discard(driver)
+            return
+
+        with self._condition:
+            self._idle.append(driver)
+            self._condition.notify()
+
+    @contextmanager
+    def browser(self, timeout: Optional[float] = None):
+        """Context manager: with browser_pool.browser() as driver: ..."""
+        driver = self.acquire(timeout)
+        healthy = True
+        try:
+            yield driver
+        except Exception:
+            healthy = self._is_healthy(driver)
+            raise
+        finally:
+            self.release(driver, healthy=healthy)
+
+    def wait_for_page_ready(self, driver, timeout: float = 10.0, quiet_period: float = 0.5) -> bool:
+        """Espera adaptativa: documento completo e DOM/rede estáveis por quiet_period
+
+        Substitui os time.sleep fixos; retorna False se o prazo acabar antes
+        da página estabilizar (o chamador pode capturar mesmo assim).
+        Dentro de run_parallel o prazo nunca passa do que resta ao item.
+        """
+        deadline = time.time() + self.time_left(timeout)
+        last_signature = None
+        stable_since = None
+
+        while time.time() < deadline:
+            try:
+                signature = driver.execute_script(
+                    "return [document.readyState,"
+                    " document.getElementsByTagName('*').length,"
+                    " performance.getEntriesByType('resource').length];"
+                )
+            except Exception:
+                signature = None
+
+            now = time.time()
+            if signature != last_signature or not signature or signature[0] != 'complete':
+                # Algo mudou (ou ainda carregando): reinicia a janela de silêncio
+                stable_since = now
+            elif now - stable_since >= quiet_period:
+                return True
+            last_signature = signature
+            time.sleep(0.1)
+
+        return False
+
+    def time_left(self, timeout: float) -> float:
+        """Limita uma espera ao que resta do prazo do item atual de run_parallel
+
+        Fora de run_parallel (sem prazo na thread) devolve timeout inalterado.
+        """
+        deadline = getattr(self._local, 'deadline', None)
+        if deadline is None:
+            return timeout
+        return max(0.0, min(timeout, deadline - time.time()))
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Threads de trabalho do pool, uma por navegador possível (criadas no primeiro uso)"""
+        with self._condition:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_size, thread_name_prefix="browser_pool")
+            return self._executor
+
+    async def run_parallel(
+        self,
+        func: Callable,
+        items: List[Any],
+        max_concurrency: Optional[int] = None,
+        item_timeout: Optional[float] = None
+    ) -> List[Any]:
+        """Executa func(driver, item) em paralelo, cada chamada com um navegador emprestado
+
+        O prazo por item vale dentro da thread e começa quando o item de fato
+        começa (já com o navegador em mãos): o page load timeout do driver é
+        ajustado ao prazo e wait_for_page_ready/time_left() usam o que resta
+        dele. Assim nenhuma thread continua presa a um navegador depois do
+        prazo e os itens seguintes não herdam a espera de um item lento.
+        Retorna uma lista alinhada com items contendo o resultado ou a exceção.
+        """
+        if not items:
+            return []
+
+        loop = asyncio.get_running_loop()
+        limit = max(1, min(max_concurrency or self.max_size, self.max_size))
+        semaphore = asyncio.Semaphore(limit)
+        executor = self._get_executor()
+
+        def run(item):
+            with self.browser() as driver:
+                if not item_timeout:
+                    return func(driver, item)
+                self._local.deadline = time.time() + item_timeout
+                try:
+                    driver.set_page_load_timeout(max(1, int(item_timeout)))
+                    return func(driver, item)
+                finally:
+                    self._local.deadline = None
+                    try:
+                        driver.set_page_load_timeout(self.page_load_timeout)
+                    except Exception:
+                        pass
+
+        async def run_one(item):
+            async with semaphore:
+                try:
+                    return await loop.run_in_executor(executor, run, item)
+                except Exception as e:
+                    return e
+
+        return await asyncio.gather(*(run_one(item) for item in items))
+
+    def shutdown(self):
+        """Encerra as threads de trabalho e todos os navegadores ociosos"""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        for driver in idle:
+            self._discard(driver)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Estatísticas de uso do pool"""
+        with self._condition:
+            idle = len(self._idle)
+            total = self._total
+        started = self.stats['browsers_started']
+        acquisitions = self.stats['acquisitions']
+        return {
+            'max_size': self.max_size,
+            'total_browsers': total,
+            'idle_browsers': idle,
+            'busy_browsers': total - idle,
+            'browsers_started': started,
+            'browsers_recycled': self.stats['browsers_recycled'],
+            'browsers_failed_health_check': self.stats['browsers_failed_health_check'],
+            'acquisitions': acquisitions,
+            'avg_acquire_wait': self.stats['acquire_wait_total'] / acquisitions if acquisitions else 0.0,
+            'avg_startup_time': self.stats['startup_time_total'] / started if started else 0.0
+        }
+
+# Instância global
+browser_pool = BrowserPool()
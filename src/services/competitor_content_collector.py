@@ -1,10 +1,13 @@
 import os
 import logging
 import requests
+from collections import Counter
 from typing import List, Dict, Any
 # from .mcp_supadata_manager import MCPSupadataManager  # Comentado - não existe
 from bs4 import BeautifulSoup
 
+from services.text_tokenizer import tokenize
+
 logger = logging.getLogger(__name__)
 
 class CompetitorContentCollector:
@@ -55,7 +58,8 @@ class CompetitorContentCollector:
                     title = extracted_data.get("title", "Sem Título")
                     
                     # Simula análise de palavras-chave e tópicos
-                    keywords = [word for word in content.lower().split() if len(word) > 5 and content.lower().count(word) > 2][:5]
+                    word_counts = Counter(tokenize(content, min_length=6))
+                    keywords = [word for word, count in word_counts.items() if count > 2][:5]
 
                     content_item = {
                         "competitor": competitor_name,
@@ -14,6 +14,8 @@ from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
 import re
 import hashlib # Import hashlib for caching
+from services.http_fetch_cache import http_fetch_cache
+from services.text_tokenizer import tokenize
 
 logger = logging.getLogger(__name__)
 
@@ -223,117 +225,98 @@ class ContentExtractor:
     def _extract_direct(self, url: str) -> Optional[str]:
         """Extração direta usando BeautifulSoup"""
         try:
-            response = requests.get(
-                url,
-                headers=self.headers,
-                timeout=20,
-                allow_redirects=True
-            )
+            response = http_fetch_cache.fetch(url, headers=self.headers, timeout=20)
 
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, "html.parser")
-
-                # Remove elementos desnecessários
-                for element in soup(["script", "style", "nav", "footer", "header",
-                                   "form", "aside", "iframe", "noscript", "advertisement",
-                                   "ads", "sidebar", "menu", "breadcrumb"]):
-                    element.decompose()
-
-                # Busca conteúdo principal
-                main_content = (
-                    soup.find('main') or
-                    soup.find('article') or
-                    soup.find('div', class_=re.compile(r'content|main|article|post|entry|body')) or
-                    soup.find('div', id=re.compile(r'content|main|article|post|entry|body')) or
-                    soup.find('section', class_=re.compile(r'content|main|article|post|entry'))
-                )
-
-                if main_content:
-                    text = main_content.get_text()
-                else:
-                    # Fallback para body completo
-                    body = soup.find('body')
-                    text = body.get_text() if body else soup.get_text()
-
-                # Limpa o texto
-                text = self._clean_text(text)
-
-                return text
+                return http_fetch_cache.extracted(response, 'content_extractor.direct', self._direct_text)
             else:
                 raise Exception(f"Resposta HTTP {response.status_code}")
 
         except Exception as e:
             raise e
 
+    def _direct_text(self, response) -> Optional[str]:
+        """Texto do conteúdo principal (ou do body inteiro) da página"""
+        soup = BeautifulSoup(response.content, "html.parser")
+
+        # Remove elementos desnecessários
+        for element in soup(["script", "style", "nav", "footer", "header",
+                           "form", "aside", "iframe", "noscript", "advertisement",
+                           "ads", "sidebar", "menu", "breadcrumb"]):
+            element.decompose()
+
+        # Busca conteúdo principal
+        main_content = (
+            soup.find('main') or
+            soup.find('article') or
+            soup.find('div', class_=re.compile(r'content|main|article|post|entry|body')) or
+            soup.find('div', id=re.compile(r'content|main|article|post|entry|body')) or
+            soup.find('section', class_=re.compile(r'content|main|article|post|entry'))
+        )
+
+        if main_content:
+            text = main_content.get_text()
+        else:
+            # Fallback para body completo
+            body = soup.find('body')
+            text = body.get_text() if body else soup.get_text()
+
+        # Limpa o texto
+        return self._clean_text(text)
+
     def _extract_with_readability(self, url: str) -> Optional[str]:
         """Extração usando algoritmo de readability"""
         try:
-            response = requests.get(
-                url,
-                headers=self.headers,
-                timeout=20,
-                allow_redirects=True
-            )
+            response = http_fetch_cache.fetch(url, headers=self.headers, timeout=20)
 
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, "html.parser")
+                text = http_fetch_cache.extracted(response, 'content_extractor.readability', self._readability_text)
+                if text:
+                    return text
+                raise Exception("Nenhum conteúdo substancial encontrado")
+            else:
+                raise Exception(f"Resposta HTTP {response.status_code}")
 
-                # Remove elementos desnecessários
-                for element in soup(["script", "style", "nav", "footer", "header",
-                                   "form", "aside", "iframe", "noscript"]):
-                    element.decompose()
+        except Exception as e:
+            raise e
 
-                # Algoritmo simples de readability
-                # Busca por elementos com mais texto
-                candidates = []
+    def _readability_text(self, response) -> Optional[str]:
+        """Texto do bloco com maior score de readability (None se nenhum é substancial)"""
+        soup = BeautifulSoup(response.content, "html.parser")
 
-                for element in soup.find_all(['div', 'article', 'section', 'main']):
-                    text = element.get_text()
-                    if len(text) > 200:  # Elementos com conteúdo substancial
-                        # Score baseado em tamanho e densidade de parágrafos
-                        paragraphs = element.find_all('p')
-                        score = len(text) + (len(paragraphs) * 50)
-                        candidates.append((score, text))
+        # Remove elementos desnecessários
+        for element in soup(["script", "style", "nav", "footer", "header",
+                           "form", "aside", "iframe", "noscript"]):
+            element.decompose()
 
-                if candidates:
-                    # Pega o elemento com maior score
-                    candidates.sort(key=lambda x: x[0], reverse=True)
-                    text = candidates[0][1]
+        # Algoritmo simples de readability
+        # Busca por elementos com mais texto
+        candidates = []
 
-                    # Limpa o texto
-                    text = self._clean_text(text)
+        for element in soup.find_all(['div', 'article', 'section', 'main']):
+            text = element.get_text()
+            if len(text) > 200:  # Elementos com conteúdo substancial
+                # Score baseado em tamanho e densidade de parágrafos
+                paragraphs = element.find_all('p')
+                score = len(text) + (len(paragraphs) * 50)
+                candidates.append((score, text))
 
-                    return text
-                else:
-                    raise Exception("Nenhum conteúdo substancial encontrado")
-            else:
-                raise Exception(f"Resposta HTTP {response.status_code}")
+        if not candidates:
+            return None
 
-        except Exception as e:
-            raise e
+        # Pega o elemento com maior score
+        candidates.sort(key=lambda x: x[0], reverse=True)
+
+        # Limpa o texto
+        return self._clean_text(candidates[0][1])
 
     def _extract_fallback(self, url: str) -> Optional[str]:
         """Extração de fallback mais agressiva"""
         try:
-            response = requests.get(
-                url,
-                headers=self.headers,
-                timeout=15,
-                allow_redirects=True
-            )
+            response = http_fetch_cache.fetch(url, headers=self.headers, timeout=15)
 
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, "html.parser")
-
-                # Remove apenas elementos críticos
-                for element in soup(["script", "style", "noscript"]):
-                    element.decompose()
-
-                # Pega todo o texto disponível
-                text = soup.get_text()
-
-                # Limpa o texto
-                text = self._clean_text(text)
+                text = http_fetch_cache.extracted(response, 'content_extractor.fallback', self._fallback_text)
 
                 # Se ainda tem conteúdo substancial, retorna
                 if len(text) > 100:
@@ -346,6 +329,17 @@ class ContentExtractor:
         except Exception as e:
             raise e
 
+    def _fallback_text(self, response) -> str:
+        """Todo o texto da página, sem scripts e estilos"""
+        soup = BeautifulSoup(response.content, "html.parser")
+
+        # Remove apenas elementos críticos
+        for element in soup(["script", "style", "noscript"]):
+            element.decompose()
+
+        # Pega todo o texto disponível e limpa
+        return self._clean_text(soup.get_text())
+
     def _youtube_api_extraction(self, url: str) -> Optional[str]:
         """Extração usando API do YouTube"""
         try:
@@ -535,12 +529,7 @@ STATUS: Fallback de emergência ativado
     def extract_metadata(self, url: str) -> Dict[str, Any]:
         """Extrai metadatos da página"""
         try:
-            response = requests.get(
-                url,
-                headers=self.headers,
-                timeout=15,
-                allow_redirects=True
-            )
+            response = http_fetch_cache.fetch(url, headers=self.headers, timeout=15)
 
             if response.status_code == 200:
                 soup = BeautifulSoup(response.content, "html.parser")
@@ -610,12 +599,7 @@ STATUS: Fallback de emergência ativado
     def extract_links(self, url: str, internal_only: bool = True) -> list:
         """Extrai links da página"""
         try:
-            response = requests.get(
-                url,
-                headers=self.headers,
-                timeout=15,
-                allow_redirects=True
-            )
+            response = http_fetch_cache.fetch(url, headers=self.headers, timeout=15)
 
             if response.status_code == 200:
                 soup = BeautifulSoup(response.content, "html.parser")
@@ -817,7 +801,7 @@ STATUS: Fallback de emergência ativado
         quality_score += min(text_ratio * 40, 40)
 
         # 2. Diversidade de palavras (30 pontos)
-        words = content.lower().split()
+        words = tokenize(content, stopwords=None)
         if words:
             unique_ratio = len(set(words)) / len(words)
             quality_score += min(unique_ratio * 30, 30)
@@ -10,8 +10,20 @@ import re
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from services.text_tokenizer import tokenize
+
 logger = logging.getLogger(__name__)
 
+# Palavras comuns em português (detecção de idioma)
+PORTUGUESE_COMMON_WORDS = frozenset([
+    'que', 'não', 'uma', 'para', 'com', 'mais', 'como',
+    'mas', 'foi', 'pelo', 'pela', 'até', 'isso', 'ela',
+    'entre', 'depois', 'sem', 'mesmo', 'aos', 'seus',
+    'quem', 'nas', 'me', 'esse', 'eles', 'você', 'tinha',
+    'foram', 'essa', 'num', 'nem', 'suas', 'meu', 'às',
+    'minha', 'numa', 'pelos', 'elas', 'qual', 'nós', 'deles'
+])
+
 class ContentQualityValidator:
     """Validador de qualidade de conteúdo"""
     
@@ -37,7 +49,7 @@ class ContentQualityValidator:
         ]
         
         # Palavras de navegação/menu
-        self.navigation_words = [
+        self.navigation_words = frozenset([
             'home', 'início', 'sobre', 'about', 'contato', 'contact',
             'menu', 'navegação', 'navigation', 'login', 'entrar',
             'cadastro', 'register', 'produtos', 'products', 'serviços',
@@ -45,18 +57,29 @@ class ContentQualityValidator:
             'suporte', 'support', 'faq', 'termos', 'terms', 'privacidade',
             'privacy', 'política', 'policy', 'cookies', 'sitemap',
             'mapa do site', 'buscar', 'search', 'pesquisar'
-        ]
+        ])
         
         # Palavras que indicam conteúdo de qualidade
-        self.quality_indicators = [
+        self.quality_indicators = frozenset([
             'análise', 'pesquisa', 'estudo', 'relatório', 'dados',
             'estatística', 'mercado', 'tendência', 'oportunidade',
             'estratégia', 'crescimento', 'inovação', 'tecnologia',
             'business', 'marketing', 'vendas', 'cliente', 'consumidor',
             'empresa', 'negócio', 'investimento', 'receita', 'lucro'
-        ]
+        ])
+
+        # Última tokenização (as verificações de um mesmo conteúdo reutilizam os tokens)
+        self._last_words = (None, [])
         
         logger.info("Content Quality Validator inicializado")
+
+    def _words(self, content: str) -> List[str]:
+        """Palavras em minúsculas do conteúdo (tokenizador compartilhado, sem filtrar stopwords)"""
+        last_content, words = self._last_words
+        if last_content is not content:
+            words = tokenize(content, stopwords=None)
+            self._last_words = (content, words)
+        return words
     
     def validate_content(self, content: str, url: str = "", context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Valida qualidade do conteúdo extraído"""
@@ -161,7 +184,7 @@ class ContentQualityValidator:
     
     def _check_navigation_ratio(self, content: str) -> Dict[str, Any]:
         """Verifica proporção de palavras de navegação"""
-        words = content.lower().split()
+        words = self._words(content)
         
         if len(words) == 0:
             return {
@@ -196,7 +219,7 @@ class ContentQualityValidator:
     
     def _check_information_density(self, content: str) -> Dict[str, Any]:
         """Verifica densidade de informação"""
-        words = content.lower().split()
+        words = self._words(content)
         
         if len(words) == 0:
             return {
@@ -232,17 +255,7 @@ class ContentQualityValidator:
     
     def _check_language(self, content: str) -> Dict[str, Any]:
         """Verifica se o conteúdo está em português"""
-        # Palavras comuns em português
-        portuguese_words = [
-            'que', 'não', 'uma', 'para', 'com', 'mais', 'como',
-            'mas', 'foi', 'pelo', 'pela', 'até', 'isso', 'ela',
-            'entre', 'depois', 'sem', 'mesmo', 'aos', 'seus',
-            'quem', 'nas', 'me', 'esse', 'eles', 'você', 'tinha',
-            'foram', 'essa', 'num', 'nem', 'suas', 'meu', 'às',
-            'minha', 'numa', 'pelos', 'elas', 'qual', 'nós', 'deles'
-        ]
-        
-        words = content.lower().split()
+        words = self._words(content)
         
         if len(words) == 0:
             return {
@@ -253,7 +266,7 @@ class ContentQualityValidator:
                 'value': 0
             }
         
-        portuguese_count = sum(1 for word in words if word in portuguese_words)
+        portuguese_count = sum(1 for word in words if word in PORTUGUESE_COMMON_WORDS)
         portuguese_ratio = portuguese_count / len(words)
         
         if portuguese_ratio >= 0.05:  # Pelo menos 5% de palavras em português
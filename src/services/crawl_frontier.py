@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - Crawl Frontier
+Fronteira de navegação assíncrona: limite global de concorrência, token bucket por host, deduplicação e orçamento de páginas
+"""
+
+import os
+import time
+import asyncio
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+logger = logging.getLogger(__name__)
+
+# Parâmetros de rastreamento removidos na normalização (não mudam o conteúdo da página)
+TRACKING_PARAMS = {'gclid', 'fbclid', 'msclkid', 'igshid', 'ref', 'ref_src', 'mc_cid', 'mc_eid'}
+
+def normalize_url(url: str) -> str:
+    """Forma canônica usada na deduplicação
+
+    Esquema e host em minúsculas, sem 'www.', porta padrão, fragmento,
+    parâmetros utm_*/de rastreamento e barra final; query ordenada.
+    """
+    try:
+        parsed = urlparse(url.strip())
+    except ValueError:
+        return url
+    scheme = (parsed.scheme or 'http').lower()
+    host = (parsed.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parsed.port and not ((scheme == 'http' and parsed.port == 80) or (scheme == 'https' and parsed.port == 443)):
+        host = f"{host}:{parsed.port}"
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    ))
+    path = parsed.path.rstrip('/') or '/'
+    # http e https da mesma página contam como uma só
+    return urlunparse(('https' if scheme in ('http', 'https') else scheme, host, path, '', query, ''))
+
+def url_host(url: str) -> str:
+    host = (urlparse(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+class TokenBucket:
+    """Token bucket assíncrono: 'rate' requisições por segundo com rajada de até 'burst'
+
+    acquire() reserva o próximo token e dorme só o necessário, sem bloquear o
+    event loop; requisições a outros hosts seguem em paralelo.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.waited = 0.0
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        # O token é descontado já (pode ficar negativo): chamadas concorrentes
+        # recebem esperas sucessivas em vez de acordarem juntas
+        self.tokens -= 1
+        if self.tokens < 0:
+            delay = -self.tokens / self.rate
+            self.waited += delay
+            await asyncio.sleep(delay)
+
+class CrawlFrontier:
+    """Fila BFS de URLs com orçamento de páginas e profundidade
+
+    Todas as URLs passam pelo mesmo conjunto de vistas (normalizadas), então
+    um resultado repetido entre engines, níveis ou queries relacionadas é
+    buscado uma vez só. No máximo 'concurrency' buscas rodam ao mesmo tempo
+    (as funções de extração síncronas rodam num pool de threads do mesmo
+    tamanho) e cada host é limitado pelo seu token bucket. A fila é
+    processada em ordem de profundidade; run() pode ser chamado de novo com
+    novas sementes, mantendo vistas e orçamento.
+    """
+
+    # Campos que descrevem a própria página e não passam para os links dela
+    PAGE_META_FIELDS = ('title', 'snippet', 'description', 'parent_url')
+
+    def __init__(
+        self,
+        max_pages: int = 25,
+        max_depth: int = 1,
+        concurrency: Optional[int] = None,
+        host_rate: Optional[float] = None,
+        host_burst: Optional[int] = None
+    ):
+        """Orçamento por chamada; concorrência e politeness vêm do ambiente por padrão"""
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.concurrency = concurrency or int(os.getenv("WEBSAILOR_CONCURRENCY", "8"))
+        self.host_rate = host_rate if host_rate is not None else float(os.getenv("WEBSAILOR_HOST_RATE", "2"))
+        self.host_burst = host_burst or int(os.getenv("WEBSAILOR_HOST_BURST", "2"))
+
+        self._seen = set()
+        self._queue: List[Tuple[int, str, Dict[str, Any]]] = []
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self.stats = {
+            'queued': 0,
+            'duplicates': 0,
+            'fetched': 0,
+            'succeeded': 0,
+            'failed': 0,
+            'skipped_budget': 0,
+            'pages_per_depth': defaultdict(int),
+            'elapsed': 0.0
+        }
+
+    def add(self, url: str, depth: int = 0, **meta) -> bool:
+        """Enfileira a URL se ainda não foi vista e cabe na profundidade"""
+        if not url or depth > self.max_depth:
+            return False
+        key = normalize_url(url)
+        if key in self._seen:
+            self.stats['duplicates'] += 1
+            return False
+        self._seen.add(key)
+        self._queue.append((depth, url, meta))
+        self.stats['queued'] += 1
+        return True
+
+    def seen(self, url: str) -> bool:
+        return normalize_url(url) in self._seen
+
+    @property
+    def budget_left(self) -> int:
+        return max(0, self.max_pages - self.stats['succeeded'])
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = url_host(url)
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.host_rate, self.host_burst)
+        return bucket
+
+    async def run_blocking(self, func: Callable, *args):
+        """Executa uma função síncrona no pool da fronteira (dimensionado pela concorrência)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="websailor")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def run(
+        self,
+        fetch: Callable[[str, int, Dict[str, Any]], Any],
+        on_result: Optional[Callable[[str, int, Dict[str, Any], Any], Any]] = None
+    ) -> List[Any]:
+        """Processa a fila até esvaziar ou esgotar o orçamento de páginas
+
+        fetch(url, depth, meta) é uma corrotina que devolve (resultado, links);
+        resultado None conta como falha. Os links são enfileirados em depth+1.
+        on_result(url, depth, meta, resultado) é chamado a cada sucesso, na
+        ordem de conclusão. Os links herdam o meta da página, exceto os campos
+        de PAGE_META_FIELDS, e recebem parent_url.
+        """
+        start = time.perf_counter()
+        results = []
+        in_flight = set()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def visit(depth: int, url: str, meta: Dict[str, Any]):
+            # A espera de politeness acontece fora do semáforo: um host lento
+            # não ocupa vaga de concorrência dos demais
+            await self._bucket(url).acquire()
+            async with semaphore:
+                self.stats['fetched'] += 1
+                try:
+                    return depth, url, meta, await fetch(url, depth, meta)
+                except Exception as e:
+                    logger.warning(f"⚠️ Falha ao navegar {url}: {e}")
+                    return depth, url, meta, (None, [])
+
+        def dispatch():
+            # BFS: sempre a menor profundidade pendente primeiro; não agenda
+            # além do que o orçamento restante ainda pode aproveitar
+            self._queue.sort(key=lambda item: item[0])
+            limit = min(2 * self.concurrency, self.budget_left)
+            while self._queue and len(in_flight) < limit:
+                in_flight.add(asyncio.ensure_future(visit(*self._queue.pop(0))))
+
+        try:
+            dispatch()
+            while in_flight:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    in_flight.discard(task)
+                    depth, url, meta, (result, links) = task.result()
+                    if result is None:
+                        self.stats['failed'] += 1
+                        continue
+                    if self.budget_left == 0:
+                        self.stats['skipped_budget'] += 1
+                        continue
+                    self.stats['succeeded'] += 1
+                    self.stats['pages_per_depth'][depth] += 1
+                    results.append(result)
+                    if on_result:
+                        on_result(url, depth, meta, result)
+                    child_meta = {key: value for key, value in meta.items() if key not in self.PAGE_META_FIELDS}
+                    for link in links or []:
+                        self.add(link, depth + 1, **child_meta, parent_url=url)
+                dispatch()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            self.stats['elapsed'] += time.perf_counter() - start
+
+        if self._queue and self.budget_left == 0:
+            self.stats['skipped_budget'] += len(self._queue)
+            self._queue.clear()
+        return results
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores da fronteira e espera acumulada de politeness por host"""
+        return {
+            **{key: value for key, value in self.stats.items() if key != 'pages_per_depth'},
+            'elapsed': round(self.stats['elapsed'], 3),
+            'pages_per_depth': dict(self.stats['pages_per_depth']),
+            'hosts': len(self._buckets),
+            'politeness_wait': round(sum(bucket.waited for bucket in self._buckets.values()), 3),
+            'limits': {
+                'max_pages': self.max_pages,
+                'max_depth': self.max_depth,
+                'concurrency': self.concurrency,
+                'host_rate': self.host_rate,
+                'host_burst': self.host_burst
+            }
+        }
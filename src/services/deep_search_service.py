@@ -15,6 +15,7 @@ import json
 from datetime import datetime
 from bs4 import BeautifulSoup
 import re
+from services.http_fetch_cache import http_fetch_cache
 
 logger = logging.getLogger(__name__)
 
@@ -295,48 +296,13 @@ class DeepSearchService:
             return None
     
     def _extract_direct_real(self, url: str) -> Optional[str]:
-        """Extração REAL direta usando requests + BeautifulSoup"""
+        """Extração REAL direta usando requests + BeautifulSoup (via cache HTTP compartilhado)"""
         
         try:
-            response = requests.get(
-                url,
-                headers=self.headers,
-                timeout=20,
-                allow_redirects=True
-            )
+            response = http_fetch_cache.fetch(url, headers=self.headers, timeout=20)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, "html.parser")
-                
-                # Remove elementos desnecessários
-                for element in soup(["script", "style", "nav", "footer", "header", "form", "aside", "iframe", "noscript", "advertisement"]):
-                    element.decompose()
-                
-                # Busca conteúdo principal
-                main_content = (
-                    soup.find('main') or 
-                    soup.find('article') or 
-                    soup.find('div', class_=re.compile(r'content|main|article|post|entry')) or
-                    soup.find('div', id=re.compile(r'content|main|article|post|entry'))
-                )
-                
-                if main_content:
-                    text = main_content.get_text()
-                else:
-                    text = soup.get_text()
-                
-                # Limpa o texto
-                lines = (line.strip() for line in text.splitlines())
-                chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                text = " ".join(chunk for chunk in chunks if chunk and len(chunk) > 5)
-                
-                # Remove caracteres especiais excessivos
-                text = re.sub(r'\s+', ' ', text)
-                text = re.sub(r'[^\w\s\.,;:!?\-\(\)%$]', '', text)
-                
-                if len(text) > 8000:
-                    text = text[:8000] + "... [conteúdo truncado para otimização]"
-                
+                text = http_fetch_cache.extracted(response, 'deep_search.direct', self._direct_real_text)
                 logger.info(f"✅ Extração direta REAL: {len(text)} caracteres de {url}")
                 return text
             else:
@@ -347,6 +313,41 @@ class DeepSearchService:
             logger.error(f"❌ Erro na extração direta REAL para {url}: {str(e)}")
             return None
     
+    def _direct_real_text(self, response) -> str:
+        """Texto limpo do conteúdo principal da página"""
+        soup = BeautifulSoup(response.content, "html.parser")
+        
+        # Remove elementos desnecessários
+        for element in soup(["script", "style", "nav", "footer", "header", "form", "aside", "iframe", "noscript", "advertisement"]):
+            element.decompose()
+        
+        # Busca conteúdo principal
+        main_content = (
+            soup.find('main') or 
+            soup.find('article') or 
+            soup.find('div', class_=re.compile(r'content|main|article|post|entry')) or
+            soup.find('div', id=re.compile(r'content|main|article|post|entry'))
+        )
+        
+        if main_content:
+            text = main_content.get_text()
+        else:
+            text = soup.get_text()
+        
+        # Limpa o texto
+        lines = (line.strip() for line in text.splitlines())
+        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+        text = " ".join(chunk for chunk in chunks if chunk and len(chunk) > 5)
+        
+        # Remove caracteres especiais excessivos
+        text = re.sub(r'\s+', ' ', text)
+        text = re.sub(r'[^\w\s\.,;:!?\-\(\)%$]', '', text)
+        
+        if len(text) > 8000:
+            text = text[:8000] + "... [conteúdo truncado para otimização]"
+        
+        return text
+    
     def _calculate_real_relevance(
         self, 
         content: str, 
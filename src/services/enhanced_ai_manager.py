@@ -9,6 +9,8 @@ import os
 import logging
 import asyncio
 import json
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime
 
@@ -50,11 +52,24 @@ class EnhancedAIManager:
         self.current_provider = None
         self.search_orchestrator = None
 
+        # Ponte assíncrona: os SDKs são síncronos, então cada chamada roda em um
+        # pool limitado de threads e o event loop do workflow fica livre
+        self.max_concurrent_calls = int(os.getenv("LLM_MAX_CONCURRENT_CALLS", "16"))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent_calls,
+            thread_name_prefix="llm_provider"
+        )
+
         self._initialize_providers()
         self._initialize_search_tools()
 
         logger.info(f"🤖 Enhanced AI Manager inicializado com {len(self.providers)} provedores")
 
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Executa uma chamada bloqueante de SDK no pool de provedores sem travar o event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
     def _initialize_providers(self):
         """Inicializa todos os provedores de IA"""
 
@@ -264,10 +279,12 @@ IMPORTANTE: Gere uma análise completa mesmo sem ferramentas de busca, baseando-
                 try:
                     # Envia mensagem
                     if iteration == 1:
-                        response = chat.send_message(prompt)
+                        response = await self._run_blocking(chat.send_message, prompt)
                     else:
                         # Continua conversa com resultados de busca
-                        response = chat.send_message("Continue a análise com os dados obtidos.")
+                        response = await self._run_blocking(
+                            chat.send_message, "Continue a análise com os dados obtidos."
+                        )
 
                     # Verifica se há function calls
                     if response.candidates[0].content.parts:
@@ -283,7 +300,8 @@ IMPORTANTE: Gere uma análise completa mesmo sem ferramentas de busca, baseando-
                                     search_results = await self._execute_real_search(search_query, session_id)
 
                                     # Envia resultados de volta para a IA
-                                    search_response = chat.send_message(
+                                    search_response = await self._run_blocking(
+                                        chat.send_message,
                                         f"Resultados da busca para \'{search_query}\':\n{search_results}"
                                     )
 
@@ -352,7 +370,8 @@ IMPORTANTE: Gere uma análise completa mesmo sem ferramentas de busca, baseando-
                 logger.info(f"🔄 Iteração OpenAI {iteration}/{max_iterations}")
 
                 try:
-                    response = client.chat.completions.create(
+                    response = await self._run_blocking(
+                        client.chat.completions.create,
                         model=self.providers["openai"]["model"],
                         messages=messages,
                         tools=tools,
@@ -523,52 +542,44 @@ Fontes encontradas: {total_sources}
         logger.info(f"🤖 Usando {provider_name} para geração de texto")
 
         try:
-            if provider_name == "openrouter":
-                client = provider["client"]
-                response = client.chat.completions.create(
-                    model=provider["model"],
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=max_tokens,
-                    temperature=temperature
-                )
-                return response.choices[0].message.content
-
-            elif provider_name == "gemini":
-                model = genai.GenerativeModel("gemini-2.0-flash-exp")
-                response = model.generate_content(
-                    prompt,
-                    generation_config=genai.types.GenerationConfig(
-                        max_output_tokens=max_tokens,
-                        temperature=temperature,
-                    )
-                )
-                return response.text
-
-            elif provider_name == "groq":
-                client = provider["client"]
-                response = client.chat.completions.create(
-                    model=provider["model"],
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=max_tokens,
-                    temperature=temperature
-                )
-                return response.choices[0].message.content
-
-            elif provider_name == "openai":
-                client = provider["client"]
-                response = client.chat.completions.create(
-                    model=provider["model"],
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=max_tokens,
-                    temperature=temperature
-                )
-                return response.choices[0].message.content
+            return await self._run_blocking(
+                self._generate_text_sync, provider_name, provider, prompt, max_tokens, temperature
+            )
 
         except Exception as e:
             logger.error(f"❌ Erro na geração de texto com {provider_name}: {e}")
             return f"Erro na geração: {str(e)}"
 
-        return "Erro: Método de geração não implementado para este provedor"
+    def _generate_text_sync(
+        self,
+        provider_name: str,
+        provider: Dict[str, Any],
+        prompt: str,
+        max_tokens: int,
+        temperature: float
+    ) -> str:
+        """Chamada bloqueante ao provedor (executada no pool de threads)"""
+
+        if provider_name == "gemini":
+            model = genai.GenerativeModel(provider["model"])
+            response = model.generate_content(
+                prompt,
+                generation_config=genai.types.GenerationConfig(
+                    max_output_tokens=max_tokens,
+                    temperature=temperature,
+                )
+            )
+            return response.text
+
+        # OpenRouter, Groq e OpenAI expõem a mesma API de chat completions
+        client = provider["client"]
+        response = client.chat.completions.create(
+            model=provider["model"],
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        return response.choices[0].message.content
 
 
 # Instância global
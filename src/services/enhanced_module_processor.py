@@ -6,10 +6,11 @@ Processador aprimorado de módulos com IA
 """
 
 import os
+import time
 import logging
 import asyncio
 import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Set
 from datetime import datetime
 from pathlib import Path
 
@@ -135,6 +136,14 @@ class EnhancedModuleProcessor:
             }
         }
 
+        # Limite de módulos simultâneos por provedor (MODULE_CONCURRENCY_<PROVEDOR>
+        # sobrescreve o padrão MODULE_CONCURRENCY)
+        self.default_concurrency = int(os.getenv("MODULE_CONCURRENCY", "4"))
+        self.provider_concurrency = {
+            name: int(os.getenv(f"MODULE_CONCURRENCY_{name.upper()}", self.default_concurrency))
+            for name in list(self.ai_manager.providers.keys()) + ["local"]
+        }
+
         logger.info("🚀 Enhanced Module Processor inicializado")
 
     async def generate_all_modules(self, session_id: str) -> Dict[str, Any]:
@@ -157,64 +166,19 @@ class EnhancedModuleProcessor:
         modules_dir = Path(f"analyses_data/{session_id}/modules")
         modules_dir.mkdir(parents=True, exist_ok=True)
 
-        # Gera cada módulo
-        for module_name, config in self.modules_config.items():
-            try:
-                logger.info(f"📝 Gerando módulo: {module_name}")
-
-                # Verifica se é o módulo especializado CPL
-                if module_name == 'cpl_completo':
-                    # CORREÇÃO 2: Chamar a função com o nome correto e argumentos ajustados
-                    # Gera o módulo CPL especializado
-                    cpl_content = await create_devastating_cpl_protocol(
-                        sintese_master=base_data.get('sintese_master', {}),
-                        avatar_data=base_data.get('avatar_data', {}),
-                        contexto_estrategico=base_data.get('contexto_estrategico', {}),
-                        dados_web=base_data.get('dados_web', {}),
-                        session_id=session_id # session_id passado como keyword argument
-                    )
-                    
-                    # Salva conteúdo do módulo CPL em formato JSON e Markdown
-                    cpl_json_path = modules_dir / f"{module_name}.json"
-                    with open(cpl_json_path, 'w', encoding='utf-8') as f:
-                        json.dump(cpl_content, f, ensure_ascii=False, indent=2)
-                    
-                    # Cria versão Markdown do conteúdo CPL
-                    cpl_md_content = self._format_cpl_content_to_markdown(cpl_content)
-                    cpl_md_path = modules_dir / f"{module_name}.md"
-                    with open(cpl_md_path, 'w', encoding='utf-8') as f:
-                        f.write(cpl_md_content)
-                else:
-                    # Gera conteúdo do módulo padrão
-                    if config.get('use_active_search', False):
-                        content = await self.ai_manager.generate_with_active_search(
-                            prompt=self._get_module_prompt(module_name, config, base_data),
-                            context=base_data.get('context', ''),
-                            session_id=session_id
-                        )
-                    else:
-                        content = await self.ai_manager.generate_text(
-                            prompt=self._get_module_prompt(module_name, config, base_data)
-                        )
-
-                    # Salva módulo padrão
-                    module_path = modules_dir / f"{module_name}.md"
-                    with open(module_path, 'w', encoding='utf-8') as f:
-                        f.write(content)
+        # Executa os módulos como um grafo de dependências: cada módulo aguarda
+        # apenas os itens listados em 'requires' e não a lista inteira
+        graph = self._build_dependency_graph(base_data)
+        step_start = time.perf_counter()
+        timings = await self._run_module_graph(graph, session_id, base_data, modules_dir, results)
 
-                results["successful_modules"] += 1
-                results["modules_generated"].append(module_name)
-
-                logger.info(f"✅ Módulo {module_name} gerado com sucesso")
-
-            except Exception as e:
-                logger.error(f"❌ Erro ao gerar módulo {module_name}: {e}")
-                salvar_erro(f"modulo_{module_name}", e, contexto={"session_id": session_id})
-                results["failed_modules"] += 1
-                results["modules_failed"].append({
-                    "module": module_name,
-                    "error": str(e)
-                })
+        # Mantém a ordem declarada em modules_config no relatório final
+        order = list(self.modules_config.keys())
+        results["modules_generated"].sort(key=order.index)
+        results["modules_failed"].sort(key=lambda item: order.index(item["module"]))
+        results["wall_time_seconds"] = round(time.perf_counter() - step_start, 3)
+        results["sum_module_seconds"] = round(sum(timings.values()), 3)
+        results["module_timings"] = timings
 
         # Gera relatório consolidado
         await self._generate_consolidated_report(session_id, results)
@@ -223,6 +187,164 @@ class EnhancedModuleProcessor:
 
         return results
 
+    def _build_dependency_graph(self, base_data: Dict[str, Any]) -> Dict[str, Set[str]]:
+        """Converte os 'requires' de modules_config em arestas entre módulos"""
+        graph = {}
+        for module_name, config in self.modules_config.items():
+            edges = set()
+            for requirement in config.get('requires', []):
+                if requirement in self.modules_config:
+                    edges.add(requirement)
+                elif requirement not in base_data:
+                    logger.warning(f"⚠️ Dependência desconhecida '{requirement}' no módulo {module_name}")
+                # Demais requisitos vêm de _load_base_data, já disponível neste ponto
+            graph[module_name] = edges
+
+        # Valida ciclos antes de agendar qualquer tarefa
+        visited, stack = set(), set()
+
+        def visit(node: str):
+            if node in stack:
+                raise ValueError(f"Ciclo de dependências envolvendo o módulo '{node}'")
+            if node in visited:
+                return
+            stack.add(node)
+            for dependency in graph[node]:
+                visit(dependency)
+            stack.discard(node)
+            visited.add(node)
+
+        for node in graph:
+            visit(node)
+
+        return graph
+
+    def _get_module_provider(self, module_name: str, config: Dict[str, Any]) -> str:
+        """Identifica qual provedor atenderá o módulo (para limitar concorrência)"""
+        if config.get('type') == 'specialized':
+            return "local"
+        if config.get('use_active_search', False) and self.ai_manager.providers.get("openrouter", {}).get("available"):
+            return "openrouter"
+        return self.ai_manager._get_best_provider(
+            require_tools=config.get('use_active_search', False)
+        ) or "local"
+
+    async def _run_module_graph(
+        self,
+        graph: Dict[str, Set[str]],
+        session_id: str,
+        base_data: Dict[str, Any],
+        modules_dir: Path,
+        results: Dict[str, Any]
+    ) -> Dict[str, float]:
+        """Agenda os módulos respeitando as dependências e o limite por provedor"""
+        # Semáforos criados aqui pertencem ao event loop da execução atual
+        semaphores = {}
+        tasks = {}
+        timings = {}
+
+        def get_semaphore(provider_name: str) -> asyncio.Semaphore:
+            if provider_name not in semaphores:
+                limit = self.provider_concurrency.get(provider_name, self.default_concurrency)
+                semaphores[provider_name] = asyncio.Semaphore(max(1, limit))
+            return semaphores[provider_name]
+
+        async def run_node(module_name: str) -> bool:
+            config = self.modules_config[module_name]
+            dependencies = graph[module_name]
+
+            if dependencies:
+                outcomes = await asyncio.gather(*(tasks[dep] for dep in dependencies))
+                failed = [dep for dep, ok in zip(dependencies, outcomes) if not ok]
+                if failed:
+                    error = f"Dependências não geradas: {', '.join(sorted(failed))}"
+                    logger.error(f"❌ Módulo {module_name} ignorado: {error}")
+                    results["failed_modules"] += 1
+                    results["modules_failed"].append({"module": module_name, "error": error})
+                    return False
+
+            provider_name = self._get_module_provider(module_name, config)
+            async with get_semaphore(provider_name):
+                module_start = time.perf_counter()
+                try:
+                    logger.info(f"📝 Gerando módulo: {module_name} ({provider_name})")
+                    await self._generate_module(module_name, config, session_id, base_data, modules_dir)
+
+                    results["successful_modules"] += 1
+                    results["modules_generated"].append(module_name)
+                    logger.info(f"✅ Módulo {module_name} gerado com sucesso")
+                    return True
+
+                except Exception as e:
+                    logger.error(f"❌ Erro ao gerar módulo {module_name}: {e}")
+                    salvar_erro(f"modulo_{module_name}", e, contexto={"session_id": session_id})
+                    results["failed_modules"] += 1
+                    results["modules_failed"].append({
+                        "module": module_name,
+                        "error": str(e)
+                    })
+                    return False
+                finally:
+                    timings[module_name] = round(time.perf_counter() - module_start, 3)
+
+        # O grafo já foi validado contra ciclos, então criar as tarefas em
+        # qualquer ordem é seguro: cada uma só aguarda as dependências
+        for module_name in graph:
+            tasks[module_name] = asyncio.ensure_future(run_node(module_name))
+        await asyncio.gather(*tasks.values())
+
+        return timings
+
+    async def _generate_module(
+        self,
+        module_name: str,
+        config: Dict[str, Any],
+        session_id: str,
+        base_data: Dict[str, Any],
+        modules_dir: Path
+    ) -> None:
+        """Gera e salva um único módulo"""
+
+        # Verifica se é o módulo especializado CPL
+        if module_name == 'cpl_completo':
+            # Gera o módulo CPL especializado
+            cpl_content = await create_devastating_cpl_protocol(
+                sintese_master=base_data.get('sintese_master', {}),
+                avatar_data=base_data.get('avatar_data', {}),
+                contexto_estrategico=base_data.get('contexto_estrategico', {}),
+                dados_web=base_data.get('dados_web', {}),
+                session_id=session_id
+            )
+
+            # Salva conteúdo do módulo CPL em formato JSON e Markdown
+            cpl_json_path = modules_dir / f"{module_name}.json"
+            with open(cpl_json_path, 'w', encoding='utf-8') as f:
+                json.dump(cpl_content, f, ensure_ascii=False, indent=2)
+
+            # Cria versão Markdown do conteúdo CPL
+            cpl_md_content = self._format_cpl_content_to_markdown(cpl_content)
+            cpl_md_path = modules_dir / f"{module_name}.md"
+            with open(cpl_md_path, 'w', encoding='utf-8') as f:
+                f.write(cpl_md_content)
+            return
+
+        # Gera conteúdo do módulo padrão
+        if config.get('use_active_search', False):
+            content = await self.ai_manager.generate_with_active_search(
+                prompt=self._get_module_prompt(module_name, config, base_data),
+                context=base_data.get('context', ''),
+                session_id=session_id
+            )
+        else:
+            content = await self.ai_manager.generate_text(
+                prompt=self._get_module_prompt(module_name, config, base_data)
+            )
+
+        # Salva módulo padrão
+        module_path = modules_dir / f"{module_name}.md"
+        with open(module_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
     def _load_base_data(self, session_id: str) -> Dict[str, Any]:
         """Carrega dados base da sessão"""
         try:
@@ -13,6 +13,8 @@ import json
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+from services.text_tokenizer import tokenize
+
 logger = logging.getLogger(__name__)
 
 class FirecrwalSocialClient:
@@ -564,21 +566,12 @@ class FirecrwalSocialClient:
 
         from collections import Counter
 
-        # Palavras-chave frequentes
-        all_words = []
+        # Palavras-chave frequentes (mais de 3 caracteres, sem stopwords), contadas por item
+        word_counts = Counter()
         for item in all_content:
-            words = item['text'].lower().split()
-            # Filtra palavras relevantes (mais de 3 caracteres)
-            relevant_words = [word for word in words if len(word) > 3]
-            all_words.extend(relevant_words)
-
-        # Conta frequência
-        word_counts = Counter(all_words)
+            word_counts.update(tokenize(item['text'], min_length=4))
 
-        # Filtra stop words comuns
-        stop_words = {'para', 'como', 'mais', 'você', 'que', 'uma', 'com', 'seu', 'sua', 'essa', 'esse'}
-        trending = [word for word, count in word_counts.most_common(20)
-                   if word not in stop_words and count > 2]
+        trending = [word for word, count in word_counts.most_common(20) if count > 2]
 
         return trending[:10]
 
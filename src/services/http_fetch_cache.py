@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - HTTP Fetch Cache
+Cache HTTP persistente (SQLite) de páginas baixadas, com revalidação condicional e texto extraído, compartilhado pelos extratores
+"""
+
+import os
+import json
+import time
+import zlib
+import asyncio
+import sqlite3
+import hashlib
+import logging
+from typing import Dict, Any, Optional, Callable
+
+import aiohttp
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from services.crawl_frontier import normalize_url
+from services.url_resolver import url_resolver
+from services.http_session_pool import http_session_pool
+from services.sqlite_cache import SQLiteCache
+
+logger = logging.getLogger(__name__)
+
+# Tipos de conteúdo guardados (PDFs e binários ficam de fora)
+CACHEABLE_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain', 'application/xml', 'text/xml')
+
+class CachedResponse:
+    """Resposta com a interface usada pelos extratores (status_code, content, text, raise_for_status)
+
+    from_cache indica que o corpo veio do disco (fresco ou revalidado com
+    304); extracted guarda os textos já extraídos deste corpo, por extrator.
+    """
+
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes,
+                 encoding: Optional[str], from_cache: bool = False, revalidated: bool = False,
+                 extracted: Optional[Dict[str, Any]] = None, cache_key: Optional[str] = None):
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.encoding = encoding
+        self.from_cache = from_cache
+        self.revalidated = revalidated
+        self.extracted = extracted or {}
+        self.cache_key = cache_key
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} para {self.url}", response=None)
+
+class HTTPFetchCache(SQLiteCache):
+    """Cache de GETs HTTP por URL resolvida, com validadores e texto extraído
+
+    Respostas 200 de páginas de texto são guardadas com corpo (zlib),
+    cabeçalhos, ETag e Last-Modified. Dentro do prazo de frescor
+    (Cache-Control max-age, ou HTTP_CACHE_TTL sem ele; no-cache,
+    must-revalidate e private zeram o prazo) o corpo é servido sem rede;
+    depois disso a página é revalidada com If-None-Match/If-Modified-Since e
+    um 304 renova a entrada sem baixar de novo. Se a rede falhar, a cópia
+    vencida é servida. O texto extraído por cada extrator fica na mesma
+    entrada e vale enquanto o corpo não mudar. Conexões, despejo e
+    contadores (agregados entre processos) vêm do SQLiteCache, como no
+    Search Cache.
+    """
+
+    label = "HTTP Fetch Cache"
+    table = "http_cache"
+    key_columns = ('url_key',)
+
+    def __init__(self, db_path: str = None, default_ttl: int = None, max_entries: int = None):
+        """Inicializa o cache e cria o schema se necessário"""
+        self.default_ttl = default_ttl if default_ttl is not None else int(os.getenv('HTTP_CACHE_TTL', '21600'))
+        self.max_ttl = int(os.getenv('HTTP_CACHE_MAX_TTL', '604800'))
+        # Piso opcional para max-age curtos (0 = respeita o servidor)
+        self.min_ttl = int(os.getenv('HTTP_CACHE_MIN_TTL', '0'))
+        self.max_body_bytes = int(os.getenv('HTTP_CACHE_MAX_BODY_BYTES', str(5 * 1024 * 1024)))
+        super().__init__(
+            db_path=db_path or os.getenv('HTTP_CACHE_PATH', 'cache/http_cache.sqlite3'),
+            max_entries=max_entries or int(os.getenv('HTTP_CACHE_MAX_ENTRIES', '5000')),
+            enabled=os.getenv('HTTP_CACHE_ENABLED', 'true').lower() != 'false'
+        )
+        if self.enabled:
+            logger.info(f"💾 HTTP Fetch Cache inicializado em {self.db_path} (TTL {self.default_ttl}s, máx {self.max_entries})")
+
+    def _get_session(self) -> requests.Session:
+        """Sessão requests por thread para quem não passa a própria"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _create_tables(self, conn: sqlite3.Connection):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url_key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                encoding TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                extracted TEXT NOT NULL DEFAULT '{}',
+                fetched_at REAL NOT NULL,
+                fresh_until REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        ''')
+        # URL pedida -> URL final (redirecionamentos)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS http_cache_alias (
+                alias_key TEXT PRIMARY KEY,
+                url_key TEXT NOT NULL
+            )
+        ''')
+
+    @staticmethod
+    def make_key(url: str) -> str:
+        return hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+
+    def _freshness(self, headers) -> Optional[float]:
+        """Segundos de frescor da resposta; None se ela não pode ser guardada"""
+        cache_control = (headers.get('Cache-Control') or '').lower()
+        if 'no-store' in cache_control:
+            return None
+        directives = {}
+        for directive in cache_control.split(','):
+            name, _, value = directive.strip().partition('=')
+            directives[name] = value.strip().strip('"')
+        # Guardada, mas sempre revalidada antes de ser servida
+        if 'no-cache' in directives or 'must-revalidate' in directives or 'private' in directives:
+            return 0.0
+        max_age = directives.get('max-age', '')
+        if max_age.isdigit():
+            return float(min(max(int(max_age), self.min_ttl), self.max_ttl))
+        return float(self.default_ttl)
+
+    def _load(self, url: str) -> Optional[Dict[str, Any]]:
+        conn = self._get_connection()
+        key = self.make_key(url)
+        alias = conn.execute('SELECT url_key FROM http_cache_alias WHERE alias_key = ?', (key,)).fetchone()
+        if alias:
+            key = alias[0]
+        row = conn.execute(
+            '''SELECT url, status, headers, body, encoding, etag, last_modified, extracted, fresh_until
+               FROM http_cache WHERE url_key = ?''', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            'key': key, 'url': row[0], 'status': row[1], 'headers': json.loads(row[2]),
+            'body': zlib.decompress(row[3]), 'encoding': row[4], 'etag': row[5],
+            'last_modified': row[6], 'extracted': json.loads(row[7]), 'fresh_until': row[8]
+        }
+
+    def _response_from_entry(self, entry: Dict[str, Any], revalidated: bool = False) -> CachedResponse:
+        return CachedResponse(entry['url'], entry['status'], entry['headers'], entry['body'], entry['encoding'],
+                              from_cache=True, revalidated=revalidated, extracted=entry['extracted'],
+                              cache_key=entry['key'])
+
+    def _lookup(self, url: str, revalidate: bool, headers: Optional[Dict[str, str]]):
+        """Entrada do cache, resposta pronta se ela ainda está fresca e cabeçalhos condicionais"""
+        entry = None
+        if self.enabled:
+            try:
+                entry = self._load(url)
+            except Exception as e:
+                logger.warning(f"⚠️ Erro ao ler HTTP Fetch Cache: {e}")
+
+        now = time.time()
+        if entry is not None and not revalidate and entry['fresh_until'] > now:
+            self._touch(entry['key'])
+            self._count('hits')
+            logger.info(f"🔄 HTTP cache hit: {url[:80]}")
+            return entry, self._response_from_entry(entry), None
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry['etag']:
+                request_headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                request_headers['If-Modified-Since'] = entry['last_modified']
+        return entry, None, request_headers
+
+    def _serve_stale(self, url: str, entry: Dict[str, Any]) -> CachedResponse:
+        self._count('stale_served')
+        logger.warning(f"⚠️ Falha de rede, servindo cópia vencida do cache: {url[:80]}")
+        return self._response_from_entry(entry)
+
+    def _complete(self, url: str, entry: Optional[Dict[str, Any]], result: CachedResponse) -> CachedResponse:
+        """Trata a resposta da rede: 304 renova a entrada, 200 cacheável é gravado"""
+        now = time.time()
+        if result.status_code == 304 and entry is not None:
+            freshness = self._freshness(result.headers)
+            self._renew(entry['key'], now + (freshness or 0.0), now)
+            self._count('revalidated')
+            return self._response_from_entry(entry, revalidated=True)
+
+        self._count('misses')
+        if result.status_code == 200:
+            result.cache_key = self._store(url, result, now)
+        return result
+
+    def fetch(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 20,
+        session: Optional[requests.Session] = None,
+        verify: bool = True,
+        revalidate: bool = False
+    ) -> CachedResponse:
+        """GET com cache: fresco sem rede, vencido com requisição condicional
+
+        Exceções de rede sobem como em requests.get, a menos que exista cópia
+        em cache (servida vencida). revalidate=True ignora o frescor.
+        """
+        url = url_resolver.resolve_redirect_url(url)
+        session = session or self._get_session()
+        entry, cached, request_headers = self._lookup(url, revalidate, headers)
+        if cached is not None:
+            return cached
+
+        try:
+            response = session.get(url, headers=request_headers, timeout=timeout,
+                                   verify=verify, allow_redirects=True)
+        except requests.RequestException:
+            if entry is None:
+                raise
+            return self._serve_stale(url, entry)
+
+        if response.encoding is None:
+            response.encoding = response.apparent_encoding or 'utf-8'
+        return self._complete(url, entry, CachedResponse(
+            response.url, response.status_code, dict(response.headers), response.content, response.encoding
+        ))
+
+    async def fetch_async(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 20,
+        session=None,
+        verify: bool = True,
+        revalidate: bool = False
+    ) -> CachedResponse:
+        """Versão assíncrona de fetch() sobre a sessão aiohttp do HTTP Session Pool
+
+        Mesmas entradas, validadores e estatísticas do fetch() síncrono.
+        Exceções de rede (aiohttp.ClientError, asyncio.TimeoutError) sobem se
+        não houver cópia em cache. Resolução de encurtadores e acesso ao
+        SQLite (leitura, zlib, gravação) rodam no executor padrão, fora do
+        event loop.
+        """
+        loop = asyncio.get_running_loop()
+        url = await loop.run_in_executor(None, url_resolver.resolve_redirect_url, url)
+        session = session or http_session_pool.get_session()
+        entry, cached, request_headers = await loop.run_in_executor(None, self._lookup, url, revalidate, headers)
+        if cached is not None:
+            return cached
+
+        try:
+            async with session.get(url, headers=request_headers, timeout=aiohttp.ClientTimeout(total=timeout),
+                                   ssl=None if verify else False, allow_redirects=True) as response:
+                content = await response.read()
+                try:
+                    encoding = response.get_encoding()
+                except (RuntimeError, LookupError):
+                    encoding = 'utf-8'
+                result = CachedResponse(str(response.url), response.status, dict(response.headers), content, encoding)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if entry is None:
+                raise
+            return await loop.run_in_executor(None, self._serve_stale, url, entry)
+
+        return await loop.run_in_executor(None, self._complete, url, entry, result)
+
+    def _store(self, requested_url: str, response: CachedResponse, now: float) -> Optional[str]:
+        """Grava a resposta 200 (se cacheável) e o alias da URL pedida"""
+        if not self.enabled:
+            return None
+        content_type = (response.headers.get('Content-Type') or 'text/html').lower()
+        if not content_type.startswith(CACHEABLE_TYPES) or len(response.content) > self.max_body_bytes:
+            return None
+        freshness = self._freshness(response.headers)
+        if freshness is None:
+            return None
+
+        try:
+            conn = self._get_connection()
+            key = self.make_key(response.url)
+            conn.execute(
+                '''INSERT OR REPLACE INTO http_cache
+                   (url_key, url, status, headers, body, encoding, etag, last_modified, extracted,
+                    fetched_at, fresh_until, last_access)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, '{}', ?, ?, ?)''',
+                (key, response.url, response.status_code, json.dumps(dict(response.headers)),
+                 zlib.compress(response.content, 6), response.encoding, response.headers.get('ETag'),
+                 response.headers.get('Last-Modified'), now, now + freshness, now)
+            )
+            alias_key = self.make_key(requested_url)
+            if alias_key != key:
+                conn.execute('INSERT OR REPLACE INTO http_cache_alias (alias_key, url_key) VALUES (?, ?)',
+                             (alias_key, key))
+            self._count('writes')
+            self._wrote()
+            return key
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao gravar HTTP Fetch Cache: {e}")
+            return None
+
+    def _renew(self, key: str, fresh_until: float, now: float):
+        try:
+            self._get_connection().execute(
+                'UPDATE http_cache SET fresh_until = ?, last_access = ? WHERE url_key = ?',
+                (fresh_until, now, key)
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao renovar entrada do HTTP Fetch Cache: {e}")
+
+    def store_extracted(self, response: CachedResponse, extractor: str, value: Any):
+        """Guarda o resultado de um extrator junto do corpo de onde ele saiu"""
+        response.extracted[extractor] = value
+        if not self.enabled or not response.cache_key:
+            return
+        try:
+            conn = self._get_connection()
+            row = conn.execute('SELECT extracted FROM http_cache WHERE url_key = ?', (response.cache_key,)).fetchone()
+            if row is None:
+                return
+            extracted = json.loads(row[0])
+            extracted[extractor] = value
+            conn.execute('UPDATE http_cache SET extracted = ? WHERE url_key = ?',
+                         (json.dumps(extracted, ensure_ascii=False), response.cache_key))
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao gravar texto extraído no HTTP Fetch Cache: {e}")
+
+    def extracted(self, response: CachedResponse, extractor: str, func: Callable[[CachedResponse], Any]) -> Any:
+        """Resultado do extrator para esta resposta: do cache, ou calculado por func e guardado"""
+        if extractor in response.extracted:
+            self._count('extracted_hits')
+            return response.extracted[extractor]
+        value = func(response)
+        if value:
+            self.store_extracted(response, extractor, value)
+        return value
+
+    def evict(self):
+        """Remove as entradas menos usadas acima de max_entries (vencidas ficam para revalidação)"""
+        super().evict()
+        self._get_connection().execute(
+            'DELETE FROM http_cache_alias WHERE url_key NOT IN (SELECT url_key FROM http_cache)'
+        )
+
+    def clear(self):
+        """Limpa todas as páginas em cache"""
+        if not self.enabled:
+            return
+        self._get_connection().execute('DELETE FROM http_cache_alias')
+        super().clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores de hit/revalidação/miss (agregados entre processos) e tamanho do cache"""
+        if not self.enabled:
+            return {'enabled': False}
+
+        try:
+            counts = {event: count for (_, event), count in self._counters().items()}
+            body_bytes = self._get_connection().execute(
+                'SELECT COALESCE(SUM(LENGTH(body)), 0) FROM http_cache'
+            ).fetchone()[0]
+            served = counts.get('hits', 0) + counts.get('revalidated', 0) + counts.get('stale_served', 0)
+            lookups = served + counts.get('misses', 0)
+            return {
+                **self._base_stats(),
+                'stored_mb': round(body_bytes / 1024 / 1024, 2),
+                'hits': counts.get('hits', 0),
+                'revalidated': counts.get('revalidated', 0),
+                'stale_served': counts.get('stale_served', 0),
+                'misses': counts.get('misses', 0),
+                'writes': counts.get('writes', 0),
+                'extracted_hits': counts.get('extracted_hits', 0),
+                'hit_rate': served / lookups if lookups else 0.0
+            }
+
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao ler estatísticas do HTTP Fetch Cache: {e}")
+            return {'enabled': True, 'error': str(e)}
+
+# Instância global
+http_fetch_cache = HTTPFetchCache()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - HTTP Session Pool
+Sessão aiohttp compartilhada por event loop com pool de conexões e métricas
+"""
+
+import os
+import time
+import atexit
+import logging
+import asyncio
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from typing import Dict, Any
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+class HTTPSessionPool:
+    """Mantém uma ClientSession de longa duração por event loop
+
+    Sessões aiohttp ficam presas ao loop que as criou e o workflow cria um loop
+    por thread, por isso o pool guarda uma sessão para cada loop ativo.
+    """
+
+    def __init__(self):
+        """Inicializa o pool com limites configuráveis via ambiente"""
+        self.limit = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+        self.limit_per_host = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "10"))
+        self.keepalive_timeout = float(os.getenv("HTTP_POOL_KEEPALIVE", "30"))
+        self.dns_cache_ttl = int(os.getenv("HTTP_POOL_DNS_TTL", "300"))
+        self.total_timeout = float(os.getenv("HTTP_POOL_TOTAL_TIMEOUT", "60"))
+
+        self._sessions = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        atexit.register(self._close_at_exit)
+
+        self.stats = {
+            'sessions_created': 0,
+            'requests': 0,
+            'connections_created': 0,
+            'connections_reused': 0,
+            'dns_cache_hits': 0,
+            'dns_cache_misses': 0,
+            'queued_requests': 0,
+            'queue_wait_total': 0.0,
+            'queue_wait_max': 0.0
+        }
+
+        logger.info(f"🔌 HTTP Session Pool inicializado (limite {self.limit}, {self.limit_per_host} por host)")
+
+    def _build_trace_config(self) -> aiohttp.TraceConfig:
+        """Registra callbacks de rastreamento para alimentar as métricas"""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            self.stats['requests'] += 1
+
+        async def on_connection_create_end(session, ctx, params):
+            self.stats['connections_created'] += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self.stats['connections_reused'] += 1
+
+        async def on_dns_cache_hit(session, ctx, params):
+            self.stats['dns_cache_hits'] += 1
+
+        async def on_dns_cache_miss(session, ctx, params):
+            self.stats['dns_cache_misses'] += 1
+
+        async def on_connection_queued_start(session, ctx, params):
+            ctx.queued_at = time.perf_counter()
+
+        async def on_connection_queued_end(session, ctx, params):
+            wait = time.perf_counter() - getattr(ctx, 'queued_at', time.perf_counter())
+            self.stats['queued_requests'] += 1
+            self.stats['queue_wait_total'] += wait
+            self.stats['queue_wait_max'] = max(self.stats['queue_wait_max'], wait)
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(on_dns_cache_miss)
+        trace_config.on_connection_queued_start.append(on_connection_queued_start)
+        trace_config.on_connection_queued_end.append(on_connection_queued_end)
+        return trace_config
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Cria a sessão com connector keep-alive e cache de DNS"""
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.dns_cache_ttl,
+            use_dns_cache=True,
+            keepalive_timeout=self.keepalive_timeout
+        )
+        self.stats['sessions_created'] += 1
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.total_timeout),
+            trace_configs=[self._build_trace_config()]
+        )
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Retorna a sessão do event loop atual, criando-a na primeira chamada"""
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            self._discard_closed_loops()
+
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                session = self._create_session()
+                self._sessions[loop] = session
+
+        return session
+
+    def _discard_closed_loops(self):
+        """Remove (e fecha) as sessões de loops encerrados sem close_current()
+
+        Cobre asyncio.run e loops criados com new_event_loop; chamado com o lock.
+        """
+        for stale_loop in [l for l in self._sessions if l.is_closed()]:
+            self._close_stale(self._sessions.pop(stale_loop))
+
+    def _close_at_exit(self):
+        """Fecha na saída do processo as sessões cujo loop já terminou"""
+        with self._lock:
+            self._discard_closed_loops()
+
+    @staticmethod
+    def _close_stale(session: aiohttp.ClientSession):
+        """Fecha o connector de uma sessão cujo loop já foi encerrado
+
+        session.close() precisa do loop original; sem ele, o connector é
+        fechado de forma síncrona (os sockets são liberados e a sessão passa
+        a constar como fechada, sem o aviso "Unclosed client session").
+        """
+        connector = session.connector
+        if connector is None or connector.closed:
+            return
+        try:
+            connector._close()
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao fechar sessão HTTP de loop encerrado: {e}")
+
+    @asynccontextmanager
+    async def session(self):
+        """Context manager compatível com 'async with ClientSession() as session'
+
+        A sessão não é fechada na saída; ela é reutilizada pelas próximas chamadas.
+        """
+        yield self.get_session()
+
+    async def close_current(self):
+        """Fecha a sessão do loop atual (chamar antes de loop.close())"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.pop(loop, None)
+        if session and not session.closed:
+            await session.close()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Retorna métricas do pool: conexões abertas, reuso e espera na fila"""
+        open_connections = 0
+        idle_connections = 0
+        with self._lock:
+            sessions = list(self._sessions.values())
+
+        for session in sessions:
+            connector = session.connector
+            if session.closed or connector is None:
+                continue
+            try:
+                # Atributos internos do TCPConnector: conexões ativas e ociosas
+                active = len(connector._acquired)
+                idle = sum(len(conns) for conns in connector._conns.values())
+                open_connections += active + idle
+                idle_connections += idle
+            except AttributeError:
+                pass
+
+        acquired = self.stats['connections_created'] + self.stats['connections_reused']
+        queued = self.stats['queued_requests']
+
+        return {
+            'active_sessions': len(sessions),
+            'open_connections': open_connections,
+            'idle_connections': idle_connections,
+            'requests': self.stats['requests'],
+            'connections_created': self.stats['connections_created'],
+            'connections_reused': self.stats['connections_reused'],
+            'reuse_ratio': self.stats['connections_reused'] / acquired if acquired else 0.0,
+            'dns_cache_hits': self.stats['dns_cache_hits'],
+            'dns_cache_misses': self.stats['dns_cache_misses'],
+            'queued_requests': queued,
+            'queue_wait_avg': self.stats['queue_wait_total'] / queued if queued else 0.0,
+            'queue_wait_max': self.stats['queue_wait_max'],
+            'limits': {
+                'limit': self.limit,
+                'limit_per_host': self.limit_per_host,
+                'keepalive_timeout': self.keepalive_timeout,
+                'total_timeout': self.total_timeout
+            }
+        }
+
+# Instância global
+http_session_pool = HTTPSessionPool()
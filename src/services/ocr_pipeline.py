@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - OCR Pipeline
+OCR paralelo em pool de processos com pré-processamento (redução, binarização, recorte de texto) e cache por hash
+"""
+
+import os
+import time
+import asyncio
+import hashlib
+import logging
+from pathlib import Path
+from collections import Counter
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from services.sqlite_cache import ContentHashCache
+from services.process_pool import LazyProcessPool
+
+logger = logging.getLogger(__name__)
+
+# Imports condicionais
+try:
+    from PIL import Image
+    import pytesseract
+    HAS_OCR = True
+except ImportError:
+    HAS_OCR = False
+
+try:
+    import cv2
+    HAS_OPENCV = True
+except ImportError:
+    HAS_OPENCV = False
+
+# Muda quando o pré-processamento muda: resultados antigos deixam de valer no cache
+OCR_PIPELINE_VERSION = "1"
+
+def image_dominant_colors(image: "np.ndarray", k: int = 5) -> List[Dict[str, Any]]:
+    """Cores predominantes (KMeans do OpenCV) de uma imagem BGR"""
+    # Redimensiona a imagem para acelerar o processamento
+    image = cv2.resize(image, (100, 100))
+    image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    pixels = np.float32(image.reshape((-1, 3)))
+
+    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 100, 0.2)
+    _, labels, centers = cv2.kmeans(pixels, k, None, criteria, 10, cv2.KMEANS_RANDOM_CENTERS)
+    centers = np.uint8(centers)
+
+    counts = Counter(labels.flatten())
+    return [
+        {"rgb": centers[i].tolist(), "percentage": (count / len(pixels)) * 100}
+        for i, count in sorted(counts.items(), key=lambda x: x[1], reverse=True)
+    ]
+
+def _downscale(gray: "np.ndarray", max_width: int) -> "np.ndarray":
+    height, width = gray.shape[:2]
+    if max_width and width > max_width:
+        scale = max_width / width
+        gray = cv2.resize(gray, (max_width, max(1, int(height * scale))), interpolation=cv2.INTER_AREA)
+    return gray
+
+def _text_regions(gray: "np.ndarray", min_height: int = 6) -> List[Tuple[int, int, int, int]]:
+    """Caixas (x, y, w, h) com cara de linha de texto: bordas densas, mais largas que altas"""
+    height = gray.shape[0]
+    gradient = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3)))
+    _, edges = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    # Une os caracteres de uma linha em um bloco
+    lines = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (9, 1)))
+    contours, _ = cv2.findContours(lines, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    regions = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        if h < min_height or h > height * 0.25 or w < h:
+            continue
+        fill = cv2.countNonZero(edges[y:y + h, x:x + w]) / float(w * h)
+        if fill >= 0.2:
+            regions.append((x, y, w, h))
+    return regions
+
+def _binarize_regions(gray: "np.ndarray", regions: List[Tuple[int, int, int, int]], pad: int = 4) -> "np.ndarray":
+    """Imagem branca só com as regiões de texto binarizadas (texto escuro), recortada às regiões
+
+    Cada região é binarizada separadamente (Otsu) e invertida quando o fundo
+    é escuro, então botões e faixas em modo escuro viram texto preto no branco.
+    """
+    height, width = gray.shape[:2]
+    canvas = np.full_like(gray, 255)
+    for x, y, w, h in regions:
+        x0, y0 = max(x - pad, 0), max(y - pad, 0)
+        x1, y1 = min(x + w + pad, width), min(y + h + pad, height)
+        _, block = cv2.threshold(gray[y0:y1, x0:x1], 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+        if cv2.countNonZero(block) < block.size / 2:
+            block = cv2.bitwise_not(block)
+        canvas[y0:y1, x0:x1] = block
+
+    xs = [x for x, _, _, _ in regions] + [x + w for x, _, w, _ in regions]
+    ys = [y for _, y, _, _ in regions] + [y + h for _, y, _, h in regions]
+    return canvas[max(min(ys) - pad, 0):min(max(ys) + pad, height), max(min(xs) - pad, 0):min(max(xs) + pad, width)]
+
+def _scale_regions(regions: List[Tuple[int, int, int, int]], scale: float) -> List[Tuple[int, int, int, int]]:
+    return [(int(x * scale), int(y * scale), int(np.ceil(w * scale)), int(np.ceil(h * scale))) for x, y, w, h in regions]
+
+def _process_image(path: str, lang: str, max_width: int, detect_width: int,
+                   tesseract_config: str) -> Dict[str, Any]:
+    """OCR de uma imagem (executa no worker): pré-processa, recorta o texto e chama o Tesseract"""
+    start = time.perf_counter()
+    result = {"text": "", "regions": 0}
+
+    if HAS_OPENCV:
+        image = cv2.imread(path, cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError(f"Não foi possível carregar a imagem: {path}")
+        result["colors"] = image_dominant_colors(image)
+
+        gray = _downscale(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), max_width)
+        # Regiões localizadas numa cópia pequena (rápido) e recortadas da imagem de OCR (legível)
+        small = _downscale(gray, detect_width)
+        regions = _scale_regions(_text_regions(small), gray.shape[1] / small.shape[1])
+        result["regions"] = len(regions)
+        # Sem regiões de texto (fotos, ilustrações) o Tesseract nem é chamado
+        if regions and HAS_OCR:
+            prepared = Image.fromarray(_binarize_regions(gray, regions))
+            result["text"] = pytesseract.image_to_string(prepared, lang=lang, config=tesseract_config)
+    elif HAS_OCR:
+        # Sem OpenCV: escala de cinza + redução + limiar global, imagem inteira
+        with Image.open(path) as image:
+            gray = image.convert("L")
+        if max_width and gray.width > max_width:
+            gray = gray.resize((max_width, max(1, int(gray.height * max_width / gray.width))), Image.LANCZOS)
+        threshold = int(np.asarray(gray).mean())
+        prepared = gray.point(lambda value: 255 if value > threshold else 0)
+        result["text"] = pytesseract.image_to_string(prepared, lang=lang, config=tesseract_config)
+
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+def _init_ocr_worker():
+    """Um núcleo por worker: o paralelismo vem do pool, não das threads do Tesseract"""
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+class OCRPipeline:
+    """OCR de lotes de imagens em pool de processos, com cache por hash da imagem
+
+    Antes do Tesseract as linhas de texto são localizadas por gradiente
+    morfológico numa cópia reduzida (OCR_DETECT_WIDTH) e só elas vão,
+    binarizadas, para o OCR (imagem limitada a OCR_MAX_WIDTH); imagens sem
+    texto não chegam ao Tesseract. O resultado (texto e cores predominantes)
+    fica em cache pelo SHA-256 do arquivo.
+    """
+
+    def __init__(self):
+        """Inicializa configuração e cache (o pool é criado no primeiro uso)"""
+        self.lang = os.getenv("OCR_LANG", "por")
+        # Largura máxima da imagem enviada ao Tesseract (reduz capturas retina/4K)
+        self.max_width = int(os.getenv("OCR_MAX_WIDTH", "1920"))
+        # Largura usada só para localizar as linhas de texto
+        self.detect_width = int(os.getenv("OCR_DETECT_WIDTH", "960"))
+        self.tesseract_config = os.getenv("OCR_TESSERACT_CONFIG", "--psm 3")
+        self.workers = int(os.getenv("OCR_WORKERS", str(min(4, os.cpu_count() or 1))))
+        self.available = HAS_OCR
+
+        self.cache = ContentHashCache(
+            label="OCR Cache",
+            table="ocr_results",
+            env_prefix="OCR_CACHE",
+            default_path="cache/ocr.sqlite3",
+            default_max_entries=100000
+        )
+        self.cache_version = f"{OCR_PIPELINE_VERSION}-{self.lang}-{self.max_width}-{self.detect_width}-{self.tesseract_config}-cv{int(HAS_OPENCV)}-ocr{int(HAS_OCR)}"
+
+        # OCR_WORKERS=0 processa no processo atual
+        self._pool = LazyProcessPool("de OCR", self.workers, "OCR_START_METHOD", initializer=_init_ocr_worker)
+        self.stats = {'images': 0, 'cache_hits': 0, 'ocr_calls': 0, 'errors': 0, 'seconds': 0.0}
+
+        logger.info(f"🔠 OCR Pipeline inicializado (OCR: {HAS_OCR}, OpenCV: {HAS_OPENCV}, workers: {self.workers})")
+
+    @staticmethod
+    def image_hash(path: Union[str, Path]) -> str:
+        """SHA-256 do arquivo de imagem"""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    async def process_images(self, paths: Iterable[Union[str, Path]]) -> List[Dict[str, Any]]:
+        """OCR (e cores, com OpenCV) de várias imagens, na ordem de entrada
+
+        Cada resultado tem file, path, text, word_count, regions, colors (se
+        OpenCV), cached e, em caso de falha, error.
+        """
+        paths = [str(path) for path in paths]
+        if not paths or not (HAS_OCR or HAS_OPENCV):
+            return []
+
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+
+        hashes = await loop.run_in_executor(None, lambda: [self._safe_hash(path) for path in paths])
+        cached = await loop.run_in_executor(
+            None, self.cache.get_many, [h for h in hashes if h], self.cache_version
+        )
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(paths)
+        pending = {}
+        for index, (path, image_hash) in enumerate(zip(paths, hashes)):
+            if image_hash in cached:
+                results[index] = {**cached[image_hash], "cached": True}
+            elif image_hash is None:
+                results[index] = {"text": "", "regions": 0, "error": "arquivo ilegível"}
+            else:
+                pending[index] = image_hash
+
+        if pending:
+            executor = self._pool.get()
+            args = (self.lang, self.max_width, self.detect_width, self.tesseract_config)
+            tasks = {
+                index: loop.run_in_executor(executor, _process_image, paths[index], *args)
+                for index in pending
+            }
+            outcomes = await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+            to_store = []
+            for index, outcome in zip(tasks, outcomes):
+                if isinstance(outcome, Exception):
+                    logger.error(f"❌ Erro no OCR de {Path(paths[index]).name}: {outcome}")
+                    self.stats['errors'] += 1
+                    results[index] = {"text": "", "regions": 0, "error": str(outcome)}
+                    continue
+                results[index] = {**outcome, "cached": False}
+                to_store.append((pending[index], outcome))
+                if outcome.get("regions"):
+                    self.stats['ocr_calls'] += 1
+            await loop.run_in_executor(None, self.cache.set_many, to_store, self.cache_version)
+
+        for path, result in zip(paths, results):
+            result["file"] = Path(path).name
+            result["path"] = path
+            result["word_count"] = len(result["text"].split())
+
+        elapsed = time.perf_counter() - start
+        cache_hits = sum(1 for result in results if result.get("cached"))
+        self.stats['images'] += len(paths)
+        self.stats['cache_hits'] += cache_hits
+        self.stats['seconds'] += elapsed
+        logger.info(f"🔠 OCR de {len(paths)} imagens em {elapsed:.2f}s ({cache_hits} do cache)")
+        return results
+
+    @classmethod
+    def _safe_hash(cls, path: str) -> Optional[str]:
+        try:
+            return cls.image_hash(path)
+        except OSError as e:
+            logger.warning(f"⚠️ Imagem ilegível para OCR {path}: {e}")
+            return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores do pipeline e do cache de OCR"""
+        return {**self.stats, 'workers': self.workers, 'cache': self.cache.get_stats()}
+
+# Instância global
+ocr_pipeline = OCRPipeline()
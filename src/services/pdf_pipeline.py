@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - PDF Pipeline
+Download de PDF em streaming, extração de páginas em pool de processos (PyMuPDF) com parada antecipada e cache por hash
+"""
+
+import os
+import time
+import hashlib
+import logging
+import tempfile
+from typing import Dict, Any, List, Optional, Tuple
+
+import requests
+
+from services.sqlite_cache import ContentHashCache
+from services.process_pool import LazyProcessPool
+
+logger = logging.getLogger(__name__)
+
+# Imports condicionais
+try:
+    import fitz  # PyMuPDF
+    HAS_PYMUPDF = True
+except ImportError:
+    HAS_PYMUPDF = False
+
+try:
+    import pdfplumber
+    HAS_PDFPLUMBER = True
+except ImportError:
+    HAS_PDFPLUMBER = False
+
+try:
+    import PyPDF2
+    HAS_PYPDF2 = True
+except ImportError:
+    HAS_PYPDF2 = False
+
+# Muda quando a extração muda: textos antigos deixam de valer no cache
+PDF_PIPELINE_VERSION = "1"
+
+def _extract_page_range(path: str, start: int, stop: int) -> List[str]:
+    """Texto das páginas [start, stop) (executa no worker; abre o documento uma vez por bloco)"""
+    with fitz.open(path) as doc:
+        return [doc[number].get_text() or "" for number in range(start, min(stop, doc.page_count))]
+
+def useful_chars(text: str) -> int:
+    """Caracteres em linhas substanciais (> 10), o mesmo critério da limpeza de conteúdo
+
+    Páginas escaneadas, capas e sumários pouco contam para a parada antecipada.
+    """
+    return sum(len(line) for line in (line.strip() for line in text.splitlines()) if len(line) > 10)
+
+class PDFPipeline:
+    """Extração de texto de PDFs grandes sem segurar a coleta
+
+    O download vai em streaming para um arquivo temporário (nunca o corpo
+    inteiro em memória), calculando o SHA-256 no caminho; o texto fica em
+    cache por esse hash. Com PyMuPDF, o primeiro bloco de páginas
+    (PDF_CHUNK_PAGES) é extraído no processo atual e o restante em blocos
+    num pool de processos, em ordem, com no máximo duas rodadas de blocos em
+    voo; quando o prefixo já extraído soma PDF_TARGET_CHARS de texto útil,
+    os blocos restantes são cancelados.
+    pdfplumber e PyPDF2 ficam de fallback, página a página e com a mesma
+    parada antecipada.
+    """
+
+    def __init__(self):
+        """Inicializa configuração e cache (o pool é criado no primeiro uso)"""
+        self.workers = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+        self.chunk_pages = max(1, int(os.getenv("PDF_CHUNK_PAGES", "25")))
+        # Texto útil suficiente: o extrator corta o conteúdo em 50K caracteres
+        self.target_chars = int(os.getenv("PDF_TARGET_CHARS", "60000"))
+        self.max_pages = int(os.getenv("PDF_MAX_PAGES", "500"))
+        self.max_bytes = int(os.getenv("PDF_MAX_BYTES", str(100 * 1024 * 1024)))
+        self.timeout = float(os.getenv("PDF_DOWNLOAD_TIMEOUT", "30"))
+        self.available = HAS_PYMUPDF or HAS_PDFPLUMBER or HAS_PYPDF2
+
+        self.cache = ContentHashCache(
+            label="PDF Text Cache",
+            table="pdf_text",
+            env_prefix="PDF_CACHE",
+            default_path="cache/pdf_text.sqlite3",
+            default_max_entries=20000
+        )
+        self.cache_version = f"{PDF_PIPELINE_VERSION}-{self.target_chars}-{self.max_pages}"
+
+        # PDF_WORKERS<=1 extrai no processo atual
+        self._pool = LazyProcessPool("de PDF", self.workers, "PDF_START_METHOD", enabled=self.workers > 1)
+        self.stats = {
+            'pdfs': 0, 'cache_hits': 0, 'failures': 0, 'bytes_downloaded': 0,
+            'pages_total': 0, 'pages_extracted': 0, 'early_stops': 0, 'seconds': 0.0
+        }
+
+        logger.info(f"📄 PDF Pipeline inicializado (PyMuPDF: {HAS_PYMUPDF}, workers: {self.workers})")
+
+    def download(self, url: str, session: Optional[requests.Session] = None,
+                 timeout: Optional[float] = None, deadline: Optional[float] = None) -> Tuple[str, str, int]:
+        """Baixa o PDF em streaming para um arquivo temporário; devolve (caminho, sha256, bytes)
+
+        Arquivos acima de PDF_MAX_BYTES são abortados no meio do download,
+        assim como downloads que passam do deadline (time.monotonic()).
+        """
+        digest = hashlib.sha256()
+        size = 0
+        timeout = timeout or self.timeout
+        if deadline is not None:
+            timeout = min(timeout, max(0.1, deadline - time.monotonic()))
+        getter = session.get if session is not None else requests.get
+        with getter(url, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            declared = int(response.headers.get('Content-Length') or 0)
+            if declared > self.max_bytes:
+                raise ValueError(f"PDF grande demais ({declared} bytes > {self.max_bytes})")
+
+            temp_file = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
+            try:
+                with temp_file:
+                    for block in response.iter_content(chunk_size=1 << 20):
+                        if deadline is not None and time.monotonic() > deadline:
+                            raise TimeoutError(f"Prazo esgotado no download do PDF ({size} bytes)")
+                        size += len(block)
+                        if size > self.max_bytes:
+                            raise ValueError(f"PDF grande demais (> {self.max_bytes} bytes)")
+                        digest.update(block)
+                        temp_file.write(block)
+            except Exception:
+                self._remove(temp_file.name)
+                raise
+
+        self.stats['bytes_downloaded'] += size
+        return temp_file.name, digest.hexdigest(), size
+
+    def extract_from_url(self, url: str, session: Optional[requests.Session] = None,
+                         timeout: Optional[float] = None, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Texto de um PDF remoto no formato do PyMuPDFClient ({'success', 'text', 'metadata'})
+
+        deadline (time.monotonic()) limita o download; sem ele vale só o timeout.
+        """
+        if not self.available:
+            return {'success': False, 'error': 'Nenhuma biblioteca de PDF disponível'}
+
+        start = time.perf_counter()
+        self.stats['pdfs'] += 1
+        path = None
+        try:
+            path, pdf_hash, size = self.download(url, session, timeout, deadline)
+            result = self._extract_cached(path, pdf_hash)
+        except Exception as e:
+            logger.error(f"❌ Erro ao processar PDF {url}: {e}")
+            self.stats['failures'] += 1
+            return {'success': False, 'error': str(e)}
+        finally:
+            if path:
+                self._remove(path)
+
+        elapsed = time.perf_counter() - start
+        self.stats['seconds'] += elapsed
+        if not result.get('text'):
+            self.stats['failures'] += 1
+            return {'success': False, 'error': result.get('error') or 'PDF sem texto extraível'}
+
+        logger.info(f"📄 PDF {url[:80]}: {result['pages_extracted']}/{result['pages']} páginas, "
+                    f"{len(result['text'])} caracteres em {elapsed:.2f}s"
+                    f"{' (cache)' if result['cached'] else ''}")
+        return {
+            'success': True,
+            'text': result['text'],
+            'metadata': {
+                'pages': result['pages'],
+                'pages_extracted': result['pages_extracted'],
+                'truncated': result['truncated'],
+                'extractor': result['extractor'],
+                'cached': result['cached'],
+                'hash': pdf_hash,
+                'bytes': size,
+                'url': url,
+                'seconds': round(elapsed, 3)
+            }
+        }
+
+    def extract_file(self, path: str) -> Dict[str, Any]:
+        """Texto de um PDF local (com cache pelo SHA-256 do arquivo)"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return self._extract_cached(path, digest.hexdigest())
+
+    def _extract_cached(self, path: str, pdf_hash: str) -> Dict[str, Any]:
+        cached = self.cache.get_many([pdf_hash], self.cache_version).get(pdf_hash)
+        if cached is not None:
+            self.stats['cache_hits'] += 1
+            return {**cached, 'cached': True}
+
+        result = self._extract(path)
+        if result.get('text'):
+            self.cache.set_many([(pdf_hash, result)], self.cache_version)
+        self.stats['pages_total'] += result.get('pages', 0)
+        self.stats['pages_extracted'] += result.get('pages_extracted', 0)
+        if result.get('truncated'):
+            self.stats['early_stops'] += 1
+        return {**result, 'cached': False}
+
+    def _extract(self, path: str) -> Dict[str, Any]:
+        """PyMuPDF em paralelo; pdfplumber e PyPDF2 só se ele falhar ou não achar texto"""
+        strategies = []
+        if HAS_PYMUPDF:
+            strategies.append(('pymupdf', self._extract_with_pymupdf))
+        if HAS_PDFPLUMBER:
+            strategies.append(('pdfplumber', self._extract_with_pdfplumber))
+        if HAS_PYPDF2:
+            strategies.append(('pypdf2', self._extract_with_pypdf2))
+
+        error = None
+        for name, extract in strategies:
+            try:
+                pages, total = extract(path)
+            except Exception as e:
+                logger.warning(f"⚠️ Extração de PDF com {name} falhou: {e}")
+                error = str(e)
+                continue
+            text = "\n".join(page for page in pages if page.strip())
+            if len(text.strip()) > 100:
+                return {'text': text, 'pages': total, 'pages_extracted': len(pages),
+                        'truncated': len(pages) < total, 'extractor': name}
+        return {'text': '', 'pages': 0, 'pages_extracted': 0, 'truncated': False,
+                'extractor': None, 'error': error}
+
+    def _extract_with_pymupdf(self, path: str) -> Tuple[List[str], int]:
+        with fitz.open(path) as doc:
+            total = doc.page_count
+            limit = min(total, self.max_pages) if self.max_pages else total
+            # Primeiro bloco no processo atual, com o documento já aberto: PDFs
+            # pequenos e paradas logo no início nem passam pelo pool
+            executor = self._pool.get() if limit > 2 * self.chunk_pages else None
+            head = limit if executor is None else self.chunk_pages
+            pages, collected = self._collect_sequential(doc[number].get_text() or "" for number in range(head))
+        if executor is None or self._enough(collected):
+            return pages, total
+
+        # Restante em blocos, em ordem, com no máximo 2 * workers em voo: o
+        # que passa do ponto de parada é cancelado antes de começar
+        chunks = [(start, min(start + self.chunk_pages, limit)) for start in range(head, limit, self.chunk_pages)]
+        in_flight = []
+        next_chunk = 0
+        try:
+            while next_chunk < len(chunks) or in_flight:
+                while next_chunk < len(chunks) and len(in_flight) < 2 * self.workers:
+                    in_flight.append(executor.submit(_extract_page_range, path, *chunks[next_chunk]))
+                    next_chunk += 1
+                chunk_pages = in_flight.pop(0).result()
+                pages.extend(chunk_pages)
+                collected += sum(useful_chars(text) for text in chunk_pages)
+                if self._enough(collected):
+                    break
+        finally:
+            for future in in_flight:
+                future.cancel()
+        return pages, total
+
+    def _enough(self, collected: int) -> bool:
+        return bool(self.target_chars) and collected >= self.target_chars
+
+    def _collect_sequential(self, texts) -> Tuple[List[str], int]:
+        """Consome páginas em ordem até juntar o texto útil alvo; devolve (páginas, texto útil)"""
+        pages = []
+        collected = 0
+        for text in texts:
+            pages.append(text)
+            collected += useful_chars(text)
+            if self._enough(collected):
+                break
+        return pages, collected
+
+    def _extract_with_pdfplumber(self, path: str) -> Tuple[List[str], int]:
+        with pdfplumber.open(path) as pdf:
+            total = len(pdf.pages)
+            limit = min(total, self.max_pages) if self.max_pages else total
+            pages, _ = self._collect_sequential(pdf.pages[number].extract_text() or "" for number in range(limit))
+            return pages, total
+
+    def _extract_with_pypdf2(self, path: str) -> Tuple[List[str], int]:
+        with open(path, 'rb') as f:
+            reader = PyPDF2.PdfReader(f)
+            total = len(reader.pages)
+            limit = min(total, self.max_pages) if self.max_pages else total
+            pages, _ = self._collect_sequential(reader.pages[number].extract_text() or "" for number in range(limit))
+            return pages, total
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores do pipeline e do cache de texto de PDF"""
+        return {**self.stats, 'workers': self.workers, 'chunk_pages': self.chunk_pages,
+                'target_chars': self.target_chars, 'cache': self.cache.get_stats()}
+
+# Instância global
+pdf_pipeline = PDFPipeline()
@@ -15,6 +15,7 @@ from pathlib import Path
 
 # Import do engine existente
 from engine.predictive_analytics_engine1 import PredictiveAnalyticsEngine
+from services.text_tokenizer import tokenize
 
 logger = logging.getLogger(__name__)
 
@@ -327,9 +328,9 @@ class PredictiveAnalyticsService:
                 ])
                 
                 # Identifica termos frequentes
-                words = all_text.lower().split()
+                words = tokenize(all_text, min_length=4)
                 from collections import Counter
-                common_terms = [term for term, count in Counter(words).most_common(10) if len(term) > 3]
+                common_terms = [term for term, count in Counter(words).most_common(10)]
                 
                 # Gera queries refinadas baseadas no contexto
                 base_context = current_context.lower()
@@ -18,7 +18,6 @@ from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.metrics import mean_squared_error, r2_score
 from textblob import TextBlob
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 import networkx as nx
 import plotly.graph_objects as go
 import plotly.express as px
@@ -26,6 +25,8 @@ from plotly.subplots import make_subplots
 import warnings
 warnings.filterwarnings('ignore')
 
+from engine.model_hub import model_hub
+
 
 @dataclass
 class PredictionResult:
@@ -58,7 +59,6 @@ class PredictiveAnalyticsEngine:
         self.models = {}
         self.scalers = {}
         self.encoders = {}
-        self.sentiment_analyzer = SentimentIntensityAnalyzer()
         self.model_cache = {}
         
         # Configurações de modelos
@@ -76,6 +76,11 @@ class PredictiveAnalyticsEngine:
                 'features': ['traffic_score', 'content_quality', 'social_presence', 'seo_score']
             }
         }
+
+    @property
+    def sentiment_analyzer(self):
+        """VADER compartilhado pelo processo (carregado no primeiro uso)"""
+        return model_hub.get("vader")
     
     async def analyze_market_trends(self, data: Dict[str, Any]) -> TrendAnalysis:
         """
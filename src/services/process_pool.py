@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - Process Pool
+Pool de processos criado no primeiro uso, com fallback para o processo atual
+"""
+
+import os
+import atexit
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+class LazyProcessPool:
+    """ProcessPoolExecutor compartilhado pelo OCR, pelos PDFs e pelas fases preditivas
+
+    O pool só é criado na primeira chamada de get(). O método de início vem
+    de start_method_env (padrão spawn: o processo chamador tem threads, como
+    o writer do auto save e o barramento de eventos, e fork não é seguro).
+    Se o pool estiver desligado ou não puder ser criado, get() devolve None
+    e o chamador executa no processo atual.
+    """
+
+    def __init__(self, name: str, workers: int, start_method_env: str,
+                 initializer: Optional[Callable] = None, enabled: bool = True):
+        self.name = name
+        self.workers = workers
+        self.start_method_env = start_method_env
+        self.initializer = initializer
+        self._executor = None
+        self._disabled = not enabled or workers <= 0
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[ProcessPoolExecutor]:
+        """Executor do pool; None quando o trabalho deve rodar no processo atual"""
+        if self._executor is not None or self._disabled:
+            return self._executor
+        with self._lock:
+            # Outra thread pode ter criado o pool enquanto esta esperava o lock
+            if self._executor is None and not self._disabled:
+                self._create()
+        return self._executor
+
+    def _create(self):
+        """Cria o executor; chamado com o lock"""
+        try:
+            context = multiprocessing.get_context(os.getenv(self.start_method_env, "spawn"))
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=context, initializer=self.initializer
+            )
+            atexit.register(self._executor.shutdown, wait=False, cancel_futures=True)
+            logger.info(f"⚙️ Pool de processos {self.name}: {self.workers} workers")
+        except Exception as e:
+            logger.warning(f"⚠️ Pool de processos {self.name} indisponível, executando no processo atual: {e}")
+            self._disabled = True
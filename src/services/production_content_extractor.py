@@ -49,6 +49,10 @@ class ProductionContentExtractor:
         """Redireciona para RobustContentExtractor"""
         return self.extractor.batch_extract(urls, max_workers)
 
+    def batch_extract_stream(self, urls: List[str], concurrency: Optional[int] = None, deadline: Optional[float] = None):
+        """Redireciona para RobustContentExtractor (gerador assíncrono)"""
+        return self.extractor.batch_extract_stream(urls, concurrency, deadline)
+
     def clear_cache(self):
         """Método de compatibilidade para limpar cache"""
         if hasattr(self.extractor, 'clear_cache'):
@@ -7,7 +7,6 @@ Gerenciador de busca para produção com múltiplos provedores e fallbacks
 
 import os
 import logging
-import time
 import requests
 from typing import Dict, List, Optional, Any
 from urllib.parse import quote_plus
@@ -15,6 +14,7 @@ from bs4 import BeautifulSoup
 import json
 import random
 from services.exa_client import exa_client
+from services.search_cache import search_cache
 
 logger = logging.getLogger(__name__)
 
@@ -67,7 +67,8 @@ class ProductionSearchManager:
             'Connection': 'keep-alive'
         }
 
-        self.cache = {}
+        # Cache persistente compartilhado (SQLite) em vez de dict por processo
+        self.cache = search_cache
         self.cache_ttl = 3600  # 1 hora
 
         enabled_count = sum(1 for p in self.providers.values() if p['enabled'])
@@ -77,12 +78,11 @@ class ProductionSearchManager:
         """Realiza busca com sistema de fallback automático"""
 
         # Verifica cache primeiro
-        cache_key = f"{query}_{max_results}"
-        if cache_key in self.cache:
-            cache_data = self.cache[cache_key]
-            if time.time() - cache_data['timestamp'] < self.cache_ttl:
-                logger.info(f"🔄 Resultado do cache para: {query}")
-                return cache_data['results']
+        cache_params = {'max_results': max_results}
+        cached_results = self.cache.get('production_search', query, cache_params)
+        if cached_results is not None:
+            logger.info(f"🔄 Resultado do cache para: {query}")
+            return cached_results
 
         # Busca com fallback
         for provider_name in self._get_provider_order():
@@ -103,11 +103,7 @@ class ProductionSearchManager:
 
                 if results:
                     # Cache resultado
-                    self.cache[cache_key] = {
-                        'results': results,
-                        'timestamp': time.time(),
-                        'provider': provider_name
-                    }
+                    self.cache.set('production_search', query, results, cache_params, ttl=self.cache_ttl)
 
                     logger.info(f"✅ {provider_name}: {len(results)} resultados")
                     return results
@@ -294,8 +290,7 @@ class ProductionSearchManager:
 
     def clear_cache(self):
         """Limpa cache de busca"""
-        self.cache = {}
-        logger.info("🧹 Cache de busca limpo")
+        self.cache.clear('production_search')
 
     def test_provider(self, provider_name: str) -> bool:
         """Testa um provedor específico"""
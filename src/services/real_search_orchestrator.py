@@ -16,6 +16,9 @@ from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote_plus
 import json
 
+from services.http_session_pool import http_session_pool
+from services.search_cache import search_cache
+
 logger = logging.getLogger(__name__)
 
 class RealSearchOrchestrator:
@@ -157,23 +160,23 @@ class RealSearchOrchestrator:
 
             # Firecrawl
             if 'FIRECRAWL' in self.api_keys:
-                web_tasks.append(self._search_firecrawl(query))
+                web_tasks.append(self._cached_search('FIRECRAWL', query, self._search_firecrawl))
 
             # Jina
             if 'JINA' in self.api_keys:
-                web_tasks.append(self._search_jina(query))
+                web_tasks.append(self._cached_search('JINA', query, self._search_jina))
 
             # Google
             if 'GOOGLE' in self.api_keys:
-                web_tasks.append(self._search_google(query))
+                web_tasks.append(self._cached_search('GOOGLE', query, self._search_google))
 
             # Exa
             if 'EXA' in self.api_keys:
-                web_tasks.append(self._search_exa(query))
+                web_tasks.append(self._cached_search('EXA', query, self._search_exa))
 
             # Serper
             if 'SERPER' in self.api_keys:
-                web_tasks.append(self._search_serper(query))
+                web_tasks.append(self._cached_search('SERPER', query, self._search_serper))
 
             # Executa todas as buscas web simultaneamente
             if web_tasks:
@@ -194,7 +197,7 @@ class RealSearchOrchestrator:
 
             # YouTube
             if 'YOUTUBE' in self.api_keys:
-                social_tasks.append(self._search_youtube(query))
+                social_tasks.append(self._cached_search('YOUTUBE', query, self._search_youtube))
 
             # Supadata (Instagram, Facebook, TikTok)
             # if 'SUPADATA' in self.api_keys:
@@ -252,6 +255,19 @@ class RealSearchOrchestrator:
             logger.error(f"❌ ERRO CRÍTICO na busca massiva: {e}")
             raise
 
+    async def _cached_search(self, provider: str, query: str, search_func) -> Dict[str, Any]:
+        """Consulta o cache persistente antes de chamar o provedor (SQLite fora do event loop)"""
+        cache_params = {'source': 'real_search_orchestrator'}
+        loop = asyncio.get_running_loop()
+        cached = await loop.run_in_executor(None, search_cache.get, provider, query, cache_params)
+        if cached is not None:
+            return cached
+
+        result = await search_func(query)
+        if result.get('success') and result.get('results'):
+            await loop.run_in_executor(None, search_cache.set, provider, query, result, cache_params)
+        return result
+
     async def _search_alibaba_websailor(self, query: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Busca REAL usando Alibaba WebSailor Agent"""
         try:
@@ -263,7 +279,7 @@ class RealSearchOrchestrator:
                 return {'success': False, 'error': 'Alibaba WebSailor não habilitado'}
 
             # Executa a pesquisa profunda - CORRIGIDO: chamando o método correto
-            research_result = await alibaba_websailor.navigate_and_research_deep(
+            research_result = await alibaba_websailor.research_deep_async(
                 query=query,
                 context=context,
                 max_pages=30,
@@ -314,7 +330,7 @@ class RealSearchOrchestrator:
             # Busca no Google e extrai com Firecrawl
             search_url = f"https://www.google.com/search?q={quote_plus(query)}&hl=pt-BR&gl=BR"
 
-            async with aiohttp.ClientSession() as session:
+            async with http_session_pool.session() as session:
                 headers = {
                     'Authorization': f'Bearer {api_key}',
                     'Content-Type': 'application/json'
@@ -373,7 +389,7 @@ class RealSearchOrchestrator:
 
             results = []
 
-            async with aiohttp.ClientSession() as session:
+            async with http_session_pool.session() as session:
                 for search_url in search_urls:
                     try:
                         jina_url = f"{self.service_urls['JINA']}{search_url}"
@@ -415,7 +431,7 @@ class RealSearchOrchestrator:
             if not api_key or not cse_id:
                 return {'success': False, 'error': 'Google API não configurada'}
 
-            async with aiohttp.ClientSession() as session:
+            async with http_session_pool.session() as session:
                 params = {
                     'key': api_key,
                     'cx': cse_id,
@@ -467,7 +483,7 @@ class RealSearchOrchestrator:
             if not api_key:
                 return {'success': False, 'error': 'YouTube API key não disponível'}
 
-            async with aiohttp.ClientSession() as session:
+            async with http_session_pool.session() as session:
                 params = {
                     'part': "snippet,id",
                     'q': f"{query} Brasil",
@@ -561,7 +577,7 @@ class RealSearchOrchestrator:
             if not api_key:
                 return {'success': False, 'error': 'Supadata API key não disponível'}
 
-            async with aiohttp.ClientSession() as session:
+            async with http_session_pool.session() as session:
                 headers = {
                     'Authorization': f'Bearer {api_key}',
                     'Content-Type': 'application/json'
@@ -626,7 +642,7 @@ class RealSearchOrchestrator:
             if not api_key:
                 return {'success': False, 'error': 'X API key não disponível'}
 
-            async with aiohttp.ClientSession() as session:
+            async with http_session_pool.session() as session:
                 headers = {
                     'Authorization': f'Bearer {api_key}',
                     'Content-Type': 'application/json'
@@ -694,7 +710,7 @@ class RealSearchOrchestrator:
             if not api_key:
                 return {'success': False, 'error': 'Exa API key não disponível'}
 
-            async with aiohttp.ClientSession() as session:
+            async with http_session_pool.session() as session:
                 headers = {
                     'x-api-key': api_key,
                     'Content-Type': 'application/json'
@@ -754,7 +770,7 @@ class RealSearchOrchestrator:
             if not api_key:
                 return {'success': False, 'error': 'Serper API key não disponível'}
 
-            async with aiohttp.ClientSession() as session:
+            async with http_session_pool.session() as session:
                 headers = {
                     'X-API-KEY': api_key,
                     'Content-Type': 'application/json'
@@ -882,81 +898,41 @@ class RealSearchOrchestrator:
         return viral_content
 
     async def _capture_viral_screenshots(self, viral_content: List[Dict[str, Any]], session_id: str) -> List[Dict[str, Any]]:
-        """Captura screenshots do conteúdo viral usando Selenium"""
-
-        screenshots = []
+        """Captura screenshots do conteúdo viral em paralelo usando o browser pool"""
 
         try:
-            from selenium import webdriver
-            from selenium.webdriver.chrome.options import Options
-            from selenium.webdriver.chrome.service import Service
-            from selenium.webdriver.common.by import By
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
-            from webdriver_manager.chrome import ChromeDriverManager
-
-            # Configura Chrome em modo headless
-            chrome_options = Options()
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument("--disable-gpu")
-
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=chrome_options)
+            from services.browser_pool import browser_pool
+
+            if not browser_pool.is_available():
+                raise ImportError("selenium")
 
             # Cria diretório para screenshots
             screenshots_dir = f"analyses_data/files/{session_id}"
             os.makedirs(screenshots_dir, exist_ok=True)
 
-            try:
-                for i, content in enumerate(viral_content, 1):
-                    try:
-                        url = content.get('url', '')
-                        if not url:
-                            continue
-
-                        logger.info(f"📸 Capturando screenshot {i}/10: {content.get('title', 'Sem título')}")
-
-                        # Acessa a URL
-                        driver.get(url)
-
-                        # Aguarda carregamento
-                        WebDriverWait(driver, 10).until(
-                            EC.presence_of_element_located((By.TAG_NAME, "body"))
-                        )
-
-                        # Aguarda renderização completa
-                        time.sleep(3)
-
-                        # Captura screenshot
-                        screenshot_path = f"{screenshots_dir}/viral_content_{i:02d}.png"
-                        driver.save_screenshot(screenshot_path)
-
-                        # Verifica se foi criado
-                        if os.path.exists(screenshot_path) and os.path.getsize(screenshot_path) > 0:
-                            screenshots.append({
-                                'content_data': content,
-                                'screenshot_path': screenshot_path,
-                                'filename': f"viral_content_{i:02d}.png",
-                                'url': url,
-                                'title': content.get('title', ''),
-                                'platform': content.get('platform', ''),
-                                'viral_score': content.get('viral_score', 0),
-                                'captured_at': datetime.now().isoformat()
-                            })
+            items = [
+                (i, content) for i, content in enumerate(viral_content, 1)
+                if content.get('url')
+            ]
 
-                            logger.info(f"✅ Screenshot {i} capturado: {screenshot_path}")
-                        else:
-                            logger.warning(f"⚠️ Falha ao capturar screenshot {i}")
+            # Cada URL usa um navegador do pool, com prazo próprio
+            results = await browser_pool.run_parallel(
+                lambda driver, item: self._capture_single_screenshot(driver, item[0], item[1], screenshots_dir),
+                items,
+                max_concurrency=int(os.getenv('SCREENSHOT_CONCURRENCY', browser_pool.max_size)),
+                item_timeout=float(os.getenv('SCREENSHOT_URL_TIMEOUT', '25'))
+            )
 
-                    except Exception as e:
-                        logger.error(f"❌ Erro ao capturar screenshot {i}: {e}")
-                        continue
+            screenshots = []
+            for (i, content), result in zip(items, results):
+                if isinstance(result, Exception):
+                    logger.error(f"❌ Erro ao capturar screenshot {i}: {result}")
+                elif result:
+                    screenshots.append(result)
+                else:
+                    logger.warning(f"⚠️ Falha ao capturar screenshot {i}")
 
-            finally:
-                driver.quit()
+            return screenshots
 
         except ImportError:
             logger.error("❌ Selenium não instalado - screenshots não disponíveis")
@@ -965,7 +941,42 @@ class RealSearchOrchestrator:
             logger.error(f"❌ Erro na captura de screenshots: {e}")
             return []
 
-        return screenshots
+    def _capture_single_screenshot(
+        self,
+        driver,
+        index: int,
+        content: Dict[str, Any],
+        screenshots_dir: str
+    ) -> Optional[Dict[str, Any]]:
+        """Captura um screenshot (executado em thread com navegador emprestado)"""
+        from services.browser_pool import browser_pool
+
+        url = content.get('url', '')
+        logger.info(f"📸 Capturando screenshot {index}/10: {content.get('title', 'Sem título')}")
+
+        # Acessa a URL e espera o DOM/rede estabilizarem em vez de um sleep fixo
+        driver.get(url)
+        browser_pool.wait_for_page_ready(driver, timeout=10)
+
+        # Captura screenshot
+        screenshot_path = f"{screenshots_dir}/viral_content_{index:02d}.png"
+        driver.save_screenshot(screenshot_path)
+
+        # Verifica se foi criado
+        if not (os.path.exists(screenshot_path) and os.path.getsize(screenshot_path) > 0):
+            return None
+
+        logger.info(f"✅ Screenshot {index} capturado: {screenshot_path}")
+        return {
+            'content_data': content,
+            'screenshot_path': screenshot_path,
+            'filename': f"viral_content_{index:02d}.png",
+            'url': url,
+            'title': content.get('title', ''),
+            'platform': content.get('platform', ''),
+            'viral_score': content.get('viral_score', 0),
+            'captured_at': datetime.now().isoformat()
+        }
 
     def _calculate_viral_score(self, stats: Dict[str, Any]) -> float:
         """Calcula score viral para YouTube"""
@@ -1019,7 +1030,10 @@ class RealSearchOrchestrator:
 
     def get_session_statistics(self) -> Dict[str, Any]:
         """Retorna estatísticas da sessão atual"""
-        return self.session_stats.copy()
+        stats = self.session_stats.copy()
+        stats['connection_pool'] = http_session_pool.get_statistics()
+        stats['search_cache'] = search_cache.get_stats()
+        return stats
 
 # Instância global
 real_search_orchestrator = RealSearchOrchestrator()
@@ -11,10 +11,13 @@ import os
 import logging
 import requests
 import json
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, AsyncIterator
 from urllib.parse import urljoin, urlparse
 import re
-import tempfile
+import copy
+import asyncio
+import threading
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from services.auto_save_manager import salvar_etapa, salvar_erro
 
@@ -39,10 +42,10 @@ except ImportError:
     HAS_NEWSPAPER = False
 
 try:
-    from bs4 import BeautifulSoup
-    HAS_BEAUTIFULSOUP = True
+    import lxml.html
+    HAS_LXML = True
 except ImportError:
-    HAS_BEAUTIFULSOUP = False
+    HAS_LXML = False
 
 try:
     import PyPDF2
@@ -63,9 +66,70 @@ except ImportError:
     HAS_PYMUPDF = False
 
 from services.url_resolver import url_resolver
+from services.http_fetch_cache import http_fetch_cache
+from services.pdf_pipeline import pdf_pipeline
 
 logger = logging.getLogger(__name__)
 
+# Extrator informado pelo PDF Pipeline -> chave de estatísticas
+PDF_STATS_KEYS = {'pymupdf': 'pdf_pymupdf', 'pdfplumber': 'pdf_pdfplumber', 'pypdf2': 'pdf_pypdf2'}
+
+def selector_xpath(selector: str) -> str:
+    """XPath equivalente aos seletores simples usados nas heurísticas (.classe, #id, [atributo], tag)"""
+    if selector.startswith('.'):
+        return f"//*[contains(concat(' ', normalize-space(@class), ' '), ' {selector[1:]} ')]"
+    if selector.startswith('#'):
+        return f"//*[@id='{selector[1:]}']"
+    if selector.startswith('['):
+        return f"//*[@{selector[1:-1]}]"
+    return f"//{selector}"
+
+class ParsedPage:
+    """HTML de uma página parseado uma única vez numa árvore lxml compartilhada pelos extratores
+
+    Extratores que modificam a árvore (trafilatura, readability, remoção de
+    scripts/navegação) recebem cópias: o deepcopy de uma árvore lxml custa
+    uma fração de um novo parse. O parse só acontece no primeiro acesso.
+    """
+
+    def __init__(self, html: str, url: str):
+        self.html = html
+        self.url = url
+        self.parses = 0
+        self.dynamic = None
+        self._tree = None
+        self._visible_text = None
+
+    @property
+    def tree(self):
+        if self._tree is None:
+            # Bytes + encoding explícito: aceita páginas com declaração <?xml encoding?>
+            parser = lxml.html.HTMLParser(encoding='utf-8')
+            try:
+                self._tree = lxml.html.document_fromstring(self.html.encode('utf-8', errors='replace'), parser=parser)
+            except (lxml.etree.ParserError, ValueError):
+                # Documento vazio/ilegível: árvore vazia, os extratores só não acham conteúdo
+                self._tree = lxml.html.document_fromstring('<html><body></body></html>')
+            self.parses += 1
+        return self._tree
+
+    def copy(self, drop: Tuple[str, ...] = ()):
+        """Cópia da árvore sem os elementos das tags em drop"""
+        tree = copy.deepcopy(self.tree)
+        if drop:
+            for element in tree.xpath(' | '.join(f'//{tag}' for tag in drop)):
+                element.drop_tree()
+        return tree
+
+    @property
+    def visible_text(self) -> str:
+        """Texto fora de script/style (sem copiar a árvore)"""
+        if self._visible_text is None:
+            self._visible_text = ''.join(self.tree.xpath(
+                '//text()[not(ancestor::script) and not(ancestor::style)]'
+            ))
+        return self._visible_text
+
 class RobustContentExtractor:
     """Extrator de conteúdo multicamadas e robusto com suporte aprimorado a PDF"""
 
@@ -89,7 +153,9 @@ class RobustContentExtractor:
             'trafilatura': {'success': 0, 'failed': 0, 'total_time': 0, 'usage_count': 0, 'available': HAS_TRAFILATURA},
             'readability': {'success': 0, 'failed': 0, 'total_time': 0, 'usage_count': 0, 'available': HAS_READABILITY},
             'newspaper': {'success': 0, 'failed': 0, 'total_time': 0, 'usage_count': 0, 'available': HAS_NEWSPAPER},
-            'beautifulsoup': {'success': 0, 'failed': 0, 'total_time': 0, 'usage_count': 0, 'available': HAS_BEAUTIFULSOUP},
+            'beautifulsoup': {'success': 0, 'failed': 0, 'total_time': 0, 'usage_count': 0, 'available': HAS_LXML},
+            'dynamic': {'success': 0, 'failed': 0, 'total_time': 0, 'usage_count': 0, 'available': HAS_LXML},
+            'aggressive_fallback': {'success': 0, 'failed': 0, 'total_time': 0, 'usage_count': 0, 'available': HAS_LXML},
             'pdf_pypdf2': {'success': 0, 'failed': 0, 'total_time': 0, 'usage_count': 0, 'available': HAS_PYPDF2},
             'pdf_pdfplumber': {'success': 0, 'failed': 0, 'total_time': 0, 'usage_count': 0, 'available': HAS_PDFPLUMBER},
             'pdf_pymupdf': {'success': 0, 'failed': 0, 'total_time': 0, 'usage_count': 0, 'available': HAS_PYMUPDF},
@@ -101,6 +167,33 @@ class RobustContentExtractor:
             }
         }
 
+        # Cascata de extratores HTML (ordem padrão) sobre uma única ParsedPage
+        self.html_extractors = {
+            'dynamic': self._extract_dynamic_content,
+            'trafilatura': self._extract_with_trafilatura,
+            'readability': self._extract_with_readability,
+            'newspaper': self._extract_with_newspaper,
+            'beautifulsoup': self._extract_with_beautifulsoup,
+            'aggressive_fallback': self._aggressive_fallback_extraction
+        }
+        self.cascade_order = list(self.html_extractors)
+        self.success_steps = {'dynamic': 'extracao_dinamica', 'aggressive_fallback': 'extracao_fallback'}
+
+        # Vencedor da cascata por domínio (LRU limitado) e contadores da cascata
+        self.max_domains = int(os.getenv("EXTRACTOR_MAX_DOMAINS", "2000"))
+        self.domain_stats: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self.cascade_stats = {'pages': 0, 'extractors_tried': 0, 'html_parses': 0, 'first_try_hits': 0}
+        self._domain_lock = threading.Lock()
+
+        # Lotes assíncronos (batch_extract_stream)
+        self.batch_concurrency = int(os.getenv("EXTRACTOR_BATCH_CONCURRENCY", "10"))
+        self.batch_deadline = float(os.getenv("EXTRACTOR_BATCH_DEADLINE", "120"))
+        self.batch_workers = int(os.getenv("EXTRACTOR_BATCH_WORKERS", str(min(4, os.cpu_count() or 1))))
+        self.batch_pdf_workers = int(os.getenv("EXTRACTOR_BATCH_PDF_WORKERS", "2"))
+        self.batch_stats = {'batches': 0, 'delivered': 0, 'retries': 0, 'deadline_expired': 0}
+        self._batch_executor: Optional[ThreadPoolExecutor] = None
+        self._pdf_executor: Optional[ThreadPoolExecutor] = None
+
         logger.info("🔧 Robust Content Extractor inicializado")
         logger.info(f"📚 Extratores disponíveis: {self._get_available_extractors()}")
 
@@ -140,41 +233,25 @@ class RobustContentExtractor:
 
             # 2. Verifica se é PDF
             if self._is_pdf_url(url):
-                logger.info("📄 Detectado PDF - usando extratores especializados")
-                # PRIORIDADE MÁXIMA: PyMuPDF primeiro
-                from services.pymupdf_client import pymupdf_client
-                if pymupdf_client.is_available():
-                    logger.info("🚀 Usando PyMuPDF Pro com PRIORIDADE MÁXIMA")
-                    pdf_result = pymupdf_client.extract_from_url(url)
-                    if pdf_result.get('success') and pdf_result.get('text'):
-                        content = pdf_result['text']
-                        if self._validate_content(content, url):
-                            salvar_etapa("extracao_pymupdf_pro", {
-                                "url": url,
-                                "content_length": len(content),
-                                "pages": pdf_result.get('metadata', {}).get('pages', 0),
-                                "extractor": "PyMuPDF_Pro_Priority"
-                            }, categoria="pesquisa_web")
-                            self.stats['global']['total_successes'] += 1
-                            self._update_global_stats()
-                            logger.info(f"✅ PyMuPDF Pro SUCESSO: {len(content)} caracteres")
-                            return content
-
-                # Fallback para outros extratores de PDF
-                content = self._extract_pdf_content(url)
+                logger.info("📄 Detectado PDF - usando pipeline de PDF (PyMuPDF em paralelo, cache por hash)")
+                content, pdf_metadata = self._extract_pdf_content(url)
                 if content and self._validate_content(content, url):
                     # Salva extração de PDF bem-sucedida
                     salvar_etapa("extracao_pdf", {
                         "url": url,
                         "content_length": len(content),
-                        "extractor": "pdf_specialized"
+                        "pages": pdf_metadata.get('pages', 0),
+                        "pages_extracted": pdf_metadata.get('pages_extracted', 0),
+                        "cached": pdf_metadata.get('cached', False),
+                        "extractor": pdf_metadata.get('extractor', 'pdf_specialized')
                     }, categoria="pesquisa_web")
                     self.stats['global']['total_successes'] += 1
                     self._update_global_stats()
                     return content
 
-            # 3. Baixa conteúdo HTML
-            html_content = self._fetch_html(url)
+            # 3. Baixa conteúdo HTML (cache HTTP compartilhado)
+            response = self._fetch_response(url)
+            html_content = response.text if response is not None else None
             if not html_content:
                 logger.error(f"❌ Falha ao baixar HTML para {url}")
                 salvar_erro("download_html", Exception(f"Falha no download: {url}"))
@@ -189,79 +266,9 @@ class RobustContentExtractor:
 
             logger.info(f"📥 HTML baixado: {len(html_content)} caracteres")
 
-            # 4. Verifica se é página dinâmica (JavaScript-heavy)
-            if self._is_dynamic_page(html_content):
-                logger.warning(f"⚠️ Página dinâmica detectada: {url}")
-                # Tenta extração mais agressiva
-                content = self._extract_dynamic_content(html_content, url)
-                if content and self._validate_content(content, url):
-                    # Salva extração dinâmica bem-sucedida
-                    salvar_etapa("extracao_dinamica", {
-                        "url": url,
-                        "content_length": len(content),
-                        "extractor": "dynamic_specialized"
-                    }, categoria="pesquisa_web")
-                    self.stats['global']['total_successes'] += 1
-                    self._update_global_stats()
-                    return content
-
-            # 5. Tenta extratores em ordem de prioridade
-            extractors = [
-                ('trafilatura', self._extract_with_trafilatura),
-                ('readability', self._extract_with_readability),
-                ('newspaper', self._extract_with_newspaper),
-                ('beautifulsoup', self._extract_with_beautifulsoup)
-            ]
-
-            for extractor_name, extractor_func in extractors:
-                if not self._is_extractor_available(extractor_name):
-                    continue
-
-                try:
-                    logger.info(f"🔍 Tentando extração com {extractor_name}...")
-                    extractor_start = time.time()
-                    self.stats[extractor_name]['usage_count'] += 1
-
-                    content = extractor_func(html_content, url)
-                    extractor_time = time.time() - extractor_start
-
-                    if self._validate_content(content, url):
-                        self.stats[extractor_name]['success'] += 1
-                        self.stats[extractor_name]['total_time'] += extractor_time
-                        self.stats['global']['total_successes'] += 1
-                        self._update_global_stats()
-
-                        # Salva extração bem-sucedida
-                        salvar_etapa("extracao_sucesso", {
-                            "url": url,
-                            "extractor": extractor_name,
-                            "content_length": len(content),
-                            "extraction_time": extractor_time
-                        }, categoria="pesquisa_web")
-
-                        logger.info(f"✅ Extração bem-sucedida com {extractor_name}: {len(content)} caracteres em {extractor_time:.2f}s")
-                        return content
-                    else:
-                        self.stats[extractor_name]['failed'] += 1
-                        logger.warning(f"⚠️ Conteúdo insuficiente com {extractor_name}: {len(content) if content else 0} caracteres")
-
-                except Exception as e:
-                    self.stats[extractor_name]['failed'] += 1
-                    logger.error(f"❌ Erro com {extractor_name}: {str(e)}")
-                    salvar_erro(f"extrator_{extractor_name}", e, contexto={"url": url})
-                    continue
-
-            # 6. Fallback final - extração agressiva
-            logger.warning(f"⚠️ Todos os extratores padrão falharam, tentando extração agressiva...")
-            content = self._aggressive_fallback_extraction(html_content, url)
-            if content and len(content) >= 100:  # Critério mais flexível para fallback
-                logger.info(f"✅ Extração agressiva bem-sucedida: {len(content)} caracteres")
-                # Salva fallback bem-sucedido
-                salvar_etapa("extracao_fallback", {
-                    "url": url,
-                    "content_length": len(content),
-                    "extractor": "aggressive_fallback"
-                }, categoria="pesquisa_web")
+            # 4. Texto já extraído deste corpo ou cascata de extratores
+            content, extractor_name = self._extract_from_response(response, url)
+            if content:
                 self.stats['global']['total_successes'] += 1
                 self._update_global_stats()
                 return content
@@ -286,156 +293,181 @@ class RobustContentExtractor:
                 'pdf' in url.lower() or 
                 'application/pdf' in url.lower())
 
-    def _extract_pdf_content(self, url: str) -> Optional[str]:
-        """Extrai conteúdo de PDF usando múltiplas estratégias"""
-
-        try:
-            # Baixa o PDF
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
-
-            # Salva temporariamente
-            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
-                temp_file.write(response.content)
-                temp_path = temp_file.name
+    def _extract_pdf_content(self, url: str, deadline: Optional[float] = None) -> Tuple[Optional[str], Dict[str, Any]]:
+        """Extrai conteúdo de PDF pelo PDF Pipeline; devolve (conteúdo, metadados)
 
-            try:
-                # Tenta PDFPlumber primeiro (melhor para PDFs complexos)
-                if HAS_PDFPLUMBER:
-                    content = self._extract_pdf_with_pdfplumber(temp_path)
-                    if content and len(content) > 100:
-                        self.stats['pdf_pdfplumber']['success'] += 1
-                        logger.info(f"✅ PDF extraído com PDFPlumber: {len(content)} caracteres")
-                        return content
-                    else:
-                        self.stats['pdf_pdfplumber']['failed'] += 1
-
-                # Tenta PyMuPDF se disponível
-                if HAS_PYMUPDF:
-                    content = self._extract_pdf_with_pymupdf(temp_path)
-                    if content and len(content) > 100:
-                        self.stats['pdf_pymupdf']['success'] += 1
-                        logger.info(f"✅ PDF extraído com PyMuPDF: {len(content)} caracteres")
-                        return content
-                    else:
-                        self.stats['pdf_pymupdf']['failed'] += 1
-
-                # Fallback para PyPDF2
-                if HAS_PYPDF2:
-                    content = self._extract_pdf_with_pypdf2(temp_path)
-                    if content and len(content) > 100:
-                        self.stats['pdf_pypdf2']['success'] += 1
-                        logger.info(f"✅ PDF extraído com PyPDF2: {len(content)} caracteres")
-                        return content
-                    else:
-                        self.stats['pdf_pypdf2']['failed'] += 1
-
-                logger.error(f"❌ Falha na extração de PDF: {url}")
-                return None
-
-            finally:
-                # Remove arquivo temporário
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
-
-        except Exception as e:
-            logger.error(f"❌ Erro ao processar PDF {url}: {str(e)}")
-            return None
-
-    def _extract_pdf_with_pdfplumber(self, pdf_path: str) -> Optional[str]:
-        """Extrai texto usando PDFPlumber"""
-        try:
-            import pdfplumber
+        PyMuPDF primeiro (páginas em paralelo, parada antecipada), pdfplumber e
+        PyPDF2 de fallback sobre o mesmo arquivo baixado uma única vez.
+        deadline (time.monotonic()) interrompe o download, como nos lotes.
+        """
+        start_time = time.time()
+        result = pdf_pipeline.extract_from_url(url, session=self.session, timeout=self.timeout, deadline=deadline)
+        metadata = result.get('metadata', {})
+        stats_key = PDF_STATS_KEYS.get(metadata.get('extractor'))
+
+        if not result.get('success'):
+            for key in PDF_STATS_KEYS.values():
+                if self.stats[key]['available']:
+                    self.stats[key]['failed'] += 1
+            logger.error(f"❌ Falha na extração de PDF {url}: {result.get('error')}")
+            return None, metadata
+
+        if stats_key:
+            self.stats[stats_key]['success'] += 1
+            self.stats[stats_key]['usage_count'] += 1
+            self.stats[stats_key]['total_time'] += time.time() - start_time
+        content = self._clean_content(result['text'])
+        logger.info(f"✅ PDF extraído com {metadata.get('extractor')}: {len(content)} caracteres")
+        return content, metadata
+
+    def _extract_from_response(self, response, url: str) -> Tuple[Optional[str], Optional[str]]:
+        """Texto da página baixada: o já extraído do mesmo corpo (cache fresco ou 304) ou a cascata
+
+        A cascata roda sobre uma única árvore lxml, começando pelo extrator que
+        venceu da última vez neste domínio; o resultado fica no cache HTTP.
+        """
+        cached_content = response.extracted.get('robust_content_extractor')
+        if cached_content:
+            logger.info(f"✅ Texto extraído em cache para {url}: {len(cached_content)} caracteres")
+            return cached_content, 'cache'
 
-            text = ""
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+        content, extractor_name = self._run_cascade(ParsedPage(response.text, url))
+        if content:
+            http_fetch_cache.store_extracted(response, 'robust_content_extractor', content)
+        return content, extractor_name
 
-            return self._clean_content(text) if text else None
+    def _strategy_order(self, domain: str, page: 'ParsedPage') -> List[str]:
+        """Ordem da cascata para o domínio: o último vencedor primeiro, depois a ordem padrão
 
-        except Exception as e:
-            logger.error(f"Erro PDFPlumber: {e}")
-            return None
+        'dynamic' só entra em páginas JavaScript-heavy; a extração agressiva
+        (validação mais frouxa) fica sempre por último.
+        """
+        order = [name for name in self.cascade_order if name != 'dynamic' or self._is_dynamic_page(page)]
+        with self._domain_lock:
+            record = self.domain_stats.get(domain)
+            winner = record.get('winner') if record else None
+        if winner in order and winner != 'aggressive_fallback':
+            order.remove(winner)
+            order.insert(0, winner)
+        return order
+
+    def _run_cascade(self, page: 'ParsedPage') -> Tuple[Optional[str], Optional[str]]:
+        """Tenta os extratores em ordem até um conteúdo válido; registra o vencedor do domínio"""
+        url = page.url
+        domain = urlparse(url).netloc.lower()
+        order = self._strategy_order(domain, page)
+        if 'dynamic' in order:
+            logger.warning(f"⚠️ Página dinâmica detectada: {url}")
+
+        tried = 0
+        content, winner = None, None
+        for extractor_name in order:
+            if not self._is_extractor_available(extractor_name):
+                continue
 
-    def _extract_pdf_with_pypdf2(self, pdf_path: str) -> Optional[str]:
-        """Extrai texto usando PyPDF2"""
-        try:
-            import PyPDF2
+            tried += 1
+            try:
+                logger.info(f"🔍 Tentando extração com {extractor_name}...")
+                extractor_start = time.time()
+                self.stats[extractor_name]['usage_count'] += 1
 
-            text = ""
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+                candidate = self.html_extractors[extractor_name](page)
+                extractor_time = time.time() - extractor_start
 
-            return self._clean_content(text) if text else None
+                # Fallback agressivo: critério mais flexível
+                if extractor_name == 'aggressive_fallback':
+                    valid = bool(candidate) and len(candidate) >= 100
+                else:
+                    valid = self._validate_content(candidate, url)
 
-        except Exception as e:
-            logger.error(f"Erro PyPDF2: {e}")
-            return None
+                if valid:
+                    self.stats[extractor_name]['success'] += 1
+                    self.stats[extractor_name]['total_time'] += extractor_time
+                    content, winner = candidate, extractor_name
 
-    def _extract_pdf_with_pymupdf(self, pdf_path: str) -> Optional[str]:
-        """Extrai texto usando PyMuPDF"""
-        try:
-            import fitz
+                    # Salva extração bem-sucedida
+                    salvar_etapa(self.success_steps.get(extractor_name, "extracao_sucesso"), {
+                        "url": url,
+                        "extractor": extractor_name,
+                        "content_length": len(content),
+                        "extraction_time": extractor_time,
+                        "extractors_tried": tried
+                    }, categoria="pesquisa_web")
 
-            doc = fitz.open(pdf_path)
-            text = ""
+                    logger.info(f"✅ Extração bem-sucedida com {extractor_name}: {len(content)} caracteres em {extractor_time:.2f}s")
+                    break
+                else:
+                    self.stats[extractor_name]['failed'] += 1
+                    logger.warning(f"⚠️ Conteúdo insuficiente com {extractor_name}: {len(candidate) if candidate else 0} caracteres")
 
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                page_text = page.get_text()
-                if page_text:
-                    text += page_text + "\n"
+            except Exception as e:
+                self.stats[extractor_name]['failed'] += 1
+                logger.error(f"❌ Erro com {extractor_name}: {str(e)}")
+                salvar_erro(f"extrator_{extractor_name}", e, contexto={"url": url})
+                continue
 
-            doc.close()
-            return self._clean_content(text) if text else None
+        self._record_domain_result(domain, winner, tried, page.parses)
+        return content, winner
 
-        except Exception as e:
-            logger.error(f"Erro PyMuPDF: {e}")
-            return None
+    def _record_domain_result(self, domain: str, winner: Optional[str], tried: int, parses: int):
+        """Atualiza o vencedor do domínio e os contadores da cascata"""
+        with self._domain_lock:
+            cascade = self.cascade_stats
+            cascade['pages'] += 1
+            cascade['extractors_tried'] += tried
+            cascade['html_parses'] += parses
 
-    def _is_dynamic_page(self, html: str) -> bool:
+            record = self.domain_stats.pop(domain, None) or {
+                'winner': None, 'wins': {}, 'pages': 0, 'first_try_hits': 0, 'failures': 0
+            }
+            record['pages'] += 1
+            if winner is None:
+                record['failures'] += 1
+            else:
+                if tried == 1:
+                    record['first_try_hits'] += 1
+                    cascade['first_try_hits'] += 1
+                record['winner'] = winner
+                record['wins'][winner] = record['wins'].get(winner, 0) + 1
+
+            # Reinsere no fim: o domínio menos recente é o primeiro a sair
+            self.domain_stats[domain] = record
+            while len(self.domain_stats) > self.max_domains:
+                self.domain_stats.popitem(last=False)
+
+    def _is_dynamic_page(self, page: 'ParsedPage') -> bool:
         """Verifica se é página dinâmica (JavaScript-heavy)"""
+        html = page.html
         if not html:
             return False
 
-        # Indicadores de página dinâmica
-        dynamic_indicators = [
-            'react', 'angular', 'vue.js', 'spa-',
-            'document.write', 'innerHTML', 'createElement',
-            'loading...', 'carregando...', 'please enable javascript',
-            'javascript required', 'js-', 'ng-', 'v-'
-        ]
+        if page.dynamic is None:
+            # Indicadores de página dinâmica
+            dynamic_indicators = [
+                'react', 'angular', 'vue.js', 'spa-',
+                'document.write', 'innerHTML', 'createElement',
+                'loading...', 'carregando...', 'please enable javascript',
+                'javascript required', 'js-', 'ng-', 'v-'
+            ]
 
-        html_lower = html.lower()
-        js_indicators = sum(1 for indicator in dynamic_indicators if indicator in html_lower)
+            html_lower = html.lower()
+            js_indicators = sum(1 for indicator in dynamic_indicators if indicator in html_lower)
 
-        # Se tem muitos indicadores JS e pouco conteúdo de texto
-        text_content = BeautifulSoup(html, 'html.parser').get_text() if HAS_BEAUTIFULSOUP else html
-        text_ratio = len(text_content.strip()) / len(html) if html else 0
+            # Só mede o texto visível (e parseia) se houver indícios de JS
+            if js_indicators <= 3:
+                page.dynamic = False
+            else:
+                # Se tem muitos indicadores JS e pouco conteúdo de texto
+                text_ratio = len(page.visible_text.strip()) / len(html)
+                page.dynamic = text_ratio < 0.1
 
-        return js_indicators > 3 and text_ratio < 0.1
+        return page.dynamic
 
-    def _extract_dynamic_content(self, html: str, url: str) -> Optional[str]:
+    def _extract_dynamic_content(self, page: 'ParsedPage') -> Optional[str]:
         """Extração especializada para conteúdo dinâmico"""
-
-        if not HAS_BEAUTIFULSOUP:
-            return None
-
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-
             # Remove scripts e elementos dinâmicos
-            for element in soup(['script', 'style', 'noscript', 'iframe']):
-                element.decompose()
+            tree = page.copy(drop=('script', 'style', 'noscript', 'iframe'))
 
             # Busca por elementos com conteúdo pré-renderizado
             content_selectors = [
@@ -448,42 +480,28 @@ class RobustContentExtractor:
             extracted_content = []
 
             for selector in content_selectors:
-                try:
-                    elements = soup.select(selector)
-                    for element in elements:
-                        text = element.get_text(strip=True)
-                        if len(text) > 50:  # Conteúdo substancial
-                            extracted_content.append(text)
-                except:
-                    continue
+                for element in tree.xpath(selector_xpath(selector)):
+                    text = ''.join(part.strip() for part in element.itertext())
+                    if len(text) > 50:  # Conteúdo substancial
+                        extracted_content.append(text)
 
             if extracted_content:
                 combined = '\n\n'.join(extracted_content)
                 return self._clean_content(combined)
 
             # Fallback: extrai todo texto disponível
-            all_text = soup.get_text()
+            all_text = tree.text_content()
             return self._clean_content(all_text) if len(all_text) > 100 else None
 
         except Exception as e:
             logger.error(f"Erro na extração dinâmica: {e}")
             return None
 
-    def _aggressive_fallback_extraction(self, html: str, url: str) -> Optional[str]:
+    def _aggressive_fallback_extraction(self, page: 'ParsedPage') -> Optional[str]:
         """Extração agressiva como último recurso"""
-
-        if not HAS_BEAUTIFULSOUP:
-            return None
-
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-
-            # Remove apenas elementos críticos
-            for element in soup(['script', 'style']):
-                element.decompose()
-
-            # Coleta todo texto disponível
-            all_text = soup.get_text()
+            # Remove apenas elementos críticos e coleta todo texto disponível
+            all_text = page.copy(drop=('script', 'style')).text_content()
 
             # Filtra linhas com conteúdo significativo
             lines = all_text.split('\n')
@@ -508,23 +526,28 @@ class RobustContentExtractor:
 
     def _fetch_html(self, url: str) -> Optional[str]:
         """Baixa conteúdo HTML da URL com retry"""
+        response = self._fetch_response(url)
+        return response.text if response is not None else None
+
+    def _fetch_response(self, url: str):
+        """Baixa a página pelo cache HTTP compartilhado, com retry
+
+        Novas tentativas revalidam a entrada em vez de servir a mesma cópia.
+        """
         max_retries = 3
 
         for attempt in range(max_retries):
             try:
-                response = self.session.get(
+                response = http_fetch_cache.fetch(
                     url,
                     timeout=self.timeout,
+                    session=self.session,
                     verify=False,  # Para evitar problemas de SSL
-                    allow_redirects=True
+                    revalidate=attempt > 0
                 )
 
                 response.raise_for_status()
 
-                # Detecta encoding
-                if response.encoding is None:
-                    response.encoding = 'utf-8'
-
                 html = response.text
 
                 if len(html) < 500:
@@ -533,7 +556,7 @@ class RobustContentExtractor:
                         time.sleep(2)  # Aguarda antes de tentar novamente
                         continue
 
-                return html
+                return response
 
             except requests.exceptions.Timeout:
                 logger.warning(f"⏰ Timeout na tentativa {attempt + 1} para {url}")
@@ -548,7 +571,7 @@ class RobustContentExtractor:
 
         return None
 
-    def _extract_with_trafilatura(self, html: str, url: str) -> Optional[str]:
+    def _extract_with_trafilatura(self, page: 'ParsedPage') -> Optional[str]:
         """Extrai com Trafilatura (prioridade 1) com configurações aprimoradas"""
         if not HAS_TRAFILATURA:
             return None
@@ -556,19 +579,18 @@ class RobustContentExtractor:
         try:
             # Configurações mais agressivas para trafilatura
             content = trafilatura.extract(
-                html,
+                page.copy(),
                 include_comments=False,
                 include_tables=True,
                 include_formatting=False,
                 favor_precision=False,  # Mudado para False para ser mais inclusivo
                 favor_recall=True,      # Prioriza recuperar mais conteúdo
-                url=url,
+                url=page.url,
                 config=trafilatura.settings.use_config()
             )
 
             if content:
-                content = self._clean_content(content)
-                return content
+                return self._clean_content(content)
 
             return None
 
@@ -576,27 +598,20 @@ class RobustContentExtractor:
             logger.error(f"Erro Trafilatura: {e}")
             return None
 
-    def _extract_with_readability(self, html: str, url: str) -> Optional[str]:
+    def _extract_with_readability(self, page: 'ParsedPage') -> Optional[str]:
         """Extrai com Readability (prioridade 2) com configurações aprimoradas"""
         if not HAS_READABILITY:
             return None
 
         try:
             # Configurações mais inclusivas
-            doc = Document(html, positive_keywords=['content', 'article', 'post', 'text', 'main'])
+            doc = Document(page.copy(), positive_keywords=['content', 'article', 'post', 'text', 'main'])
             content = doc.summary()
 
             if content:
-                # Remove tags HTML
-                if HAS_BEAUTIFULSOUP:
-                    soup = BeautifulSoup(content, 'html.parser')
-                    content = soup.get_text()
-                else:
-                    # Remove tags manualmente
-                    content = re.sub(r'<[^>]+>', '', content)
-
-                content = self._clean_content(content)
-                return content
+                # Remove tags HTML do resumo (fragmento pequeno)
+                content = lxml.html.fromstring(content).text_content()
+                return self._clean_content(content)
 
             return None
 
@@ -604,20 +619,23 @@ class RobustContentExtractor:
             logger.error(f"Erro Readability: {e}")
             return None
 
-    def _extract_with_newspaper(self, html: str, url: str) -> Optional[str]:
-        """Extrai com Newspaper3k (prioridade 3) com configurações aprimoradas"""
+    def _extract_with_newspaper(self, page: 'ParsedPage') -> Optional[str]:
+        """Extrai com Newspaper3k (prioridade 3) com configurações aprimoradas
+
+        O newspaper3k só aceita HTML em texto e faz o próprio parse.
+        """
         if not HAS_NEWSPAPER:
             return None
 
         try:
-            article = Article(url)
-            article.set_html(html)
+            article = Article(page.url)
+            article.set_html(page.html)
             article.parse()
+            page.parses += 1
 
             content = article.text
             if content:
-                content = self._clean_content(content)
-                return content
+                return self._clean_content(content)
 
             return None
 
@@ -625,52 +643,50 @@ class RobustContentExtractor:
             logger.error(f"Erro Newspaper: {e}")
             return None
 
-    def _extract_with_beautifulsoup(self, html: str, url: str) -> Optional[str]:
-        """Extrai com BeautifulSoup (fallback final) com estratégia aprimorada"""
-        if not HAS_BEAUTIFULSOUP:
-            return None
+    def _extract_with_beautifulsoup(self, page: 'ParsedPage') -> Optional[str]:
+        """Extração heurística sobre a árvore (fallback final)
 
+        Mantém o nome 'beautifulsoup' nas estatísticas por compatibilidade;
+        as heurísticas rodam sobre a mesma árvore lxml dos outros extratores.
+        """
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-
-            # Remove scripts e styles
-            for script in soup(['script', 'style', 'nav', 'header', 'footer', 'aside', 'form']):
-                script.decompose()
+            # Remove scripts, styles e navegação
+            tree = page.copy(drop=('script', 'style', 'nav', 'header', 'footer', 'aside', 'form'))
 
             # Estratégia em camadas para encontrar conteúdo
             content_strategies = [
                 # Estratégia 1: Elementos semânticos
-                lambda: self._extract_semantic_content(soup),
+                self._extract_semantic_content,
                 # Estratégia 2: Elementos por classe/ID
-                lambda: self._extract_by_selectors(soup),
+                self._extract_by_selectors,
                 # Estratégia 3: Maior bloco de texto
-                lambda: self._extract_largest_text_block(soup),
+                self._extract_largest_text_block,
                 # Estratégia 4: Todo o body
-                lambda: self._extract_full_body(soup)
+                self._extract_full_body
             ]
 
             for strategy in content_strategies:
                 try:
-                    content = strategy()
+                    content = strategy(tree)
                     if content and len(content) > 100:
                         return self._clean_content(content)
-                except:
+                except Exception:
                     continue
 
             return None
 
         except Exception as e:
-            logger.error(f"Erro BeautifulSoup: {e}")
+            logger.error(f"Erro na extração heurística: {e}")
             return None
 
-    def _extract_semantic_content(self, soup) -> Optional[str]:
+    def _extract_semantic_content(self, tree) -> Optional[str]:
         """Extrai usando elementos semânticos HTML5"""
-        semantic_elements = soup.find_all(['article', 'main', 'section'])
+        semantic_elements = tree.xpath('//article | //main | //section')
 
         if semantic_elements:
             content_parts = []
             for element in semantic_elements:
-                text = element.get_text()
+                text = element.text_content()
                 if len(text) > 50:
                     content_parts.append(text)
 
@@ -679,7 +695,7 @@ class RobustContentExtractor:
 
         return None
 
-    def _extract_by_selectors(self, soup) -> Optional[str]:
+    def _extract_by_selectors(self, tree) -> Optional[str]:
         """Extrai usando seletores CSS comuns"""
         content_selectors = [
             '.content', '#content', '.post', '.article',
@@ -689,44 +705,39 @@ class RobustContentExtractor:
         ]
 
         for selector in content_selectors:
-            try:
-                elements = soup.select(selector)
-                if elements:
-                    content_parts = []
-                    for element in elements:
-                        text = element.get_text()
-                        if len(text) > 50:
-                            content_parts.append(text)
-
-                    if content_parts:
-                        return '\n\n'.join(content_parts)
-            except:
-                continue
+            elements = tree.xpath(selector_xpath(selector))
+            if elements:
+                content_parts = []
+                for element in elements:
+                    text = element.text_content()
+                    if len(text) > 50:
+                        content_parts.append(text)
+
+                if content_parts:
+                    return '\n\n'.join(content_parts)
 
         return None
 
-    def _extract_largest_text_block(self, soup) -> Optional[str]:
+    def _extract_largest_text_block(self, tree) -> Optional[str]:
         """Encontra e extrai o maior bloco de texto"""
-        all_divs = soup.find_all(['div', 'section', 'article'])
-
         largest_text = ""
         largest_size = 0
 
-        for div in all_divs:
-            text = div.get_text()
+        for div in tree.xpath('//div | //section | //article'):
+            text = div.text_content()
             if len(text) > largest_size:
                 largest_size = len(text)
                 largest_text = text
 
         return largest_text if largest_size > 100 else None
 
-    def _extract_full_body(self, soup) -> Optional[str]:
+    def _extract_full_body(self, tree) -> Optional[str]:
         """Extrai todo o conteúdo do body como último recurso"""
-        body = soup.find('body')
-        if body:
-            return body.get_text()
+        body = tree.find('body')
+        if body is not None:
+            return body.text_content()
         else:
-            return soup.get_text()
+            return tree.text_content()
 
     def _clean_content(self, content: str) -> str:
         """Limpa e normaliza o conteúdo extraído com melhorias"""
@@ -858,17 +869,29 @@ class RobustContentExtractor:
                     stats['reason'] = 'Biblioteca readability-lxml não instalada'
                 elif extractor_name == 'newspaper' and not HAS_NEWSPAPER:
                     stats['reason'] = 'Biblioteca newspaper3k não instalada'
-                elif extractor_name == 'beautifulsoup' and not HAS_BEAUTIFULSOUP:
-                    stats['reason'] = 'Biblioteca beautifulsoup4 não instalada'
+                elif extractor_name in ('beautifulsoup', 'dynamic', 'aggressive_fallback') and not HAS_LXML:
+                    stats['reason'] = 'Biblioteca lxml não instalada'
                 elif extractor_name == 'pdf_pypdf2' and not HAS_PYPDF2:
                     stats['reason'] = 'Biblioteca PyPDF2 não instalada'
                 elif extractor_name == 'pdf_pdfplumber' and not HAS_PDFPLUMBER:
                     stats['reason'] = 'Biblioteca pdfplumber não instalada'
 
     def get_extractor_stats(self) -> Dict[str, Any]:
-        """Retorna estatísticas dos extratores"""
+        """Retorna estatísticas dos extratores, da cascata e o vencedor de cada domínio"""
         self._update_global_stats()
-        return self.stats.copy()
+        with self._domain_lock:
+            pages = self.cascade_stats['pages']
+            cascade = {
+                **self.cascade_stats,
+                'avg_extractors_per_page': round(self.cascade_stats['extractors_tried'] / pages, 2) if pages else 0.0,
+                'avg_parses_per_page': round(self.cascade_stats['html_parses'] / pages, 2) if pages else 0.0,
+                'first_try_rate': self.cascade_stats['first_try_hits'] / pages if pages else 0.0
+            }
+            domains = {
+                domain: {**record, 'wins': dict(record['wins'])}
+                for domain, record in self.domain_stats.items()
+            }
+        return {**self.stats, 'cascade': cascade, 'domains': domains, 'batch': dict(self.batch_stats)}
 
     def reset_extractor_stats(self, extractor_name: Optional[str] = None):
         """Reset estatísticas dos extratores"""
@@ -894,6 +917,13 @@ class RobustContentExtractor:
                 'total_failures': 0,
                 'success_rate': 0.0
             }
+
+            # Contadores zerados; o vencedor aprendido de cada domínio é mantido
+            with self._domain_lock:
+                self.cascade_stats = {'pages': 0, 'extractors_tried': 0, 'html_parses': 0, 'first_try_hits': 0}
+                for record in self.domain_stats.values():
+                    record.update({'wins': {}, 'pages': 0, 'first_try_hits': 0, 'failures': 0})
+            self.batch_stats = {'batches': 0, 'delivered': 0, 'retries': 0, 'deadline_expired': 0}
             logger.info("🔄 Reset estatísticas de todos os extratores")
 
     def batch_extract(self, urls: List[str], max_workers: int = 5) -> Dict[str, Optional[str]]:
@@ -914,6 +944,198 @@ class RobustContentExtractor:
 
         return results
 
+    async def batch_extract_stream(
+        self,
+        urls: List[str],
+        concurrency: Optional[int] = None,
+        deadline: Optional[float] = None
+    ) -> AsyncIterator[Tuple[str, Optional[str], Dict[str, Any]]]:
+        """Extrai várias URLs e entrega (url, conteúdo, metadados) na ordem de conclusão
+
+        Os downloads usam a sessão aiohttp do HTTP Session Pool (via cache
+        HTTP) e as esperas entre tentativas são asyncio.sleep, sem prender
+        threads; a cascata de extratores (CPU) roda num pool de threads e os
+        PDFs num pool próprio, com o download limitado pelo prazo. Ao fim do prazo do lote (segundos, EXTRACTOR_BATCH_DEADLINE)
+        as URLs pendentes são canceladas e entregues com conteúdo None e
+        error='deadline'. Toda URL (sem duplicatas) é entregue uma vez.
+        """
+        concurrency = concurrency or self.batch_concurrency
+        deadline = deadline if deadline is not None else self.batch_deadline
+        deadline_at = time.monotonic() + deadline
+        semaphore = asyncio.Semaphore(concurrency)
+
+        pending = {
+            asyncio.ensure_future(self._extract_one_async(url, semaphore, deadline_at)): url
+            for url in dict.fromkeys(urls)
+        }
+        self.batch_stats['batches'] += 1
+        logger.info(f"🚀 Extração em lote (stream) de {len(pending)} URLs, concorrência {concurrency}, prazo {deadline:.0f}s")
+
+        try:
+            while pending:
+                remaining = deadline_at - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, _ = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    url = pending.pop(task)
+                    try:
+                        content, metadata = task.result()
+                    except Exception as e:
+                        logger.error(f"Erro na extração paralela de {url}: {e}")
+                        content, metadata = None, {'error': str(e)}
+                    self.batch_stats['delivered'] += 1
+                    yield url, content, metadata
+
+            # Prazo do lote esgotado: hosts lentos não seguram o resto da coleta
+            for task, url in list(pending.items()):
+                task.cancel()
+                del pending[task]
+                self.batch_stats['deadline_expired'] += 1
+                logger.warning(f"⏰ Prazo do lote esgotado para {url}")
+                yield url, None, {'error': 'deadline', 'elapsed': round(deadline, 3)}
+        finally:
+            # Consumidor interrompeu o stream (break/aclose): cancela o que faltou
+            for task in pending:
+                task.cancel()
+
+    async def _extract_one_async(
+        self,
+        url: str,
+        semaphore: asyncio.Semaphore,
+        deadline_at: float
+    ) -> Tuple[Optional[str], Dict[str, Any]]:
+        """Extração de uma URL do lote; devolve (conteúdo, metadados)"""
+        start = time.monotonic()
+        metadata: Dict[str, Any] = {'extractor': None, 'attempts': 0, 'from_cache': False}
+
+        def finish(content: Optional[str], error: Optional[str] = None):
+            metadata['elapsed'] = round(time.monotonic() - start, 3)
+            metadata['content_length'] = len(content) if content else 0
+            if error:
+                metadata['error'] = error
+            return content, metadata
+
+        self.stats['global']['total_extractions'] += 1
+        content, error = None, None
+        if not url or not url.startswith('http'):
+            logger.error(f"❌ URL inválida: {url}")
+            error = 'url_invalida'
+        elif self._is_pdf_url(url):
+            async with semaphore:
+                content, error = await self._extract_pdf_async(url, deadline_at, metadata)
+        else:
+            async with semaphore:
+                content, error = await self._extract_html_async(url, deadline_at, metadata)
+
+        self.stats['global']['total_successes' if content else 'total_failures'] += 1
+        self._update_global_stats()
+        return finish(content, error)
+
+    async def _extract_pdf_async(
+        self,
+        url: str,
+        deadline_at: float,
+        metadata: Dict[str, Any]
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """PDF no pool de PDFs, com o download interrompido no prazo do lote; devolve (conteúdo, erro)
+
+        Um PDF lento não ocupa as threads da cascata nem passa do prazo
+        baixando em segundo plano depois do lote ter sido entregue.
+        """
+        metadata['attempts'] = 1
+        content, pdf_metadata = await asyncio.get_running_loop().run_in_executor(
+            self._get_pdf_executor(), self._extract_pdf_content, url, deadline_at
+        )
+        metadata['extractor'] = pdf_metadata.get('extractor') or 'pdf'
+        metadata['from_cache'] = pdf_metadata.get('cached', False)
+        if not content or not self._validate_content(content, url):
+            return None, 'deadline' if time.monotonic() >= deadline_at else 'extracao'
+        return content, None
+
+    async def _extract_html_async(
+        self,
+        url: str,
+        deadline_at: float,
+        metadata: Dict[str, Any]
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Download assíncrono e cascata no pool de threads; devolve (conteúdo, erro)"""
+        response = await self._fetch_response_async(url, deadline_at, metadata)
+        if response is None:
+            salvar_erro("download_html", Exception(f"Falha no download: {url}"))
+            return None, metadata.pop('error', None) or 'download'
+        metadata.pop('error', None)
+
+        metadata.update({'final_url': response.url, 'status': response.status_code,
+                         'from_cache': response.from_cache})
+        content, extractor_name = await asyncio.get_running_loop().run_in_executor(
+            self._get_batch_executor(), self._extract_from_response, response, url
+        )
+        metadata['extractor'] = extractor_name
+        if not content:
+            logger.error(f"❌ FALHA CRÍTICA: Todos os extratores falharam para {url}")
+            return None, 'extracao'
+        return content, None
+
+    async def _fetch_response_async(self, url: str, deadline_at: float, metadata: Dict[str, Any]):
+        """Como _fetch_response, mas assíncrono e limitado pelo prazo do lote
+
+        O backoff entre tentativas é asyncio.sleep e nunca passa do prazo.
+        """
+        max_retries = 3
+
+        for attempt in range(max_retries):
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                metadata['error'] = 'deadline'
+                return None
+            metadata['attempts'] = attempt + 1
+            delay = 2 + random.uniform(0, 2)
+            try:
+                response = await http_fetch_cache.fetch_async(
+                    url,
+                    headers=dict(self.session.headers),
+                    timeout=min(self.timeout, remaining),
+                    verify=False,  # Para evitar problemas de SSL
+                    revalidate=attempt > 0
+                )
+                response.raise_for_status()
+
+                if len(response.content) < 500:
+                    logger.warning(f"⚠️ HTML muito pequeno (tentativa {attempt + 1}): {len(response.content)} caracteres")
+                    if attempt < max_retries - 1 and deadline_at - time.monotonic() > 2:
+                        await asyncio.sleep(2)
+                        continue
+
+                return response
+
+            except asyncio.TimeoutError:
+                logger.warning(f"⏰ Timeout na tentativa {attempt + 1} para {url}")
+                metadata['error'] = 'timeout'
+            except Exception as e:
+                logger.error(f"❌ Erro ao baixar {url} (tentativa {attempt + 1}): {str(e)}")
+                metadata['error'] = str(e) or type(e).__name__
+
+            if attempt < max_retries - 1:
+                if deadline_at - time.monotonic() <= delay:
+                    break
+                self.batch_stats['retries'] += 1
+                await asyncio.sleep(delay)
+
+        return None
+
+    def _get_batch_executor(self) -> ThreadPoolExecutor:
+        """Pool de threads compartilhado pelos lotes, só para a cascata de extratores (CPU)"""
+        if self._batch_executor is None:
+            self._batch_executor = ThreadPoolExecutor(max_workers=self.batch_workers, thread_name_prefix="extractor")
+        return self._batch_executor
+
+    def _get_pdf_executor(self) -> ThreadPoolExecutor:
+        """Pool de threads dos lotes para PDFs (download e extração bloqueantes)"""
+        if self._pdf_executor is None:
+            self._pdf_executor = ThreadPoolExecutor(max_workers=self.batch_pdf_workers, thread_name_prefix="extractor-pdf")
+        return self._pdf_executor
+
     def test_extraction(self, url: str) -> Dict[str, Any]:
         """Testa extração para uma URL específica com detalhes"""
         start_time = time.time()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - Save Event Bus
+Barramento de eventos de salvamento com assinantes executados em pool de workers
+"""
+
+import os
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+class SaveEventBus:
+    """Publica eventos de 'etapa salva' para assinantes assíncronos
+
+    publish() apenas agenda o trabalho; os assinantes rodam em um pool de
+    threads, então quem salva nunca espera processamento derivado (NLP,
+    scores). Um assinante pode informar dedup_key para que o mesmo conteúdo
+    não seja processado duas vezes.
+    """
+
+    def __init__(self):
+        """Inicializa o barramento (o pool de workers é criado no primeiro evento)"""
+        self.max_workers = int(os.getenv("SAVE_EVENT_WORKERS", "2"))
+        self.max_pending = int(os.getenv("SAVE_EVENT_MAX_PENDING", "1000"))
+        self.dedup_size = int(os.getenv("SAVE_EVENT_DEDUP_SIZE", "10000"))
+
+        self._subscribers = []
+        self._executor = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0
+        self._seen = OrderedDict()
+
+        self.stats = {
+            'published': 0,
+            'dispatched': 0,
+            'deduplicated': 0,
+            'dropped': 0,
+            'failed': 0
+        }
+
+    def subscribe(self, name: str, handler: Callable[[Dict[str, Any]], None],
+                  dedup_key: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None):
+        """Registra um assinante
+
+        Args:
+            name: identificador do assinante (também separa o espaço de dedup)
+            handler: chamado com o evento; deve ignorar eventos que não lhe interessam
+            dedup_key: retorna o conteúdo que identifica o trabalho, ou None para sempre executar
+        """
+        self._subscribers.append((name, handler, dedup_key))
+        logger.info(f"📡 Assinante '{name}' registrado no Save Event Bus")
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="save_event")
+        return self._executor
+
+    def publish(self, event: Dict[str, Any]):
+        """Agenda o evento para todos os assinantes sem bloquear o chamador"""
+        self.stats['published'] += 1
+
+        for name, handler, dedup_key in self._subscribers:
+            with self._lock:
+                if self._pending >= self.max_pending:
+                    self.stats['dropped'] += 1
+                    logger.warning(f"⚠️ Save Event Bus saturado, evento descartado para '{name}'")
+                    continue
+                self._pending += 1
+                executor = self._get_executor()
+            executor.submit(self._dispatch, name, handler, dedup_key, event)
+
+    @staticmethod
+    def _digest(name: str, content: str) -> str:
+        return hashlib.sha1(f"{name}\x00{content}".encode('utf-8', 'ignore')).hexdigest()
+
+    def _already_seen(self, digest: str) -> bool:
+        """Marca o conteúdo como processado; True se já tinha sido visto (LRU limitado)
+
+        A marca vale já durante o processamento, para que cópias simultâneas
+        do mesmo evento não rodem em paralelo; _forget a desfaz se o
+        assinante falhar.
+        """
+        with self._lock:
+            if digest in self._seen:
+                self._seen.move_to_end(digest)
+                return True
+            self._seen[digest] = True
+            while len(self._seen) > self.dedup_size:
+                self._seen.popitem(last=False)
+            return False
+
+    def _forget(self, digest: str):
+        """Desfaz a marca de um conteúdo cujo processamento falhou"""
+        with self._lock:
+            self._seen.pop(digest, None)
+
+    def _dispatch(self, name: str, handler: Callable, dedup_key: Optional[Callable], event: Dict[str, Any]):
+        digest = None
+        try:
+            if dedup_key is not None:
+                content = dedup_key(event)
+                if content is None:
+                    return
+                digest = self._digest(name, content)
+                if self._already_seen(digest):
+                    self.stats['deduplicated'] += 1
+                    return
+            self.stats['dispatched'] += 1
+            handler(event)
+        except Exception as e:
+            # Falhou: o mesmo conteúdo pode ser reprocessado num próximo evento
+            if digest is not None:
+                self._forget(digest)
+            self.stats['failed'] += 1
+            logger.warning(f"⚠️ Assinante '{name}' falhou para {event.get('nome_etapa')}: {e}")
+        finally:
+            with self._lock:
+                self._pending -= 1
+                if self._pending == 0:
+                    self._idle.notify_all()
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Espera todos os eventos agendados terminarem"""
+        deadline = None if timeout is None else time.time() + timeout
+        with self._lock:
+            while self._pending > 0:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores do barramento"""
+        with self._lock:
+            pending = self._pending
+        return {
+            **self.stats,
+            'pending': pending,
+            'subscribers': [name for name, _, _ in self._subscribers],
+            'workers': self.max_workers
+        }
+
+# Instância global
+save_event_bus = SaveEventBus()
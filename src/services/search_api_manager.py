@@ -8,11 +8,13 @@ Gerenciador de APIs de busca com rotação automática
 import os
 import logging
 import asyncio
-import aiohttp
 import time
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+from services.http_session_pool import http_session_pool
+from services.search_cache import search_cache
+
 logger = logging.getLogger(__name__)
 
 class SearchAPIManager:
@@ -91,19 +93,19 @@ class SearchAPIManager:
         search_tasks = []
         
         if 'SERPER' in self.api_keys:
-            search_tasks.append(('SERPER', self._search_serper(query)))
+            search_tasks.append(('SERPER', self._cached_search('SERPER', query, self._search_serper)))
         
         if 'GOOGLE' in self.api_keys:
-            search_tasks.append(('GOOGLE', self._search_google(query)))
+            search_tasks.append(('GOOGLE', self._cached_search('GOOGLE', query, self._search_google)))
         
         if 'EXA' in self.api_keys:
-            search_tasks.append(('EXA', self._search_exa(query)))
+            search_tasks.append(('EXA', self._cached_search('EXA', query, self._search_exa)))
         
         if 'FIRECRAWL' in self.api_keys:
-            search_tasks.append(('FIRECRAWL', self._search_firecrawl(query)))
+            search_tasks.append(('FIRECRAWL', self._cached_search('FIRECRAWL', query, self._search_firecrawl)))
         
         if 'JINA' in self.api_keys:
-            search_tasks.append(('JINA', self._search_jina(query)))
+            search_tasks.append(('JINA', self._cached_search('JINA', query, self._search_jina)))
         
         # Executa buscas em paralelo
         if search_tasks:
@@ -112,6 +114,8 @@ class SearchAPIManager:
             
             for i, result in enumerate(results):
                 provider_name = search_tasks[i][0]
+                # Resultados vindos do cache não passam por get_next_api_key
+                self.provider_stats.setdefault(provider_name, {'requests': 0, 'successes': 0, 'failures': 0})
                 
                 if isinstance(result, Exception):
                     logger.error(f"❌ Erro em {provider_name}: {result}")
@@ -136,6 +140,19 @@ class SearchAPIManager:
         logger.info(f"✅ Busca intercalada concluída: {search_results['successful_searches']} sucessos")
         return search_results
 
+    async def _cached_search(self, provider: str, query: str, search_func) -> Dict[str, Any]:
+        """Consulta o cache persistente antes de chamar o provedor (SQLite fora do event loop)"""
+        cache_params = {'source': 'search_api_manager'}
+        loop = asyncio.get_running_loop()
+        cached = await loop.run_in_executor(None, search_cache.get, provider, query, cache_params)
+        if cached is not None:
+            return cached
+
+        result = await search_func(query)
+        if result.get('success') and result.get('results'):
+            await loop.run_in_executor(None, search_cache.set, provider, query, result, cache_params)
+        return result
+
     async def _search_serper(self, query: str) -> Dict[str, Any]:
         """Busca usando Serper API"""
         try:
@@ -143,7 +160,7 @@ class SearchAPIManager:
             if not api_key:
                 return {'success': False, 'error': 'Serper API key não disponível'}
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session_pool.session() as session:
                 headers = {
                     'X-API-KEY': api_key,
                     'Content-Type': 'application/json'
@@ -195,7 +212,7 @@ class SearchAPIManager:
             if not api_key or not cse_id:
                 return {'success': False, 'error': 'Google API não configurado'}
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session_pool.session() as session:
                 params = {
                     'key': api_key,
                     'cx': cse_id,
@@ -241,7 +258,7 @@ class SearchAPIManager:
             if not api_key:
                 return {'success': False, 'error': 'Exa API key não disponível'}
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session_pool.session() as session:
                 headers = {
                     'x-api-key': api_key,
                     'Content-Type': 'application/json'
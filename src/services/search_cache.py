@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - Search Cache
+Cache persistente (SQLite) de resultados de busca compartilhado entre processos
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import unicodedata
+from typing import Dict, Any, Optional
+
+from services.sqlite_cache import SQLiteCache
+
+logger = logging.getLogger(__name__)
+
+def _json_default(value: Any) -> Any:
+    """Tipos do numpy voltam como tipos Python (um hit devolve o mesmo tipo que o miss)"""
+    if hasattr(value, 'dtype'):
+        return value.item() if getattr(value, 'ndim', 0) == 0 else value.tolist()
+    return str(value)
+
+class SearchCache(SQLiteCache):
+    """Cache de resultados de busca com TTL, despejo LRU e backend em disco
+
+    A chave combina provedor, query normalizada e parâmetros da chamada.
+    Conexões, despejo e contadores de hit/miss por provedor (gravados em
+    lote a cada SEARCH_CACHE_FLUSH_EVERY leituras ou
+    SEARCH_CACHE_FLUSH_INTERVAL segundos) vêm do SQLiteCache.
+    """
+
+    label = "Search Cache"
+    table = "search_cache"
+    key_columns = ('cache_key',)
+
+    def __init__(self, db_path: str = None, default_ttl: int = None, max_entries: int = None):
+        """Inicializa o cache e cria o schema se necessário"""
+        self.default_ttl = default_ttl if default_ttl is not None else int(os.getenv('SEARCH_CACHE_TTL', '21600'))
+        super().__init__(
+            db_path=db_path or os.getenv('SEARCH_CACHE_PATH', 'cache/search_cache.sqlite3'),
+            max_entries=max_entries or int(os.getenv('SEARCH_CACHE_MAX_ENTRIES', '5000')),
+            enabled=os.getenv('SEARCH_CACHE_ENABLED', 'true').lower() != 'false',
+            flush_every=int(os.getenv('SEARCH_CACHE_FLUSH_EVERY', '100')),
+            flush_interval=float(os.getenv('SEARCH_CACHE_FLUSH_INTERVAL', '30'))
+        )
+        if self.enabled:
+            logger.info(f"💾 Search Cache inicializado em {self.db_path} (TTL {self.default_ttl}s, máx {self.max_entries})")
+
+    def _create_tables(self, conn: sqlite3.Connection):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS search_cache (
+                cache_key TEXT PRIMARY KEY,
+                provider TEXT NOT NULL,
+                query TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        ''')
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Normaliza a query: unicode NFKC, minúsculas e espaços colapsados"""
+        normalized = unicodedata.normalize('NFKC', query or '')
+        return ' '.join(normalized.lower().split())
+
+    def make_key(self, provider: str, query: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Gera a chave (provedor, query normalizada, parâmetros)"""
+        payload = json.dumps(
+            [provider.upper(), self.normalize_query(query), params or {}],
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, provider: str, query: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """Retorna o valor em cache ou None se ausente/expirado"""
+        if not self.enabled:
+            return None
+
+        try:
+            conn = self._get_connection()
+            key = self.make_key(provider, query, params)
+            row = conn.execute(
+                'SELECT value, expires_at FROM search_cache WHERE cache_key = ?', (key,)
+            ).fetchone()
+
+            if row is None or row[1] < time.time():
+                if row is not None:
+                    conn.execute('DELETE FROM search_cache WHERE cache_key = ?', (key,))
+                self._count('misses', provider.upper())
+                return None
+
+            self._touch(key)
+            self._count('hits', provider.upper())
+            logger.info(f"🔄 Cache hit {provider}: {query[:60]}")
+            return json.loads(row[0])
+
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao ler Search Cache: {e}")
+            return None
+
+    def set(self, provider: str, query: str, value: Any,
+            params: Optional[Dict[str, Any]] = None, ttl: Optional[int] = None):
+        """Grava um valor com TTL e aplica o limite de tamanho (LRU)"""
+        if not self.enabled:
+            return
+
+        try:
+            conn = self._get_connection()
+            now = time.time()
+            conn.execute(
+                '''INSERT OR REPLACE INTO search_cache
+                   (cache_key, provider, query, value, created_at, expires_at, last_access)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                (
+                    self.make_key(provider, query, params),
+                    provider.upper(),
+                    self.normalize_query(query),
+                    json.dumps(value, ensure_ascii=False, default=_json_default),
+                    now,
+                    now + (ttl if ttl is not None else self.default_ttl),
+                    now
+                )
+            )
+            self._count('writes', provider.upper())
+            self._wrote()
+
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao gravar Search Cache: {e}")
+
+    def evict(self):
+        """Remove entradas expiradas e as menos usadas acima de max_entries"""
+        self._get_connection().execute('DELETE FROM search_cache WHERE expires_at < ?', (time.time(),))
+        super().evict()
+
+    def clear(self, provider: Optional[str] = None):
+        """Limpa o cache inteiro ou apenas um provedor"""
+        if not self.enabled:
+            return
+        if not provider:
+            super().clear()
+            return
+        self._get_connection().execute('DELETE FROM search_cache WHERE provider = ?', (provider.upper(),))
+        logger.info(f"🧹 Search Cache limpo ({provider})")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna contadores de hit/miss por provedor (agregados entre processos)"""
+        if not self.enabled:
+            return {'enabled': False}
+
+        try:
+            providers = {}
+            for (provider, event), count in self._counters().items():
+                providers.setdefault(provider, {'hits': 0, 'misses': 0, 'writes': 0})[event] = count
+            for counts in providers.values():
+                lookups = counts['hits'] + counts['misses']
+                counts['hit_rate'] = counts['hits'] / lookups if lookups else 0.0
+
+            return {**self._base_stats(), 'providers': providers}
+
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao ler estatísticas do Search Cache: {e}")
+            return {'enabled': True, 'error': str(e)}
+
+# Instância global
+search_cache = SearchCache()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - Session Event Store
+Log de eventos append-only (JSONL) por sessão para etapas, trechos web e erros
+"""
+
+import os
+import json
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    # Windows: sem flock; o log assume um único processo escritor
+    HAS_FCNTL = False
+
+logger = logging.getLogger(__name__)
+
+class SessionEventStore:
+    """Um arquivo JSONL por sessão, aberto em modo append
+
+    Cada salvamento vira uma linha compacta no log da sessão em vez de um
+    arquivo novo. O log é a fonte da verdade; as visões por etapa gravadas
+    pelo AutoSaveManager podem ser reconstruídas a partir dele.
+    """
+
+    def __init__(self, base_path: str = None):
+        """Inicializa o store (arquivos são abertos sob demanda)"""
+        self.base_path = base_path or os.getenv("SESSION_EVENTS_PATH", "relatorios_intermediarios/eventos")
+        self.fsync = os.getenv("SESSION_EVENTS_FSYNC", "false").lower() == "true"
+        self.max_open_files = int(os.getenv("SESSION_EVENTS_MAX_OPEN", "32"))
+
+        self._lock = threading.Lock()
+        self._handles = OrderedDict()
+        self._sequences = {}
+        self._known_sizes = {}
+
+        os.makedirs(self.base_path, exist_ok=True)
+        logger.info(f"📒 Session Event Store inicializado em {self.base_path}")
+
+    @staticmethod
+    def _session_key(session_id: Optional[str]) -> str:
+        """Nome seguro do arquivo da sessão (eventos sem sessão vão para _global)"""
+        if not session_id:
+            return "_global"
+        return "".join(c for c in str(session_id) if c.isalnum() or c in ('_', '-'))[:128] or "_global"
+
+    def log_path(self, session_id: Optional[str]) -> str:
+        """Caminho do log JSONL da sessão"""
+        return os.path.join(self.base_path, f"{self._session_key(session_id)}.jsonl")
+
+    def _get_handle(self, key: str):
+        """Handle de append mantido aberto (LRU limitado por max_open_files)"""
+        handle = self._handles.get(key)
+        if handle is not None:
+            self._handles.move_to_end(key)
+            return handle
+
+        handle = open(os.path.join(self.base_path, f"{key}.jsonl"), 'ab')
+        self._handles[key] = handle
+        while len(self._handles) > self.max_open_files:
+            _, oldest = self._handles.popitem(last=False)
+            oldest.close()
+        return handle
+
+    def _sync_sequence(self, key: str, size: int):
+        """Retoma a sequência da sessão a partir das linhas que este processo não gravou
+
+        Chamado com o flock do log, então as linhas de outros processos (ou
+        de uma execução anterior) já estão completas.
+        """
+        start = self._known_sizes.get(key, 0)
+        if key in self._sequences and start == size:
+            return
+        last = self._sequences.get(key, 0)
+        for _, _, event in self._iter_file(os.path.join(self.base_path, f"{key}.jsonl"), start):
+            last = max(last, event.get("seq", 0))
+        self._sequences[key] = last
+
+    def _next_sequence(self, key: str) -> int:
+        """Sequência monotônica por sessão"""
+        self._sequences[key] += 1
+        return self._sequences[key]
+
+    def append(self, session_id: Optional[str], tipo: str, nome: str, dados: Any,
+               categoria: str = None) -> Tuple[str, int]:
+        """Acrescenta um evento ao log da sessão
+
+        Returns:
+            (caminho do log, offset em bytes da linha gravada)
+        """
+        payload = json.dumps(dados, ensure_ascii=False, separators=(',', ':'), default=str)
+        offsets = self.append_many(session_id, [(tipo, nome, categoria, payload)])
+        return self.log_path(session_id), offsets[0]
+
+    def append_many(self, session_id: Optional[str], records: List[Tuple]) -> List[int]:
+        """Acrescenta vários eventos já serializados com uma única escrita
+
+        Cada registro é (tipo, nome, categoria, dados_json[, view_key]);
+        dados_json é inserido como está, sem nova serialização, e view_key
+        separa as visões materializadas de eventos sem session_id.
+
+        Vários processos (ex.: workers do gunicorn) podem escrever no mesmo
+        log: offsets e seq são calculados e a linha é gravada sob flock.
+
+        Returns:
+            offsets em bytes de cada linha, na ordem dos registros
+        """
+        key = self._session_key(session_id)
+        ts = datetime.now().isoformat()
+
+        with self._lock:
+            handle = self._get_handle(key)
+            if HAS_FCNTL:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                return self._write_records(key, handle, session_id, ts, records)
+            finally:
+                if HAS_FCNTL:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def _write_records(self, key: str, handle, session_id: Optional[str], ts: str, records: List[Tuple]) -> List[int]:
+        """Serializa e grava os registros; chamado com o lock do log"""
+        offset = os.fstat(handle.fileno()).st_size
+        self._sync_sequence(key, offset)
+        offsets = []
+        lines = []
+        for tipo, nome, categoria, payload, *extra in records:
+            meta = {
+                "tipo": tipo,
+                "nome": nome,
+                "categoria": categoria,
+                "session_id": session_id,
+                "ts": ts,
+                "seq": self._next_sequence(key)
+            }
+            if extra and extra[0] is not None:
+                meta["view_key"] = extra[0]
+            envelope = json.dumps(meta, ensure_ascii=False, separators=(',', ':'), default=str)
+            line = f'{envelope[:-1]},"dados":{payload}}}\n'.encode('utf-8')
+            offsets.append(offset)
+            lines.append(line)
+            offset += len(line)
+
+        handle.write(b"".join(lines))
+        handle.flush()
+        if self.fsync:
+            os.fsync(handle.fileno())
+        self._known_sizes[key] = offset
+
+        return offsets
+
+    def read_at(self, session_id: Optional[str], offset: int) -> Optional[Dict[str, Any]]:
+        """Lê o evento gravado no offset informado"""
+        try:
+            with open(self.log_path(session_id), 'rb') as f:
+                f.seek(offset)
+                return json.loads(f.readline().decode('utf-8'))
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Evento inválido em {session_id}@{offset}: {e}")
+            return None
+
+    @staticmethod
+    def _iter_file(path: str, start: int = 0) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        """Itera (offset, próximo offset, evento) a partir de start
+
+        Linhas corrompidas são ignoradas; uma última linha sem quebra (escrita
+        em andamento ou truncada por crash) encerra a leitura.
+        """
+        if not os.path.exists(path):
+            return
+        with open(path, 'rb') as f:
+            f.seek(start)
+            offset = start
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    return
+                next_offset = offset + len(raw)
+                try:
+                    yield offset, next_offset, json.loads(raw.decode('utf-8'))
+                except ValueError:
+                    logger.warning(f"⚠️ Linha corrompida ignorada em {path}@{offset}")
+                offset = next_offset
+
+    def iter_events(self, session_id: Optional[str], tipo: str = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Itera os eventos da sessão em ordem de gravação, opcionalmente filtrando por tipo"""
+        for offset, _, event in self._iter_file(self.log_path(session_id)):
+            if tipo is None or event.get("tipo") == tipo:
+                yield offset, event
+
+    def scan(self, session_id: Optional[str], start: int = 0) -> Tuple[list, int]:
+        """Eventos gravados a partir de start e o offset onde a leitura parou"""
+        events = []
+        end = start
+        for offset, next_offset, event in self._iter_file(self.log_path(session_id), start):
+            events.append((offset, event))
+            end = next_offset
+        return events, end
+
+    def list_sessions(self) -> list:
+        """Sessões que possuem log gravado"""
+        return sorted(
+            name[:-len(".jsonl")] for name in os.listdir(self.base_path) if name.endswith(".jsonl")
+        )
+
+    def close_session(self, session_id: Optional[str]):
+        """Fecha o handle de append da sessão"""
+        with self._lock:
+            handle = self._handles.pop(self._session_key(session_id), None)
+        if handle:
+            handle.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Arquivos abertos e tamanho total dos logs"""
+        total_bytes = 0
+        sessions = self.list_sessions()
+        for key in sessions:
+            try:
+                total_bytes += os.path.getsize(os.path.join(self.base_path, f"{key}.jsonl"))
+            except OSError:
+                pass
+        with self._lock:
+            open_files = len(self._handles)
+        return {
+            'path': self.base_path,
+            'sessions': len(sessions),
+            'open_files': open_files,
+            'total_bytes': total_bytes,
+            'fsync': self.fsync
+        }
+
+# Instância global
+session_event_store = SessionEventStore()
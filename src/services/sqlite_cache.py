@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - SQLite Cache
+Base dos caches persistentes em SQLite: conexão WAL por thread, despejo LRU e contadores gravados em lote
+"""
+
+import os
+import json
+import time
+import atexit
+import sqlite3
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Limite de parâmetros por consulta do SQLite
+_SQL_BATCH = 500
+
+class SQLiteCache:
+    """Base do Search Cache, do HTTP Fetch Cache e dos caches por hash de conteúdo
+
+    O arquivo SQLite em modo WAL sobrevive a reinícios e é compartilhado
+    pelos workers do gunicorn; cada thread tem a própria conexão. A tabela
+    de entradas (table) tem uma coluna last_access e é identificada por
+    key_columns. Leituras não escrevem no disco: last_access e contadores
+    (tabela <table>_counters, agregada entre processos) ficam em memória e
+    são gravados numa transação a cada flush_every registros ou
+    flush_interval segundos. A cada eviction_interval gravações as entradas
+    menos usadas acima de max_entries são removidas (LRU).
+
+    Subclasses definem label, table e key_columns e criam as próprias
+    tabelas em _create_tables.
+    """
+
+    label = "SQLite Cache"
+    table = ""
+    key_columns: Tuple[str, ...] = ()
+    eviction_interval = 50
+
+    def __init__(self, db_path: str, max_entries: int, enabled: bool = True,
+                 flush_every: int = 100, flush_interval: float = 30.0):
+        """Abre o arquivo e cria o schema; em caso de erro o cache fica desativado"""
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+
+        self._local = threading.local()
+        self._writes_since_eviction = 0
+        self._pending_lock = threading.Lock()
+        self._pending_access: Dict[Tuple, float] = {}
+        self._pending_counts: Dict[Tuple[str, str], int] = {}
+        self._pending_records = 0
+        self._last_flush = time.time()
+
+        if self.enabled:
+            try:
+                directory = os.path.dirname(self.db_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._init_schema()
+                atexit.register(self.flush)
+            except Exception as e:
+                logger.error(f"❌ Erro ao inicializar {self.label}, cache desativado: {e}")
+                self.enabled = False
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Uma conexão por thread (conexões SQLite não são compartilháveis entre threads)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        conn = self._get_connection()
+        self._create_tables(conn)
+        conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{self.table}_lru ON {self.table} (last_access)')
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {self.table}_counters (
+                scope TEXT NOT NULL,
+                event TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (scope, event)
+            )
+        ''')
+
+    def _create_tables(self, conn: sqlite3.Connection):
+        """Cria a tabela de entradas (com last_access) e as auxiliares da subclasse"""
+        raise NotImplementedError
+
+    @contextmanager
+    def _transaction(self):
+        """BEGIN/COMMIT na conexão da thread, com ROLLBACK em caso de erro"""
+        conn = self._get_connection()
+        conn.execute('BEGIN')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    def _count(self, event: str, scope: str = '', amount: int = 1):
+        """Soma um contador em memória até o próximo flush"""
+        if not self.enabled:
+            return
+        with self._pending_lock:
+            counter = (scope, event)
+            self._pending_counts[counter] = self._pending_counts.get(counter, 0) + amount
+            self._pending_records += 1
+        self._maybe_flush()
+
+    def _touch(self, *key):
+        """Marca o acesso à entrada (valores de key_columns) em memória até o próximo flush"""
+        if not self.enabled:
+            return
+        with self._pending_lock:
+            self._pending_access[key] = time.time()
+            self._pending_records += 1
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        with self._pending_lock:
+            due = (self._pending_records >= self.flush_every
+                   or time.time() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Grava last_access e contadores acumulados numa única transação"""
+        if not self.enabled:
+            return
+        with self._pending_lock:
+            access, counts = self._pending_access, self._pending_counts
+            self._pending_access, self._pending_counts = {}, {}
+            self._pending_records = 0
+            self._last_flush = time.time()
+        if not access and not counts:
+            return
+
+        where = ' AND '.join(f'{column} = ?' for column in self.key_columns)
+        try:
+            with self._transaction() as conn:
+                if access:
+                    conn.executemany(
+                        f'UPDATE {self.table} SET last_access = MAX(last_access, ?) WHERE {where}',
+                        [(accessed, *key) for key, accessed in access.items()]
+                    )
+                if counts:
+                    conn.executemany(
+                        f'''INSERT INTO {self.table}_counters (scope, event, count) VALUES (?, ?, ?)
+                            ON CONFLICT(scope, event) DO UPDATE SET count = count + excluded.count''',
+                        [(scope, event, amount) for (scope, event), amount in counts.items()]
+                    )
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao gravar acessos do {self.label}: {e}")
+
+    def _counters(self) -> Dict[Tuple[str, str], int]:
+        """Contadores agregados entre processos ({(scope, event): count}), já com os pendentes"""
+        self.flush()
+        return {
+            (scope, event): count for scope, event, count in
+            self._get_connection().execute(f'SELECT scope, event, count FROM {self.table}_counters')
+        }
+
+    def _wrote(self, count: int = 1):
+        """Registra gravações e aplica o limite de tamanho a cada eviction_interval"""
+        self._writes_since_eviction += count
+        if self._writes_since_eviction >= self.eviction_interval:
+            self._writes_since_eviction = 0
+            self.evict()
+
+    def evict(self):
+        """Remove as entradas menos usadas acima de max_entries"""
+        self.flush()
+        self._get_connection().execute(
+            f'''DELETE FROM {self.table} WHERE rowid IN (
+                    SELECT rowid FROM {self.table} ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )''',
+            (self.max_entries,)
+        )
+
+    def clear(self):
+        """Limpa o cache inteiro"""
+        if not self.enabled:
+            return
+        with self._pending_lock:
+            self._pending_access = {}
+        self._get_connection().execute(f'DELETE FROM {self.table}')
+        logger.info(f"🧹 {self.label} limpo")
+
+    def _base_stats(self) -> Dict[str, Any]:
+        """Campos comuns de get_stats (caminho, entradas em disco e limite)"""
+        entries = self._get_connection().execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+        return {'enabled': True, 'path': self.db_path, 'entries': entries, 'max_entries': self.max_entries}
+
+class ContentHashCache(SQLiteCache):
+    """Resultados JSON indexados por (hash do conteúdo, versão do processamento)
+
+    O mesmo conteúdo processado pela mesma versão sempre gera o mesmo
+    resultado. Quando a versão muda, as entradas antigas deixam de ser
+    encontradas e saem pelo despejo LRU. Cada instância tem o próprio
+    arquivo, rótulo nos logs e variáveis de ambiente
+    <env_prefix>_PATH, <env_prefix>_MAX_ENTRIES e <env_prefix>_ENABLED.
+    """
+
+    key_columns = ('content_hash', 'version')
+    value_column = 'value'
+    eviction_interval = 1000
+
+    def __init__(self, label: str, table: str, env_prefix: str, default_path: str,
+                 default_max_entries: int, db_path: str = None, max_entries: int = None):
+        """Inicializa o cache e cria o schema se necessário"""
+        self.label = label
+        self.table = table
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0}
+        super().__init__(
+            db_path=db_path or os.getenv(f'{env_prefix}_PATH', default_path),
+            max_entries=max_entries or int(os.getenv(f'{env_prefix}_MAX_ENTRIES', str(default_max_entries))),
+            enabled=os.getenv(f'{env_prefix}_ENABLED', 'true').lower() != 'false'
+        )
+        if self.enabled:
+            logger.info(f"💾 {self.label} inicializado em {self.db_path} (máx {self.max_entries})")
+
+    def _create_tables(self, conn: sqlite3.Connection):
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                content_hash TEXT NOT NULL,
+                version TEXT NOT NULL,
+                {self.value_column} TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (content_hash, version)
+            )
+        ''')
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """SHA-256 do texto"""
+        return hashlib.sha256((text or '').encode('utf-8', 'ignore')).hexdigest()
+
+    def get_many(self, hashes: Iterable[str], version: str) -> Dict[str, Any]:
+        """Resultados em cache para os hashes informados ({hash: resultado})"""
+        hashes = list(dict.fromkeys(hashes))
+        if not self.enabled or not hashes:
+            return {}
+
+        found = {}
+        try:
+            conn = self._get_connection()
+            for start in range(0, len(hashes), _SQL_BATCH):
+                batch = hashes[start:start + _SQL_BATCH]
+                placeholders = ','.join('?' * len(batch))
+                for content_hash, value in conn.execute(
+                    f'''SELECT content_hash, {self.value_column} FROM {self.table}
+                        WHERE version = ? AND content_hash IN ({placeholders})''',
+                    (version, *batch)
+                ):
+                    found[content_hash] = json.loads(value)
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao ler {self.label}: {e}")
+            return {}
+
+        for content_hash in found:
+            self._touch(content_hash, version)
+        self.stats['hits'] += len(found)
+        self.stats['misses'] += len(hashes) - len(found)
+        return found
+
+    def set_many(self, items: List[Tuple[str, Any]], version: str):
+        """Grava [(hash, resultado)] em uma transação e aplica o limite de tamanho (LRU)"""
+        if not self.enabled or not items:
+            return
+
+        try:
+            now = time.time()
+            with self._transaction() as conn:
+                conn.executemany(
+                    f'''INSERT OR REPLACE INTO {self.table}
+                       (content_hash, version, {self.value_column}, created_at, last_access)
+                       VALUES (?, ?, ?, ?, ?)''',
+                    [
+                        (content_hash, version, json.dumps(value, ensure_ascii=False, default=str), now, now)
+                        for content_hash, value in items
+                    ]
+                )
+            self.stats['writes'] += len(items)
+            self._wrote(len(items))
+
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao gravar {self.label}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hits/misses deste processo e número de entradas em disco"""
+        if not self.enabled:
+            return {'enabled': False}
+
+        lookups = self.stats['hits'] + self.stats['misses']
+        try:
+            base = self._base_stats()
+        except Exception:
+            base = {'enabled': True, 'path': self.db_path, 'entries': None, 'max_entries': self.max_entries}
+        return {
+            **base,
+            **self.stats,
+            'hit_rate': self.stats['hits'] / lookups if lookups else 0.0
+        }
@@ -13,6 +13,8 @@ import httpx
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+from services.text_tokenizer import count_tokens
+
 logger = logging.getLogger(__name__)
 
 class TavilyMCPClient:
@@ -236,18 +238,13 @@ class TavilyMCPClient:
     
     def _extract_common_terms(self, results: List[Dict[str, Any]]) -> List[str]:
         """Extrai termos comuns dos resultados"""
-        # Implementação simplificada
-        all_text = ' '.join([r.get('title', '') + ' ' + r.get('content', '') for r in results])
-        words = all_text.lower().split()
-        
-        # Conta frequência de palavras (versão básica)
-        word_count = {}
-        for word in words:
-            if len(word) > 3:  # Apenas palavras com mais de 3 caracteres
-                word_count[word] = word_count.get(word, 0) + 1
+        # Conta palavras com mais de 3 caracteres, sem stopwords, resultado a resultado
+        word_count = count_tokens(
+            (r.get('title', '') + ' ' + r.get('content', '') for r in results), min_length=4
+        )
         
         # Retorna top 10 termos
-        return [word for word, count in sorted(word_count.items(), key=lambda x: x[1], reverse=True)[:10]]
+        return [word for word, count in word_count.most_common(10)]
     
     def _identify_trending_content(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Identifica conteúdo em trending"""
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v3.0 - Text Tokenizer
+Tokenização compartilhada: regex pré-compilada, stopwords em frozenset e normalização de acentos
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from collections import Counter
+from typing import Iterable, Iterator, List, Optional, AbstractSet
+
+# Palavras: sequências de caracteres de palavra (letras acentuadas, dígitos, _)
+WORD_PATTERN = re.compile(r'\b\w+\b')
+
+PORTUGUESE_STOPWORDS = frozenset([
+    'a', 'o', 'e', 'é', 'de', 'do', 'da', 'em', 'um', 'uma', 'para', 'com', 'não', 'que', 'se', 'na', 'por',
+    'mais', 'as', 'os', 'como', 'mas', 'foi', 'ao', 'ele', 'das', 'tem', 'à', 'seu', 'sua', 'ou', 'ser',
+    'quando', 'muito', 'há', 'nos', 'já', 'está', 'eu', 'também', 'só', 'pelo', 'pela', 'até', 'isso',
+    'ela', 'entre', 'era', 'depois', 'sem', 'mesmo', 'aos', 'ter', 'seus', 'quem', 'nas', 'me', 'esse',
+    'eles', 'estão', 'você', 'tinha', 'foram', 'essa', 'num', 'nem', 'suas', 'meu', 'às', 'minha', 'têm',
+    'numa', 'pelos', 'elas', 'havia', 'seja', 'qual', 'será', 'nós', 'tenho', 'lhe', 'deles', 'essas',
+    'esses', 'pelas', 'este', 'fosse', 'dele', 'tu', 'te', 'vocês', 'vos', 'lhes', 'meus', 'minhas'
+])
+
+def _build_accent_table() -> dict:
+    """Tabela str.translate que remove diacríticos do bloco Latin-1/Latin Extended-A"""
+    table = {}
+    for code in range(0xC0, 0x180):
+        char = chr(code)
+        base = ''.join(c for c in unicodedata.normalize('NFKD', char) if not unicodedata.combining(c))
+        if base and base != char:
+            table[code] = base
+    return table
+
+_ACCENT_TABLE = _build_accent_table()
+
+def strip_accents(text: str) -> str:
+    """Remove acentos ('ação' -> 'acao') com uma única passada de str.translate"""
+    return text.translate(_ACCENT_TABLE)
+
+@lru_cache(maxsize=32)
+def _normalized_stopwords(stopwords: frozenset) -> frozenset:
+    return frozenset(strip_accents(word) for word in stopwords)
+
+PORTUGUESE_STOPWORDS_NO_ACCENTS = _normalized_stopwords(PORTUGUESE_STOPWORDS)
+
+def tokenize(
+    text: str,
+    stopwords: Optional[AbstractSet[str]] = PORTUGUESE_STOPWORDS,
+    min_length: int = 1,
+    normalize_accents: bool = False,
+    alpha_only: bool = False
+) -> List[str]:
+    """Palavras em minúsculas, sem stopwords
+
+    Args:
+        stopwords: conjunto (frozenset/set) a excluir; None ou vazio não filtra
+        min_length: tamanho mínimo do token
+        normalize_accents: remove acentos do texto e compara com as stopwords sem acento
+        alpha_only: descarta tokens com dígitos ou '_'
+    """
+    if not text:
+        return []
+
+    text = text.lower()
+    if normalize_accents:
+        text = strip_accents(text)
+        if stopwords is PORTUGUESE_STOPWORDS:
+            stopwords = PORTUGUESE_STOPWORDS_NO_ACCENTS
+        elif stopwords:
+            stopwords = _normalized_stopwords(frozenset(stopwords))
+
+    tokens = WORD_PATTERN.findall(text)
+    if stopwords:
+        tokens = [token for token in tokens if token not in stopwords]
+    if min_length > 1:
+        tokens = [token for token in tokens if len(token) >= min_length]
+    if alpha_only:
+        tokens = [token for token in tokens if token.isalpha()]
+    return tokens
+
+def iter_tokens(texts: Iterable[str], **kwargs) -> Iterator[List[str]]:
+    """Tokens de cada texto, sob demanda (mesmos parâmetros de tokenize)"""
+    for text in texts:
+        yield tokenize(text, **kwargs)
+
+def count_tokens(texts: Iterable[str], **kwargs) -> Counter:
+    """Frequência dos tokens de vários textos, contada texto a texto"""
+    counts = Counter()
+    for tokens in iter_tokens(texts, **kwargs):
+        counts.update(tokens)
+    return counts
@@ -13,8 +13,6 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 import re
 from urllib.parse import urlparse, parse_qs
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -22,6 +20,8 @@ from PIL import Image
 import io
 import time
 
+from services.browser_pool import browser_pool
+
 
 @dataclass
 class ViralContent:
@@ -70,43 +70,37 @@ class ViralContentAnalyzer:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.session.aclose()
     
-    def _setup_selenium_driver(self, mobile: bool = False) -> webdriver.Chrome:
-        """Configura driver Selenium para captura de screenshots"""
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        
-        if mobile:
-            chrome_options.add_argument('--window-size=375,812')  # iPhone X size
-            chrome_options.add_argument('--user-agent=Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X)')
-        else:
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-        
-        return webdriver.Chrome(options=chrome_options)
-    
     async def capture_screenshot(self, url: str, filename: str, 
                                 mobile: bool = False, full_page: bool = True) -> str:
         """
-        Captura screenshot de uma URL
+        Captura screenshot de uma URL com um navegador emprestado do pool
         """
+        driver = None
+        original_agent = None
         try:
-            driver = self._setup_selenium_driver(mobile)
+            driver = await browser_pool.acquire_async()
+            
+            if mobile:
+                # Emula o iPhone X no navegador do pool; desfeito antes de devolver
+                original_agent = driver.execute_script("return navigator.userAgent")
+                driver.execute_cdp_cmd('Network.setUserAgentOverride', {
+                    'userAgent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X)'
+                })
+                driver.set_window_size(375, 812)
+            
             driver.get(url)
             
             # Aguarda carregamento
-            WebDriverWait(driver, 15).until(
+            WebDriverWait(driver, browser_pool.time_left(15)).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
+            browser_pool.wait_for_page_ready(driver)
             
             # Scroll para carregar conteúdo dinâmico
             if full_page:
                 driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(3)
+                browser_pool.wait_for_page_ready(driver)
                 driver.execute_script("window.scrollTo(0, 0);")
-                time.sleep(2)
             
             # Remove elementos que podem atrapalhar
             driver.execute_script("""
@@ -122,17 +116,27 @@ class ViralContentAnalyzer:
             if full_page:
                 # Screenshot da página inteira
                 total_height = driver.execute_script("return document.body.scrollHeight")
-                driver.set_window_size(1920, total_height)
-                time.sleep(2)
+                driver.set_window_size(375 if mobile else 1920, total_height)
+                browser_pool.wait_for_page_ready(driver, timeout=5.0)
             
             driver.save_screenshot(screenshot_path)
-            driver.quit()
             
             return screenshot_path
             
         except Exception as e:
             print(f"Erro ao capturar screenshot de {url}: {e}")
             return ""
+        finally:
+            if driver is not None:
+                # Devolve o navegador ao pool com o tamanho e user agent padrão
+                healthy = True
+                try:
+                    driver.set_window_size(1920, 1080)
+                    if original_agent:
+                        driver.execute_cdp_cmd('Network.setUserAgentOverride', {'userAgent': original_agent})
+                except Exception:
+                    healthy = False
+                browser_pool.release(driver, healthy=healthy)
     
     async def analyze_instagram_content(self, hashtag: str, limit: int = 20) -> List[ViralContent]:
         """
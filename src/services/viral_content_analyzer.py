@@ -7,7 +7,6 @@ Analisador de conteúdo viral com captura de screenshots
 
 import os
 import logging
-import asyncio
 import time
 from typing import Dict, List, Any, Optional
 from datetime import datetime
@@ -24,18 +23,16 @@ except ImportError:
 
 # Selenium imports
 try:
-    from selenium import webdriver
-    from selenium.webdriver.chrome.options import Options
-    from selenium.webdriver.chrome.service import Service
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
-    from selenium.common.exceptions import TimeoutException, WebDriverException
-    from webdriver_manager.chrome import ChromeDriverManager
+    from selenium.common.exceptions import TimeoutException
     HAS_SELENIUM = True
 except ImportError:
     HAS_SELENIUM = False
 
+from services.browser_pool import browser_pool
+
 logger = logging.getLogger(__name__)
 
 # Mock SeleniumChecker if it's not available to avoid errors during initialization
@@ -335,187 +332,152 @@ class ViralContentAnalyzer:
         viral_content: List[Dict[str, Any]],
         session_id: str
     ) -> List[Dict[str, Any]]:
-        """Captura screenshots do conteúdo viral"""
+        """Captura screenshots do conteúdo viral em paralelo usando o browser pool"""
 
         if not HAS_SELENIUM:
             logger.warning("⚠️ Selenium não disponível para screenshots")
             return []
 
         screenshots = []
-        driver = None
 
         try:
-            # Configura Chrome headless para Replit
-            chrome_options = Options()
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--disable-web-security")
-            chrome_options.add_argument("--disable-features=VizDisplayCompositor")
-            chrome_options.add_argument("--remote-debugging-port=9222")
-            chrome_options.add_argument("--disable-extensions")
-            chrome_options.add_argument("--disable-plugins")
-            chrome_options.add_argument(f"--window-size={self.screenshot_config['width']},{self.screenshot_config['height']}")
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36")
-
-            # Usa Chrome do sistema Nix diretamente
-            try:
-                from .selenium_checker import SeleniumChecker
-                checker = SeleniumChecker()
-                check_results = checker.full_check()
-
-                if not check_results['selenium_ready']:
-                    logger.warning("⚠️ Selenium não está pronto - screenshots desabilitados")
-                    return []
-
-                best_chrome_path = check_results.get('best_chrome_path')
-                if best_chrome_path:
-                    chrome_options.binary_location = best_chrome_path
-                    logger.info(f"✅ Chrome configurado: {best_chrome_path}")
-                else:
-                    logger.warning("⚠️ Chrome não encontrado - screenshots desabilitados")
-                    return []
-
-                try:
-                    service = Service(ChromeDriverManager().install())
-                    driver = webdriver.Chrome(service=service, options=chrome_options)
-                    logger.info("✅ ChromeDriverManager funcionou")
-                except Exception as e:
-                    logger.warning(f"⚠️ ChromeDriverManager falhou: {e}, tentando usar chromedriver do sistema")
-                    try:
-                        driver = webdriver.Chrome(options=chrome_options)
-                        logger.info("✅ Chromedriver do sistema funcionou")
-                    except WebDriverException as sys_driver_e:
-                        logger.error(f"❌ Falha ao iniciar Chrome com chromedriver do sistema: {sys_driver_e}. Certifique-se de que o chromedriver esteja no PATH ou especificado.")
-                        return []
-
-            except Exception as e:
-                logger.error(f"❌ Falha total na configuração do Chrome: {e}")
-                return []
-
             screenshots_dir = Path(f"analyses_data/files/{session_id}")
             screenshots_dir.mkdir(parents=True, exist_ok=True)
 
+            items = []
             for i, content in enumerate(viral_content, 1):
-                try:
+                url = content.get('url', '')
+                if not url or not url.startswith(('http://', 'https://')):
+                    logger.warning(f"Skipping invalid URL: {url}")
+                    continue
+                items.append((i, content))
+
+            # Cada URL usa um navegador do pool, com prazo próprio
+            results = await browser_pool.run_parallel(
+                lambda driver, item: self._capture_single_screenshot(
+                    driver, item[0], len(viral_content), item[1], screenshots_dir
+                ),
+                items,
+                max_concurrency=int(os.getenv('SCREENSHOT_CONCURRENCY', browser_pool.max_size)),
+                item_timeout=float(os.getenv('SCREENSHOT_URL_TIMEOUT', '25'))
+            )
+
+            for (i, content), result in zip(items, results):
+                if isinstance(result, Exception):
                     url = content.get('url', '')
-                    platform = content.get('platform', 'web')
-
-                    if not url or not url.startswith(('http://', 'https://')):
-                        logger.warning(f"Skipping invalid URL: {url}")
-                        continue
-
-                    logger.info(f"📸 Capturando screenshot {i}/{len(viral_content)}: {content.get('title', 'Sem título')}")
-
-                    driver.get(url)
-
-                    # Adiciona lógica específica para Instagram/Facebook
-                    if platform == 'instagram':
-                        # Tenta fechar pop-up de login se existir
-                        try:
-                            WebDriverWait(driver, 5).until(
-                                EC.presence_of_element_located((By.XPATH, "//button[text()='Agora não']"))
-                            ).click()
-                            logger.info("Fechou pop-up de login do Instagram")
-                        except TimeoutException:
-                            pass # Pop-up não apareceu ou já foi fechado
-                        except Exception as e:
-                            logger.warning(f"Erro ao tentar fechar pop-up do Instagram: {e}")
-
-                        # Espera por elementos de post (ex: imagem principal ou vídeo)
-                        try:
-                            WebDriverWait(driver, 10).until(
-                                EC.presence_of_element_located((By.XPATH, "//img[contains(@srcset, 's150x150')] | //video"))
-                            )
-                        except TimeoutException:
-                            logger.warning(f"Não encontrou elementos de post no Instagram para {url}")
-
-                    elif platform == 'facebook':
-                        # Tenta fechar pop-up de cookies/login
-                        try:
-                            WebDriverWait(driver, 5).until(
-                                EC.presence_of_element_located((By.XPATH, "//div[@aria-label='Aceitar todos os cookies'] | //a[@data-testid='login_button']"))
-                            ).click()
-                            logger.info("Fechou pop-up de cookies/login do Facebook")
-                        except TimeoutException:
-                            pass
-                        except Exception as e:
-                            logger.warning(f"Erro ao tentar fechar pop-up do Facebook: {e}")
-
-                        # Espera por elementos de post (ex: post feed)
-                        try:
-                            WebDriverWait(driver, 10).until(
-                                EC.presence_of_element_located((By.XPATH, "//div[@role='feed'] | //div[@data-pagelet='ProfileCometPostCollection']"))
-                            )
-                        except TimeoutException:
-                            logger.warning(f"Não encontrou elementos de post no Facebook para {url}")
-
-                    # Aguarda carregamento geral
-                    WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((By.TAG_NAME, "body"))
-                    )
-
-                    await asyncio.sleep(self.screenshot_config['wait_time'])
-
-                    # Scroll para carregar conteúdo lazy-loaded
-                    driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-                    await asyncio.sleep(self.screenshot_config['scroll_pause'])
-                    driver.execute_script("window.scrollTo(0, 0);")
-                    await asyncio.sleep(1)
-
-                    page_title = driver.title or content.get('title', 'Sem título')
-                    current_url = driver.current_url
-
-                    filename = f"screenshot_{platform}_{i:03d}"
-                    screenshot_path = screenshots_dir / f"{filename}.png"
-
-                    driver.save_screenshot(str(screenshot_path))
-
-                    if screenshot_path.exists() and screenshot_path.stat().st_size > 0:
-                        logger.info(f"✅ Screenshot salvo: {screenshot_path}")
-                        screenshots.append({
-                            'success': True,
-                            'url': url,
-                            'final_url': current_url,
-                            'title': page_title,
-                            'platform': platform,
-                            'viral_score': content.get('viral_score', 0),
-                            'filename': f"{filename}.png",
-                            'filepath': str(screenshot_path),
-                            'relative_path': str(screenshot_path.relative_to(Path('analyses_data'))),
-                            'filesize': screenshot_path.stat().st_size,
-                            'timestamp': datetime.now().isoformat(),
-                            'content_metrics': {
-                                'likes': content.get('likes', 0),
-                                'comments': content.get('comments', 0),
-                                'shares': content.get('shares', 0),
-                                'views': content.get('view_count', 0) # Para YouTube/TikTok
-                            }
-                        })
-                    else:
-                        raise Exception("Screenshot não foi criado ou está vazio")
-
-                except Exception as e:
-                    logger.error(f"❌ Erro ao capturar screenshot de {url}: {e}")
+                    logger.error(f"❌ Erro ao capturar screenshot de {url}: {result}")
                     screenshots.append({
                         'success': False,
                         'url': url,
-                        'error': str(e),
+                        'error': str(result),
                         'timestamp': datetime.now().isoformat()
                     })
+                else:
+                    screenshots.append(result)
 
         except Exception as e:
             logger.error(f"❌ Erro crítico na captura de screenshots: {e}")
-        finally:
-            if driver:
-                try:
-                    driver.quit()
-                    logger.info("✅ Chrome driver fechado")
-                except Exception as e:
-                    logger.error(f"❌ Erro ao fechar driver: {e}")
+
         return screenshots
 
+    def _capture_single_screenshot(
+        self,
+        driver,
+        index: int,
+        total: int,
+        content: Dict[str, Any],
+        screenshots_dir: Path
+    ) -> Dict[str, Any]:
+        """Captura um screenshot (executado em thread com navegador emprestado)"""
+
+        url = content.get('url', '')
+        platform = content.get('platform', 'web')
+
+        logger.info(f"📸 Capturando screenshot {index}/{total}: {content.get('title', 'Sem título')}")
+
+        driver.get(url)
+
+        # Adiciona lógica específica para Instagram/Facebook
+        if platform == 'instagram':
+            # Tenta fechar pop-up de login se existir
+            try:
+                WebDriverWait(driver, browser_pool.time_left(5)).until(
+                    EC.presence_of_element_located((By.XPATH, "//button[text()='Agora não']"))
+                ).click()
+                logger.info("Fechou pop-up de login do Instagram")
+            except TimeoutException:
+                pass # Pop-up não apareceu ou já foi fechado
+            except Exception as e:
+                logger.warning(f"Erro ao tentar fechar pop-up do Instagram: {e}")
+
+            # Espera por elementos de post (ex: imagem principal ou vídeo)
+            try:
+                WebDriverWait(driver, browser_pool.time_left(10)).until(
+                    EC.presence_of_element_located((By.XPATH, "//img[contains(@srcset, 's150x150')] | //video"))
+                )
+            except TimeoutException:
+                logger.warning(f"Não encontrou elementos de post no Instagram para {url}")
+
+        elif platform == 'facebook':
+            # Tenta fechar pop-up de cookies/login
+            try:
+                WebDriverWait(driver, browser_pool.time_left(5)).until(
+                    EC.presence_of_element_located((By.XPATH, "//div[@aria-label='Aceitar todos os cookies'] | //a[@data-testid='login_button']"))
+                ).click()
+                logger.info("Fechou pop-up de cookies/login do Facebook")
+            except TimeoutException:
+                pass
+            except Exception as e:
+                logger.warning(f"Erro ao tentar fechar pop-up do Facebook: {e}")
+
+            # Espera por elementos de post (ex: post feed)
+            try:
+                WebDriverWait(driver, browser_pool.time_left(10)).until(
+                    EC.presence_of_element_located((By.XPATH, "//div[@role='feed'] | //div[@data-pagelet='ProfileCometPostCollection']"))
+                )
+            except TimeoutException:
+                logger.warning(f"Não encontrou elementos de post no Facebook para {url}")
+
+        # Aguarda o DOM e a rede estabilizarem (wait_time passa a ser o teto, não um sleep fixo)
+        browser_pool.wait_for_page_ready(driver, timeout=self.screenshot_config['wait_time'] + 5)
+
+        # Scroll para carregar conteúdo lazy-loaded
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
+        browser_pool.wait_for_page_ready(driver, timeout=self.screenshot_config['scroll_pause'], quiet_period=0.3)
+        driver.execute_script("window.scrollTo(0, 0);")
+
+        page_title = driver.title or content.get('title', 'Sem título')
+        current_url = driver.current_url
+
+        filename = f"screenshot_{platform}_{index:03d}"
+        screenshot_path = screenshots_dir / f"{filename}.png"
+
+        driver.save_screenshot(str(screenshot_path))
+
+        if not (screenshot_path.exists() and screenshot_path.stat().st_size > 0):
+            raise Exception("Screenshot não foi criado ou está vazio")
+
+        logger.info(f"✅ Screenshot salvo: {screenshot_path}")
+        return {
+            'success': True,
+            'url': url,
+            'final_url': current_url,
+            'title': page_title,
+            'platform': platform,
+            'viral_score': content.get('viral_score', 0),
+            'filename': f"{filename}.png",
+            'filepath': str(screenshot_path),
+            'relative_path': str(screenshot_path.relative_to(Path('analyses_data'))),
+            'filesize': screenshot_path.stat().st_size,
+            'timestamp': datetime.now().isoformat(),
+            'content_metrics': {
+                'likes': content.get('likes', 0),
+                'comments': content.get('comments', 0),
+                'shares': content.get('shares', 0),
+                'views': content.get('view_count', 0) # Para YouTube/TikTok
+            }
+        }
+
     def _calculate_viral_metrics(self, viral_content: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Calcula métricas gerais de viralidade"""
         total_score = 0
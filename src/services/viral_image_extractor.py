@@ -15,8 +15,6 @@ from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 import re
 from urllib.parse import urlparse, parse_qs, urljoin
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -26,6 +24,9 @@ import time
 import logging
 from pathlib import Path
 
+from services.browser_pool import browser_pool
+from services.ocr_pipeline import ocr_pipeline
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -45,6 +46,7 @@ class ViralImage:
     extraction_timestamp: str
     image_size: Tuple[int, int]
     file_size: int
+    ocr_text: str = ""
 
 class ViralImageExtractor:
     """Extrator de imagens virais de redes sociais"""
@@ -56,13 +58,10 @@ class ViralImageExtractor:
         self.extracted_images = []
         self.min_images_target = 20
         
-        # Configuração do Selenium para extração de imagens
-        self.chrome_options = Options()
-        self.chrome_options.add_argument('--headless')
-        self.chrome_options.add_argument('--no-sandbox')
-        self.chrome_options.add_argument('--disable-dev-shm-usage')
-        self.chrome_options.add_argument('--disable-gpu')
-        self.chrome_options.add_argument('--window-size=1920,1080')
+        # Navegadores vêm do pool compartilhado (services.browser_pool)
+        self.browser_pool = browser_pool
+        # Texto das imagens baixadas via OCR em lote (VIRAL_IMAGE_OCR=false desativa)
+        self.ocr_enabled = os.getenv("VIRAL_IMAGE_OCR", "true").lower() != "false" and ocr_pipeline.available
         
         logger.info("🖼️ Viral Image Extractor inicializado")
     
@@ -108,12 +107,29 @@ class ViralImageExtractor:
         
         self.extracted_images = final_images
         
+        # Texto das imagens (OCR paralelo com cache por hash)
+        if self.ocr_enabled:
+            await self.extract_images_text(final_images)
+        
         # Salva metadados das imagens
         await self.save_images_metadata(final_images, session_id)
         
         logger.info(f"✅ {len(final_images)} imagens virais extraídas com sucesso")
         return final_images
     
+    async def extract_images_text(self, images: List[ViralImage]) -> List[ViralImage]:
+        """
+        Preenche ocr_text das imagens baixadas usando o pipeline de OCR compartilhado
+        """
+        local_images = [image for image in images if image.local_path and os.path.exists(image.local_path)]
+        try:
+            ocr_results = await ocr_pipeline.process_images(image.local_path for image in local_images)
+            for image, ocr_result in zip(local_images, ocr_results):
+                image.ocr_text = ocr_result.get("text", "").strip()
+        except Exception as e:
+            logger.warning(f"⚠️ Erro no OCR das imagens virais: {e}")
+        return images
+    
     async def extract_instagram_images(self, query: str, session_id: str, limit: int = 8) -> List[ViralImage]:
         """
         Extrai imagens reais do Instagram usando scraping inteligente
@@ -214,6 +230,7 @@ class ViralImageExtractor:
         """
         images = []
         
+        driver = None
         try:
             # Remove # se presente
             clean_hashtag = hashtag.replace('#', '')
@@ -221,7 +238,7 @@ class ViralImageExtractor:
             # URL pública do Instagram para hashtag
             url = f"https://www.instagram.com/explore/tags/{clean_hashtag}/"
             
-            driver = webdriver.Chrome(options=self.chrome_options)
+            driver = await self.browser_pool.acquire_async()
             driver.get(url)
             
             # Aguarda carregamento
@@ -233,28 +250,25 @@ class ViralImageExtractor:
                 time.sleep(2)
             
             # Extrai links de posts
-            post_links = driver.find_elements(By.CSS_SELECTOR, 'a[href*="/p/"]')
-            
-            for i, link in enumerate(post_links[:limit]):
-                if i >= limit:
-                    break
-                
-                try:
-                    post_url = link.get_attribute('href')
-                    
-                    # Extrai imagem do post
-                    image_data = await self._extract_instagram_post_image(post_url, session_id, i)
-                    if image_data:
-                        images.append(image_data)
-                        
-                except Exception as e:
-                    logger.warning(f"⚠️ Erro ao extrair post {i}: {e}")
-                    continue
-            
-            driver.quit()
+            post_urls = [link.get_attribute('href') for link in driver.find_elements(By.CSS_SELECTOR, 'a[href*="/p/"]')[:limit]]
             
         except Exception as e:
             logger.error(f"❌ Erro no scraping do Instagram: {e}")
+            post_urls = []
+        finally:
+            # Devolve o navegador antes de abrir os posts, que pegam outro do pool
+            self.browser_pool.release(driver)
+        
+        for i, post_url in enumerate(post_urls):
+            try:
+                # Extrai imagem do post
+                image_data = await self._extract_instagram_post_image(post_url, session_id, i)
+                if image_data:
+                    images.append(image_data)
+                    
+            except Exception as e:
+                logger.warning(f"⚠️ Erro ao extrair post {i}: {e}")
+                continue
         
         return images
     
@@ -262,8 +276,9 @@ class ViralImageExtractor:
         """
         Extrai imagem específica de um post do Instagram
         """
+        driver = None
         try:
-            driver = webdriver.Chrome(options=self.chrome_options)
+            driver = await self.browser_pool.acquire_async()
             driver.get(post_url)
             time.sleep(3)
             
@@ -313,13 +328,12 @@ class ViralImageExtractor:
                         file_size=image_info['file_size']
                     )
                     
-                    driver.quit()
                     return viral_image
             
-            driver.quit()
-            
         except Exception as e:
             logger.error(f"❌ Erro ao extrair imagem do Instagram: {e}")
+        finally:
+            self.browser_pool.release(driver)
         
         return None
     
@@ -329,31 +343,33 @@ class ViralImageExtractor:
         """
         images = []
         
+        driver = None
         try:
             # Busca páginas públicas relacionadas
             search_url = f"https://www.facebook.com/search/pages/?q={query.replace(' ', '%20')}"
             
-            driver = webdriver.Chrome(options=self.chrome_options)
+            driver = await self.browser_pool.acquire_async()
             driver.get(search_url)
             time.sleep(5)
             
             # Busca links de páginas
-            page_links = driver.find_elements(By.CSS_SELECTOR, 'a[href*="/pages/"]')[:3]
-            
-            for page_link in page_links:
-                try:
-                    page_url = page_link.get_attribute('href')
-                    page_images = await self._extract_facebook_page_images(page_url, session_id, limit//3)
-                    images.extend(page_images)
-                    
-                except Exception as e:
-                    logger.warning(f"⚠️ Erro ao extrair página do Facebook: {e}")
-                    continue
-            
-            driver.quit()
+            page_urls = [link.get_attribute('href') for link in driver.find_elements(By.CSS_SELECTOR, 'a[href*="/pages/"]')[:3]]
             
         except Exception as e:
             logger.error(f"❌ Erro no scraping do Facebook: {e}")
+            page_urls = []
+        finally:
+            # Devolve o navegador antes de abrir as páginas, que pegam outro do pool
+            self.browser_pool.release(driver)
+        
+        for page_url in page_urls:
+            try:
+                page_images = await self._extract_facebook_page_images(page_url, session_id, limit//3)
+                images.extend(page_images)
+                
+            except Exception as e:
+                logger.warning(f"⚠️ Erro ao extrair página do Facebook: {e}")
+                continue
         
         return images[:limit]
     
@@ -363,8 +379,9 @@ class ViralImageExtractor:
         """
         images = []
         
+        driver = None
         try:
-            driver = webdriver.Chrome(options=self.chrome_options)
+            driver = await self.browser_pool.acquire_async()
             driver.get(page_url)
             time.sleep(3)
             
@@ -417,10 +434,10 @@ class ViralImageExtractor:
                     logger.warning(f"⚠️ Erro ao processar imagem {i}: {e}")
                     continue
             
-            driver.quit()
-            
         except Exception as e:
             logger.error(f"❌ Erro ao extrair imagens da página: {e}")
+        finally:
+            self.browser_pool.release(driver)
         
         return images
     
@@ -430,11 +447,12 @@ class ViralImageExtractor:
         """
         videos = []
         
+        driver = None
         try:
             # URL de busca do YouTube
             search_url = f"https://www.youtube.com/results?search_query={query.replace(' ', '+')}&sp=CAMSAhAB"
             
-            driver = webdriver.Chrome(options=self.chrome_options)
+            driver = await self.browser_pool.acquire_async()
             driver.get(search_url)
             time.sleep(5)
             
@@ -477,10 +495,10 @@ class ViralImageExtractor:
                     logger.warning(f"⚠️ Erro ao processar vídeo {i}: {e}")
                     continue
             
-            driver.quit()
-            
         except Exception as e:
             logger.error(f"❌ Erro no scraping do YouTube: {e}")
+        finally:
+            self.browser_pool.release(driver)
         
         return videos
     
@@ -600,8 +618,9 @@ class ViralImageExtractor:
         """
         images = []
         
+        driver = None
         try:
-            driver = webdriver.Chrome(options=self.chrome_options)
+            driver = await self.browser_pool.acquire_async()
             driver.get(search_url)
             time.sleep(3)
             
@@ -653,10 +672,10 @@ class ViralImageExtractor:
                     logger.warning(f"⚠️ Erro ao processar imagem {i}: {e}")
                     continue
             
-            driver.quit()
-            
         except Exception as e:
             logger.error(f"❌ Erro na extração de imagens: {e}")
+        finally:
+            self.browser_pool.release(driver)
         
         return images
     
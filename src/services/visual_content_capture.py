@@ -9,20 +9,17 @@ Captura de screenshots e conteúdo visual usando Selenium
 import os
 import logging
 import time
-import asyncio
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from pathlib import Path
 
 # Selenium imports
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
+
+from services.browser_pool import browser_pool
 
 logger = logging.getLogger(__name__)
 
@@ -37,59 +34,6 @@ class VisualContentCapture:
         
         logger.info("📸 Visual Content Capture inicializado")
 
-    def _setup_driver(self) -> webdriver.Chrome:
-        """Configura o driver do Chrome em modo headless"""
-        try:
-            chrome_options = Options()
-            
-            # Configurações para modo headless e otimização no Replit
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--disable-web-security")
-            chrome_options.add_argument("--disable-features=VizDisplayCompositor")
-            chrome_options.add_argument("--remote-debugging-port=9222")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument("--disable-extensions")
-            chrome_options.add_argument("--disable-plugins")
-            chrome_options.add_argument("--disable-images")  # Para economizar banda
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36")
-            
-            # Usa selenium_checker para configuração robusta
-            from .selenium_checker import selenium_checker
-            
-            # Executa verificação completa
-            check_results = selenium_checker.full_check()
-            
-            if not check_results['selenium_ready']:
-                raise Exception("Selenium não está configurado corretamente")
-            
-            # Configura o Chrome com o melhor caminho encontrado
-            best_chrome_path = check_results['best_chrome_path']
-            if best_chrome_path:
-                chrome_options.binary_location = best_chrome_path
-                logger.info(f"✅ Chrome configurado: {best_chrome_path}")
-            
-            # Tenta usar ChromeDriverManager primeiro
-            try:
-                service = Service(ChromeDriverManager().install())
-                driver = webdriver.Chrome(service=service, options=chrome_options)
-                logger.info("✅ ChromeDriverManager funcionou")
-            except Exception as e:
-                logger.warning(f"⚠️ ChromeDriverManager falhou: {e}, usando chromedriver do sistema")
-                # Fallback para chromedriver do sistema
-                driver = webdriver.Chrome(options=chrome_options)
-            
-            driver.set_page_load_timeout(self.page_load_timeout)
-            
-            logger.info("✅ Chrome driver configurado com sucesso")
-            return driver
-            
-        except Exception as e:
-            logger.error(f"❌ Erro ao configurar Chrome driver: {e}")
-            raise
-
     def _create_session_directory(self, session_id: str) -> Path:
         """Cria diretório para a sessão"""
         try:
@@ -103,33 +47,34 @@ class VisualContentCapture:
             logger.error(f"❌ Erro ao criar diretório: {e}")
             raise
 
-    def _take_screenshot(self, url: str, filename: str, session_dir: Path) -> Dict[str, Any]:
+    def _take_screenshot(self, url: str, filename: str, session_dir: Path, driver=None) -> Dict[str, Any]:
         """Captura screenshot de uma URL específica"""
+        driver = driver or self.driver
         try:
             logger.info(f"📸 Capturando screenshot: {url}")
             
             # Acessa a URL
-            self.driver.get(url)
+            driver.get(url)
             
             # Aguarda o carregamento da página
             try:
-                WebDriverWait(self.driver, self.wait_timeout).until(
+                WebDriverWait(driver, browser_pool.time_left(self.wait_timeout)).until(
                     EC.presence_of_element_located((By.TAG_NAME, "body"))
                 )
             except TimeoutException:
                 logger.warning(f"⚠️ Timeout aguardando carregamento de {url}")
             
-            # Aguarda um pouco mais para renderização completa
-            time.sleep(2)
+            # Aguarda o DOM e a rede estabilizarem em vez de um sleep fixo
+            browser_pool.wait_for_page_ready(driver, timeout=self.wait_timeout)
             
             # Captura informações da página
-            page_title = self.driver.title or "Sem título"
-            page_url = self.driver.current_url
+            page_title = driver.title or "Sem título"
+            page_url = driver.current_url
             
             # Tenta obter meta description
             meta_description = ""
             try:
-                meta_element = self.driver.find_element(By.CSS_SELECTOR, 'meta[name="description"]')
+                meta_element = driver.find_element(By.CSS_SELECTOR, 'meta[name="description"]')
                 meta_description = meta_element.get_attribute("content") or ""
             except:
                 pass
@@ -138,7 +83,7 @@ class VisualContentCapture:
             screenshot_path = session_dir / f"{filename}.png"
             
             # Captura o screenshot
-            self.driver.save_screenshot(str(screenshot_path))
+            driver.save_screenshot(str(screenshot_path))
             
             # Verifica se o arquivo foi criado
             if screenshot_path.exists() and screenshot_path.stat().st_size > 0:
@@ -196,39 +141,36 @@ class VisualContentCapture:
             session_dir = self._create_session_directory(session_id)
             capture_results['session_directory'] = str(session_dir)
             
-            # Configura o driver
-            self.driver = self._setup_driver()
-            
-            # Processa cada URL
+            # Valida URLs antes de distribuir entre os navegadores
+            jobs = []
             for i, url in enumerate(urls, 1):
                 if not url or not url.startswith(('http://', 'https://')):
                     logger.warning(f"⚠️ URL inválida ignorada: {url}")
                     capture_results['failed_captures'] += 1
                     capture_results['errors'].append(f"URL inválida: {url}")
                     continue
-                
-                try:
-                    # Gera nome do arquivo
-                    filename = f"screenshot_{i:03d}"
-                    
-                    # Captura o screenshot
-                    result = self._take_screenshot(url, filename, session_dir)
-                    
-                    if result['success']:
-                        capture_results['successful_captures'] += 1
-                        capture_results['screenshots'].append(result)
-                    else:
-                        capture_results['failed_captures'] += 1
-                        capture_results['errors'].append(result['error'])
-                    
-                    # Pequena pausa entre capturas para não sobrecarregar
-                    await asyncio.sleep(1)
-                    
-                except Exception as e:
-                    error_msg = f"Erro processando URL {url}: {e}"
+                jobs.append((url, f"screenshot_{i:03d}"))
+
+            # Captura em paralelo, cada URL com um navegador do pool e prazo próprio
+            results = await browser_pool.run_parallel(
+                lambda driver, job: self._take_screenshot(job[0], job[1], session_dir, driver=driver),
+                jobs,
+                max_concurrency=int(os.getenv('SCREENSHOT_CONCURRENCY', browser_pool.max_size)),
+                item_timeout=float(os.getenv('SCREENSHOT_URL_TIMEOUT', self.page_load_timeout))
+            )
+
+            for (url, _), result in zip(jobs, results):
+                if isinstance(result, Exception):
+                    error_msg = f"Erro processando URL {url}: {result}"
                     logger.error(f"❌ {error_msg}")
                     capture_results['failed_captures'] += 1
                     capture_results['errors'].append(error_msg)
+                elif result['success']:
+                    capture_results['successful_captures'] += 1
+                    capture_results['screenshots'].append(result)
+                else:
+                    capture_results['failed_captures'] += 1
+                    capture_results['errors'].append(result['error'])
             
             # Finaliza a captura
             capture_results['end_time'] = datetime.now().isoformat()
@@ -239,16 +181,6 @@ class VisualContentCapture:
             error_msg = f"Erro crítico na captura: {e}"
             logger.error(f"❌ {error_msg}")
             capture_results['critical_error'] = error_msg
-            
-        finally:
-            # Fecha o driver se estiver aberto
-            if self.driver:
-                try:
-                    self.driver.quit()
-                    logger.info("✅ Chrome driver fechado")
-                except Exception as e:
-                    logger.error(f"❌ Erro ao fechar driver: {e}")
-                self.driver = None
         
         return capture_results
 
@@ -15,6 +15,8 @@ import numpy as np
 from urllib.parse import urljoin
 import time
 
+from services.search_cache import search_cache
+
 
 @dataclass
 class DataQuery:
@@ -46,7 +48,7 @@ class SupadataClient:
         self.session = httpx.AsyncClient(timeout=60.0)
         self.base_url = os.getenv('SUPADATA_BASE_URL', 'https://api.supadata.com/v1')
         self.api_key = os.getenv('SUPADATA_API_KEY', '')
-        self.cache = {}
+        self.cache = search_cache
         self.rate_limit_delay = 1.0  # segundos entre requests
         
     async def __aenter__(self):
@@ -105,18 +107,17 @@ class SupadataClient:
         query_id = f"market_{segment}_{region}_{timeframe}_{int(time.time())}"
         
         # Cache check
-        cache_key = f"market_{segment}_{region}_{timeframe}"
-        if cache_key in self.cache:
-            cached_result = self.cache[cache_key]
-            if time.time() - cached_result['timestamp'] < 3600:  # 1 hora
-                return DataResult(
-                    query_id=query_id,
-                    data=cached_result['data'],
-                    metadata=cached_result['metadata'],
-                    timestamp=datetime.now().isoformat(),
-                    status='cached',
-                    processing_time=0.0
-                )
+        cache_params = {'region': region, 'timeframe': timeframe}
+        cached_result = self.cache.get('supadata', f"market {segment}", cache_params)
+        if cached_result is not None:
+            return DataResult(
+                query_id=query_id,
+                data=cached_result['data'],
+                metadata=cached_result['metadata'],
+                timestamp=datetime.now().isoformat(),
+                status='cached',
+                processing_time=0.0
+            )
         
         start_time = time.time()
         
@@ -141,11 +142,10 @@ class SupadataClient:
         )
         
         # Cache result
-        self.cache[cache_key] = {
+        self.cache.set('supadata', f"market {segment}", {
             'data': market_data,
-            'metadata': result.metadata,
-            'timestamp': time.time()
-        }
+            'metadata': result.metadata
+        }, cache_params, ttl=3600)  # 1 hora
         
         return result
     